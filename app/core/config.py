@@ -1,7 +1,7 @@
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
@@ -39,6 +39,7 @@ class Settings(BaseSettings):
     HELIUS_API_KEY: Optional[str] = None
     HELIUS_RPC_URL: str = "https://rpc.helius.xyz/?api-key="
     HELIUS_BASE_URL: str = "https://mainnet.helius-rpc.com"
+    HELIUS_WS_URL: Optional[str] = Field(default=None, description="Helius websocket RPC (defaults to wss://mainnet.helius-rpc.com with the API key)")
 
     # Birdeye
     BIRDEYE_API_KEY: Optional[str] = None
@@ -70,6 +71,16 @@ class Settings(BaseSettings):
     # ==============================================
     CHROMA_DB_PATH: str = "./shared_data/chroma"
     CHROMA_COLLECTION_NAME: str = "solana_tokens_knowledge"
+    CHROMA_THREAD_POOL_SIZE: int = Field(default=4, description="Threads running ChromaDB calls off the event loop")
+    CHROMA_WRITE_BATCH_SIZE: int = Field(default=64, description="Queued ChromaDB writes upserted (and embedded) per batch")
+    CHROMA_WRITE_FLUSH_MS: int = Field(default=500, description="Max time a queued ChromaDB write waits for its batch (ms)")
+    CHROMA_WRITE_MAX_RETRIES: int = Field(default=5, description="Failed batch upserts before a document is retried alone and then dropped")
+    CHROMA_EMBEDDING_BACKEND: str = Field(default="default", description="Embedding backend: default (ONNX MiniLM) or sentence_transformers; changing it needs a fresh collection")
+    CHROMA_EMBEDDING_MODEL: str = Field(default="all-MiniLM-L6-v2", description="Model name for the sentence_transformers backend")
+    CHROMA_QUERY_EMBEDDING_CACHE_SIZE: int = Field(default=1024, description="Search query embeddings kept in the LRU cache")
+    ANALYSIS_INDEX_PATH: str = Field(default="./shared_data/analyses.db", description="SQLite side-index of stored analyses (listing, counts, recency)")
+    RUN_BLOB_STORE_PATH: str = Field(default="./shared_data/run_blobs.db", description="Compressed, content-addressed store for analysis run results")
+    RUN_BLOB_CACHE_SIZE: int = Field(default=32, description="Decoded run payloads kept in memory for repeated reads")
     KNOWLEDGE_BASE_PATH: str = "./shared_data/knowledge_base"
     LOGS_DIR: str = "./shared_data/logs"
 
@@ -94,13 +105,26 @@ class Settings(BaseSettings):
     SNAPSHOT_INTERVAL_SECONDS: int = Field(default=3600, description="How often to run scheduled snapshots (seconds)")
     SNAPSHOT_ENABLED: bool = Field(default=True, description="Enable/disable scheduled snapshot service")
     SNAPSHOT_MAX_TOKENS_PER_RUN: int = Field(default=100, description="Max tokens per scheduled batch")
-    SNAPSHOT_RATE_LIMIT_DELAY: float = Field(default=1.0, description="Delay between token snapshots (seconds)")
+    SNAPSHOT_RATE_LIMIT_DELAY: float = Field(default=1.0, description="Delay between token snapshots per pool slot (seconds)")
+    SNAPSHOT_CONCURRENCY: int = Field(default=8, description="Max tokens snapshotted in parallel")
+    SNAPSHOT_POSITION_INTERVAL: int = Field(default=10, description="Refresh interval for tokens with an open position (seconds)")
+    SNAPSHOT_HOT_INTERVAL: int = Field(default=60, description="Refresh interval for volatile or young tokens (seconds)")
+    SNAPSHOT_HOT_VOLATILITY_PERCENT: float = Field(default=15.0, description="Volatility at which a token moves to the hot interval")
+    SNAPSHOT_YOUNG_TOKEN_HOURS: float = Field(default=6.0, description="Pools younger than this use the hot interval")
+    SNAPSHOT_EVICT_LIQUIDITY_USD: float = Field(default=1000.0, description="Stop refreshing tokens below this liquidity unless held")
+    SNAPSHOT_MAX_TRACKED_TOKENS: int = Field(default=500, description="Max tokens kept in the snapshot refresh schedule")
+    SNAPSHOT_PROVIDER_BUDGET: float = Field(default=0.8, description="Share of each provider's rate quota a snapshot run may use")
     SNAPSHOT_RETRY_FAILED_AFTER: int = Field(default=24, description="Retry failed tokens after N hours")
+    SNAPSHOT_STORE_PATH: str = Field(default="./shared_data/snapshots.db", description="SQLite store for latest snapshot per token")
+    SNAPSHOT_HISTORY_RETENTION_HOURS: int = Field(default=168, description="Keep snapshot time-series points for N hours")
 
     # ==============================================
     # TRADING APIS
     # ==============================================
     JUPITER_API_URL: str = "https://quote-api.jup.ag/v6"
+    POSITION_PRICE_FEED_ENABLED: bool = Field(default=True, description="Stream pool reserves of open positions over Helius websocket")
+    POSITION_PRICE_FEED_COMMITMENT: str = Field(default="processed", description="Commitment level for pool account subscriptions")
+    POSITION_BOOK_CHECKPOINT_EVERY: int = Field(default=200, description="Position log records between compacted checkpoints")
 
     # ==============================================
     # SECURITY
@@ -118,13 +142,68 @@ class Settings(BaseSettings):
     API_TIMEOUT: int = 30
     AI_TIMEOUT: int = 60
     WEBHOOK_TIMEOUT: int = 5
+    BIRDEYE_MARKET_TIMEOUT: float = Field(default=90.0, description="Cap on a Birdeye market node, including its wait for quota (seconds)")
     HTTP_POOL_SIZE: int = 100
+    HTTP_POOL_PER_HOST: int = Field(default=20, description="Max pooled connections per upstream host")
+    HTTP_DNS_CACHE_TTL: int = Field(default=300, description="DNS resolution cache TTL for pooled connections (seconds)")
+    HTTP_KEEPALIVE_TIMEOUT: float = Field(default=30.0, description="Idle keep-alive connection lifetime (seconds)")
     HTTP_MAX_RETRIES: int = 3
+    AUTH_TOKEN_REFRESH_MARGIN: float = Field(default=120.0, description="Renew GOplus/RugCheck bearer tokens this long before expiry (seconds)")
+    LOOP_MONITOR_ENABLED: Optional[bool] = Field(default=None, description="Log event loop stalls with the blocking stack (defaults to DEBUG)")
+    LOOP_MONITOR_THRESHOLD_MS: float = Field(default=100.0, description="Loop stall reported once a callback blocks this long (ms)")
+    LOOP_MONITOR_INTERVAL_MS: float = Field(default=25.0, description="Heartbeat interval of the loop lag monitor (ms)")
     CACHE_TTL_SHORT: int = 300
     CACHE_TTL_MEDIUM: int = 1800
     CACHE_TTL_LONG: int = 7200
     REPORT_TTL_SECONDS: int = 7200
-    
+
+    # Analysis result cache (freshness window per analysis tier)
+    ANALYSIS_CACHE_ENABLED: bool = Field(default=True, description="Reuse analysis results within freshness window")
+    ANALYSIS_CACHE_TTL_QUICK: int = Field(default=120, description="Freshness window for quick analyses (seconds)")
+    ANALYSIS_CACHE_TTL_DEEP: int = Field(default=300, description="Freshness window for deep AI analyses (seconds)")
+    ANALYSIS_CACHE_TTL_SECURITY: int = Field(default=60, description="Freshness window for security-only analyses (seconds)")
+
+    # Single-flight coalescing of concurrent analyses for the same token
+    SINGLE_FLIGHT_ENABLED: bool = Field(default=True, description="Share one in-flight analysis between concurrent callers")
+    SINGLE_FLIGHT_LOCK_TTL: int = Field(default=90, description="Cross-process analysis lock TTL (seconds)")
+    SINGLE_FLIGHT_WAIT_TIMEOUT: float = Field(default=60.0, description="Max wait for another worker's analysis (seconds)")
+
+    # Batch security screening (POST /api/security/batch)
+    SECURITY_BATCH_MAX_TOKENS: int = Field(default=500, description="Max mints accepted per batch screening request")
+    SECURITY_BATCH_CONCURRENCY: int = Field(default=8, description="Max security analyses running at once within a batch")
+
+    # Security verdict index (buy path reuses recent security runs)
+    SECURITY_INDEX_ENABLED: bool = Field(default=True, description="Record security verdicts per mint and gate buys on them")
+    SECURITY_INDEX_MAX_AGE_SAFE: int = Field(default=900, description="Max age of a passing verdict accepted for a buy (seconds)")
+    SECURITY_INDEX_MAX_AGE_UNSAFE: int = Field(default=3600, description="Max age of a verdict with critical issues that blocks a buy (seconds)")
+
+    # Webhook task queue (Redis Streams priority lanes, in-memory fallback)
+    WEBHOOK_QUEUE_BACKEND: str = Field(default="redis", description="redis | memory")
+    WEBHOOK_WORKERS_ENABLED: bool = Field(default=True, description="Run webhook workers inside the API process")
+    WEBHOOK_WORKER_COUNT: int = Field(default=3, description="Webhook workers started per process")
+    WEBHOOK_WORKERS_MIN: int = Field(default=2, description="Lower bound for the autoscaled webhook worker pool")
+    WEBHOOK_WORKERS_MAX: int = Field(default=16, description="Upper bound for the autoscaled webhook worker pool")
+    WEBHOOK_AUTOSCALE_INTERVAL: float = Field(default=5.0, description="Seconds between worker pool resizes")
+    WEBHOOK_BACKLOG_TARGET_SECONDS: float = Field(default=30.0, description="Backlog drain time the pool is sized for (seconds)")
+    WEBHOOK_TOKEN_CONCURRENCY: int = Field(default=4, description="Tokens analyzed in parallel within one webhook payload")
+    WEBHOOK_MAX_RETRIES: int = Field(default=3, description="Retries before a webhook task is dead-lettered")
+    WEBHOOK_RETRY_BACKOFF: float = Field(default=5.0, description="Base retry delay, doubled per attempt (seconds)")
+    WEBHOOK_TASK_VISIBILITY_TIMEOUT: int = Field(default=300, description="Idle time before another worker reclaims an unacked task (seconds)")
+    WEBHOOK_STREAM_MAXLEN: int = Field(default=10000, description="Approximate max entries kept per webhook stream")
+
+    # Provider response cache (wraps each API client's _request)
+    PROVIDER_CACHE_ENABLED: bool = Field(default=True, description="Cache successful external API responses")
+    PROVIDER_CACHE_LRU_SIZE: int = Field(default=2048, description="Max in-process provider responses kept in front of Redis")
+    PROVIDER_CACHE_TTL_METADATA: int = Field(default=21600, description="TTL for token metadata and supply (seconds)")
+    PROVIDER_CACHE_TTL_SECURITY: int = Field(default=300, description="TTL for security verdicts and holder data (seconds)")
+    PROVIDER_CACHE_TTL_MARKET: int = Field(default=15, description="TTL for prices, trades and pairs (seconds)")
+
+    # Provider rate limiting (token bucket per provider + API key, shared via Redis)
+    PROVIDER_RATE_LIMIT_ENABLED: bool = Field(default=True, description="Throttle outgoing API calls with shared token buckets")
+    PROVIDER_RATE_LIMIT_MAX_WAIT: float = Field(default=60.0, description="Max time a request waits for a token (seconds)")
+    PROVIDER_RATE_LIMIT_MAX_RETRIES: int = Field(default=2, description="Retries after a 429 response before the request fails")
+    PROVIDER_RATE_LIMITS: Dict[str, Dict[str, float]] = Field(default_factory=dict, description='Plan quota overrides, e.g. {"birdeye": {"rate": 15, "burst": 15}}')
+
     # ==============================================
     # MONITORING
     # ==============================================
@@ -229,6 +308,11 @@ class Settings(BaseSettings):
             return f"{self.HELIUS_RPC_URL}{self.HELIUS_API_KEY}"
         return self.HELIUS_RPC_URL
 
+    def get_helius_ws_url(self) -> str:
+        if self.HELIUS_WS_URL:
+            return self.HELIUS_WS_URL
+        return f"wss://mainnet.helius-rpc.com/?api-key={self.HELIUS_API_KEY or ''}"
+
     def get_webhook_urls(self) -> dict[str, str]:
         """Get all webhook endpoint URLs"""
         return {
@@ -244,7 +328,11 @@ class Settings(BaseSettings):
             "max_tokens_per_run": self.SNAPSHOT_MAX_TOKENS_PER_RUN,
             "rate_limit_delay": self.SNAPSHOT_RATE_LIMIT_DELAY,
             "retry_failed_after_hours": self.SNAPSHOT_RETRY_FAILED_AFTER,
-            "estimated_run_time_minutes": round((self.SNAPSHOT_MAX_TOKENS_PER_RUN * self.SNAPSHOT_RATE_LIMIT_DELAY) / 60, 1)
+            "concurrency": self.SNAPSHOT_CONCURRENCY,
+            "provider_budget": self.SNAPSHOT_PROVIDER_BUDGET,
+            "position_interval": self.SNAPSHOT_POSITION_INTERVAL,
+            "hot_interval": self.SNAPSHOT_HOT_INTERVAL,
+            "estimated_run_time_minutes": round((self.SNAPSHOT_MAX_TOKENS_PER_RUN * self.SNAPSHOT_RATE_LIMIT_DELAY / max(self.SNAPSHOT_CONCURRENCY, 1)) / 60, 1)
         }
 
     def validate_critical_keys(self) -> list[str]:
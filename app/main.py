@@ -102,6 +102,15 @@ async def lifespan(app: FastAPI):
         (static_dir / "img").mkdir(exist_ok=True)
         logger.info("✅ Created static files directory structure")
     
+    # Watch for callbacks blocking the event loop (debug mode by default)
+    loop_monitor_enabled = settings.DEBUG if settings.LOOP_MONITOR_ENABLED is None else settings.LOOP_MONITOR_ENABLED
+    if loop_monitor_enabled:
+        try:
+            from app.utils.loop_monitor import loop_monitor
+            await loop_monitor.start()
+        except Exception as e:
+            logger.warning(f"⚠️  Event loop lag monitor failed to start: {str(e)}")
+    
     # Initialize system dependencies
     try:
         await startup_dependencies()
@@ -118,13 +127,16 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to initialize API services: {str(e)}")
         logger.warning("Some token analysis features may be limited")
     
-    # Start webhook workers
-    try:
-        from app.utils.webhook_tasks import start_webhook_workers
-        await start_webhook_workers()
-        logger.info("✅ Webhook background workers started")
-    except Exception as e:
-        logger.warning(f"⚠️  Webhook workers failed to start: {str(e)}")
+    # Start webhook workers (unless they run as separate processes)
+    if settings.WEBHOOK_WORKERS_ENABLED:
+        try:
+            from app.utils.webhook_tasks import start_webhook_workers
+            await start_webhook_workers()
+            logger.info("✅ Webhook background workers started")
+        except Exception as e:
+            logger.warning(f"⚠️  Webhook workers failed to start: {str(e)}")
+    else:
+        logger.info("📦 Webhook workers disabled in API process - run `python -m app.webhook_worker`")
 
     # Start snapshot scheduler
     try:
@@ -138,6 +150,14 @@ async def lifespan(app: FastAPI):
             
     except Exception as e:
         logger.warning(f"⚠️  Snapshot scheduler failed to start: {str(e)}")
+
+    # Start streaming price feed for open positions
+    try:
+        from app.services.trade.position_price_feed import position_price_feed
+        if await position_price_feed.start():
+            logger.info("✅ Position price feed started")
+    except Exception as e:
+        logger.warning(f"⚠️  Position price feed failed to start: {str(e)}")
     
     # Check web interface status
     templates_available = templates_dir.exists() and any(templates_dir.iterdir())
@@ -186,20 +206,30 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️  Error stopping webhook workers: {str(e)}")
 
-    # Start snapshot scheduler
+    # Stop position price feed
     try:
-        from app.services.snapshots.snapshot_scheduler import start_snapshot_scheduler
-        scheduler_started = await start_snapshot_scheduler()
-        
-        if scheduler_started:
-            logger.info("✅ Snapshot scheduler started")
-        else:
-            logger.info("📸 Snapshot scheduler disabled in configuration")
-            
+        from app.services.trade.position_price_feed import position_price_feed
+        await position_price_feed.stop()
     except Exception as e:
-        logger.warning(f"⚠️  Snapshot scheduler failed to start: {str(e)}")
-    
-    # Cleanup API services
+        logger.warning(f"⚠️  Error stopping position price feed: {str(e)}")
+
+    # Stop snapshot scheduler before closing the shared HTTP pool
+    try:
+        from app.services.snapshots.snapshot_scheduler import stop_snapshot_scheduler
+        await stop_snapshot_scheduler()
+        logger.info("✅ Snapshot scheduler stopped")
+    except Exception as e:
+        logger.warning(f"⚠️  Error stopping snapshot scheduler: {str(e)}")
+
+    # Persist a compacted position checkpoint once nothing can update positions
+    try:
+        from app.services.trade.autotrade_service import autotrade_service
+        await autotrade_service.book.close()
+        logger.info("✅ Position book checkpointed")
+    except Exception as e:
+        logger.warning(f"⚠️  Error checkpointing position book: {str(e)}")
+
+    # Cleanup API services and shared HTTP transport
     try:
         await cleanup_api_services()
         logger.info("✅ API services cleaned up")
@@ -212,6 +242,12 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️  Dependency cleanup warning: {str(e)}")
     
+    try:
+        from app.utils.loop_monitor import loop_monitor
+        await loop_monitor.stop()
+    except Exception as e:
+        logger.warning(f"⚠️  Error stopping event loop lag monitor: {str(e)}")
+    
     logger.info("👋 System shutdown complete")
 
 
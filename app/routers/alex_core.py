@@ -474,18 +474,8 @@ async def get_specific_run_api(
     try:
         from app.services.analysis_storage import analysis_storage
         
-        if profile_type:
-            # Direct lookup with profile type
-            run_data = await analysis_storage.get_analysis_run(run_id, profile_type)
-        else:
-            # Try each profile type to find the run
-            valid_profiles = ["pump", "twitter", "whale", "discovery", "listing"]
-            run_data = None
-            
-            for profile in valid_profiles:
-                run_data = await analysis_storage.get_analysis_run(run_id, profile)
-                if run_data:
-                    break
+        # Exact lookup; without profile_type the run index resolves it
+        run_data = await analysis_storage.get_analysis_run(run_id, profile_type)
         
         if not run_data:
             raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
@@ -542,44 +532,10 @@ async def generate_run_docx(
                 break
         
         if not run_data:
-            # Try broader search using ChromaDB directly
-            logger.info(f"❌ Run not found with standard profile types, trying broader search...")
-            try:
-                search_results = await analysis_storage.search_analyses(
-                    query=f"run_id {run_id}",
-                    limit=5,
-                    filters={"doc_type": "analysis_run"}
-                )
-                
-                for result in search_results:
-                    metadata = result.get("metadata", {})
-                    if metadata.get("run_id") == run_id:
-                        # Convert metadata to run_data format
-                        try:
-                            results_data = json.loads(metadata.get("results_json", "[]"))
-                            filters_data = json.loads(metadata.get("filters_applied", "{}"))
-                            
-                            run_data = {
-                                "run_id": metadata.get("run_id"),
-                                "profile_type": metadata.get("profile_type"),
-                                "timestamp": metadata.get("timestamp_unix"),
-                                "tokens_analyzed": metadata.get("tokens_analyzed", 0),
-                                "successful_analyses": metadata.get("successful_analyses", 0),
-                                "processing_time": metadata.get("processing_time", 0),
-                                "status": metadata.get("run_status", "completed"),
-                                "results": results_data,
-                                "filters": filters_data,
-                                "results_count": metadata.get("results_count", 0),
-                                "snapshots_analyzed": metadata.get("snapshots_analyzed", 0),
-                                "candidates_found": len(results_data)
-                            }
-                            logger.info(f"✅ Found run via search: {metadata.get('profile_type')}")
-                            break
-                        except Exception as e:
-                            logger.warning(f"Error parsing run data: {e}")
-                            continue
-            except Exception as e:
-                logger.warning(f"Broader search failed: {e}")
+            # Stored under another profile type - resolve through the run index
+            run_data = await analysis_storage.get_analysis_run(run_id)
+            if run_data:
+                logger.info(f"✅ Found run via run index: {run_data.get('profile_type')}")
         
         if not run_data:
             raise HTTPException(
@@ -738,7 +694,7 @@ async def dashboard_api():
         healthy_services = health_data.get("summary", {}).get("healthy_services", 0)
         total_services = health_data.get("summary", {}).get("total_services", 1)
         
-        recent_analyses_data = await _get_recent_analyses_from_chromadb(limit=10)
+        recent_analyses_data = await _get_recent_analyses(limit=10)
         total_analyses = recent_analyses_data.get("total_count", 0)
         recent_analyses = recent_analyses_data.get("analyses", [])
         
@@ -830,6 +786,7 @@ async def get_all_analyses_api(
     risk_level: Optional[str] = Query(None, description="Filter by risk level"),
     security_status: Optional[str] = Query(None, description="Filter by security status"),
     search: Optional[str] = Query(None, description="Search by token address, name, or symbol"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page's next_cursor (overrides page)"),
     _: None = Depends(rate_limit_per_ip)
 ):
     """
@@ -853,15 +810,16 @@ async def get_all_analyses_api(
         if search:
             filters["search"] = search
             
-        # Get analyses with pagination using existing ChromaDB integration
+        # Get analyses with pagination from the analysis side-index
         result = await _get_analyses_paginated(
             page=page,
             per_page=per_page,
-            filters=filters
+            filters=filters,
+            cursor=cursor
         )
         
         if not result:
-            # Return empty result if ChromaDB not available
+            # Return empty result if the analysis index is unavailable
             return {
                 "analyses": [],
                 "pagination": {
@@ -874,20 +832,11 @@ async def get_all_analyses_api(
                 },
                 "filters_applied": filters,
                 "chromadb_available": False,
-                "message": "Analysis history not available - ChromaDB not connected"
+                "message": "Analysis history not available"
             }
         
+        # Already newest first (ordered by the index)
         analyses = result.get("analyses", [])
-        if analyses:
-            analyses.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-            logger.debug(f"✅ Frontend backup sort applied: {len(analyses)} analyses")
-            
-            # Debug: Show first few results
-            for i, analysis in enumerate(analyses[:3]):
-                logger.debug(f"  {i+1}. {analysis['token_symbol']} - {_format_analysis_date(analysis['timestamp'])}")
-        
-        result["analyses"] = analyses  # Update with sorted analyses
-            
         logger.info(f"✅ Retrieved {len(analyses)} analyses (most recent first)")
         
         return {
@@ -940,44 +889,8 @@ async def _get_chat_response(prompt: str) -> Optional[str]:
 async def _get_run_data_for_chat(run_id: str) -> Optional[Dict[str, Any]]:
     """Get analysis run data for chat context"""
     try:
-        # Try discovery profile first (most common)
-        run_data = await analysis_storage.get_analysis_run(run_id, "discovery")
-        if run_data:
-            return run_data
-        
-        # Try other profile types
-        profile_types = ["pump", "whale", "twitter", "listing"]
-        for profile_type in profile_types:
-            run_data = await analysis_storage.get_analysis_run(run_id, profile_type)
-            if run_data:
-                return run_data
-        
-        # Last resort: search by run_id in ChromaDB
-        search_results = await analysis_storage.search_analyses(
-            query=f"run_id {run_id}",
-            limit=5,
-            filters={"doc_type": "analysis_run"}
-        )
-        
-        for result in search_results:
-            metadata = result.get("metadata", {})
-            if metadata.get("run_id") == run_id:
-                # Convert search result to run format
-                try:
-                    results_data = json.loads(metadata.get("results_json", "[]"))
-                    return {
-                        "run_id": run_id,
-                        "profile_type": metadata.get("profile_type", "unknown"),
-                        "timestamp": metadata.get("timestamp_unix"),
-                        "results": results_data,
-                        "status": metadata.get("run_status", "completed"),
-                        "processing_time": metadata.get("processing_time", 0)
-                    }
-                except Exception as e:
-                    logger.warning(f"Error parsing search result: {e}")
-                    continue
-        
-        return None
+        # Exact key lookup through the run index, whatever the profile type
+        return await analysis_storage.get_analysis_run(run_id)
         
     except Exception as e:
         logger.error(f"Error getting run data for chat: {e}")
@@ -1100,391 +1013,129 @@ def _build_chat_prompt(user_question: str, run_data: Dict[str, Any]) -> str:
     return prompt
 
 
-async def _get_analyses_paginated(page: int = 1, per_page: int = 20, filters: dict = None) -> dict:
-    """
-    Get paginated analyses with filtering - integrates with existing ChromaDB - FIXED for most recent first
-    """
+def _format_analysis_item(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape stored analysis metadata for the dashboard and analyses list"""
+    # Determine status based on analysis result
+    status = "completed"  # Default to completed
+    if metadata.get("analysis_stopped_at_security"):
+        status = "security_failed"
+    elif metadata.get("critical_issues_count", 0) > 0:
+        status = "critical_issues"
+    elif metadata.get("warnings_count", 0) > 0:
+        status = "warnings"
+    # Note: "warnings" status is still considered successful for success rate calculation
+    
     try:
-        from app.utils.chroma_client import get_chroma_client
-        
-        chroma_client = await get_chroma_client()
-        if not chroma_client.is_connected():
-            logger.debug("ChromaDB not available for paginated analyses")
-            return None
-        
-        # Calculate offset
-        offset = (page - 1) * per_page
-        
-        # Build search parameters - GET MORE results for proper sorting
-        search_params = {
-            "limit": 500,  # 🆕 Get many more results to ensure proper sorting
-        }
-        
-        # For ChromaDB, we need to handle filtering differently
-        # If no filters, get all analyses without where clause
-        if not filters or not any(filters.get(k) for k in ['source_event', 'risk_level', 'security_status', 'date_from', 'date_to']):
-            # No filters - use simple search
-            logger.debug("No filters applied, using simple search")
-            if filters and filters.get("search"):
-                search_query = filters["search"]
-                results = await analysis_storage.search_analyses(
-                    query=search_query,
-                    limit=search_params["limit"]
-                )
-            else:
-                results = await analysis_storage.search_analyses(
-                    query="token analysis",
-                    limit=search_params["limit"]
-                )
-        else:
-            # We have filters - need to work around ChromaDB limitations
-            # Get all results first, then filter in Python
-            logger.debug(f"Filters applied: {filters}, getting all results for manual filtering")
-            
-            if filters and filters.get("search"):
-                search_query = filters["search"]
-                all_results = await analysis_storage.search_analyses(
-                    query=search_query,
-                    limit=1000  # Get even more results for filtering
-                )
-            else:
-                all_results = await analysis_storage.search_analyses(
-                    query="token analysis",
-                    limit=1000  # Get more results for filtering
-                )
-            
-            # Filter results in Python
-            if all_results:
-                filtered_results = []
-                for result in all_results:
-                    metadata = result.get("metadata", {})
-                    include = True
-                    
-                    # Apply filters
-                    if filters.get("source_event") and metadata.get("source_event") != filters["source_event"]:
-                        include = False
-                    
-                    if filters.get("risk_level") and metadata.get("risk_level") != filters["risk_level"]:
-                        include = False
-                    
-                    if filters.get("security_status") and metadata.get("security_status") != filters["security_status"]:
-                        include = False
-                    
-                    # Date filters
-                    if filters.get("date_from"):
-                        try:
-                            from datetime import datetime
-                            date_from_ts = datetime.strptime(filters["date_from"], "%Y-%m-%d").timestamp()
-                            if metadata.get("timestamp_unix", 0) < date_from_ts:
-                                include = False
-                        except ValueError:
-                            pass
-                    
-                    if filters.get("date_to"):
-                        try:
-                            from datetime import datetime
-                            date_to_ts = datetime.strptime(filters["date_to"], "%Y-%m-%d").timestamp() + 86400
-                            if metadata.get("timestamp_unix", 0) > date_to_ts:
-                                include = False
-                        except ValueError:
-                            pass
-                    
-                    if include:
-                        filtered_results.append(result)
-                
-                results = filtered_results
-                logger.debug(f"After Python filtering: {len(results)} results")
-            else:
-                results = []
-        
-        logger.debug(f"Search returned {len(results) if results else 0} results")
-        
-        if not results:
-            return {
-                "analyses": [],
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total_items": 0,
-                    "total_pages": 0,
-                    "has_next": False,
-                    "has_prev": page > 1
-                }
-            }
-        
-        # Sort results by date (most recent first) BEFORE pagination
-        results.sort(key=lambda x: x.get("metadata", {}).get("timestamp_unix", 0), reverse=True)
-        logger.debug(f"Results sorted by date (most recent first)")
-        
-        # Get total count for pagination
-        total_items = len(results)  # Total filtered results
-        
-        # Apply pagination to sorted results (slice the results we got)
-        paginated_results = results[offset:offset + per_page] if len(results) > offset else []
-        logger.debug(f"After pagination: {len(paginated_results)} results for page {page}")
-        
-        # Log first few results to verify sorting
-        if paginated_results:
-            logger.debug(f"📊 Page {page} most recent analyses:")
-            for i, result in enumerate(paginated_results[:3]):
-                metadata = result.get("metadata", {})
-                timestamp = metadata.get("timestamp_unix", 0)
-                token_symbol = metadata.get("token_symbol", "Unknown")
-                logger.debug(f"  {i+1}. {token_symbol} - {_format_analysis_date(timestamp)} (ts: {timestamp})")
-        
-        # Process results for frontend display
-        analyses = []
-        for result in paginated_results:
-            metadata = result.get("metadata", {})
-            
-            # Skip if no valid timestamp
-            if not metadata.get("timestamp_unix"):
-                continue
-            
-            # Determine status
-            status = "completed"
-            if metadata.get("analysis_stopped_at_security"):
-                status = "security_failed"
-            elif metadata.get("critical_issues_count", 0) > 0:
-                status = "critical_issues"
-            elif metadata.get("warnings_count", 0) > 0:
-                status = "warnings"
+        critical_issues_list = json.loads(metadata.get("critical_issues_list", "[]"))
+    except (json.JSONDecodeError, TypeError):
+        critical_issues_list = []
 
-            try:
-                critical_issues_list = json.loads(metadata.get("critical_issues_list", "[]"))
-            except (json.JSONDecodeError, TypeError):
-                critical_issues_list = []
+    try:
+        warnings_list = json.loads(metadata.get("warnings_list", "[]"))
+    except (json.JSONDecodeError, TypeError):
+        warnings_list = []
 
-            try:
-                warnings_list = json.loads(metadata.get("warnings_list", "[]"))
-            except (json.JSONDecodeError, TypeError):
-                warnings_list = []
+    if metadata.get("warnings_count", 0) > 0 and metadata.get("critical_issues_count", 0) == 0:
+        security_status = "warning" 
+    else:
+        security_status = metadata.get("security_status", "unknown")
 
-            if metadata.get("warnings_count", 0) > 0 and metadata.get("critical_issues_count", 0) == 0:
-                security_status = "warning" 
-            else:
-                security_status = metadata.get("security_status", "unknown")
-            
-            analysis = {
-                # Basic identifiers
-                "id": metadata.get("analysis_id", "unknown"),
-                "token_symbol": metadata.get("token_symbol", "N/A"),
-                "token_name": metadata.get("token_name", "Unknown Token"),
-                "token_address": metadata.get("token_address"),
-                "mint": metadata.get("token_address"),  # For backward compatibility
-                "status": status,
-                
-                # Keep NEW schema field names (don't convert)
-                "security_status": security_status,  # Keep as "safe"/"unsafe"/"warning"
-                "critical_issues_count": metadata.get("critical_issues_count", 0),  # Keep new name
-                "warnings_count": metadata.get("warnings_count", 0),  # Keep new name
-                "critical_issues_list": critical_issues_list,
-                "warnings_list": warnings_list,
-                
-                # All the new fields your popup expects
-                "has_ai_analysis": metadata.get("has_ai_analysis", False),
-                "ai_score": metadata.get("ai_score", 0),
-                "ai_recommendation": metadata.get("ai_recommendation"),
-                "ai_risk_assessment": metadata.get("ai_risk_assessment", "unknown"),
-                "ai_stop_flags_count": metadata.get("ai_stop_flags_count", 0),
-                
-                # Market data
-                "price_usd": metadata.get("price_usd"),
-                "price_change_24h": metadata.get("price_change_24h"),
-                "volume_24h": metadata.get("volume_24h"),
-                "market_cap": metadata.get("market_cap"),
-                "liquidity": metadata.get("liquidity"),
-                
-                # Enhanced metrics
-                "whale_count": metadata.get("whale_count", 0),
-                "whale_control_percent": metadata.get("whale_control_percent", 0),
-                "sniper_risk": metadata.get("sniper_risk", "unknown"),
-                "volatility_risk": metadata.get("volatility_risk", "unknown"),
-                
-                # Security details
-                "security_score": metadata.get("security_score", 0),
-                "mint_authority_active": metadata.get("mint_authority_active", False),
-                "freeze_authority_active": metadata.get("freeze_authority_active", False),
-                
-                # Metadata
-                "risk_level": metadata.get("risk_level", "unknown"),
-                "overall_score": metadata.get("overall_score", 0),
-                "recommendation": metadata.get("recommendation", "HOLD"),
-                "processing_time": metadata.get("processing_time", 0),
-                "services_successful": metadata.get("services_successful", 0),
-                "data_completeness": metadata.get("data_completeness", 0),
-                "analysis_type": metadata.get("analysis_type", "unknown"),
-                "timestamp": metadata.get("timestamp_unix", 0),
-                "time": _format_relative_time(metadata.get("timestamp_unix", 0)),
-                "source_event": metadata.get("source_event", "unknown")
-            }
-            analyses.append(analysis)
-        
-        # Calculate pagination
-        total_pages = (total_items + per_page - 1) // per_page
-        has_next = page < total_pages
-        has_prev = page > 1
-        
-        logger.debug(f"Returning {len(analyses)} analyses, total_items: {total_items}, total_pages: {total_pages}")
-        
-        return {
-            "analyses": analyses,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total_items": total_items,
-                "total_pages": total_pages,
-                "has_next": has_next,
-                "has_prev": has_prev
-            }
-        }
+    return {
+        # Basic identifiers
+        "id": metadata.get("analysis_id", "unknown"),
+        "token_symbol": metadata.get("token_symbol", "N/A"),
+        "token_name": metadata.get("token_name", "Unknown Token"),
+        "token_address": metadata.get("token_address"),
+        "mint": metadata.get("token_address"),  # For backward compatibility
+        "status": status,
+        
+        # Keep NEW schema field names (don't convert)
+        "security_status": security_status,  # Keep as "safe"/"unsafe"/"warning"
+        "critical_issues_count": metadata.get("critical_issues_count", 0),  # Keep new name
+        "warnings_count": metadata.get("warnings_count", 0),  # Keep new name
+        "critical_issues_list": critical_issues_list,
+        "warnings_list": warnings_list,
+        
+        # All the new fields your popup expects
+        "has_ai_analysis": metadata.get("has_ai_analysis", False),
+        "ai_score": metadata.get("ai_score", 0),
+        "ai_recommendation": metadata.get("ai_recommendation"),
+        "ai_risk_assessment": metadata.get("ai_risk_assessment", "unknown"),
+        "ai_stop_flags_count": metadata.get("ai_stop_flags_count", 0),
         
-    except Exception as e:
-        logger.error(f"Error in paginated analyses query: {str(e)}")
-        return None
-
+        # Market data
+        "price_usd": metadata.get("price_usd"),
+        "price_change_24h": metadata.get("price_change_24h"),
+        "volume_24h": metadata.get("volume_24h"),
+        "market_cap": metadata.get("market_cap"),
+        "liquidity": metadata.get("liquidity"),
+        
+        # Enhanced metrics
+        "whale_count": metadata.get("whale_count", 0),
+        "whale_control_percent": metadata.get("whale_control_percent", 0),
+        "sniper_risk": metadata.get("sniper_risk", "unknown"),
+        "volatility_risk": metadata.get("volatility_risk", "unknown"),
+        
+        # Security details
+        "security_score": metadata.get("security_score", 0),
+        "mint_authority_active": metadata.get("mint_authority_active", False),
+        "freeze_authority_active": metadata.get("freeze_authority_active", False),
+        
+        # Metadata
+        "risk_level": metadata.get("risk_level", "unknown"),
+        "overall_score": metadata.get("overall_score", 0),
+        "recommendation": metadata.get("recommendation", "HOLD"),
+        "processing_time": metadata.get("processing_time", 0),
+        "services_successful": metadata.get("services_successful", 0),
+        "data_completeness": metadata.get("data_completeness", 0),
+        "analysis_type": metadata.get("analysis_type", "unknown"),
+        "timestamp": metadata.get("timestamp_unix", 0),
+        "time": _format_relative_time(metadata.get("timestamp_unix", 0)),
+        "source_event": metadata.get("source_event", "unknown")
+    }
 
-async def _get_recent_analyses_from_chromadb(limit: int = 10) -> Dict[str, Any]:
-    """Get recent analyses from ChromaDB for dashboard display - FIXED to get most recent"""
-    try:
-        from app.utils.chroma_client import get_chroma_client
-        
-        chroma_client = await get_chroma_client()
-        if not chroma_client.is_connected():
-            logger.debug("ChromaDB not available for dashboard data")
-            return {
-                "chromadb_available": False,
-                "total_count": 0,
-                "analyses": []
-            }
-        
-        # Search for recent analyses - GET MORE than we need to sort properly
-        results = await analysis_storage.search_analyses(
-            query="recent token analysis",
-            limit=50,  # Get more results to ensure proper sorting
-            filters={}
-        )
-        
-        # Get collection stats for total count
-        try:
-            stats = await chroma_client.get_collection_stats()
-            total_count = stats.get("total_documents", 0)
-        except Exception:
-            total_count = len(results) if results else 0
-        
-        # Transform results for dashboard display
-        dashboard_analyses = []
-        for result in results:
-            metadata = result.get("metadata", {})
-            
-            # Skip entries without valid timestamps
-            if not metadata.get("timestamp_unix"):
-                continue
-            
-            # Determine status based on analysis result
-            status = "completed"  # Default to completed
-            if metadata.get("analysis_stopped_at_security"):
-                status = "security_failed"
-            elif metadata.get("critical_issues_count", 0) > 0:
-                status = "critical_issues"
-            elif metadata.get("warnings_count", 0) > 0:
-                status = "warnings"
-            # Note: "warnings" status is still considered successful for success rate calculation
-            
-            try:
-                critical_issues_list = json.loads(metadata.get("critical_issues_list", "[]"))
-            except (json.JSONDecodeError, TypeError):
-                critical_issues_list = []
 
-            try:
-                warnings_list = json.loads(metadata.get("warnings_list", "[]"))
-            except (json.JSONDecodeError, TypeError):
-                warnings_list = []
+async def _get_analyses_paginated(page: int = 1, per_page: int = 20, filters: dict = None, cursor: Optional[str] = None) -> dict:
+    """
+    Get paginated analyses (most recent first) from the analysis side-index
+    """
+    result = await analysis_storage.get_analyses_paginated(
+        page=page,
+        per_page=per_page,
+        filters=filters,
+        cursor=cursor
+    )
+    if result is None:
+        return None
+    
+    analyses = [_format_analysis_item(metadata) for metadata in result["items"]]
+    logger.debug(f"Returning {len(analyses)} analyses, total_items: {result['pagination']['total_items']}")
+    
+    return {
+        "analyses": analyses,
+        "pagination": result["pagination"]
+    }
 
-            if metadata.get("warnings_count", 0) > 0 and metadata.get("critical_issues_count", 0) == 0:
-                security_status = "warning" 
-            else:
-                security_status = metadata.get("security_status", "unknown")
 
-            # Format for dashboard display
-            analysis_item = {
-                # Basic identifiers
-                "id": metadata.get("analysis_id", "unknown"),
-                "token_symbol": metadata.get("token_symbol", "N/A"),
-                "token_name": metadata.get("token_name", "Unknown Token"),
-                "token_address": metadata.get("token_address"),
-                "mint": metadata.get("token_address"),  # For backward compatibility
-                "status": status,
-                
-                # Keep NEW schema field names (don't convert)
-                "security_status": security_status,  # Keep as "safe"/"unsafe"/"warning"
-                "critical_issues_count": metadata.get("critical_issues_count", 0),  # Keep new name
-                "warnings_count": metadata.get("warnings_count", 0),  # Keep new name
-                "critical_issues_list": critical_issues_list,
-                "warnings_list": warnings_list,
-                
-                # All the new fields your popup expects
-                "has_ai_analysis": metadata.get("has_ai_analysis", False),
-                "ai_score": metadata.get("ai_score", 0),
-                "ai_recommendation": metadata.get("ai_recommendation"),
-                "ai_risk_assessment": metadata.get("ai_risk_assessment", "unknown"),
-                "ai_stop_flags_count": metadata.get("ai_stop_flags_count", 0),
-                
-                # Market data
-                "price_usd": metadata.get("price_usd"),
-                "price_change_24h": metadata.get("price_change_24h"),
-                "volume_24h": metadata.get("volume_24h"),
-                "market_cap": metadata.get("market_cap"),
-                "liquidity": metadata.get("liquidity"),
-                
-                # Enhanced metrics
-                "whale_count": metadata.get("whale_count", 0),
-                "whale_control_percent": metadata.get("whale_control_percent", 0),
-                "sniper_risk": metadata.get("sniper_risk", "unknown"),
-                "volatility_risk": metadata.get("volatility_risk", "unknown"),
-                
-                # Security details
-                "security_score": metadata.get("security_score", 0),
-                "mint_authority_active": metadata.get("mint_authority_active", False),
-                "freeze_authority_active": metadata.get("freeze_authority_active", False),
-                
-                # Metadata
-                "risk_level": metadata.get("risk_level", "unknown"),
-                "overall_score": metadata.get("overall_score", 0),
-                "recommendation": metadata.get("recommendation", "HOLD"),
-                "processing_time": metadata.get("processing_time", 0),
-                "services_successful": metadata.get("services_successful", 0),
-                "data_completeness": metadata.get("data_completeness", 0),
-                "analysis_type": metadata.get("analysis_type", "unknown"),
-                "timestamp": metadata.get("timestamp_unix", 0),
-                "time": _format_relative_time(metadata.get("timestamp_unix", 0)),
-                "source_event": metadata.get("source_event", "unknown")
-            }
-            
-            dashboard_analyses.append(analysis_item)
-        
-        dashboard_analyses.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-        
-        dashboard_analyses = dashboard_analyses[:limit]
-        
-        logger.debug(f"📊 Retrieved {len(dashboard_analyses)} most recent analyses from ChromaDB")
-        if dashboard_analyses:
-            logger.debug(f"📊 Most recent analysis: {dashboard_analyses[0]['token_symbol']} at {_format_relative_time(dashboard_analyses[0]['timestamp'])}")
-        
-        return {
-            "chromadb_available": True,
-            "total_count": total_count,
-            "analyses": dashboard_analyses
-        }
-        
-    except Exception as e:
-        logger.warning(f"Error getting recent analyses from ChromaDB: {str(e)}")
+async def _get_recent_analyses(limit: int = 10) -> Dict[str, Any]:
+    """Get the most recent analyses and the exact total for dashboard display"""
+    result = await analysis_storage.get_recent_analyses(limit)
+    if result is None:
         return {
             "chromadb_available": False,
             "total_count": 0,
-            "analyses": [],
-            "error": str(e)
+            "analyses": []
         }
+    
+    dashboard_analyses = [_format_analysis_item(metadata) for metadata in result["items"]]
+    if dashboard_analyses:
+        logger.debug(f"📊 Most recent analysis: {dashboard_analyses[0]['token_symbol']} at {dashboard_analyses[0]['time']}")
+    
+    return {
+        "chromadb_available": True,
+        "total_count": result["total_count"],
+        "analyses": dashboard_analyses
+    }
 
 def _format_relative_time(timestamp_unix: int) -> str:
     """Format unix timestamp as relative time"""
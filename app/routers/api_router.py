@@ -1,6 +1,7 @@
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from loguru import logger
 import time
 import json
@@ -9,6 +10,9 @@ from app.services.token_analyzer import token_analyzer
 from app.services.service_manager import get_api_health_status
 from app.core.dependencies import rate_limit_per_ip
 from app.utils.redis_client import get_redis_client
+from app.core.config import get_settings
+
+settings = get_settings()
 
 router = APIRouter(prefix="/api", tags=["Token Analysis API"])
 
@@ -61,10 +65,12 @@ async def analyze_token_endpoint(
         logger.info(f"🔍 API token analysis request for {token_address}")
         
         # Perform comprehensive analysis
-        analysis_result = await token_analyzer.analyze_token_comprehensive(token_address, "api_request")
+        analysis_result = await token_analyzer.analyze_token_comprehensive(
+            token_address, "api_request", force_refresh=force_refresh
+        )
         
         # Add API-specific metadata
-        analysis_result["metadata"]["from_cache"] = False
+        analysis_result["metadata"].setdefault("from_cache", False)
         analysis_result["metadata"]["force_refresh"] = force_refresh
         analysis_result["metadata"]["api_response_time"] = round((time.time() - start_time) * 1000, 1)
         
@@ -96,6 +102,90 @@ async def get_token_analysis(
     return await analyze_token_endpoint(token_address, force_refresh)
 
 
+class SecurityBatchRequest(BaseModel):
+    token_addresses: List[str] = Field(..., min_length=1, description="Token mint addresses to screen")
+    force_refresh: bool = Field(default=False, description="Ignore recent security results")
+    include_details: bool = Field(default=False, description="Stream full analyses instead of verdict summaries")
+
+
+def _security_batch_record(result: Dict[str, Any], include_details: bool) -> Dict[str, Any]:
+    """Compact NDJSON record for one screened token"""
+    if include_details:
+        return {"type": "result", **result}
+    
+    metadata = result.get("metadata", {})
+    security = result.get("security_analysis", {})
+    overall = result.get("overall_analysis", {})
+    
+    return {
+        "type": "result",
+        "token_address": result.get("token_address"),
+        "security_passed": metadata.get("security_check_passed", False),
+        "risk_level": overall.get("risk_level"),
+        "score": overall.get("score"),
+        "critical_issues": security.get("critical_issues", []),
+        "warnings": security.get("warnings", []),
+        "errors": result.get("errors", []),
+        "dex_pairs": len(result.get("market_context", {}).get("dexscreener_pairs", [])),
+        "from_cache": metadata.get("from_cache", False),
+        "processing_time_seconds": metadata.get("processing_time_seconds")
+    }
+
+
+@router.post("/security/batch", summary="Batch Security Screening (NDJSON stream)")
+async def security_batch_endpoint(
+    request: SecurityBatchRequest,
+    _: None = Depends(rate_limit_per_ip)
+):
+    """
+    Security-only screening for many tokens in one call
+    
+    Streams one JSON object per line as each token completes (duplicates and recently
+    screened tokens first), followed by a summary line.
+    """
+    if len(request.token_addresses) > settings.SECURITY_BATCH_MAX_TOKENS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many tokens (max {settings.SECURITY_BATCH_MAX_TOKENS})"
+        )
+    
+    invalid = [address for address in request.token_addresses if not address or len(address) < 32 or len(address) > 44]
+    if invalid:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid Solana token address format: {', '.join(invalid[:5])}"
+        )
+    
+    unique_count = len(set(request.token_addresses))
+    logger.info(f"🛡️ Batch security screening request for {unique_count} tokens ({len(request.token_addresses)} submitted)")
+    
+    async def stream():
+        start_time = time.time()
+        summary = {
+            "type": "summary",
+            "requested": len(request.token_addresses),
+            "unique": unique_count,
+            "from_cache": 0,
+            "passed": 0,
+            "failed": 0
+        }
+        
+        async for result in token_analyzer.analyze_tokens_security_batch(
+            request.token_addresses, "api_batch", force_refresh=request.force_refresh
+        ):
+            record = _security_batch_record(result, request.include_details)
+            metadata = result.get("metadata", {})
+            summary["from_cache"] += 1 if metadata.get("from_cache") else 0
+            summary["passed" if metadata.get("security_check_passed") else "failed"] += 1
+            yield json.dumps(record, default=str) + "\n"
+        
+        summary["processing_time_seconds"] = round(time.time() - start_time, 3)
+        logger.info(f"✅ Batch security screening completed: {summary}")
+        yield json.dumps(summary) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.get("/analyze/recent", summary="Get Recent Webhook Analyses")
 async def get_recent_webhook_analyses(
     limit: int = Query(10, ge=1, le=50, description="Number of recent analyses to return"),
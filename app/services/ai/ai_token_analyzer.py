@@ -3,10 +3,11 @@ import time
 import json
 from typing import Dict, Any, Optional, List, Tuple
 from loguru import logger
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from app.core.config import get_settings
 from app.utils.cache import cache_manager
+from app.utils.single_flight import single_flight
 from app.services.analysis_storage import analysis_storage
 
 settings = get_settings()
@@ -29,12 +30,29 @@ class EnhancedTokenAnalyzer:
         }
 
 
-    async def analyze_token_deep(self, token_address: str, source_event: str = "api_request") -> Dict[str, Any]:
+    async def analyze_token_deep(self, token_address: str, source_event: str = "api_request", force_refresh: bool = False) -> Dict[str, Any]:
         """
         Perform deep token analysis with AI integration - STOPS on security failure
         
         Flow: Security checks -> Market analysis -> AI analysis -> Storage -> Response
         """
+        from app.services.token_analyzer import token_analyzer
+        
+        cached_result = await token_analyzer.get_cached_analysis(token_address, "deep", force_refresh)
+        if cached_result:
+            return cached_result
+        
+        # Concurrent callers for the same token share one deep analysis run
+        return await single_flight.do(
+            f"deep:{token_address}",
+            lambda: self._analyze_token_deep(token_address, source_event),
+            result_loader=lambda: token_analyzer.get_cached_analysis(token_address, "deep")
+        )
+    
+    async def _analyze_token_deep(self, token_address: str, source_event: str) -> Dict[str, Any]:
+        """Run deep analysis (use analyze_token_deep for cached/coalesced access)"""
+        from app.services.token_analyzer import token_analyzer
+        
         start_time = time.time()
         analysis_id = f"analysis_{int(time.time())}_{token_address}"
         
@@ -62,18 +80,9 @@ class EnhancedTokenAnalyzer:
             }
         }
         
-        try:
-            cached_result = await self.cache.get(key=analysis_id)
-            if cached_result:
-                logger.info(f"Found cached deep analysis for {token_address}")
-                return cached_result
-        except Exception as e:
-            logger.warning(f"Cache retrieval failed: {str(e)}")
-            analysis_response["warnings"].append(f"Cache retrieval failed: {str(e)}")
-        
-        # STEP 1: SECURITY CHECKS (using existing token_analyzer logic)
-        logger.info("🛡️ STEP 1: Running security checks (GOplus + RugCheck + SolSniffer)")
-        security_passed, security_data = await self._run_security_checks(token_address, analysis_response)
+        # STEP 1: SECURITY CHECKS with market services started speculatively (token_analyzer pipeline)
+        logger.info("🛡️ STEP 1: Running security checks (GOplus + RugCheck + SolSniffer), market services in parallel")
+        security_passed, security_data = await self._run_analysis_pipeline(token_address, analysis_response)
         
         # Store security data
         analysis_response["security_analysis"] = security_data
@@ -100,16 +109,13 @@ class EnhancedTokenAnalyzer:
             analysis_response["metadata"]["processing_time_seconds"] = round(processing_time, 3)
             
             logger.warning(f"❌ Analysis STOPPED for {token_address} due to security issues in {processing_time:.2f}s")
+            await token_analyzer.cache_analysis(token_address, "deep", analysis_response, retention=0)
             return analysis_response
         
         logger.info(f"✅ SECURITY CHECKS PASSED for {token_address} - CONTINUING WITH DEEP ANALYSIS")
         
-        # STEP 3: Run market analysis services
-        logger.info("📊 STEP 2: Running market and technical analysis services")
-        await self._run_market_analysis_services(token_address, analysis_response)
-        
-        # STEP 4: AI ANALYSIS (only if security passed)
-        logger.info("🤖 STEP 3: Running AI analysis with Llama 3.0")
+        # STEP 3: AI ANALYSIS (only if security passed, market data already merged)
+        logger.info("🤖 STEP 2: Running AI analysis with Llama 3.0")
         ai_analysis_result = await self._run_ai_analysis(
             token_address, 
             analysis_response["service_responses"],
@@ -142,20 +148,7 @@ class EnhancedTokenAnalyzer:
         analysis_response["metadata"]["processing_time_seconds"] = round(processing_time, 3)
         
         # Cache the result
-        try:
-            await self.cache.set(
-                key=analysis_id,
-                value=analysis_response,
-                ttl=self.cache_ttl
-            )
-
-            analysis_response["docx_cache_key"] = analysis_id
-            analysis_response["docx_expires_at"] = (datetime.utcnow() + timedelta(seconds=self.cache_ttl)).isoformat()
-
-            logger.info(f"💾 Cached deep analysis for {token_address} with TTL {self.cache_ttl}s")
-        except Exception as e:
-            logger.warning(f"Failed to cache deep analysis: {str(e)}")
-            analysis_response["warnings"].append(f"Caching failed: {str(e)}")
+        await token_analyzer.cache_analysis(token_address, "deep", analysis_response, retention=self.cache_ttl)
         
         # Log completion
         logger.info(
@@ -173,11 +166,11 @@ class EnhancedTokenAnalyzer:
         # This already has the proper logic for determining when to stop
         return await token_analyzer._run_security_checks(token_address, analysis_response)
     
-    async def _run_market_analysis_services(self, token_address: str, analysis_response: Dict[str, Any]) -> None:
-        """Run market analysis services - delegate to existing logic"""
+    async def _run_analysis_pipeline(self, token_address: str, analysis_response: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """Run security checks and speculative market services - delegate to token_analyzer pipeline"""
         from app.services.token_analyzer import token_analyzer
         
-        await token_analyzer._run_market_analysis_services(token_address, analysis_response)
+        return await token_analyzer._run_analysis_pipeline(token_address, analysis_response)
     
     async def _run_ai_analysis(
         self, 
@@ -529,18 +522,19 @@ class EnhancedTokenAnalyzer:
 enhanced_token_analyzer = EnhancedTokenAnalyzer()
 
 
-async def analyze_token_deep_comprehensive(token_address: str, source_event: str = "api_request") -> Dict[str, Any]:
+async def analyze_token_deep_comprehensive(token_address: str, source_event: str = "api_request", force_refresh: bool = False) -> Dict[str, Any]:
     """
     Perform deep comprehensive token analysis with AI integration
     
     Args:
         token_address: Token mint address
         source_event: Source of analysis request
+        force_refresh: Bypass cached results from the current freshness window
     
     Returns:
         Enhanced analysis result with AI insights (only if security passes)
     """
-    return await enhanced_token_analyzer.analyze_token_deep(token_address, source_event)
+    return await enhanced_token_analyzer.analyze_token_deep(token_address, source_event, force_refresh)
 
 
 async def analyze_token_security_only(token_address: str, source_event: str = "webhook") -> Dict[str, Any]:
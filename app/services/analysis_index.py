@@ -0,0 +1,315 @@
+import asyncio
+import json
+import sqlite3
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+from app.core.config import get_settings
+from app.utils.sqlite_store import SQLiteStore
+
+settings = get_settings()
+
+
+# Exact-match filters served from indexed columns
+INDEXED_FILTERS = ("source_event", "risk_level", "security_status", "token_address", "analysis_type")
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Keyset cursor pointing after ``row`` in newest-first order"""
+    return f"{int(row['timestamp_unix'])}:{row['doc_id']}"
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[int, str]]:
+    try:
+        timestamp_unix, doc_id = cursor.split(":", 1)
+        return int(timestamp_unix), doc_id
+    except (AttributeError, ValueError):
+        return None
+
+
+class AnalysisIndex(SQLiteStore):
+    """Relational side-index of stored token analyses and analysis runs
+
+    One row per analysis document written to ChromaDB, holding its metadata and
+    indexed filter columns. Listing, exact counts and "most recent N" are served
+    from here; ChromaDB is only needed for semantic search. Analysis runs get a
+    time-ordered table of their own, keyed by ChromaDB document ID.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS analyses (
+        doc_id TEXT PRIMARY KEY,
+        analysis_id TEXT,
+        token_address TEXT,
+        token_name TEXT,
+        token_symbol TEXT,
+        timestamp_unix INTEGER NOT NULL,
+        risk_level TEXT,
+        security_status TEXT,
+        source_event TEXT,
+        analysis_type TEXT,
+        metadata TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_analyses_time ON analyses (timestamp_unix, doc_id);
+    CREATE INDEX IF NOT EXISTS idx_analyses_risk ON analyses (risk_level, timestamp_unix);
+    CREATE INDEX IF NOT EXISTS idx_analyses_security ON analyses (security_status, timestamp_unix);
+    CREATE INDEX IF NOT EXISTS idx_analyses_source ON analyses (source_event, timestamp_unix);
+    CREATE INDEX IF NOT EXISTS idx_analyses_token ON analyses (token_address, timestamp_unix);
+    CREATE TABLE IF NOT EXISTS runs (
+        doc_id TEXT PRIMARY KEY,
+        run_id TEXT NOT NULL,
+        profile_type TEXT NOT NULL,
+        timestamp_unix INTEGER NOT NULL,
+        metadata TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_runs_profile_time ON runs (profile_type, timestamp_unix);
+    CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (timestamp_unix);
+    CREATE INDEX IF NOT EXISTS idx_runs_run_id ON runs (run_id);
+    """
+
+    COLUMNS = ("doc_id", "analysis_id", "token_address", "token_name", "token_symbol", "timestamp_unix",
+               "risk_level", "security_status", "source_event", "analysis_type", "metadata")
+
+    def __init__(self, db_path: Optional[str] = None):
+        super().__init__(db_path or settings.ANALYSIS_INDEX_PATH)
+        self._backfilled = False
+        self._runs_backfilled = False
+        self._backfill_lock = asyncio.Lock()
+        self._runs_backfill_lock = asyncio.Lock()
+
+    async def add(self, doc_id: str, metadata: Dict[str, Any]) -> None:
+        """Index one stored analysis document (insert or replace)"""
+        await self.run(self._upsert, [self._to_row(doc_id, metadata)])
+
+    async def remove(self, doc_id: str) -> None:
+        """Forget an analysis or run document (e.g. one ChromaDB never stored)"""
+        await self.run(self._delete, doc_id)
+
+    async def page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Newest-first page of analysis metadata
+
+        With ``cursor`` (from a previous page's ``next_cursor``) the page starts right
+        after that row without scanning skipped rows; otherwise ``offset`` applies.
+        """
+        await self._ensure_backfilled()
+        rows = await self.run(self._select_page, filters or {}, limit + 1, offset, decode_cursor(cursor) if cursor else None)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "items": [self._to_metadata(row) for row in rows],
+            "next_cursor": encode_cursor(rows[-1]) if has_more else None
+        }
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Exact number of analyses matching the filters"""
+        await self._ensure_backfilled()
+        return await self.run(self._count, filters or {})
+
+    async def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Metadata of the N most recent analyses"""
+        return (await self.page(limit=limit))["items"]
+
+    async def add_run(self, doc_id: str, metadata: Dict[str, Any]) -> None:
+        """Index one stored analysis run document (insert or replace)"""
+        await self.run(self._upsert_runs, [self._to_run_row(doc_id, metadata)])
+
+    async def recent_runs(self, profile_type: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Metadata of the N most recent runs, optionally of one profile type"""
+        await self._ensure_runs_backfilled()
+        where, params = ("WHERE profile_type = ?", (profile_type,)) if profile_type else ("", ())
+        rows = await self.run(
+            lambda conn: conn.execute(
+                f"SELECT doc_id, metadata FROM runs {where} ORDER BY timestamp_unix DESC, doc_id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        )
+        return [self._to_metadata(row) for row in rows]
+
+    async def find_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata of the newest run stored under ``run_id``, whatever its profile type"""
+        await self._ensure_runs_backfilled()
+        row = await self.run(
+            lambda conn: conn.execute(
+                "SELECT doc_id, metadata FROM runs WHERE run_id = ? ORDER BY timestamp_unix DESC LIMIT 1",
+                (run_id,)
+            ).fetchone()
+        )
+        return self._to_metadata(row) if row else None
+
+    @staticmethod
+    def _to_run_row(doc_id: str, metadata: Dict[str, Any]) -> tuple:
+        return (
+            doc_id,
+            str(metadata.get("run_id")),
+            metadata.get("profile_type") or "unknown",
+            int(metadata.get("timestamp_unix") or 0),
+            # Legacy runs carry results inline; the index only needs the summary
+            json.dumps({k: v for k, v in metadata.items() if k != "results_json"}, default=str)
+        )
+
+    @staticmethod
+    def _to_row(doc_id: str, metadata: Dict[str, Any]) -> tuple:
+        return (
+            doc_id,
+            metadata.get("analysis_id"),
+            metadata.get("token_address"),
+            metadata.get("token_name"),
+            metadata.get("token_symbol"),
+            int(metadata.get("timestamp_unix") or 0),
+            metadata.get("risk_level"),
+            metadata.get("security_status"),
+            metadata.get("source_event"),
+            metadata.get("analysis_type"),
+            json.dumps(metadata, default=str)
+        )
+
+    @staticmethod
+    def _to_metadata(row: sqlite3.Row) -> Dict[str, Any]:
+        return {**json.loads(row["metadata"]), "doc_id": row["doc_id"]}
+
+    @staticmethod
+    def _where(filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+
+        for field in INDEXED_FILTERS:
+            if filters.get(field):
+                clauses.append(f"{field} = ?")
+                params.append(filters[field])
+
+        for field, op, extra in (("date_from", ">=", 0), ("date_to", "<", 86400)):
+            if filters.get(field):
+                try:
+                    # Same local-date semantics as the ChromaDB where clause; date_to includes the whole day
+                    bound = datetime.strptime(filters[field], "%Y-%m-%d").timestamp() + extra
+                except ValueError:
+                    logger.warning(f"Invalid {field} format: {filters[field]}")
+                    continue
+                clauses.append(f"timestamp_unix {op} ?")
+                params.append(bound)
+
+        if filters.get("search"):
+            term = "%" + filters["search"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append(
+                "(token_address LIKE ? ESCAPE '\\' OR token_name LIKE ? ESCAPE '\\' OR token_symbol LIKE ? ESCAPE '\\')"
+            )
+            params.extend([term] * 3)
+
+        return clauses, params
+
+    @classmethod
+    def _select_page(
+        cls,
+        conn: sqlite3.Connection,
+        filters: Dict[str, Any],
+        limit: int,
+        offset: int,
+        cursor: Optional[Tuple[int, str]]
+    ) -> List[sqlite3.Row]:
+        clauses, params = cls._where(filters)
+        if cursor:
+            clauses.append("(timestamp_unix, doc_id) < (?, ?)")
+            params.extend(cursor)
+            offset = 0
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return conn.execute(
+            f"SELECT doc_id, timestamp_unix, metadata FROM analyses {where} "
+            f"ORDER BY timestamp_unix DESC, doc_id DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+
+    @classmethod
+    def _count(cls, conn: sqlite3.Connection, filters: Dict[str, Any]) -> int:
+        clauses, params = cls._where(filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return conn.execute(f"SELECT COUNT(*) FROM analyses {where}", params).fetchone()[0]
+
+    @classmethod
+    def _upsert(cls, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        placeholders = ", ".join("?" * len(cls.COLUMNS))
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO analyses ({', '.join(cls.COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, doc_id: str) -> None:
+        with conn:
+            conn.execute("DELETE FROM analyses WHERE doc_id = ?", (doc_id,))
+            conn.execute("DELETE FROM runs WHERE doc_id = ?", (doc_id,))
+
+    @staticmethod
+    def _upsert_runs(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO runs (doc_id, run_id, profile_type, timestamp_unix, metadata) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    async def _ensure_runs_backfilled(self) -> None:
+        """Index runs already stored in ChromaDB the first time the runs table is empty"""
+        if self._runs_backfilled:
+            return
+        async with self._runs_backfill_lock:
+            if not self._runs_backfilled:
+                self._runs_backfilled = await self._backfill(
+                    "runs", "analysis_run", self._upsert_runs,
+                    lambda doc_id, metadata: self._to_run_row(doc_id, metadata) if metadata.get("run_id") else None
+                )
+
+    async def _ensure_backfilled(self) -> None:
+        """Index analyses already stored in ChromaDB the first time the index is empty"""
+        if self._backfilled:
+            return
+        async with self._backfill_lock:
+            if not self._backfilled:
+                self._backfilled = await self._backfill("analyses", "token_analysis", self._upsert, self._to_row)
+
+    async def _backfill(
+        self,
+        table: str,
+        doc_type: str,
+        upsert: Callable[[sqlite3.Connection, List[tuple]], None],
+        to_row: Callable[[str, Dict[str, Any]], Optional[tuple]]
+    ) -> bool:
+        """Copy ``doc_type`` metadata from ChromaDB into ``table`` if it is empty
+
+        Returns True once the table is known to be complete (already populated or
+        backfilled); False if ChromaDB was unavailable so the next call retries.
+        """
+        try:
+            if await self.run(lambda conn: conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()):
+                return True
+
+            from app.utils.chroma_client import get_chroma_client
+            chroma_client = await get_chroma_client()
+            if not chroma_client.is_connected():
+                return False
+
+            # Exact metadata filter - no embedding query
+            existing = await chroma_client.get(where={"doc_type": doc_type}, include=["metadatas"])
+            rows = [
+                row
+                for doc_id, metadata in zip(existing.get("ids") or [], existing.get("metadatas") or [])
+                if metadata and (row := to_row(doc_id, metadata))
+            ]
+
+            if rows:
+                await self.run(upsert, rows)
+                logger.info(f"📚 Analysis index backfilled {len(rows)} {table} from ChromaDB")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Analysis index backfill of {table} from ChromaDB failed: {str(e)}")
+            return False
+
+# Global analysis index instance
+analysis_index = AnalysisIndex()
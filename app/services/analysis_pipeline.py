@@ -0,0 +1,193 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from loguru import logger
+
+
+class PipelineNode:
+    """Single provider call in an analysis pipeline"""
+
+    def __init__(
+        self,
+        name: str,
+        call: Callable[[], Awaitable[Any]],
+        depends_on: Optional[List[str]] = None,
+        speculative: bool = False,
+        gate: Optional[Callable[[Any], bool]] = None,
+        timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.call = call
+        self.depends_on = list(depends_on or [])
+        self.speculative = speculative
+        self.gate = gate
+        self.timeout = timeout
+
+        self.status = "pending"  # pending -> running -> done -> completed/failed, or skipped/cancelled
+        self.passed = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.released_at: Optional[float] = None
+
+
+class AnalysisPipeline:
+    """Dependency-graph executor for analysis provider calls
+
+    Nodes start as soon as their dependencies have passed. Speculative nodes start
+    immediately but their result is only released once every dependency has
+    passed; if a dependency fails or its gate rejects the result, they are
+    cancelled. ``on_result`` is called for each node as its result is released,
+    so callers can merge data into the response while the rest is in flight.
+    """
+
+    FINAL_STATES = ("completed", "failed", "skipped", "cancelled")
+
+    def __init__(self, name: str = "analysis"):
+        self.name = name
+        self.nodes: Dict[str, PipelineNode] = {}
+        self._started_at: Optional[float] = None
+
+    def add_node(
+        self,
+        name: str,
+        call: Callable[[], Awaitable[Any]],
+        depends_on: Optional[List[str]] = None,
+        speculative: bool = False,
+        gate: Optional[Callable[[Any], bool]] = None,
+        timeout: Optional[float] = None
+    ) -> "AnalysisPipeline":
+        """Add a node; ``gate`` decides from the node's result whether dependents may proceed"""
+        if name in self.nodes:
+            raise ValueError(f"Duplicate pipeline node: {name}")
+        self.nodes[name] = PipelineNode(name, call, depends_on, speculative, gate, timeout)
+        return self
+
+    async def run(self, on_result: Optional[Callable[[PipelineNode], None]] = None) -> Dict[str, PipelineNode]:
+        """Execute the graph and return all nodes with their final state"""
+        self._validate()
+        self._started_at = time.time()
+        running: Dict[asyncio.Task, PipelineNode] = {}
+
+        try:
+            while True:
+                self._advance(running, on_result)
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(list(running.keys()), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = running.pop(task)
+                    node.finished_at = self._elapsed()
+                    if node.status != "running":
+                        continue  # cancelled by a failed dependency
+                    if task.cancelled():
+                        node.error = asyncio.CancelledError()
+                    else:
+                        node.error = task.exception()
+                        node.result = task.result() if node.error is None else None
+                    node.status = "done"
+        finally:
+            for task in running:
+                task.cancel()
+
+        return self.nodes
+
+    def _advance(self, running: Dict[asyncio.Task, PipelineNode], on_result: Optional[Callable[[PipelineNode], None]]) -> None:
+        """Start, release or cancel nodes until nothing changes"""
+        progress = True
+        while progress:
+            progress = False
+            for node in self.nodes.values():
+                if node.status in self.FINAL_STATES:
+                    continue
+
+                deps = [self.nodes[name] for name in node.depends_on]
+
+                if any(dep.status in self.FINAL_STATES and not dep.passed for dep in deps):
+                    if node.task and not node.task.done():
+                        node.task.cancel()
+                        logger.debug(f"Pipeline {self.name}: cancelled speculative node {node.name}")
+                    node.status = "cancelled" if node.status in ("running", "done") else "skipped"
+                    progress = True
+                    continue
+
+                deps_passed = all(dep.status in self.FINAL_STATES and dep.passed for dep in deps)
+
+                if node.status == "pending" and (deps_passed or node.speculative):
+                    self._start(node, running)
+                    progress = True
+                elif node.status == "done" and deps_passed:
+                    self._release(node, on_result)
+                    progress = True
+
+    def _start(self, node: PipelineNode, running: Dict[asyncio.Task, PipelineNode]) -> None:
+        node.status = "running"
+        node.started_at = self._elapsed()
+        node.task = asyncio.create_task(self._execute(node))
+        running[node.task] = node
+
+    async def _execute(self, node: PipelineNode) -> Any:
+        if node.timeout:
+            return await asyncio.wait_for(node.call(), timeout=node.timeout)
+        return await node.call()
+
+    def _release(self, node: PipelineNode, on_result: Optional[Callable[[PipelineNode], None]]) -> None:
+        node.released_at = self._elapsed()
+        if node.error is None:
+            node.status = "completed"
+            try:
+                node.passed = node.gate(node.result) if node.gate else True
+            except Exception as e:
+                logger.warning(f"Pipeline {self.name}: gate for {node.name} failed: {str(e)}")
+                node.passed = False
+        else:
+            node.status = "failed"
+            node.passed = False
+
+        if on_result:
+            try:
+                on_result(node)
+            except Exception as e:
+                logger.warning(f"Pipeline {self.name}: result handler for {node.name} failed: {str(e)}")
+
+    def _validate(self) -> None:
+        """Check dependencies exist and the graph has no cycles"""
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"Pipeline node {node.name} depends on unknown node {dep}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline dependency cycle at {name}")
+            visiting.add(name)
+            for dep in self.nodes[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+    def _elapsed(self) -> float:
+        return round(time.time() - (self._started_at or time.time()), 3)
+
+    def get_report(self) -> Dict[str, Any]:
+        """Per-node status and timings (seconds since pipeline start)"""
+        return {
+            name: {
+                "status": node.status,
+                "speculative": node.speculative,
+                "started_at": node.started_at,
+                "finished_at": node.finished_at,
+                "released_at": node.released_at
+            }
+            for name, node in self.nodes.items()
+        }
@@ -64,7 +64,7 @@ class BaseAnalysisProfile(ABC):
             
             # Map service names to appropriate methods
             if service_name == "birdeye":
-                tasks[service_name] = self._safe_call(client.get_multiple_data_sequential, token_address)
+                tasks[service_name] = self._safe_call(client.get_market_data, token_address)
             elif service_name == "goplus":
                 tasks[service_name] = self._safe_call(client.analyze_token_security, token_address)
             elif service_name == "rugcheck":
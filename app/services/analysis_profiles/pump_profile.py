@@ -6,11 +6,17 @@ import asyncio
 from datetime import datetime
 
 from app.services.analysis_storage import analysis_storage
+from app.services.snapshots.snapshot_history import snapshot_history
+from app.services.snapshots.snapshot_store import snapshot_store
 
 
 class PumpAnalysisProfile:
     """Simplified pump analysis using existing snapshots"""
     
+    # Snapshot history used for velocity/acceleration, downsampled to 1-minute points
+    TRAJECTORY_WINDOW_SECONDS = 3600
+    TRAJECTORY_BUCKET_SECONDS = 60
+    
     def __init__(self):
         self.profile_name = "Pump Detection"
         self.analysis_type = "pump"
@@ -25,7 +31,7 @@ class PumpAnalysisProfile:
             # Generate run_id here (consistent across method)
             run_id = f"run_{int(time.time())}"  # 🆕 GENERATE ONCE HERE
             
-            # Get recent snapshots from ChromaDB
+            # Get recent snapshots from the snapshot store
             snapshots = await self._get_recent_snapshots(limit=200)
             
             if not snapshots:
@@ -103,14 +109,10 @@ class PumpAnalysisProfile:
             }
     
     async def _get_recent_snapshots(self, limit: int = 200) -> List[Dict[str, Any]]:
-        """Get recent snapshots with full market data from ChromaDB"""
+        """Get most recently updated snapshots with full market data"""
         try:
-            # Search for token snapshots
-            results = await analysis_storage.search_analyses(
-                query="token snapshot recent",
-                limit=limit,
-                filters={"doc_type": "token_snapshot"}
-            )
+            # Time-ordered listing from the snapshot store
+            results = await snapshot_store.list_recent(limit)
             
             if not results:
                 return []
@@ -119,11 +121,14 @@ class PumpAnalysisProfile:
             snapshots = []
             for result in results:
                 try:
-                    metadata = result.get("metadata", {})
-                    content = result.get("content", "{}")
-                    
-                    # Parse the OnChainData from content
-                    market_data = json.loads(content) if content != "{}" else {}
+                    metadata = {
+                        "doc_type": "token_snapshot",
+                        "analysis_id": result["analysis_id"],
+                        "token_address": result["token_address"],
+                        "timestamp": result["timestamp"],
+                        "snapshot_generation": str(result["snapshot_generation"])
+                    }
+                    market_data = result.get("market_data") or {}
                     
                     # Combine metadata + market data
                     snapshot = {
@@ -152,6 +157,18 @@ class PumpAnalysisProfile:
                     logger.warning(f"Error processing snapshot: {e}")
                     continue
             
+            # Attach trajectories from the snapshot time series (one query for all tokens)
+            try:
+                history = await snapshot_history.range_many(
+                    [snapshot["token_address"] for snapshot in snapshots],
+                    start=time.time() - self.TRAJECTORY_WINDOW_SECONDS,
+                    bucket_seconds=self.TRAJECTORY_BUCKET_SECONDS
+                )
+                for snapshot in snapshots:
+                    snapshot["trajectory"] = self._calculate_trajectory(history.get(snapshot["token_address"], []))
+            except Exception as e:
+                logger.warning(f"Snapshot history unavailable: {e}")
+            
             logger.info(f"Retrieved {len(snapshots)} snapshots with market data")
             
             # Debug: show first snapshot data
@@ -244,6 +261,7 @@ class PumpAnalysisProfile:
                 "mcap": int(market_cap),
                 "ai": "",  # Will be filled with AI analysis
                 "pump_score": round(pump_score, 2),
+                "trajectory": snapshot.get("trajectory") or self._calculate_trajectory([]),
                 "age_minutes": age_minutes,
                 "timestamp": timestamp_str,
                 "security": {
@@ -326,6 +344,41 @@ class PumpAnalysisProfile:
             logger.warning(f"Pump score calculation failed: {e}")
             return 0.0
     
+    def _calculate_trajectory(self, points: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Velocity (%/min) and acceleration (%/min²) of price, liquidity and 5m volume
+        
+        Velocity is the change from the first to the last point; acceleration is the
+        change in velocity between the first and second half of the window.
+        """
+        trajectory = {"points": len(points), "window_minutes": 0.0}
+        for field in ("price", "liquidity", "volume_5m"):
+            trajectory[f"{field}_velocity"] = None
+            trajectory[f"{field}_acceleration"] = None
+        
+        if len(points) < 2:
+            return trajectory
+        
+        first, middle, last = points[0], points[len(points) // 2], points[-1]
+        window_minutes = (last["ts"] - first["ts"]) / 60
+        trajectory["window_minutes"] = round(window_minutes, 2)
+        
+        def velocity(start: Dict[str, Any], end: Dict[str, Any], field: str) -> Optional[float]:
+            minutes = (end["ts"] - start["ts"]) / 60
+            if minutes <= 0 or not start.get(field) or end.get(field) is None:
+                return None
+            return (end[field] - start[field]) / start[field] * 100 / minutes
+        
+        for field in ("price", "liquidity", "volume_5m"):
+            overall = velocity(first, last, field)
+            trajectory[f"{field}_velocity"] = round(overall, 4) if overall is not None else None
+            
+            if len(points) >= 3:
+                early, late = velocity(first, middle, field), velocity(middle, last, field)
+                if early is not None and late is not None:
+                    trajectory[f"{field}_acceleration"] = round((late - early) / (window_minutes / 2), 4)
+        
+        return trajectory
+    
     def _calculate_age_minutes(self, timestamp_str: str) -> float:
         """Calculate age in minutes from timestamp string"""
         try:
@@ -360,6 +413,7 @@ class PumpAnalysisProfile:
             whale_data = candidate.get('whales1h', {})
             whale_count = whale_data.get('count', 0)
             whale_inflow = whale_data.get('total_inflow_usd', 0)
+            trajectory = candidate.get('trajectory') or {}
             
             prompt = f"""
 ГЛУБОКИЙ АНАЛИЗ ПАМПА ТОКЕНА:
@@ -378,6 +432,7 @@ class PumpAnalysisProfile:
 - Коэффициент объем/ликвидность: {liq_ratio:.3f} ({liq_ratio*100:.1f}%)
 - Рост объема (5м/60м): {vol_growth:.2f}x
 - Приток китов за час: {whale_count} китов на ${whale_inflow:,}
+- Скорость цены: {self._format_rate(trajectory.get('price_velocity'), '%/мин')}, ускорение: {self._format_rate(trajectory.get('price_acceleration'), '%/мин²')}
 
 ЗАДАЧА: Создай ЭКСПЕРТНОЕ сообщение на русском языке (2-3 предложения) для опытных трейдеров.
 
@@ -417,6 +472,10 @@ class PumpAnalysisProfile:
             logger.warning(f"AI message generation failed: {e}")
             return self._generate_fallback_message(candidate)
 
+    def _format_rate(self, value: Optional[float], unit: str) -> str:
+        """Format a trajectory rate for the prompt (n/a without history)"""
+        return f"{value:+.2f}{unit}" if value is not None else "н/д"
+
     def _generate_fallback_message(self, candidate: Dict[str, Any]) -> str:
         """Generate fallback Russian message when AI fails"""
         try:
@@ -4,7 +4,9 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from loguru import logger
 
-from app.utils.chroma_client import get_chroma_client
+from app.utils.chroma_client import chroma_client as shared_chroma_client, get_chroma_client
+from app.services.analysis_index import analysis_index
+from app.services.run_blob_store import run_blob_store
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -45,15 +47,21 @@ class AnalysisStorageService:
             # Generate metadata (for filtering)
             metadata = self._generate_metadata(doc_data)
             
-            # Store in ChromaDB
-            doc_id = f"analysis_{doc_data['timestamp_unix']}_{doc_data['token_address'][:8]}"
+            # Store in ChromaDB (upsert - re-storing the same analysis replaces it)
+            doc_id = f"analysis_{doc_data['timestamp_unix']}_{doc_data.get('analysis_type') or 'quick'}_{doc_data['token_address']}"
             
-            await chroma_client.add_document(
+            doc_id = await chroma_client.add_document(
                 content=content,
                 metadata=metadata,
                 doc_id=doc_id
             )
             
+            # Side-index for listing, counts and recency (no vector queries)
+            try:
+                await analysis_index.add(doc_id, metadata)
+            except Exception as e:
+                logger.warning(f"Failed to index analysis {doc_id}: {str(e)}")
+            
             logger.info(f"✅ Analysis stored in ChromaDB: {doc_id}")
             return True
             
@@ -1215,169 +1223,57 @@ class AnalysisStorageService:
             logger.error(f"Error getting token history: {str(e)}")
             return []
         
-    async def get_analyses_paginated(self, page: int = 1, per_page: int = 20, filters: dict = None) -> dict:
+    async def get_analyses_paginated(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        filters: dict = None,
+        cursor: Optional[str] = None
+    ) -> dict:
         """
-        Get paginated analyses with filtering
+        Get one page of analysis metadata (most recent first) with an exact total
+        
+        Served from the analysis side-index. Pass ``cursor`` (the previous page's
+        ``next_cursor``) for keyset pagination; ``page`` is used otherwise.
         """
-        if not self.collection:
-            logger.warning("ChromaDB collection not available for paginated query")
-            return None
-            
         try:
-            # Calculate offset
-            offset = (page - 1) * per_page
-            
-            # Build where clause for filtering
-            where_clause = {}
-            where_conditions = []
-            
-            if filters:
-                # Source event filter
-                if filters.get("source_event"):
-                    where_conditions.append({"source_event": {"$eq": filters["source_event"]}})
-                
-                # Risk level filter
-                if filters.get("risk_level"):
-                    where_conditions.append({"risk_level": {"$eq": filters["risk_level"]}})
-                
-                # Security status filter
-                if filters.get("security_status"):
-                    where_conditions.append({"security_status": {"$eq": filters["security_status"]}})
-                
-                # Date range filters (using timestamp)
-                if filters.get("date_from"):
-                    try:
-                        from datetime import datetime
-                        date_from = datetime.strptime(filters["date_from"], "%Y-%m-%d").timestamp()
-                        where_conditions.append({"timestamp": {"$gte": date_from}})
-                    except ValueError:
-                        logger.warning(f"Invalid date_from format: {filters['date_from']}")
-                
-                if filters.get("date_to"):
-                    try:
-                        from datetime import datetime
-                        # Add 24 hours to include the entire day
-                        date_to = datetime.strptime(filters["date_to"], "%Y-%m-%d").timestamp() + 86400
-                        where_conditions.append({"timestamp": {"$lt": date_to}})
-                    except ValueError:
-                        logger.warning(f"Invalid date_to format: {filters['date_to']}")
-            
-            # Combine where conditions
-            if where_conditions:
-                if len(where_conditions) == 1:
-                    where_clause = where_conditions[0]
-                else:
-                    where_clause = {"$and": where_conditions}
-            
-            # Query with pagination
-            query_params = {
-                "n_results": per_page,
-                "offset": offset,
-                "include": ["metadatas", "documents"]
-            }
-            
-            if where_clause:
-                query_params["where"] = where_clause
-            
-            # Handle search filter separately (text search)
-            if filters and filters.get("search"):
-                search_term = filters["search"]
-                # Use query_texts for semantic/text search
-                query_params["query_texts"] = [search_term]
-                # Remove n_results limit for search, we'll handle it after
-                search_results = self.collection.query(**query_params)
-            else:
-                search_results = self.collection.get(**query_params)
-            
-            if not search_results or not search_results.get("metadatas"):
-                return {
-                    "analyses": [],
-                    "pagination": {
-                        "page": page,
-                        "per_page": per_page,
-                        "total_items": 0,
-                        "total_pages": 0,
-                        "has_next": False,
-                        "has_prev": page > 1
-                    }
-                }
-            
-            # Get total count for pagination (separate query)
-            count_params = {}
-            if where_clause:
-                count_params["where"] = where_clause
-            
-            try:
-                # ChromaDB doesn't have a direct count method, so we get all IDs and count them
-                total_results = self.collection.get(
-                    include=["metadatas"],
-                    **count_params
-                )
-                total_items = len(total_results.get("metadatas", []))
-            except Exception as e:
-                logger.warning(f"Could not get total count: {str(e)}")
-                total_items = len(search_results.get("metadatas", []))
-            
-            # Process results
-            analyses = []
-            metadatas = search_results.get("metadatas", [])
-            
-            for i, metadata in enumerate(metadatas):
-                if not metadata:
-                    continue
-                    
-                # Apply search filter to metadata if provided
-                if filters and filters.get("search"):
-                    search_term = filters["search"].lower()
-                    searchable_text = " ".join([
-                        str(metadata.get("token_address", "")),
-                        str(metadata.get("token_name", "")),
-                        str(metadata.get("token_symbol", ""))
-                    ]).lower()
-                    
-                    if search_term not in searchable_text:
-                        continue
-                
-                analysis = {
-                    "id": metadata.get("analysis_id", f"analysis_{i}"),
-                    "token_address": metadata.get("token_address", ""),
-                    "token_name": metadata.get("token_name", "Unknown Token"),
-                    "token_symbol": metadata.get("token_symbol", "N/A"),
-                    "mint": metadata.get("token_address", ""),
-                    "timestamp": metadata.get("timestamp"),
-                    "risk_level": metadata.get("risk_level", "unknown"),
-                    "security_status": metadata.get("security_status", "unknown"),
-                    "source_event": metadata.get("source_event", "unknown"),
-                    "overall_score": metadata.get("overall_score"),
-                    "critical_issues": metadata.get("critical_issues", 0),
-                    "warnings": metadata.get("warnings", 0),
-                    "processing_time": metadata.get("processing_time", 0),
-                    "recommendation": metadata.get("recommendation", "HOLD"),
-                    "time": self._format_relative_time(metadata.get("timestamp"))
-                }
-                analyses.append(analysis)
-            
-            # Calculate pagination info
+            result = await analysis_index.page(
+                filters=filters,
+                limit=per_page,
+                offset=(page - 1) * per_page,
+                cursor=cursor
+            )
+            total_items = await analysis_index.count(filters)
             total_pages = (total_items + per_page - 1) // per_page
-            has_next = page < total_pages
-            has_prev = page > 1
             
             return {
-                "analyses": analyses,
+                "items": result["items"],
                 "pagination": {
                     "page": page,
                     "per_page": per_page,
                     "total_items": total_items,
                     "total_pages": total_pages,
-                    "has_next": has_next,
-                    "has_prev": has_prev
+                    "has_next": result["next_cursor"] is not None,
+                    "has_prev": page > 1 or cursor is not None,
+                    "next_cursor": result["next_cursor"]
                 }
             }
             
         except Exception as e:
             logger.error(f"Error in paginated query: {str(e)}")
             return None
-        
+    
+    async def get_recent_analyses(self, limit: int = 10) -> Dict[str, Any]:
+        """Metadata of the most recent analyses plus the exact total count"""
+        try:
+            return {
+                "items": await analysis_index.recent(limit),
+                "total_count": await analysis_index.count()
+            }
+        except Exception as e:
+            logger.error(f"Error getting recent analyses: {str(e)}")
+            return None
+    
     async def store_analysis_run(self, run_data: Dict[str, Any]) -> bool:
         """Store analysis run results with reusable structure"""
         try:
@@ -1435,9 +1331,15 @@ class AnalysisStorageService:
                 "processing_time": run_data.get("processing_time", 0),
                 "filters_applied": json.dumps(run_data.get("filters", {})),
                 "run_status": run_data.get("status", "completed"),
-                "results_count": len(results),
-                "results_json": json.dumps(results, default=str)
+                "results_count": len(results)
             }
+
+            # Full results live in the blob store; ChromaDB keeps only the reference
+            blob = await run_blob_store.put(results)
+            metadata.update({
+                "results_blob_id": blob["blob_id"],
+                "results_bytes": blob["raw_size"]
+            })
             
             # Add profile-specific metadata
             if profile_type == "pump" or profile_type == "pump_filter":
@@ -1459,6 +1361,12 @@ class AnalysisStorageService:
                 doc_id=doc_id
             )
 
+            # Time-ordered run index (recent runs, lookup by run_id alone)
+            try:
+                await analysis_index.add_run(doc_id, metadata)
+            except Exception as e:
+                logger.warning(f"Failed to index analysis run {doc_id}: {str(e)}")
+
             logger.info(f"Stored analysis run: {run_id} ({profile_type})")
             return True
             
@@ -1466,81 +1374,80 @@ class AnalysisStorageService:
             logger.error(f"Error storing analysis run: {e}")
             return False
 
-    async def get_analysis_run(self, run_id: str, profile_type: str) -> Optional[Dict[str, Any]]:
-        """Get specific analysis run by ID and profile type"""
+    async def get_analysis_run(self, run_id: str, profile_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get specific analysis run by ID
+        
+        With ``profile_type`` the run document is fetched by its exact ID; without it
+        the run index resolves which profile the run was stored under.
+        """
         try:
             chroma_client = await get_chroma_client()
             if not chroma_client.is_connected():
                 return None
 
-            # Search for the specific run
-            results = await chroma_client.search(
-                query=f"analysis run {run_id} {profile_type}",
-                n_results=5,
-                where={
-                    "doc_type": "analysis_run",
-                    "run_id": run_id,
-                    "profile_type": profile_type
-                }
-            )
+            if profile_type:
+                doc_id = f"run_{profile_type}_{run_id}"
+            else:
+                indexed = await analysis_index.find_run(run_id)
+                if not indexed:
+                    return None
+                doc_id = indexed["doc_id"]
 
-            if not results or not results.get("metadatas") or not results["metadatas"][0]:
+            # Exact ID fetch - no embedding query
+            results = await chroma_client.get(ids=[doc_id], include=["metadatas"])
+            metadatas = results.get("metadatas") if results else None
+            if not metadatas or not metadatas[0]:
                 return None
 
-            # Get the run metadata
-            metadata = results["metadatas"][0][0]
-            
-            try:
-                results_data = json.loads(metadata.get("results_json", "[]"))
-                filters_data = json.loads(metadata.get("filters_applied", "{}"))
-            except (json.JSONDecodeError, TypeError):
-                results_data = []
-                filters_data = {}
-
-            return {
-                "run_id": metadata.get("run_id"),
-                "profile_type": metadata.get("profile_type"),
-                "timestamp": metadata.get("timestamp_unix"),
-                "tokens_analyzed": metadata.get("tokens_analyzed", 0),
-                "successful_analyses": metadata.get("successful_analyses", 0),
-                "processing_time": metadata.get("processing_time", 0),
-                "status": metadata.get("run_status", "completed"),
-                "results": results_data,
-                "filters": filters_data,
-                "results_count": metadata.get("results_count", 0)
-            }
+            return await self.load_run(metadatas[0])
             
         except Exception as e:
             logger.error(f"Error getting analysis run {run_id}: {e}")
             return None
 
+    async def load_run(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Build run data from stored run metadata, decoding its results payload
+        
+        Runs stored before the blob store carry their results inline as ``results_json``.
+        """
+        results_data = None
+        if metadata.get("results_blob_id"):
+            results_data = await run_blob_store.get(metadata["results_blob_id"])
+            if results_data is None:
+                logger.warning(f"Results blob missing for run {metadata.get('run_id')}")
+
+        try:
+            if results_data is None:
+                results_data = json.loads(metadata.get("results_json", "[]"))
+            filters_data = json.loads(metadata.get("filters_applied", "{}"))
+        except (json.JSONDecodeError, TypeError):
+            results_data = results_data or []
+            filters_data = {}
+
+        return {
+            "run_id": metadata.get("run_id"),
+            "profile_type": metadata.get("profile_type"),
+            "timestamp": metadata.get("timestamp_unix"),
+            "tokens_analyzed": metadata.get("tokens_analyzed", 0),
+            "successful_analyses": metadata.get("successful_analyses", 0),
+            "processing_time": metadata.get("processing_time", 0),
+            "status": metadata.get("run_status", "completed"),
+            # Shallow copy - the decoded payload is cached and shared
+            "results": list(results_data),
+            "filters": filters_data,
+            "results_count": metadata.get("results_count", 0)
+        }
+
     async def get_recent_runs(self, 
                             profile_type: Optional[str] = None,
                             limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent analysis runs, optionally filtered by profile type"""
         try:
-            chroma_client = await get_chroma_client()
-            if not chroma_client.is_connected():
-                return []
-
-            # Build search parameters
-            where_clause = {"doc_type": "analysis_run"}
-            if profile_type:
-                where_clause["profile_type"] = profile_type
-
-            # Search for recent runs
-            results = await chroma_client.search(
-                query="analysis run recent",
-                n_results=limit * 2,  # Get more to sort properly
-                where=where_clause
-            )
+            # Newest first straight from the run index
+            run_metadatas = await analysis_index.recent_runs(profile_type, limit)
 
-            if not results or not results.get("metadatas") or not results["metadatas"][0]:
-                return []
-
-            # Process and sort results
             runs = []
-            for metadata in results["metadatas"][0]:
+            for metadata in run_metadatas:
                 try:
                     run_info = {
                         "run_id": metadata.get("run_id"),
@@ -1569,9 +1476,7 @@ class AnalysisStorageService:
                     logger.warning(f"Error processing run metadata: {e}")
                     continue
 
-            # Sort by timestamp (most recent first) and limit
-            runs.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-            return runs[:limit]
+            return runs
             
         except Exception as e:
             logger.error(f"Error getting recent runs: {e}")
@@ -1762,4 +1667,7 @@ class AnalysisStorageService:
 
 
 # Global instance
-analysis_storage = AnalysisStorageService()
\ No newline at end of file
+analysis_storage = AnalysisStorageService()
+
+# Documents the ChromaDB write buffer gives up on must not stay listed in the side index
+shared_chroma_client.add_drop_listener(analysis_index.remove)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class AccessTokenRefresher:
+    """Bearer token holder that renews ahead of expiry off the request path
+
+    ``fetch`` returns ``(token, expires_in_seconds)``. Requests get the cached token
+    while it is valid; inside the refresh margin a renewal starts in the background
+    and a timer renews idle clients before expiry. Only a missing or expired token
+    makes callers wait, and concurrent callers share a single fetch.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[Tuple[str, float]]], refresh_margin: Optional[float] = None):
+        self.name = name
+        self._fetch = fetch
+        self.refresh_margin = settings.AUTH_TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        self.token: Optional[str] = None
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._renewal_task: Optional[asyncio.Task] = None
+        self.stats = {"fetches": 0, "background_refreshes": 0, "waits": 0, "failures": 0}
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return bool(self.token) and now < self.expires_at
+
+    async def get(self) -> str:
+        """Current token, fetching only when none is valid"""
+        now = time.time()
+        if self.is_valid(now):
+            if now >= self.refresh_at:
+                self.refresh_in_background()
+            return self.token
+
+        self.stats["waits"] += 1
+        return await asyncio.shield(self._start_refresh())
+
+    def refresh_in_background(self) -> None:
+        """Start a renewal without waiting for it (no-op if one is running)"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self.stats["background_refreshes"] += 1
+        self._start_refresh()
+
+    def invalidate(self) -> None:
+        """Drop the token after the provider rejected it"""
+        self.token = None
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+
+    async def close(self) -> None:
+        """Cancel pending renewals"""
+        for task in (self._renewal_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._renewal_task = None
+        self._refresh_task = None
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    async def _refresh(self) -> str:
+        token, expires_in = await self._fetch()
+        self.stats["fetches"] += 1
+        now = time.time()
+        # Short-lived tokens renew halfway through their lifetime
+        renew_in = max(0.0, float(expires_in) - min(self.refresh_margin, float(expires_in) / 2))
+        self.token = token
+        self.expires_at = now + float(expires_in)
+        self.refresh_at = now + renew_in
+        self._schedule_renewal(renew_in)
+        logger.debug(f"{self.name} access token renewed, valid for {int(expires_in)}s")
+        return token
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.stats["failures"] += 1
+            logger.warning(f"{self.name} access token refresh failed: {str(error)}")
+
+    def _schedule_renewal(self, delay: float) -> None:
+        if self._renewal_task and not self._renewal_task.done():
+            self._renewal_task.cancel()
+        self._renewal_task = asyncio.create_task(self._renew_after(delay))
+
+    async def _renew_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self.refresh_in_background()
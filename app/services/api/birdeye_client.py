@@ -7,6 +7,9 @@ from datetime import datetime, timedelta
 from loguru import logger
 
 from app.core.config import get_settings
+from app.services.api.http_transport import http_transport
+from app.utils.provider_rate_limiter import provider_rate_limiter
+from app.utils.provider_cache import cached_request
 
 settings = get_settings()
 
@@ -27,56 +30,35 @@ class BirdeyeClient:
         self.api_key = settings.BIRDEYE_API_KEY
         self.base_url = settings.BIRDEYE_BASE_URL
         self.session = None
-        self._rate_limit_delay = 1.0  # Increased to 1 second to handle rate limits better
-        self._last_request_time = 0
-        self._request_lock = asyncio.Lock()  # Add lock for sequential requests
         self.timeout = settings.API_TIMEOUT
         
-        # Track request timing for better rate limiting
-        self._request_times = []
-        self._max_requests_per_second = 1  # Conservative rate limit
-        
         if self.api_key:
             logger.debug(f"Birdeye API key configured")
         else:
             logger.debug("Birdeye API key not configured")
     
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self._ensure_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - pooled session stays open for other clients"""
+        self.session = None
+    
     async def _ensure_session(self):
-        """Ensure session is available"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure shared pooled session is available"""
+        self.session = http_transport.get_session()
     
-    async def _smart_rate_limit(self):
-        """Smart rate limiting that adapts to API responses"""
-        async with self._request_lock:
-            current_time = time.time()
-            
-            # Clean old request times (older than 1 second)
-            self._request_times = [t for t in self._request_times if current_time - t < 1.0]
-            
-            # If we've made too many requests in the last second, wait
-            if len(self._request_times) >= self._max_requests_per_second:
-                sleep_time = 1.0 - (current_time - self._request_times[0])
-                if sleep_time > 0:
-                    logger.debug(f"Birdeye rate limiting: sleeping {sleep_time:.2f}s")
-                    await asyncio.sleep(sleep_time)
-            
-            # Additional delay based on last request
-            time_since_last = current_time - self._last_request_time
-            if time_since_last < self._rate_limit_delay:
-                additional_sleep = self._rate_limit_delay - time_since_last
-                logger.debug(f"Birdeye additional delay: {additional_sleep:.2f}s")
-                await asyncio.sleep(additional_sleep)
-            
-            # Record this request
-            self._request_times.append(time.time())
-            self._last_request_time = time.time()
+    async def _rate_limit(self):
+        """Wait for a token from the provider quota shared by all workers"""
+        await provider_rate_limiter.acquire("birdeye", self.api_key)
     
+    @cached_request("birdeye")
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with enhanced rate limiting"""
         await self._ensure_session()
-        await self._smart_rate_limit()
+        await self._rate_limit()
 
         # Setup headers
         headers = {
@@ -96,55 +78,56 @@ class BirdeyeClient:
         logger.debug(f"Birdeye {method} {endpoint}")
         
         try:
-            async with self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=json_data,
-                **kwargs
-            ) as response:
+            for attempt in range(settings.PROVIDER_RATE_LIMIT_MAX_RETRIES + 1):
+                if attempt:
+                    await self._rate_limit()
+
+                async with self.session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    json=json_data,
+                    **kwargs
+                ) as response:
                 
-                logger.debug(f"Birdeye response status: {response.status}")
-                content_type = response.headers.get("content-type", "").lower()
+                    logger.debug(f"Birdeye response status: {response.status}")
+                    content_type = response.headers.get("content-type", "").lower()
                 
-                if response.status == 200:
-                    if "application/json" in content_type:
-                        response_data = await response.json()
-                        logger.info(f"✅ Birdeye {method} {endpoint} successful")
-                        return response_data
-                    else:
-                        text_response = await response.text()
-                        logger.error(f"Unexpected content type: {content_type}")
-                        raise BirdeyeAPIError(f"Expected JSON, got {content_type}")
+                    if response.status == 200:
+                        if "application/json" in content_type:
+                            response_data = await response.json()
+                            logger.info(f"✅ Birdeye {method} {endpoint} successful")
+                            return response_data
+                        else:
+                            text_response = await response.text()
+                            logger.error(f"Unexpected content type: {content_type}")
+                            raise BirdeyeAPIError(f"Expected JSON, got {content_type}")
                         
-                elif response.status == 429:
-                    # Rate limited - increase delay and retry
-                    retry_after = int(response.headers.get("Retry-After", 3))
-                    logger.warning(f"Birdeye rate limited, waiting {retry_after}s and increasing delay")
-                    
-                    # Increase rate limit delay for future requests
-                    self._rate_limit_delay = min(2.0, self._rate_limit_delay * 1.5)
-                    self._max_requests_per_second = max(0.5, self._max_requests_per_second * 0.8)
+                    elif response.status == 429:
+                        # Rate limited - block the shared bucket so every worker backs off
+                        retry_after = int(response.headers.get("Retry-After", 3))
+                        logger.warning(f"Birdeye rate limited, waiting {retry_after}s")
+                        await provider_rate_limiter.penalize("birdeye", self.api_key, retry_after)
+                        # Leave the response (freeing the pooled connection) and retry once the quota allows it
+                        continue
                     
-                    await asyncio.sleep(retry_after)
-                    # Retry once with new rate limits
-                    return await self._request(method, endpoint, params=params, json=json_data, **kwargs)
+                    elif response.status == 401:
+                        error_text = await response.text()
+                        logger.error(f"401 Authentication failed: {error_text[:500]}")
                     
-                elif response.status == 401:
-                    error_text = await response.text()
-                    logger.error(f"401 Authentication failed: {error_text[:500]}")
-                    
-                    if self.api_key:
-                        raise BirdeyeAPIError(f"Authentication failed: Invalid API key")
-                    else:
-                        raise BirdeyeAPIError(f"Authentication required: API key needed")
+                        if self.api_key:
+                            raise BirdeyeAPIError(f"Authentication failed: Invalid API key")
+                        else:
+                            raise BirdeyeAPIError(f"Authentication required: API key needed")
                         
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Birdeye API error {response.status}: {error_text[:500]}")
-                    raise BirdeyeAPIError(f"HTTP {response.status}: {error_text[:200] if error_text else 'No response content'}")
-                    
+                    else:
+                        error_text = await response.text()
+                        logger.error(f"Birdeye API error {response.status}: {error_text[:500]}")
+                        raise BirdeyeAPIError(f"HTTP {response.status}: {error_text[:200] if error_text else 'No response content'}")
+
+            raise BirdeyeAPIError(f"Birdeye rate limit exceeded after {settings.PROVIDER_RATE_LIMIT_MAX_RETRIES} retries")
+        
         except asyncio.TimeoutError:
             raise BirdeyeAPIError("Birdeye API request timeout")
         except aiohttp.ClientError as e:
@@ -154,9 +137,13 @@ class BirdeyeClient:
         except Exception as e:
             raise BirdeyeAPIError(f"Unexpected error: {str(e)}")
     
-    async def get_multiple_data_sequential(self, token_address: str) -> Dict[str, Any]:
-        """Get multiple data points from Birdeye with proper sequential processing"""
-        logger.info(f"🔧 Birdeye sequential data collection for {token_address}")
+    async def get_market_data(self, token_address: str, trades_limit: int = 20) -> Dict[str, Any]:
+        """Get price and recent trades from Birdeye concurrently
+        
+        Both calls are issued together and scheduled by the shared provider rate
+        limiter, which only spaces them out when the plan's quota has no room for a burst.
+        """
+        logger.info(f"🔧 Birdeye market data collection for {token_address}")
         
         results = {
             "token_address": token_address,
@@ -165,35 +152,27 @@ class BirdeyeClient:
             "errors": []
         }
         
-        # Define the sequence of calls
-        sequential_calls = [
-            ("price", lambda: self.get_token_price(token_address, include_liquidity=True, check_liquidity=100)),
-            ("trades", lambda: self.get_token_trades(token_address, sort_type="desc", limit=20))
-        ]
+        calls = {
+            "price": self.get_token_price(token_address, include_liquidity=True, check_liquidity=100),
+            "trades": self.get_token_trades(token_address, sort_type="desc", limit=trades_limit)
+        }
         
-        for call_name, call_func in sequential_calls:
-            try:
-                logger.debug(f"Birdeye calling {call_name} endpoint")
-                data = await call_func()
-                
-                if data:
-                    results[call_name] = data
-                    results["data_collected"].append(call_name)
-                    logger.info(f"✅ Birdeye {call_name} data collected")
-                else:
-                    logger.warning(f"⚠️ Birdeye {call_name} returned no data")
-                    results["errors"].append(f"{call_name}: No data returned")
-                
-                # Wait between calls if we have more calls to make
-                if call_name != sequential_calls[-1][0]:  # Not the last call
-                    await asyncio.sleep(1.2)  # Slightly longer delay between different endpoints
-                    
-            except Exception as e:
-                error_msg = f"Birdeye {call_name} failed: {str(e)}"
+        responses = await asyncio.gather(*calls.values(), return_exceptions=True)
+        
+        for call_name, data in zip(calls.keys(), responses):
+            if isinstance(data, Exception):
+                error_msg = f"Birdeye {call_name} failed: {str(data)}"
                 logger.warning(f"❌ {error_msg}")
                 results["errors"].append(error_msg)
+            elif data:
+                results[call_name] = data
+                results["data_collected"].append(call_name)
+                logger.info(f"✅ Birdeye {call_name} data collected")
+            else:
+                logger.warning(f"⚠️ Birdeye {call_name} returned no data")
+                results["errors"].append(f"{call_name}: No data returned")
         
-        logger.info(f"✅ Birdeye sequential collection completed: {len(results['data_collected'])} datasets")
+        logger.info(f"✅ Birdeye market data collection completed: {len(results['data_collected'])} datasets")
         return results
     
     # Your existing methods remain the same, just use the improved _request method
@@ -456,7 +435,7 @@ async def check_birdeye_health() -> Dict[str, Any]:
     
 
 # Convenience function for token analyzer
-async def get_birdeye_data_sequential(token_address: str) -> Dict[str, Any]:
-    """Get Birdeye data with proper sequential processing"""
+async def get_birdeye_market_data(token_address: str) -> Dict[str, Any]:
+    """Get Birdeye price and trades data"""
     async with BirdeyeClient() as client:
-        return await client.get_multiple_data_sequential(token_address)
\ No newline at end of file
+        return await client.get_market_data(token_address)
\ No newline at end of file
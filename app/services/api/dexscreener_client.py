@@ -7,6 +7,9 @@ from datetime import datetime, timedelta
 from loguru import logger
 
 from app.core.config import get_settings
+from app.services.api.http_transport import http_transport
+from app.utils.provider_rate_limiter import provider_rate_limiter
+from app.utils.provider_cache import cached_request
 
 settings = get_settings()
 
@@ -22,41 +25,28 @@ class DexScreenerClient:
     def __init__(self):
         self.base_url = settings.DEXSCREENER_BASE_URL
         self.session = None
-        self._rate_limit_delay = 0.5  # 500ms between requests to be respectful
-        self._last_request_time = 0
         self.timeout = settings.API_TIMEOUT
         
         logger.info("DexScreener client initialized (no API key required)")
     
     async def __aenter__(self):
         """Async context manager entry"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        await self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Async context manager exit - pooled session stays open for other clients"""
+        self.session = None
     
     async def _ensure_session(self):
-        """Ensure session is available"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure shared pooled session is available"""
+        self.session = http_transport.get_session()
     
     async def _rate_limit(self):
-        """Simple rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        
-        if time_since_last < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - time_since_last)
-        
-        self._last_request_time = time.time()
+        """Wait for a token from the provider quota shared by all workers"""
+        await provider_rate_limiter.acquire("dexscreener", None)
     
+    @cached_request("dexscreener")
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling and rate limiting"""
         await self._ensure_session()
@@ -69,38 +59,44 @@ class DexScreenerClient:
         }
         
         try:
-            async with self.session.request(method, url, headers=headers, **kwargs) as response:
-                content_type = response.headers.get('content-type', '').lower()
+            for attempt in range(settings.PROVIDER_RATE_LIMIT_MAX_RETRIES + 1):
+                if attempt:
+                    await self._rate_limit()
+
+                async with self.session.request(method, url, headers=headers, **kwargs) as response:
+                    content_type = response.headers.get('content-type', '').lower()
                 
-                logger.debug(f"DexScreener {method} {endpoint} - Status: {response.status}, Content-Type: {content_type}")
+                    logger.debug(f"DexScreener {method} {endpoint} - Status: {response.status}, Content-Type: {content_type}")
                 
-                if response.status == 200:
-                    if 'application/json' in content_type:
-                        response_data = await response.json()
-                        return response_data
-                    else:
-                        response_text = await response.text()
-                        logger.warning(f"Unexpected content type from DexScreener: {response_text}")
-                        raise DexScreenerAPIError(f"Expected JSON, got {content_type}")
+                    if response.status == 200:
+                        if 'application/json' in content_type:
+                            response_data = await response.json()
+                            return response_data
+                        else:
+                            response_text = await response.text()
+                            logger.warning(f"Unexpected content type from DexScreener: {response_text}")
+                            raise DexScreenerAPIError(f"Expected JSON, got {content_type}")
                         
-                elif response.status == 429:
-                    # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 2))
-                    logger.warning(f"DexScreener rate limited, waiting {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    # Retry once
-                    return await self._request(method, endpoint, **kwargs)
-                elif response.status == 404:
-                    # Not found - might be normal for tokens not on DEXes
-                    logger.debug(f"DexScreener 404 for {endpoint} - token may not be traded on DEXes")
-                    return None
-                else:
-                    try:
-                        error_text = await response.text()
-                        raise DexScreenerAPIError(f"HTTP {response.status}: {error_text[:200]}")
-                    except:
-                        raise DexScreenerAPIError(f"HTTP {response.status}: Unknown error")
-                    
+                    elif response.status == 429:
+                        # Rate limited
+                        retry_after = int(response.headers.get('Retry-After', 2))
+                        logger.warning(f"DexScreener rate limited, waiting {retry_after}s")
+                        await provider_rate_limiter.penalize("dexscreener", None, retry_after)
+                        # Leave the response (freeing the pooled connection) and retry once the quota allows it
+                        continue
+                    elif response.status == 404:
+                        # Not found - might be normal for tokens not on DEXes
+                        logger.debug(f"DexScreener 404 for {endpoint} - token may not be traded on DEXes")
+                        return None
+                    else:
+                        try:
+                            error_text = await response.text()
+                            raise DexScreenerAPIError(f"HTTP {response.status}: {error_text[:200]}")
+                        except:
+                            raise DexScreenerAPIError(f"HTTP {response.status}: Unknown error")
+
+            raise DexScreenerAPIError(f"DexScreener rate limit exceeded after {settings.PROVIDER_RATE_LIMIT_MAX_RETRIES} retries")
+        
         except asyncio.TimeoutError:
             raise DexScreenerAPIError("DexScreener API request timeout")
         except aiohttp.ClientError as e:
@@ -202,17 +198,17 @@ class DexScreenerClient:
             
             # Process results by address
             results = {}
-            if "pairs" in response:
-                for pair in response["pairs"]:
-                    base_address = pair.get("baseToken", {}).get("address")
-                    quote_address = pair.get("quoteToken", {}).get("address")
-                    
-                    # Group pairs by token address
-                    for addr in addresses:
-                        if addr == base_address or addr == quote_address:
-                            if addr not in results:
-                                results[addr] = []
-                            results[addr].append(pair)
+            pairs = response if isinstance(response, list) else response.get("pairs") or []
+            for pair in pairs:
+                base_address = pair.get("baseToken", {}).get("address")
+                quote_address = pair.get("quoteToken", {}).get("address")
+                
+                # Group pairs by token address
+                for addr in addresses:
+                    if addr == base_address or addr == quote_address:
+                        if addr not in results:
+                            results[addr] = []
+                        results[addr].append(pair)
             
             return results
             
@@ -1,11 +1,15 @@
 import asyncio
 import aiohttp
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 from goplus.auth import Auth
 
 from app.core.config import get_settings
+from app.services.api.access_token import AccessTokenRefresher
+from app.services.api.http_transport import http_transport
+from app.utils.provider_rate_limiter import provider_rate_limiter
+from app.utils.provider_cache import cached_request
 
 settings = get_settings()
 
@@ -25,13 +29,10 @@ class GOplusClient:
         
         self.base_url = settings.GOPLUS_BASE_URL
         self.session = None
-        self._rate_limit_delay = 2
-        self._last_request_time = 0
         self.timeout = settings.API_TIMEOUT
         
-        # Token management
-        self._access_token = None
-        self._token_expiry = 0
+        # Bearer token renewed in the background before expiry
+        self._auth = AccessTokenRefresher("GOplus", self._fetch_access_token)
         
         # Log API key status
         self._log_api_key_status()
@@ -45,55 +46,49 @@ class GOplusClient:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        await self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Async context manager exit - pooled session stays open for other clients"""
+        self.session = None
+        await self._auth.close()
     
     async def _ensure_session(self):
-        """Ensure session is available"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure shared pooled session is available"""
+        self.session = http_transport.get_session()
     
     async def _rate_limit(self):
-        """Simple rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        
-        if time_since_last < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - time_since_last)
-        
-        self._last_request_time = time.time()
+        """Wait for a token from the provider quota shared by all workers"""
+        await provider_rate_limiter.acquire("goplus", self.app_key)
+    
+    def prefetch_access_token(self) -> None:
+        """Start fetching the bearer token so the first request does not wait for it"""
+        if self.app_key and self.app_secret:
+            self._auth.refresh_in_background()
     
     async def _get_access_token(self) -> str:
-        """Get access token using APP_KEY and APP_SECRET"""
-        
-        # Check if we have a valid cached token
-        current_time = time.time()
-        if self._access_token and current_time < self._token_expiry:
-            return self._access_token
-        
+        """Get access token (cached, renewed in the background before expiry)"""
         if not self.app_key or not self.app_secret:
             raise GOplusAPIError("GOplus APP_KEY and APP_SECRET not configured")
         
-        await self._ensure_session()
+        return await self._auth.get()
+    
+    async def _fetch_access_token(self) -> Tuple[str, float]:
+        """Request a new token using APP_KEY and APP_SECRET
         
+        The GOplus SDK call is synchronous, so it runs in a worker thread. ``expires_in``
+        is the token lifetime in seconds.
+        """
         try:
-            response = Auth(key=self.app_key, secret=self.app_secret).get_access_token()
+            response = await asyncio.wait_for(
+                asyncio.to_thread(Auth(key=self.app_key, secret=self.app_secret).get_access_token),
+                timeout=self.timeout
+            )
             response_data = response.to_dict()
             if response_data["code"] == 1:
-                self._access_token = response_data["result"]["access_token"]
-                self._token_expiry = response_data["result"]["expires_in"]
-
                 logger.debug(f"GOplus access token obtained")
-                return response_data["result"]["access_token"]
+                return response_data["result"]["access_token"], float(response_data["result"]["expires_in"])
                 
             else:
                 raise GOplusAPIError("Failed to optain access token")
@@ -103,6 +98,7 @@ class GOplusClient:
         except aiohttp.ClientError as e:
             raise GOplusAPIError(f"Token request error: {str(e)}")
     
+    @cached_request("goplus")
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with bearer token authentication"""
         await self._ensure_session()
@@ -151,8 +147,7 @@ class GOplusClient:
                                 # Handle token expiry
                                 if error_code in [4001, 4002]:  # Token expired or invalid
                                     # Clear cached token and retry once
-                                    self._access_token = None
-                                    self._token_expiry = 0
+                                    self._auth.invalidate()
                                     
                                     logger.debug("Token expired, retrying with new token")
                                     return await self._request(method, endpoint, params=params, json=json_data, **kwargs)
@@ -166,9 +161,8 @@ class GOplusClient:
                 
                 elif response.status == 401:
                     # Token might be expired, clear cache and retry once
-                    if self._access_token:
-                        self._access_token = None
-                        self._token_expiry = 0
+                    if self._auth.token:
+                        self._auth.invalidate()
                         logger.debug("401 error, clearing token cache")
                         return await self._request(method, endpoint, params=params, json=json_data, **kwargs)
                     else:
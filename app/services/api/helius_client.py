@@ -6,6 +6,9 @@ from decimal import Decimal
 from loguru import logger
 
 from app.core.config import get_settings
+from app.services.api.http_transport import http_transport
+from app.utils.provider_rate_limiter import provider_rate_limiter
+from app.utils.provider_cache import cached_request
 
 settings = get_settings()
 
@@ -23,8 +26,6 @@ class HeliusClient:
         self.rpc_url = settings.get_helius_rpc_url()
         self.base_url = settings.HELIUS_BASE_URL
         self.session = None
-        self._rate_limit_delay = 0.1  # 100ms between requests
-        self._last_request_time = 0
         self.timeout = settings.API_TIMEOUT
         
         if not self.api_key:
@@ -32,55 +33,50 @@ class HeliusClient:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        await self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Async context manager exit - pooled session stays open for other clients"""
+        self.session = None
     
     async def _ensure_session(self):
-        """Ensure session is available"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure shared pooled session is available"""
+        self.session = http_transport.get_session()
     
     async def _rate_limit(self):
-        """Simple rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        
-        if time_since_last < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - time_since_last)
-        
-        self._last_request_time = time.time()
+        """Wait for a token from the provider quota shared by all workers"""
+        await provider_rate_limiter.acquire("helius", self.api_key)
     
+    @cached_request("helius")
     async def _request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling and rate limiting"""
         await self._ensure_session()
         await self._rate_limit()
         
         try:
-            async with self.session.request(method, url, **kwargs) as response:
-                response_data = await response.json()
+            for attempt in range(settings.PROVIDER_RATE_LIMIT_MAX_RETRIES + 1):
+                if attempt:
+                    await self._rate_limit()
+
+                async with self.session.request(method, url, **kwargs) as response:
+                    response_data = await response.json()
                 
-                if response.status == 200:
-                    return response_data
-                elif response.status == 429:
-                    # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 1))
-                    logger.warning(f"Helius rate limited, waiting {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    # Retry once
-                    return await self._request(method, url, **kwargs)
-                else:
-                    error_msg = response_data.get('error', f'HTTP {response.status}')
-                    raise HeliusAPIError(f"Helius API error: {error_msg}")
-                    
+                    if response.status == 200:
+                        return response_data
+                    elif response.status == 429:
+                        # Rate limited
+                        retry_after = int(response.headers.get('Retry-After', 1))
+                        logger.warning(f"Helius rate limited, waiting {retry_after}s")
+                        await provider_rate_limiter.penalize("helius", self.api_key, retry_after)
+                        # Leave the response (freeing the pooled connection) and retry once the quota allows it
+                        continue
+                    else:
+                        error_msg = response_data.get('error', f'HTTP {response.status}')
+                        raise HeliusAPIError(f"Helius API error: {error_msg}")
+
+            raise HeliusAPIError(f"Helius rate limit exceeded after {settings.PROVIDER_RATE_LIMIT_MAX_RETRIES} retries")
+        
         except asyncio.TimeoutError:
             raise HeliusAPIError("Helius API request timeout")
         except aiohttp.ClientError as e:
@@ -136,6 +132,31 @@ class HeliusClient:
             logger.error(f"Error getting token accounts for {mint_address}: {str(e)}")
             return []
     
+    async def get_token_accounts_by_owner(self, owner_address: str, mint_address: str) -> List[Dict[str, Any]]:
+        """Get SPL token accounts of a mint owned by an address (e.g. pool vaults)"""
+        try:
+            result = await self._rpc_request(
+                "getTokenAccountsByOwner",
+                [owner_address, {"mint": mint_address}, {"encoding": "jsonParsed"}]
+            )
+            
+            accounts = []
+            for account in (result or {}).get("value", []):
+                info = account.get("account", {}).get("data", {}).get("parsed", {}).get("info", {})
+                token_amount = info.get("tokenAmount", {})
+                accounts.append({
+                    "address": account.get("pubkey"),
+                    "mint": info.get("mint"),
+                    "ui_amount": token_amount.get("uiAmount"),
+                    "decimals": token_amount.get("decimals")
+                })
+            
+            return accounts
+            
+        except Exception as e:
+            logger.error(f"Error getting {mint_address} accounts owned by {owner_address}: {str(e)}")
+            return []
+    
     async def get_token_supply(self, mint_address: str) -> Dict[str, Any]:
         """Get token supply information"""
         try:
@@ -176,6 +197,28 @@ class HeliusClient:
             logger.warning(f"Token metadata endpoint failed: {str(e)}")
             return {}
     
+    async def get_tokens_metadata(self, mint_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get token metadata for multiple mints in one call (up to 100), keyed by mint"""
+        if len(mint_addresses) > 100:
+            logger.warning("Helius token-metadata allows max 100 mints, truncating list")
+            mint_addresses = mint_addresses[:100]
+        
+        url = "https://api.helius.xyz/v0/token-metadata"
+        
+        payload = {
+            "mintAccounts": mint_addresses,
+            "includeOffChain": False,
+            "disableCache": False
+        }
+        
+        response = await self._request("POST", url, headers={"Content-Type": "application/json"}, json=payload, params={"api-key":self.api_key})
+        
+        return {
+            item["account"]: item
+            for item in response or []
+            if isinstance(item, dict) and item.get("account")
+        }
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check Helius API health"""
         try:
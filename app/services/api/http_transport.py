@@ -0,0 +1,116 @@
+import asyncio
+import aiohttp
+import httpx
+from typing import Dict, Any, Optional
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class HTTPTransport:
+    """Shared pooled HTTP transport for API clients and the bot service
+
+    One aiohttp session (API clients) and one httpx client (bot service) are kept
+    open for the process lifetime so connections, TLS sessions and DNS lookups are
+    reused across requests instead of being set up per call.
+    """
+
+    def __init__(self):
+        self.pool_size = settings.HTTP_POOL_SIZE
+        self.per_host_limit = settings.HTTP_POOL_PER_HOST
+        self.dns_cache_ttl = settings.HTTP_DNS_CACHE_TTL
+        self.keepalive_timeout = settings.HTTP_KEEPALIVE_TIMEOUT
+        self.timeout = settings.API_TIMEOUT
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._httpx_client: Optional[httpx.AsyncClient] = None
+        self._httpx_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {
+            "sessions_created": 0,
+            "httpx_clients_created": 0
+        }
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get shared aiohttp session, creating it on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host_limit,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._session_loop = loop
+            self._stats["sessions_created"] += 1
+            logger.debug(f"HTTP transport session created (pool {self.pool_size}, per host {self.per_host_limit})")
+        return self._session
+
+    def get_httpx_client(self) -> httpx.AsyncClient:
+        """Get shared httpx client, creating it on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._httpx_client is None or self._httpx_client.is_closed or self._httpx_loop is not loop:
+            self._httpx_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.per_host_limit,
+                    keepalive_expiry=self.keepalive_timeout
+                )
+            )
+            self._httpx_loop = loop
+            self._stats["httpx_clients_created"] += 1
+        return self._httpx_client
+
+    async def start(self):
+        """Open pooled sessions ahead of the first request"""
+        self.get_session()
+        self.get_httpx_client()
+        logger.info(f"✅ HTTP transport ready (pool {self.pool_size}, DNS cache {self.dns_cache_ttl}s)")
+
+    async def close(self):
+        """Close pooled sessions"""
+        if self._session and not self._session.closed:
+            try:
+                await self._session.close()
+            except Exception as e:
+                logger.warning(f"⚠️  Error closing HTTP session: {str(e)}")
+        self._session = None
+        self._session_loop = None
+
+        if self._httpx_client and not self._httpx_client.is_closed:
+            try:
+                await self._httpx_client.aclose()
+            except Exception as e:
+                logger.warning(f"⚠️  Error closing httpx client: {str(e)}")
+        self._httpx_client = None
+        self._httpx_loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics"""
+        stats = {
+            "pool_size": self.pool_size,
+            "per_host_limit": self.per_host_limit,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "keepalive_timeout": self.keepalive_timeout,
+            **self._stats,
+            "session_open": bool(self._session and not self._session.closed)
+        }
+
+        connector = self._session.connector if self._session and not self._session.closed else None
+        if connector is not None:
+            acquired = getattr(connector, "_acquired", None)
+            stats["active_connections"] = len(acquired) if acquired is not None else None
+
+        return stats
+
+
+# Global HTTP transport instance (owned by APIManager)
+http_transport = HTTPTransport()
@@ -3,10 +3,14 @@ import aiohttp
 import time
 import json
 import base58
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 
 from app.core.config import get_settings
+from app.services.api.access_token import AccessTokenRefresher
+from app.services.api.http_transport import http_transport
+from app.utils.provider_rate_limiter import provider_rate_limiter
+from app.utils.provider_cache import cached_request
 
 settings = get_settings()
 
@@ -32,13 +36,10 @@ class RugCheckClient:
         self.wallet_private_key = settings.WALLET_SECRET_KEY
         self.base_url = settings.RUGCHECK_BASE_URL
         self.session = None
-        self._rate_limit_delay = 0.3  # 300ms between requests
-        self._last_request_time = 0
         self.timeout = settings.API_TIMEOUT
         
-        # JWT token management
-        self._access_token = None
-        self._token_expiry = 0
+        # JWT renewed in the background before expiry
+        self._auth = AccessTokenRefresher("RugCheck", self._fetch_access_token)
         self._wallet = None
         
         if not self.wallet_private_key:
@@ -48,32 +49,21 @@ class RugCheckClient:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        await self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Async context manager exit - pooled session stays open for other clients"""
+        self.session = None
+        await self._auth.close()
     
     async def _ensure_session(self):
-        """Ensure session is available"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure shared pooled session is available"""
+        self.session = http_transport.get_session()
     
     async def _rate_limit(self):
-        """Simple rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        
-        if time_since_last < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - time_since_last)
-        
-        self._last_request_time = time.time()
+        """Wait for a token from the provider quota shared by all workers"""
+        await provider_rate_limiter.acquire("rugcheck", self.wallet_private_key)
     
     
     def _initialize_wallet(self):
@@ -110,20 +100,24 @@ class RugCheckClient:
         except Exception as e:
             raise RugCheckAPIError(f"Failed to sign message: {str(e)}")
     
+    def prefetch_access_token(self) -> None:
+        """Start fetching the JWT so the first request does not wait for it"""
+        if self.wallet_private_key and SOLANA_AVAILABLE:
+            self._auth.refresh_in_background()
+    
     async def _get_access_token(self) -> str:
-        """Get JWT access token using wallet signature authentication"""
-        # Check if we have a valid cached token
-        current_time = time.time()
-        if self._access_token and current_time < self._token_expiry:
-            return self._access_token
-        
+        """Get JWT access token (cached, renewed in the background before expiry)"""
         if not self.wallet_private_key:
             raise RugCheckAPIError("RugCheck requires WALLET_SECRET_KEY for authentication")
         
         if not SOLANA_AVAILABLE:
             raise RugCheckAPIError("Solana libraries not available for RugCheck authentication")
         
-        # Initialize wallet if not done
+        return await self._auth.get()
+    
+    async def _fetch_access_token(self) -> Tuple[str, float]:
+        """Sign in with the wallet and return (JWT, lifetime in seconds)"""
+        # Initialize wallet if not done (the startup prefetch signs in before any request)
         if not self._wallet:
             self._wallet = self._initialize_wallet()
             if not self._wallet:
@@ -164,13 +158,11 @@ class RugCheckClient:
                     # Extract access token from response
                     access_token = response_data.get("accessToken") or response_data.get("token")
                     if access_token:
-                        self._access_token = access_token
-                        # Set expiry time (assume 1 hour if not provided)
+                        # Assume 1 hour if no lifetime is provided
                         expires_in = response_data.get("expiresIn", 3600)
-                        self._token_expiry = current_time + expires_in
 
                         logger.debug("RugCheck JWT token obtained successfully")
-                        return self._access_token
+                        return access_token, float(expires_in)
                     else:
                         raise RugCheckAPIError("No access token in authentication response")
                         
@@ -186,19 +178,16 @@ class RugCheckClient:
         except Exception as e:
             raise RugCheckAPIError(f"Authentication error: {str(e)}")
     
+    @cached_request("rugcheck")
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with JWT bearer token authentication"""
         await self._ensure_session()
         await self._rate_limit()
 
-        if self._access_token is None or time.time() >= self._token_expiry:
-            # Get access token
-            try:
-                access_token = await self._get_access_token()
-            except RugCheckAPIError as e:
-                raise RugCheckAPIError(f"Authentication failed: {str(e)}")
-        else:
-            access_token = self._access_token
+        try:
+            access_token = await self._get_access_token()
+        except RugCheckAPIError as e:
+            raise RugCheckAPIError(f"Authentication failed: {str(e)}")
         
         url = f"{self.base_url}{endpoint}"
         headers = {
@@ -208,46 +197,51 @@ class RugCheckClient:
         }
         
         try:
-            async with self.session.request(method, url, headers=headers, **kwargs) as response:
-                content_type = response.headers.get('content-type', '').lower()
+            for attempt in range(settings.PROVIDER_RATE_LIMIT_MAX_RETRIES + 1):
+                if attempt:
+                    await self._rate_limit()
+
+                async with self.session.request(method, url, headers=headers, **kwargs) as response:
+                    content_type = response.headers.get('content-type', '').lower()
                 
-                logger.debug(f"RugCheck {method} {endpoint} - Status: {response.status}, Content-Type: {content_type}")
+                    logger.debug(f"RugCheck {method} {endpoint} - Status: {response.status}, Content-Type: {content_type}")
                 
-                if response.status == 200:
-                    if 'application/json' in content_type:
-                        response_data = await response.json()
-                        return response_data
-                    else:
-                        response_text = await response.text()
-                        logger.warning(f"Unexpected content type from RugCheck: {response_text}")
-                        raise RugCheckAPIError(f"Expected JSON, got {content_type}")
+                    if response.status == 200:
+                        if 'application/json' in content_type:
+                            response_data = await response.json()
+                            return response_data
+                        else:
+                            response_text = await response.text()
+                            logger.warning(f"Unexpected content type from RugCheck: {response_text}")
+                            raise RugCheckAPIError(f"Expected JSON, got {content_type}")
                         
-                elif response.status == 429:
-                    # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 2))
-                    logger.warning(f"RugCheck rate limited, waiting {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    # Retry once
-                    return await self._request(method, endpoint, **kwargs)
-                elif response.status == 401:
-                    # Token might be expired, clear cache and retry once
-                    if self._access_token:
-                        self._access_token = None
-                        self._token_expiry = 0
-                        logger.debug("401 error, clearing token cache")
-                        return await self._request(method, endpoint, **kwargs)
+                    elif response.status == 429:
+                        # Rate limited
+                        retry_after = int(response.headers.get('Retry-After', 2))
+                        logger.warning(f"RugCheck rate limited, waiting {retry_after}s")
+                        await provider_rate_limiter.penalize("rugcheck", self.wallet_private_key, retry_after)
+                        # Leave the response (freeing the pooled connection) and retry once the quota allows it
+                        continue
+                    elif response.status == 401:
+                        # Token might be expired, clear cache and retry once
+                        if self._auth.token:
+                            self._auth.invalidate()
+                            logger.debug("401 error, clearing token cache")
+                            return await self._request(method, endpoint, **kwargs)
+                        else:
+                            raise RugCheckAPIError("Invalid RugCheck authentication")
+                    elif response.status == 404:
+                        logger.debug(f"RugCheck 404 for {endpoint} - token may not be found")
+                        return None
                     else:
-                        raise RugCheckAPIError("Invalid RugCheck authentication")
-                elif response.status == 404:
-                    logger.debug(f"RugCheck 404 for {endpoint} - token may not be found")
-                    return None
-                else:
-                    try:
-                        error_text = await response.text()
-                        raise RugCheckAPIError(f"HTTP {response.status}: {error_text[:200]}")
-                    except:
-                        raise RugCheckAPIError(f"HTTP {response.status}: Unknown error")
-                    
+                        try:
+                            error_text = await response.text()
+                            raise RugCheckAPIError(f"HTTP {response.status}: {error_text[:200]}")
+                        except:
+                            raise RugCheckAPIError(f"HTTP {response.status}: Unknown error")
+
+            raise RugCheckAPIError(f"RugCheck rate limit exceeded after {settings.PROVIDER_RATE_LIMIT_MAX_RETRIES} retries")
+        
         except asyncio.TimeoutError:
             raise RugCheckAPIError("RugCheck API request timeout")
         except aiohttp.ClientError as e:
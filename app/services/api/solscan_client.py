@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from loguru import logger
 
 from app.core.config import get_settings
+from app.services.api.http_transport import http_transport
+from app.utils.provider_rate_limiter import provider_rate_limiter
 
 settings = get_settings()
 
@@ -25,8 +27,6 @@ class SolscanClient:
         self.api_key = settings.SOLSCAN_API_KEY
         self.base_url = "https://pro-api.solscan.io"  # Updated to pro-api
         self.session = None
-        self._rate_limit_delay = 0.2  # 200ms between requests
-        self._last_request_time = 0
         self.timeout = settings.API_TIMEOUT
         
         if not self.api_key:
@@ -34,32 +34,20 @@ class SolscanClient:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        await self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Async context manager exit - pooled session stays open for other clients"""
+        self.session = None
     
     async def _ensure_session(self):
-        """Ensure session is available"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure shared pooled session is available"""
+        self.session = http_transport.get_session()
     
     async def _rate_limit(self):
-        """Simple rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        
-        if time_since_last < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - time_since_last)
-        
-        self._last_request_time = time.time()
+        """Wait for a token from the provider quota shared by all workers"""
+        await provider_rate_limiter.acquire("solscan", self.api_key)
     
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling and rate limiting"""
@@ -79,41 +67,47 @@ class SolscanClient:
             headers["Authorization"] = f"Bearer {self.api_key}"
         
         try:
-            async with self.session.request(method, url, headers=headers, **kwargs) as response:
-                content_type = response.headers.get('content-type', '').lower()
+            for attempt in range(settings.PROVIDER_RATE_LIMIT_MAX_RETRIES + 1):
+                if attempt:
+                    await self._rate_limit()
+
+                async with self.session.request(method, url, headers=headers, **kwargs) as response:
+                    content_type = response.headers.get('content-type', '').lower()
                 
-                logger.debug(f"Solscan {method} {endpoint} - Status: {response.status}, Content-Type: {content_type}")
+                    logger.debug(f"Solscan {method} {endpoint} - Status: {response.status}, Content-Type: {content_type}")
                 
-                if response.status == 200:
-                    if 'application/json' in content_type:
-                        response_data = await response.json()
-                        return response_data
-                    else:
-                        response_text = await response.text()
-                        logger.warning(f"Unexpected content type from Solscan: {content_type}")
-                        raise SolscanAPIError(f"Expected JSON, got {content_type}")
+                    if response.status == 200:
+                        if 'application/json' in content_type:
+                            response_data = await response.json()
+                            return response_data
+                        else:
+                            response_text = await response.text()
+                            logger.warning(f"Unexpected content type from Solscan: {content_type}")
+                            raise SolscanAPIError(f"Expected JSON, got {content_type}")
                         
-                elif response.status == 429:
-                    # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 2))
-                    logger.warning(f"Solscan rate limited, waiting {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    # Retry once
-                    return await self._request(method, endpoint, **kwargs)
-                elif response.status == 401:
-                    raise SolscanAPIError("Invalid Solscan API key or unauthorized access")
-                elif response.status == 403:
-                    raise SolscanAPIError("Forbidden - check API key permissions")
-                elif response.status == 404:
-                    # Endpoint not found
-                    raise SolscanAPIError(f"Solscan endpoint not found: {endpoint}")
-                else:
-                    try:
-                        error_text = await response.text()
-                        raise SolscanAPIError(f"HTTP {response.status}: {error_text[:200]}")
-                    except:
-                        raise SolscanAPIError(f"HTTP {response.status}: Unknown error")
-                    
+                    elif response.status == 429:
+                        # Rate limited
+                        retry_after = int(response.headers.get('Retry-After', 2))
+                        logger.warning(f"Solscan rate limited, waiting {retry_after}s")
+                        await provider_rate_limiter.penalize("solscan", self.api_key, retry_after)
+                        # Leave the response (freeing the pooled connection) and retry once the quota allows it
+                        continue
+                    elif response.status == 401:
+                        raise SolscanAPIError("Invalid Solscan API key or unauthorized access")
+                    elif response.status == 403:
+                        raise SolscanAPIError("Forbidden - check API key permissions")
+                    elif response.status == 404:
+                        # Endpoint not found
+                        raise SolscanAPIError(f"Solscan endpoint not found: {endpoint}")
+                    else:
+                        try:
+                            error_text = await response.text()
+                            raise SolscanAPIError(f"HTTP {response.status}: {error_text[:200]}")
+                        except:
+                            raise SolscanAPIError(f"HTTP {response.status}: Unknown error")
+
+            raise SolscanAPIError(f"Solscan rate limit exceeded after {settings.PROVIDER_RATE_LIMIT_MAX_RETRIES} retries")
+        
         except asyncio.TimeoutError:
             raise SolscanAPIError("Solscan API request timeout")
         except aiohttp.ClientError as e:
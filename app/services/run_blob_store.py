@@ -0,0 +1,123 @@
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logger.debug("zstandard not installed - run blobs compressed with zlib")
+
+from app.core.config import get_settings
+from app.utils.sqlite_store import SQLiteStore
+
+settings = get_settings()
+
+
+def _compress(raw: bytes) -> tuple:
+    if ZSTD_AVAILABLE:
+        return "zstd", zstandard.ZstdCompressor(level=6).compress(raw)
+    return "zlib", zlib.compress(raw, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown run blob codec: {codec}")
+
+
+class RunBlobStore(SQLiteStore):
+    """Content-addressed store for analysis run payloads
+
+    Run results are serialized once, compressed and kept as a SQLite BLOB under
+    the SHA-256 of their JSON; ChromaDB metadata only carries that key. Decoded
+    payloads are held in a small LRU so repeated reads of the same run (chat,
+    DOCX, filtered views) skip decompression and JSON parsing.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS run_blobs (
+        blob_id TEXT PRIMARY KEY,
+        codec TEXT NOT NULL,
+        raw_size INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        created_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, db_path: Optional[str] = None, cache_size: Optional[int] = None):
+        super().__init__(db_path or settings.RUN_BLOB_STORE_PATH)
+        self.cache_size = cache_size if cache_size is not None else settings.RUN_BLOB_CACHE_SIZE
+        self._decoded: "OrderedDict[str, Any]" = OrderedDict()
+        self.stats = {"writes": 0, "dedup_hits": 0, "reads": 0, "cache_hits": 0, "misses": 0}
+
+    async def put(self, payload: Any) -> Dict[str, Any]:
+        """Store ``payload`` and return its blob reference
+
+        Identical payloads map to the same ``blob_id`` and are stored once.
+        Serialization and compression run in the worker thread with the insert.
+        """
+        reference, inserted = await self.run(self._encode_and_insert, payload)
+        self.stats["writes" if inserted else "dedup_hits"] += 1
+        return reference
+
+    async def get(self, blob_id: str) -> Optional[Any]:
+        """Decoded payload for ``blob_id``, or None if unknown
+
+        The cached object is shared between callers; treat it as read-only.
+        """
+        self.stats["reads"] += 1
+        if blob_id in self._decoded:
+            self._decoded.move_to_end(blob_id)
+            self.stats["cache_hits"] += 1
+            return self._decoded[blob_id]
+
+        found, payload = await self.run(self._select_and_decode, blob_id)
+        if not found:
+            self.stats["misses"] += 1
+            return None
+
+        self._decoded[blob_id] = payload
+        while len(self._decoded) > self.cache_size:
+            self._decoded.popitem(last=False)
+        return payload
+
+    @staticmethod
+    def _encode_and_insert(conn: sqlite3.Connection, payload: Any) -> Tuple[Dict[str, Any], bool]:
+        raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+        blob_id = hashlib.sha256(raw).hexdigest()
+        codec, data = _compress(raw)
+
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO run_blobs (blob_id, codec, raw_size, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                (blob_id, codec, len(raw), data, time.time())
+            )
+        return {"blob_id": blob_id, "raw_size": len(raw), "stored_size": len(data)}, cursor.rowcount > 0
+
+    @staticmethod
+    def _select_and_decode(conn: sqlite3.Connection, blob_id: str) -> Tuple[bool, Any]:
+        row = conn.execute("SELECT codec, data FROM run_blobs WHERE blob_id = ?", (blob_id,)).fetchone()
+        if row is None:
+            return False, None
+        return True, json.loads(_decompress(row["codec"], row["data"]))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Blob counters for health metrics"""
+        return {
+            **self.stats,
+            "codec": "zstd" if ZSTD_AVAILABLE else "zlib",
+            "cached_payloads": len(self._decoded)
+        }
+
+
+# Global run blob store instance
+run_blob_store = RunBlobStore()
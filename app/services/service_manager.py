@@ -10,6 +10,7 @@ from app.services.api.goplus_client import GOplusClient, check_goplus_health
 from app.services.api.dexscreener_client import DexScreenerClient, check_dexscreener_health
 from app.services.api.rugcheck_client import RugCheckClient, check_rugcheck_health
 from app.services.api.solsniffer_client import SolSnifferClient, check_solsniffer_health
+from app.services.api.http_transport import http_transport
 
 
 class APIManager:
@@ -25,12 +26,14 @@ class APIManager:
             "rugcheck": None,
             "solsniffer": None
         }
+        self.transport = http_transport
         self._health_cache = {}
         self._cache_duration = 300  # 5 minutes
     
     async def initialize_clients(self):
         """Initialize all API clients"""
         try:
+            await self.transport.start()
             self.clients = {
                 "helius": HeliusClient(),
                 "birdeye": BirdeyeClient(),
@@ -40,6 +43,9 @@ class APIManager:
                 "rugcheck": RugCheckClient(),
                 "solsniffer": SolSnifferClient()
             }
+            # Fetch bearer tokens up front; they are renewed in the background afterwards
+            for name in ("goplus", "rugcheck"):
+                self.clients[name].prefetch_access_token()
             logger.info("✅ All API clients initialized")
         except Exception as e:
             logger.error(f"❌ Error initializing API clients: {str(e)}")
@@ -54,6 +60,10 @@ class APIManager:
                     logger.debug(f"✅ {name} client cleaned up")
                 except Exception as e:
                     logger.warning(f"⚠️  Error cleaning up {name} client: {str(e)}")
+        
+        # Close shared connection pool last
+        await self.transport.close()
+        logger.debug("✅ HTTP transport closed")
     
     async def check_all_services_health(self) -> Dict[str, Any]:
         """Check health of all API services"""
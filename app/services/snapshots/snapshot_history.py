@@ -0,0 +1,173 @@
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from app.core.config import get_settings
+from app.services.snapshots.snapshot_store import _timestamp_to_epoch
+from app.utils.sqlite_store import SQLiteStore
+
+settings = get_settings()
+
+
+# Metric columns kept per point: (column, OnChainData key)
+HISTORY_FIELDS = (
+    ("price", "currentPriceUSD"),
+    ("liquidity", "liquidityUSD"),
+    ("market_cap", "marketCapUSD"),
+    ("volume_5m", "volume5min"),
+    ("volume_1h", "volume1h"),
+)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SnapshotHistoryStore(SQLiteStore):
+    """Append-only time series of snapshot metrics keyed by (mint, timestamp)
+
+    One narrow row per captured snapshot so trajectories (price, liquidity, mcap,
+    volumes, whale inflow) can be range-queried and downsampled without touching
+    the full OnChainData documents. Points older than the retention window are pruned.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS snapshot_points (
+        token_address TEXT NOT NULL,
+        ts REAL NOT NULL,
+        price REAL,
+        liquidity REAL,
+        market_cap REAL,
+        volume_5m REAL,
+        volume_1h REAL,
+        whale_inflow REAL,
+        whale_count INTEGER,
+        PRIMARY KEY (token_address, ts)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_snapshot_points_ts ON snapshot_points (ts);
+    """
+
+    COLUMNS = [column for column, _ in HISTORY_FIELDS] + ["whale_inflow", "whale_count"]
+
+    def __init__(self, db_path: Optional[str] = None, retention_hours: Optional[int] = None):
+        super().__init__(db_path or settings.SNAPSHOT_STORE_PATH)
+        self.retention_hours = retention_hours or settings.SNAPSHOT_HISTORY_RETENTION_HOURS
+
+    async def append(self, snapshot_response: Dict[str, Any]) -> None:
+        """Record the metrics of a captured snapshot as a new point"""
+        market_data = snapshot_response.get("metrics", {}).get("market_data", {})
+        whales = market_data.get("whales1h") or {}
+        timestamp = snapshot_response.get("timestamp")
+
+        row = (
+            snapshot_response["token_address"],
+            _timestamp_to_epoch(timestamp) if timestamp else time.time(),
+            *[_to_float(market_data.get(key)) for _, key in HISTORY_FIELDS],
+            _to_float(whales.get("whaleVolume")),
+            int(whales.get("whaleCount") or 0)
+        )
+        await self.run(self._insert, row)
+
+    async def range(
+        self,
+        token_address: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        bucket_seconds: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Points for one mint in [start, end], oldest first"""
+        return (await self.range_many([token_address], start, end, bucket_seconds)).get(token_address, [])
+
+    async def range_many(
+        self,
+        token_addresses: List[str],
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        bucket_seconds: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Points for many mints in [start, end], oldest first, keyed by mint
+
+        With ``bucket_seconds`` points are downsampled to one averaged point per
+        bucket (``ts`` is the bucket start, ``samples`` the number of raw points).
+        """
+        rows = await self.run(
+            self._select_range, list(dict.fromkeys(token_addresses)),
+            start if start is not None else 0.0,
+            end if end is not None else time.time() + 1,
+            bucket_seconds
+        )
+
+        series: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            point = dict(row)
+            series.setdefault(point.pop("token_address"), []).append(point)
+        return series
+
+    async def prune(self, retention_hours: Optional[int] = None) -> int:
+        """Delete points older than the retention window, returns rows removed"""
+        cutoff = time.time() - (retention_hours or self.retention_hours) * 3600
+        removed = await self.run(self._delete_before, cutoff)
+        if removed:
+            logger.info(f"🧹 Pruned {removed} snapshot history points older than {retention_hours or self.retention_hours}h")
+        return removed
+
+    async def count(self, token_address: Optional[str] = None) -> int:
+        if token_address:
+            return await self.run(lambda conn: conn.execute(
+                "SELECT COUNT(*) FROM snapshot_points WHERE token_address = ?", (token_address,)
+            ).fetchone()[0])
+        return await self.run(lambda conn: conn.execute("SELECT COUNT(*) FROM snapshot_points").fetchone()[0])
+
+    @classmethod
+    def _insert(cls, conn: sqlite3.Connection, row: tuple) -> None:
+        columns = ", ".join(["token_address", "ts"] + cls.COLUMNS)
+        with conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO snapshot_points ({columns}) VALUES ({', '.join('?' * len(row))})",
+                row
+            )
+
+    @classmethod
+    def _select_range(
+        cls,
+        conn: sqlite3.Connection,
+        token_addresses: List[str],
+        start: float,
+        end: float,
+        bucket_seconds: Optional[int]
+    ) -> List[sqlite3.Row]:
+        if bucket_seconds:
+            columns = (
+                f"CAST(ts / {int(bucket_seconds)} AS INTEGER) * {int(bucket_seconds)} AS ts, "
+                + ", ".join(f"AVG({column}) AS {column}" for column in cls.COLUMNS)
+                + ", COUNT(*) AS samples"
+            )
+            group = "GROUP BY token_address, CAST(ts / %d AS INTEGER)" % int(bucket_seconds)
+        else:
+            columns = "ts, " + ", ".join(cls.COLUMNS)
+            group = ""
+
+        rows = []
+        for i in range(0, len(token_addresses), 500):
+            chunk = token_addresses[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(conn.execute(
+                f"SELECT token_address, {columns} FROM snapshot_points "
+                f"WHERE token_address IN ({placeholders}) AND ts BETWEEN ? AND ? "
+                f"{group} ORDER BY token_address, ts",
+                (*chunk, start, end)
+            ).fetchall())
+        return rows
+
+    @staticmethod
+    def _delete_before(conn: sqlite3.Connection, cutoff: float) -> int:
+        with conn:
+            return conn.execute("DELETE FROM snapshot_points WHERE ts < ?", (cutoff,)).rowcount
+
+
+# Global snapshot history instance
+snapshot_history = SnapshotHistoryStore()
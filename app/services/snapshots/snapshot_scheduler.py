@@ -1,23 +1,64 @@
 import asyncio
+import heapq
+import itertools
 import time
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Set, Tuple
 from loguru import logger
 from datetime import datetime, timedelta
 
 from app.core.config import get_settings
-from app.services.snapshots.token_snapshot import run_scheduled_snapshots
+from app.services.snapshots.snapshot_history import snapshot_history
+from app.services.snapshots.snapshot_store import snapshot_store
+from app.services.snapshots.token_snapshot import token_snapshot_service
 
 settings = get_settings()
 
 
+# Refresh tiers, most important first (rank breaks ties between equally due tokens)
+TIER_RANKS = {"position": 0, "hot": 1, "normal": 2}
+
+# Window over which refresh throughput is measured (seconds)
+THROUGHPUT_WINDOW = 300.0
+
+
 class SnapshotScheduler:
-    """Simple scheduler for running snapshots at regular intervals"""
-    
+    """Priority scheduler refreshing each tracked token on its own cadence
+
+    Tokens sit in a heap keyed by next-due time. After every refresh a token is
+    re-classified: open positions are refreshed every few seconds, volatile or
+    young tokens every minute, everything else on the regular interval, and
+    illiquid tokens without a position are evicted. ``get_status`` reports
+    throughput and how far the schedule is running behind.
+    """
+
     def __init__(self):
         self.running = False
         self.task: Optional[asyncio.Task] = None
         self.interval_seconds = settings.SNAPSHOT_INTERVAL_SECONDS
         self.enabled = settings.SNAPSHOT_ENABLED
+        self.intervals = {
+            "position": settings.SNAPSHOT_POSITION_INTERVAL,
+            "hot": settings.SNAPSHOT_HOT_INTERVAL,
+            "normal": settings.SNAPSHOT_INTERVAL_SECONDS
+        }
+        self.concurrency = max(1, settings.SNAPSHOT_CONCURRENCY)
+        self.max_tracked = settings.SNAPSHOT_MAX_TRACKED_TOKENS
+
+        # Heap of (due_at, rank, seq, token); stale entries are skipped lazily
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._due: Dict[str, float] = {}
+        self._tiers: Dict[str, str] = {}
+        self._evicted: Set[str] = set()
+        self._position_tokens: Set[str] = set()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._sequence = itertools.count()
+        self._next_start = 0.0
+        self._last_seed = 0.0
+        self._last_position_sync = 0.0
+        self._last_maintenance = time.time()
+        self._recent_refreshes: Deque[float] = deque()
+
         self.stats = {
             "runs_completed": 0,
             "runs_failed": 0,
@@ -25,31 +66,36 @@ class SnapshotScheduler:
             "next_run_time": None,
             "total_tokens_processed": 0,
             "total_snapshots_successful": 0,
-            "total_snapshots_failed": 0
+            "total_snapshots_failed": 0,
+            "tokens_evicted": 0,
+            "history_points_pruned": 0
         }
-        
+
     async def start(self):
         """Start the snapshot scheduler"""
         if not self.enabled:
             logger.info("📸 Snapshot scheduler is DISABLED in configuration")
             return False
-            
+
         if self.running:
             return True
-            
+
         self.running = True
         self.task = asyncio.create_task(self._scheduler_loop())
-        
-        logger.info(f"📸 Snapshot scheduler started - running every {self.interval_seconds}s ({self.interval_seconds/3600:.1f}h)")
+
+        logger.info(
+            f"📸 Snapshot scheduler started - positions every {self.intervals['position']}s, "
+            f"hot tokens every {self.intervals['hot']}s, others every {self.intervals['normal']}s"
+        )
         return True
-    
+
     async def stop(self):
         """Stop the snapshot scheduler"""
         if not self.running:
             return
-            
+
         self.running = False
-        
+
         if self.task:
             self.task.cancel()
             try:
@@ -57,83 +103,264 @@ class SnapshotScheduler:
             except asyncio.CancelledError:
                 pass
             self.task = None
-            
+
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        self._in_flight.clear()
+
         logger.info("📸 Snapshot scheduler stopped")
-    
+
     async def _scheduler_loop(self):
-        """Main scheduler loop"""
-        logger.info(f"📸 Snapshot scheduler loop started (interval: {self.interval_seconds}s)")
-        
+        """Main scheduler loop: start due refreshes, then sleep until the next one is due"""
+        logger.info("📸 Snapshot scheduler loop started")
+
         while self.running:
             try:
-                # Wait for the interval
-                await asyncio.sleep(self.interval_seconds)
-                
-                if not self.running:
-                    break
-                    
-                # Run snapshots
-                await self._run_snapshots()
-                
+                now = time.time()
+
+                if now - self._last_position_sync >= self.intervals["position"] / 2:
+                    self._sync_positions()
+                if now - self._last_seed >= self.intervals["hot"]:
+                    await self._seed_from_store()
+                if now - self._last_maintenance >= self.intervals["normal"]:
+                    await self._maintenance()
+
+                self._start_due_refreshes()
+
+                # Sleep until the next due token (or a free slot / pacing window), max 1s
+                next_due = self._peek_due()
+                wait = 1.0 if next_due is None else min(1.0, max(next_due - time.time(), 0.05))
+                await asyncio.sleep(wait)
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Snapshot scheduler error: {str(e)}")
+                self.stats["runs_failed"] += 1
                 # Continue running even after errors
-                await asyncio.sleep(60)  # Wait 1 minute before retrying
-    
-    async def _run_snapshots(self):
-        """Execute snapshot run"""
+                await asyncio.sleep(5)
+
+    def schedule(self, token_address: str, due_at: float, tier: str = "normal") -> None:
+        """(Re)schedule a token; an earlier pending due time is kept"""
+        current = self._due.get(token_address)
+        if current is not None and current <= due_at:
+            return
+
+        self._due[token_address] = due_at
+        self._tiers[token_address] = tier
+        heapq.heappush(self._heap, (due_at, TIER_RANKS.get(tier, 2), next(self._sequence), token_address))
+        self.stats["next_run_time"] = datetime.utcfromtimestamp(self._peek_due() or due_at).isoformat()
+
+    def classify(self, token_address: str, market_data: Optional[Dict[str, Any]]) -> Tuple[str, Optional[float]]:
+        """Refresh tier and interval for a token, interval None means evict"""
+        if token_address in self._position_tokens:
+            return "position", self.intervals["position"]
+
+        market_data = market_data or {}
+        liquidity = float(market_data.get("liquidityUSD") or 0)
+        if liquidity < settings.SNAPSHOT_EVICT_LIQUIDITY_USD:
+            return "evicted", None
+
+        volatility = market_data.get("volatility_percent")
+        pool_age = market_data.get("poolAge")
+        if volatility is not None and float(volatility) >= settings.SNAPSHOT_HOT_VOLATILITY_PERCENT:
+            return "hot", self.intervals["hot"]
+        if pool_age is not None and float(pool_age) < settings.SNAPSHOT_YOUNG_TOKEN_HOURS * 3600:
+            return "hot", self.intervals["hot"]
+
+        return "normal", self.intervals["normal"]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Scheduler statistics with the current tier breakdown, throughput and lag"""
+        tiers: Dict[str, int] = {}
+        for tier in self._tiers.values():
+            tiers[tier] = tiers.get(tier, 0) + 1
+        next_due = self._peek_due()
+        now = time.time()
+
+        return {
+            **self.stats,
+            "running": self.running,
+            "tracked_tokens": len(self._due),
+            "in_flight": len(self._in_flight),
+            "tiers": tiers,
+            "evicted_tokens": len(self._evicted),
+            "next_due_in_seconds": round(max(next_due - now, 0), 1) if next_due else None,
+            **self.get_progress(now)
+        }
+
+    def get_progress(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Refresh throughput and backlog: tokens past their due time, the oldest lag and time to catch up"""
+        now = now or time.time()
+        while self._recent_refreshes and self._recent_refreshes[0] < now - THROUGHPUT_WINDOW:
+            self._recent_refreshes.popleft()
+
+        overdue = [now - due_at for due_at in self._due.values() if due_at <= now]
+        per_minute = len(self._recent_refreshes) / THROUGHPUT_WINDOW * 60
+        # Time to clear the overdue backlog at the recent pace (unknown while nothing completes)
+        if not overdue:
+            eta = 0.0
+        else:
+            eta = round(len(overdue) / per_minute * 60, 1) if per_minute else None
+        return {
+            "refreshes_per_minute": round(per_minute, 2),
+            "overdue_tokens": len(overdue),
+            "max_lag_seconds": round(max(overdue), 1) if overdue else 0.0,
+            "eta_seconds": eta
+        }
+
+    def _peek_due(self) -> Optional[float]:
+        """Due time of the earliest live heap entry (drops stale entries)"""
+        while self._heap:
+            due_at, _, _, token_address = self._heap[0]
+            if self._due.get(token_address) == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _start_due_refreshes(self) -> None:
+        """Start refreshes for due tokens while pool slots and the provider budget allow"""
+        interval = token_snapshot_service._get_start_interval()
+
+        while len(self._in_flight) < self.concurrency:
+            next_due = self._peek_due()
+            now = time.time()
+            if next_due is None or next_due > now or self._next_start > now:
+                return
+
+            _, _, _, token_address = heapq.heappop(self._heap)
+            del self._due[token_address]
+            if token_address in self._in_flight:
+                continue  # rescheduled when the running refresh finishes
+
+            self._next_start = now + interval
+            self._in_flight[token_address] = asyncio.create_task(self._refresh(token_address))
+
+    async def _refresh(self, token_address: str) -> None:
+        """Refresh one token, check its position and reschedule it by tier"""
+        started = time.time()
+        market_data = None
+
         try:
-            logger.info("🔄 Starting scheduled snapshot run")
-            
-            # Run the snapshots
-            result = await run_scheduled_snapshots()
-            
-            # Log results
-            if result.get("status") == "completed":
-                logger.info(
-                    f"✅ Scheduled snapshot run completed: "
-                    f"{result.get('successful', 0)} successful, {result.get('failed', 0)} failed"
-                )
-                
-                # Check all positions after all snapshots complete
-                try:
-                    from app.services.trade.autotrade_service import autotrade_service 
-                    active_positions = autotrade_service.get_active_positions()
-                    
-                    for position in active_positions:
-                        token_address = position["token_address"]
-                        
-                        # Get fresh snapshot data for this token
-                        recent_snapshot = await self._get_token_snapshot_data(token_address)
-                        if recent_snapshot:
-                            await autotrade_service.check_position_on_snapshot_update(token_address, recent_snapshot)
-                    
-                    logger.info(f"📊 Checked {len(active_positions)} positions after snapshots")
-                    
-                except Exception as e:
-                    logger.error(f"AutoTrade position checks failed: {e}")
-                
-            elif result.get("status") == "no_tokens":
-                logger.warning(f"⚠️ Scheduled snapshot run failed: No tokens found")
+            snapshot = await token_snapshot_service.capture_token_snapshot(token_address, update_existing=True)
+            self.stats["total_tokens_processed"] += 1
+
+            if snapshot.get("errors"):
+                self.stats["total_snapshots_failed"] += 1
+                logger.warning(f"Snapshot failed for {token_address}: {snapshot['errors']}")
             else:
-                logger.error(f"❌ Scheduled snapshot run failed: {result.get('error', 'Unknown error')}")
-                
+                self.stats["total_snapshots_successful"] += 1
+                market_data = snapshot.get("metrics", {}).get("market_data", {})
+                await self._check_position(token_address, market_data)
+
         except Exception as e:
-            logger.error(f"❌ Snapshot run exception: {str(e)}")
+            self.stats["total_snapshots_failed"] += 1
+            logger.error(f"Error refreshing snapshot for {token_address}: {str(e)}")
+        finally:
+            self._in_flight.pop(token_address, None)
+            self._recent_refreshes.append(time.time())
+            self.stats["last_run_time"] = datetime.utcnow().isoformat()
+
+        if market_data is None:
+            # Failed refresh - keep tier, but never retry faster than the hot cadence
+            tier = self._tiers.get(token_address, "normal")
+            self.schedule(token_address, started + max(self.intervals[tier], self.intervals["hot"]), tier)
+            return
+
+        tier, interval = self.classify(token_address, market_data)
+        if interval is None:
+            self._evict(token_address)
+        else:
+            self.schedule(token_address, started + interval, tier)
+
+    async def _check_position(self, token_address: str, market_data: Dict[str, Any]) -> None:
+        """Run autotrade exit checks as soon as a held token's snapshot lands"""
+        if token_address not in self._position_tokens:
+            return
 
-    async def _get_token_snapshot_data(self, token_address: str):
-        """Get fresh snapshot data for a token"""
         try:
+            from app.services.trade.autotrade_service import autotrade_service
             from app.services.trade.bot_service import bot_service
-            recent_snapshot = await bot_service._get_recent_snapshot(token_address, max_age_minutes=10)
-            if recent_snapshot:
-                return bot_service._extract_onchain_data_from_snapshot(recent_snapshot)
-            return None
+            await autotrade_service.check_position_on_snapshot_update(
+                token_address, bot_service._extract_onchain_data_from_snapshot(market_data)
+            )
+        except Exception as e:
+            logger.error(f"AutoTrade position check failed for {token_address}: {e}")
+
+    def _sync_positions(self) -> None:
+        """Promote newly opened positions to the position tier right away"""
+        self._last_position_sync = time.time()
+        try:
+            from app.services.trade.autotrade_service import autotrade_service
+            tokens = {position["token_address"] for position in autotrade_service.get_active_positions()}
         except Exception as e:
-            logger.error(f"Failed to get snapshot for {token_address}: {e}")
-            return None
+            logger.error(f"AutoTrade positions unavailable: {e}")
+            return
+
+        for token_address in tokens - self._position_tokens:
+            self._evicted.discard(token_address)
+            self.schedule(token_address, time.time(), "position")
+
+        # Closed positions drop back to their market tier after the next refresh
+        self._position_tokens = tokens
+
+    async def _seed_from_store(self) -> None:
+        """Pick up tokens that entered the snapshot store since the last pass"""
+        self._last_seed = time.time()
+        try:
+            records = await snapshot_store.list_recent(self.max_tracked)
+        except Exception as e:
+            logger.warning(f"Snapshot scheduler could not read the snapshot store: {e}")
+            return
+
+        added = 0
+        for record in records:
+            token_address = record["token_address"]
+            if token_address in self._due or token_address in self._in_flight or token_address in self._evicted:
+                continue
+            if len(self._due) + len(self._in_flight) >= self.max_tracked:
+                break
+
+            tier, interval = self.classify(token_address, record.get("market_data"))
+            if interval is None:
+                self._evict(token_address)
+                continue
+            self.schedule(token_address, record["updated_at"] + interval, tier)
+            added += 1
+
+        if added:
+            self.stats["runs_completed"] += 1
+            logger.info(f"📸 Snapshot scheduler tracking {added} new tokens ({len(self._due)} scheduled)")
+
+    async def _maintenance(self) -> None:
+        """Log schedule progress and prune old snapshot history, once per regular interval"""
+        self._last_maintenance = time.time()
+        progress = self.get_progress()
+        logger.info(
+            f"📸 Snapshot scheduler: {len(self._due)} scheduled, {len(self._in_flight)} in flight, "
+            f"{progress['refreshes_per_minute']:.1f} refreshes/min, {progress['overdue_tokens']} overdue "
+            f"(max lag {progress['max_lag_seconds']:.0f}s, ETA {self._format_eta(progress['eta_seconds'])})"
+        )
+
+        try:
+            self.stats["history_points_pruned"] += await snapshot_history.prune()
+        except Exception as e:
+            logger.warning(f"Snapshot history pruning failed: {str(e)}")
+
+    @staticmethod
+    def _format_eta(eta_seconds: Optional[float]) -> str:
+        if eta_seconds is None:
+            return "unknown"
+        return f"{eta_seconds / 60:.1f}min" if eta_seconds >= 60 else f"{eta_seconds:.0f}s"
+
+    def _evict(self, token_address: str) -> None:
+        """Stop refreshing an illiquid token (re-admitted if a position is opened)"""
+        self._due.pop(token_address, None)
+        self._tiers.pop(token_address, None)
+        self._evicted.add(token_address)
+        self.stats["tokens_evicted"] += 1
+        logger.debug(f"Snapshot scheduler evicted {token_address} (illiquid, no position)")
 
 
 # Global scheduler instance
@@ -148,4 +375,4 @@ async def start_snapshot_scheduler():
 
 async def stop_snapshot_scheduler():
     """Stop the snapshot scheduler"""
-    await snapshot_scheduler.stop()
\ No newline at end of file
+    await snapshot_scheduler.stop()
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from app.core.config import get_settings
+from app.utils.sqlite_store import SQLiteStore
+
+settings = get_settings()
+
+
+def snapshot_doc_id(token_address: str) -> str:
+    """Deterministic snapshot document ID (full mint, no prefix collisions)"""
+    return f"snapshot_{token_address}"
+
+
+def _timestamp_to_epoch(timestamp: Any) -> float:
+    """ISO (UTC, naive) or numeric snapshot timestamp -> epoch seconds"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    try:
+        return (datetime.fromisoformat(str(timestamp)) - datetime(1970, 1, 1)).total_seconds()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+class SnapshotStore(SQLiteStore):
+    """Latest snapshot per token keyed by mint
+
+    Exact lookups by mint (single and bulk) and a time-ordered index of snapshot
+    updates, so readers no longer go through embedding search in ChromaDB.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        token_address TEXT PRIMARY KEY,
+        analysis_id TEXT NOT NULL,
+        snapshot_generation INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        market_data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_snapshots_updated_at ON snapshots (updated_at);
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        super().__init__(db_path or settings.SNAPSHOT_STORE_PATH)
+        self._backfilled = False
+        self._backfill_lock = asyncio.Lock()
+
+    async def get(self, token_address: str) -> Optional[Dict[str, Any]]:
+        """Latest snapshot for a mint, None if never captured"""
+        await self._ensure_backfilled()
+        rows = await self.run(self._select_many, [token_address])
+        return self._to_record(rows[0]) if rows else None
+
+    async def get_many(self, token_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Latest snapshots for many mints, keyed by mint (missing mints omitted)"""
+        await self._ensure_backfilled()
+        rows = await self.run(self._select_many, list(dict.fromkeys(token_addresses)))
+        return {row["token_address"]: self._to_record(row) for row in rows}
+
+    async def put(self, snapshot_response: Dict[str, Any]) -> None:
+        """Insert or replace the latest snapshot for its mint"""
+        timestamp = snapshot_response.get("timestamp") or datetime.utcnow().isoformat()
+        row = (
+            snapshot_response["token_address"],
+            snapshot_response.get("analysis_id") or snapshot_doc_id(snapshot_response["token_address"]),
+            int(snapshot_response.get("snapshot_generation", 1)),
+            timestamp,
+            _timestamp_to_epoch(timestamp),
+            json.dumps(snapshot_response.get("metrics", {}).get("market_data", {}), default=str)
+        )
+        await self.run(self._upsert, [row])
+
+    async def list_oldest(self, limit: int) -> List[Dict[str, Any]]:
+        """Snapshots ordered by last update, oldest first (without market data)"""
+        await self._ensure_backfilled()
+        rows = await self.run(self._select_ordered, "ASC", limit, False)
+        return [self._to_record(row) for row in rows]
+
+    async def list_recent(self, limit: int) -> List[Dict[str, Any]]:
+        """Snapshots ordered by last update, newest first"""
+        await self._ensure_backfilled()
+        rows = await self.run(self._select_ordered, "DESC", limit, True)
+        return [self._to_record(row) for row in rows]
+
+    async def count(self) -> int:
+        await self._ensure_backfilled()
+        return await self.run(lambda conn: conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0])
+
+    @staticmethod
+    def _select_many(conn: sqlite3.Connection, token_addresses: List[str]) -> List[sqlite3.Row]:
+        rows = []
+        for i in range(0, len(token_addresses), 500):
+            chunk = token_addresses[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(conn.execute(
+                f"SELECT * FROM snapshots WHERE token_address IN ({placeholders})", chunk
+            ).fetchall())
+        return rows
+
+    @staticmethod
+    def _select_ordered(conn: sqlite3.Connection, direction: str, limit: int, with_data: bool) -> List[sqlite3.Row]:
+        columns = "*" if with_data else "token_address, analysis_id, snapshot_generation, timestamp, updated_at"
+        return conn.execute(
+            f"SELECT {columns} FROM snapshots ORDER BY updated_at {direction} LIMIT ?", (limit,)
+        ).fetchall()
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO snapshots "
+                "(token_address, analysis_id, snapshot_generation, timestamp, updated_at, market_data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        if "market_data" in record:
+            record["market_data"] = json.loads(record["market_data"])
+        return record
+
+    async def _ensure_backfilled(self) -> None:
+        """Import snapshots already stored in ChromaDB the first time the store is empty"""
+        if self._backfilled:
+            return
+        async with self._backfill_lock:
+            if not self._backfilled:
+                self._backfilled = await self._backfill()
+
+    async def _backfill(self) -> bool:
+        """Copy snapshot documents from ChromaDB into an empty store
+
+        False when ChromaDB could not be read, leaving the import to the next lookup.
+        """
+        try:
+            if await self.run(lambda conn: conn.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone()):
+                return True
+
+            from app.utils.chroma_client import get_chroma_client
+            chroma_client = await get_chroma_client()
+            if not chroma_client.is_connected():
+                return False
+
+            # Exact metadata filter - no embedding query
+            existing = await chroma_client.get(
+                where={"doc_type": "token_snapshot"}, include=["documents", "metadatas"]
+            )
+
+            rows = {}
+            for content, metadata in zip(existing.get("documents") or [], existing.get("metadatas") or []):
+                token_address = (metadata or {}).get("token_address")
+                if not token_address:
+                    continue
+                timestamp = metadata.get("timestamp") or datetime.utcnow().isoformat()
+                row = (
+                    token_address,
+                    metadata.get("analysis_id") or snapshot_doc_id(token_address),
+                    int(metadata.get("snapshot_generation", 1)),
+                    timestamp,
+                    _timestamp_to_epoch(timestamp),
+                    content or "{}"
+                )
+                if token_address not in rows or row[4] > rows[token_address][4]:
+                    rows[token_address] = row
+
+            if rows:
+                await self.run(self._upsert, list(rows.values()))
+                logger.info(f"📸 Snapshot store backfilled {len(rows)} snapshots from ChromaDB")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Snapshot store backfill from ChromaDB failed: {str(e)}")
+            return False
+
+
+# Global snapshot store instance
+snapshot_store = SnapshotStore()
@@ -1,18 +1,24 @@
 import asyncio
 import time
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 from loguru import logger
 from datetime import datetime, timedelta
 
 from app.services.service_manager import api_manager
 from app.core.config import get_settings
 from app.utils.cache import cache_manager
-from app.services.analysis_storage import analysis_storage
+from app.utils.provider_rate_limiter import provider_rate_limiter
+from app.services.snapshots.snapshot_history import snapshot_history
+from app.services.snapshots.snapshot_store import snapshot_store, snapshot_doc_id
 
 settings = get_settings()
 
 
+# Provider requests issued per token snapshot (see _run_market_analysis_services)
+SNAPSHOT_PROVIDER_CALLS = {"birdeye": 2, "helius": 1, "solanafm": 1, "dexscreener": 1}
+
+
 class TokenSnapshotService:
     """Token snapshot service - captures market data without security checks"""
     
@@ -20,10 +26,10 @@ class TokenSnapshotService:
         self.cache = cache_manager
         self.cache_ttl = settings.REPORT_TTL_SECONDS
         self.snapshot_interval = getattr(settings, 'SNAPSHOT_INTERVAL_SECONDS', 3600)
-        self.max_tokens_per_run = getattr(settings, 'SNAPSHOT_MAX_TOKENS_PER_RUN', 100)
         self.rate_limit_delay = getattr(settings, 'SNAPSHOT_RATE_LIMIT_DELAY', 1.0)
+        self.concurrency = max(1, settings.SNAPSHOT_CONCURRENCY)
+        self.provider_budget = min(max(settings.SNAPSHOT_PROVIDER_BUDGET, 0.01), 1.0)
         self.default_security_status = getattr(settings, 'SNAPSHOT_SECURITY_STATUS', 'safe')
-        self._running = False
         
     async def capture_token_snapshot(
         self, 
@@ -37,7 +43,7 @@ class TokenSnapshotService:
         start_time = time.time()
         
         # Use consistent analysis_id based on token address only (NO TIMESTAMP)
-        analysis_id = f"snapshot_{token_address[:8]}"
+        analysis_id = snapshot_doc_id(token_address)
         
         # Check for existing snapshot
         existing_snapshot = None
@@ -141,7 +147,9 @@ class TokenSnapshotService:
             processing_time = time.time() - start_time
             snapshot_response["metadata"]["processing_time_seconds"] = round(processing_time, 3)
             
-            # Store in ChromaDB
+            # Store latest snapshot by mint plus a history point, ChromaDB copy in background
+            await snapshot_store.put(snapshot_response)
+            await snapshot_history.append(snapshot_response)
             asyncio.create_task(self._store_snapshot_async(snapshot_response))
             
             logger.info(f"✅ Snapshot captured for {token_address} in {processing_time:.2f}s (gen {snapshot_generation}, ID: {analysis_id})")
@@ -201,199 +209,35 @@ class TokenSnapshotService:
                 "sniper_detection": {}
             }
     
-    async def run_scheduled_snapshots(self) -> Dict[str, Any]:
-        """Run scheduled snapshots for multiple tokens"""
-        if self._running:
-            logger.warning("Snapshot run already in progress")
-            return {"status": "already_running"}
+    def _get_start_interval(self) -> float:
+        """Seconds between token starts allowed by the snapshot share of provider quotas"""
+        interval = self.rate_limit_delay / self.concurrency
+        if not provider_rate_limiter.enabled:
+            return interval
         
-        self._running = True
-        start_time = time.time()
+        for provider, calls in SNAPSHOT_PROVIDER_CALLS.items():
+            if not api_manager.clients.get(provider):
+                continue
+            rate, _ = provider_rate_limiter.get_quota(provider)
+            interval = max(interval, calls / (rate * self.provider_budget))
         
-        try:
-            logger.info(f"🔄 Starting scheduled snapshot run (max {self.max_tokens_per_run} tokens)")
-            
-            # Get tokens for snapshot (sorted by oldest first)
-            tokens = await self._get_tokens_for_snapshot()
-            if not tokens:
-                logger.info("No tokens found for snapshot - this is normal if no snapshots exist yet")
-                return {"status": "no_tokens", "tokens_processed": 0, "message": "No existing snapshots to update"}
-            
-            logger.info(f"Processing {len(tokens)} tokens for snapshots (oldest snapshots first)")
-            
-            results = {
-                "status": "completed",
-                "tokens_processed": 0,
-                "successful": 0,
-                "failed": 0,
-                "errors": [],
-                "processing_time": 0
-            }
-            
-            # Process each token
-            for i, token_address in enumerate(tokens):
-                try:
-                    logger.debug(f"Processing token {i+1}/{len(tokens)}: {token_address}")
-                    
-                    snapshot = await self.capture_token_snapshot(token_address, update_existing=True)
-                    results["tokens_processed"] += 1
-                    
-                    if snapshot.get("errors"):
-                        results["failed"] += 1
-                        results["errors"].extend(snapshot["errors"])
-                        logger.warning(f"Snapshot failed for {token_address}: {snapshot['errors']}")
-                    else:
-                        results["successful"] += 1
-                        logger.debug(f"Snapshot successful for {token_address}")
-                    
-                    # Rate limiting
-                    if i < len(tokens) - 1:  # Don't delay after last token
-                        await asyncio.sleep(self.rate_limit_delay)
-                        
-                except Exception as e:
-                    logger.error(f"Error processing token {token_address}: {str(e)}")
-                    results["failed"] += 1
-                    results["errors"].append(f"{token_address}: {str(e)}")
-            
-            processing_time = time.time() - start_time
-            results["processing_time"] = round(processing_time, 2)
-            
-            logger.info(
-                f"✅ Snapshot run completed in {processing_time:.2f}s: "
-                f"{results['successful']} successful, {results['failed']} failed"
-            )
-            
-            return results
-            
-        except Exception as e:
-            processing_time = time.time() - start_time
-            logger.error(f"❌ Scheduled snapshot run failed: {str(e)}")
-            return {
-                "status": "error",
-                "error": str(e),
-                "processing_time": round(processing_time, 2)
-            }
-        finally:
-            self._running = False
+        return interval
     
     async def _get_latest_snapshot(self, token_address: str) -> Optional[Dict[str, Any]]:
-        """Get latest snapshot for a token from ChromaDB"""
+        """Get latest snapshot for a token from the snapshot store"""
         try:
-            results = await analysis_storage.search_analyses(
-                query=f"token snapshot {token_address}",
-                limit=1,
-                filters={"token_address": token_address, "doc_type": "token_snapshot"}
-            )
-            
-            if results and len(results) > 0:
-                document = results[0]
-                metadata = document.get("metadata", {})
-                analysis_id = metadata.get("analysis_id")
-                
-                # CONVERT TO INT - metadata stores as string
-                snapshot_generation = int(metadata.get("snapshot_generation", "0"))
-                timestamp = metadata.get("timestamp", 0)
-                
-                if not analysis_id:
-                    analysis_id = f"snapshot_{token_address[:8]}"
-                    logger.info(f"Generated fallback analysis_id: {analysis_id}")
-                
-                return {
-                    "analysis_id": analysis_id,
-                    "snapshot_generation": snapshot_generation,  # Now it's an int
-                    "timestamp": timestamp
-                }
-            
-            return None
-            
+            return await snapshot_store.get(token_address)
         except Exception as e:
             logger.warning(f"Error getting latest snapshot for {token_address}: {e}")
             return None
     
-    async def _get_tokens_for_snapshot(self) -> List[str]:
-        """Get list of tokens that need snapshots, sorted by oldest first"""
-        try:
-            logger.info("Searching for existing snapshots in ChromaDB...")
-            
-            # Search for existing snapshots, not analyses
-            results = await analysis_storage.search_analyses(
-                query="snapshot",
-                limit=self.max_tokens_per_run * 3,  # Get more to sort and filter
-                filters={"doc_type": "token_snapshot"}
-            )
-            
-            logger.info(f"Found {len(results)} snapshot results from ChromaDB")
-            
-            if not results:
-                logger.info("No existing snapshots found")
-                return []
-            
-            # Extract tokens with their timestamps for sorting
-            token_data = []
-            seen = set()
-            
-            for result in results:
-                metadata = result.get("metadata", {})
-                token_address = metadata.get("token_address")
-                timestamp = metadata.get("timestamp", "")
-                
-                if token_address and token_address not in seen:
-                    token_data.append({
-                        "token_address": token_address,
-                        "timestamp": timestamp
-                    })
-                    seen.add(token_address)
-            
-            # Sort by timestamp (oldest first) so oldest snapshots get updated first
-            token_data.sort(key=lambda x: x["timestamp"])
-            
-            # Extract just the token addresses, limited by max_tokens_per_run
-            tokens = [item["token_address"] for item in token_data[:self.max_tokens_per_run]]
-            
-            logger.info(f"Returning {len(tokens)} tokens for snapshot updates (oldest first)")
-            for i, token in enumerate(tokens[:3]):  # Log first 3 for debugging
-                logger.debug(f"Token {i+1}: {token}")
-            
-            return tokens
-            
-        except Exception as e:
-            logger.warning(f"Error getting tokens for snapshot (non-fatal): {e}")
-            return []  # Return empty list instead of throwing error
-    
     async def _run_market_analysis_services(self, token_address: str, snapshot_response: Dict[str, Any]) -> None:
         """Run market analysis services (same as comprehensive analysis but no security)"""
 
-        # BIRDEYE - Sequential processing
-        birdeye_data = {}
+        # BIRDEYE - Start first so it overlaps with the other services (quota handled by the rate limiter)
+        birdeye_task = None
         if api_manager.clients.get("birdeye"):
-            try:
-                birdeye_client = api_manager.clients["birdeye"]
-                
-                # Price data
-                price_data = await birdeye_client.get_token_price(
-                    token_address, include_liquidity=True, check_liquidity=100
-                )
-                if price_data:
-                    birdeye_data["price"] = price_data
-                
-                await asyncio.sleep(1.0)  # Rate limiting
-                
-                # Trades data
-                trades_data = await birdeye_client.get_token_trades(
-                    token_address, sort_type="desc", limit=20
-                )
-                if trades_data:
-                    birdeye_data["trades"] = trades_data
-                
-                if birdeye_data:
-                    snapshot_response["service_responses"]["birdeye"] = birdeye_data
-                    snapshot_response["data_sources"].append("birdeye")
-                    snapshot_response["metadata"]["services_attempted"] += 1
-                    snapshot_response["metadata"]["services_successful"] += 1
-                    
-            except Exception as e:
-                logger.warning(f"Birdeye failed: {str(e)}")
-                snapshot_response["warnings"].append(f"Birdeye failed: {str(e)}")
+            birdeye_task = asyncio.create_task(api_manager.clients["birdeye"].get_market_data(token_address))
         
         # OTHER SERVICES - Parallel
         other_tasks = {}
@@ -448,6 +292,21 @@ class TokenSnapshotService:
             except asyncio.TimeoutError:
                 logger.warning("Market analysis services timed out")
                 snapshot_response["warnings"].append("Some market services timed out")
+        
+        if birdeye_task is not None:
+            try:
+                market_data = await birdeye_task
+                birdeye_data = {key: market_data[key] for key in ("price", "trades") if market_data.get(key)}
+                
+                if birdeye_data:
+                    snapshot_response["service_responses"]["birdeye"] = birdeye_data
+                    snapshot_response["data_sources"].append("birdeye")
+                    snapshot_response["metadata"]["services_attempted"] += 1
+                    snapshot_response["metadata"]["services_successful"] += 1
+                    
+            except Exception as e:
+                logger.warning(f"Birdeye failed: {str(e)}")
+                snapshot_response["warnings"].append(f"Birdeye failed: {str(e)}")
     
     def _calculate_simple_volatility(self, birdeye_data: Dict[str, Any]) -> Optional[float]:
         """Calculate simple volatility from recent trades"""
@@ -956,7 +815,7 @@ class TokenSnapshotService:
                 logger.warning("ChromaDB not available")
                 return
                 
-            doc_id = f"snapshot_{token_address[:8]}"
+            doc_id = snapshot_doc_id(token_address)
             
             # Store the OnChainData as JSON content
             onchain_data = snapshot_response.get("metrics", {}).get("market_data", {})
@@ -971,14 +830,15 @@ class TokenSnapshotService:
                 "snapshot_generation": str(snapshot_response.get("snapshot_generation", 1))
             }
             
-            # Update or create
-            existing = chroma_client._collection.get(ids=[doc_id])
-            if existing and existing.get('ids'):
-                chroma_client._collection.update(ids=[doc_id], documents=[content], metadatas=[metadata])
-                logger.info(f"✅ UPDATED snapshot: {doc_id}")
-            else:
-                await chroma_client.add_document(content=content, metadata=metadata, doc_id=doc_id)
-                logger.info(f"✅ CREATED snapshot: {doc_id}")
+            # Upsert (batched write-behind)
+            await chroma_client.add_document(content=content, metadata=metadata, doc_id=doc_id)
+            logger.info(f"✅ STORED snapshot: {doc_id}")
+            
+            # Drop the document stored under the old 8-char prefix ID for this mint
+            legacy_id = f"snapshot_{token_address[:8]}"
+            legacy = await chroma_client.get(ids=[legacy_id])
+            if legacy and legacy.get("ids") and (legacy.get("metadatas") or [{}])[0].get("token_address") == token_address:
+                await chroma_client.delete(ids=[legacy_id])
                 
         except Exception as e:
             logger.error(f"Failed to store snapshot: {str(e)}")
@@ -1003,8 +863,3 @@ async def capture_single_snapshot(
         security_service_responses=security_service_responses,
         update_existing=update_existing
     )
-
-
-async def run_scheduled_snapshots() -> Dict[str, Any]:
-    """Run scheduled snapshots for multiple tokens"""
-    return await token_snapshot_service.run_scheduled_snapshots()
\ No newline at end of file
@@ -1,13 +1,17 @@
 import asyncio
 import time
 import json
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from loguru import logger
 from datetime import datetime, timedelta
 
 from app.services.service_manager import api_manager
 from app.core.config import get_settings
 from app.utils.cache import cache_manager
+from app.utils.analysis_cache import analysis_cache
+from app.utils.security_index import security_index
+from app.utils.single_flight import single_flight
+from app.services.analysis_pipeline import AnalysisPipeline
 from app.services.analysis_storage import analysis_storage
 
 import inspect
@@ -20,6 +24,8 @@ class TokenAnalyzer:
     def __init__(self):
         """Initialize analyzer with cache manager"""
         self.cache = cache_manager
+        self.analysis_cache = analysis_cache
+        self.security_index = security_index
         self.cache_ttl = settings.REPORT_TTL_SECONDS
         self.services = {
             "helius": True,
@@ -32,8 +38,22 @@ class TokenAnalyzer:
         }
         
     
-    async def analyze_token_comprehensive(self, token_address: str, source_event: str = "webhook") -> Dict[str, Any]:
+    async def analyze_token_comprehensive(self, token_address: str, source_event: str = "webhook", force_refresh: bool = False) -> Dict[str, Any]:
         """Comprehensive token analysis with security-first approach"""
+        cached_result = await self.get_cached_analysis(token_address, "quick", force_refresh)
+        if cached_result:
+            return cached_result
+        
+        # Concurrent callers for the same token share one analysis run
+        return await single_flight.do(
+            f"quick:{token_address}",
+            lambda: self._analyze_token_comprehensive(token_address, source_event),
+            result_loader=lambda: self.get_cached_analysis(token_address, "quick")
+        )
+
+
+    async def _analyze_token_comprehensive(self, token_address: str, source_event: str) -> Dict[str, Any]:
+        """Run comprehensive analysis (use analyze_token_comprehensive for cached/coalesced access)"""
         start_time = time.time()
         analysis_id = f"analysis_{int(time.time())}_{token_address}"
         
@@ -59,18 +79,9 @@ class TokenAnalyzer:
             }
         }
         
-        try:
-            cached_result = await self.cache.get(key=analysis_id)
-            if cached_result:
-                logger.info(f"Found cached analysis for {token_address}")
-                return cached_result
-        except Exception as e:
-            logger.warning(f"Cache retrieval failed: {str(e)}")
-            analysis_response["warnings"].append(f"Cache retrieval failed: {str(e)}")
-        
-        # STEP 1: SECURITY CHECKS FIRST (GOplus, RugCheck, SolSniffer)
-        logger.info("STEP 1: Running security checks (GOplus + RugCheck + SolSniffer)")
-        security_passed, security_data = await self._run_security_checks(token_address, analysis_response)
+        # STEP 1: SECURITY CHECKS (GOplus, RugCheck, SolSniffer) with market services started speculatively
+        logger.info("STEP 1: Running security checks (GOplus + RugCheck + SolSniffer), market services in parallel")
+        security_passed, security_data = await self._run_analysis_pipeline(token_address, analysis_response)
         
         # Store security data
         analysis_response["security_analysis"] = security_data
@@ -97,15 +108,12 @@ class TokenAnalyzer:
             analysis_response["metadata"]["processing_time_seconds"] = round(processing_time, 3)
             
             logger.warning(f"Analysis STOPPED for {token_address} due to security issues in {processing_time:.2f}s")
+            await self.cache_analysis(token_address, "quick", analysis_response, retention=0)
             return analysis_response
         
         logger.info(f"SECURITY CHECKS PASSED for {token_address} - CONTINUING WITH FULL ANALYSIS")
         
-        # STEP 3: Run all other services (Birdeye, Helius, etc.)
-        logger.info("STEP 2: Running market and technical analysis services")
-        await self._run_market_analysis_services(token_address, analysis_response)
-        
-        # STEP 4: Generate comprehensive analysis
+        # STEP 3: Generate comprehensive analysis (market data already merged by the pipeline)
         analysis_response["overall_analysis"] = await self._generate_comprehensive_analysis(
             analysis_response["service_responses"], security_data, token_address
         )
@@ -121,20 +129,7 @@ class TokenAnalyzer:
         analysis_response["metadata"]["processing_time_seconds"] = round(processing_time, 3)
         
         # Cache the result with proper TTL
-        try:
-            await self.cache.set(
-                key=analysis_id,
-                value=analysis_response,
-                ttl=self.cache_ttl
-            )
-
-            analysis_response["docx_cache_key"] = analysis_id
-            analysis_response["docx_expires_at"] = (datetime.utcnow() + timedelta(seconds=self.cache_ttl)).isoformat()
-
-            logger.info(f"Cached analysis for {token_address} with TTL {self.cache_ttl}s")
-        except Exception as e:
-            logger.warning(f"Failed to cache analysis: {str(e)}")
-            analysis_response["warnings"].append(f"Caching failed: {str(e)}")
+        await self.cache_analysis(token_address, "quick", analysis_response)
         
         # Log completion
         logger.info(
@@ -145,10 +140,23 @@ class TokenAnalyzer:
         return analysis_response
 
 
-    async def analyze_token_security_only(self, token_address: str, source_event: str = "webhook") -> Dict[str, Any]:
+    async def analyze_token_security_only(self, token_address: str, source_event: str = "webhook", force_refresh: bool = False) -> Dict[str, Any]:
         """
         Security-only analysis for webhooks - runs security checks and stores if passed
         """
+        cached_result = await self.get_cached_analysis(token_address, "security_only", force_refresh)
+        if cached_result:
+            return cached_result
+        
+        return await single_flight.do(
+            f"security_only:{token_address}",
+            lambda: self._analyze_token_security_only(token_address, source_event),
+            result_loader=lambda: self.get_cached_analysis(token_address, "security_only")
+        )
+
+
+    async def _analyze_token_security_only(self, token_address: str, source_event: str) -> Dict[str, Any]:
+        """Run security-only analysis (use analyze_token_security_only for cached/coalesced access)"""
         start_time = time.time()
         analysis_id = f"security_{int(time.time())}_{token_address}"
         
@@ -204,6 +212,7 @@ class TokenAnalyzer:
             }
             
             logger.warning(f"Security analysis completed for {token_address} in {processing_time:.2f}s - FAILED")
+            await self.cache_analysis(token_address, "security_only", analysis_response, retention=0)
             return analysis_response
         
         logger.info(f"✅ Security check PASSED for {token_address}")
@@ -221,11 +230,207 @@ class TokenAnalyzer:
         }
         
         logger.info(f"✅ Security-only analysis completed for {token_address} in {processing_time:.2f}s - PASSED")
+        await self.cache_analysis(token_address, "security_only", analysis_response, retention=0)
         return analysis_response
 
     
+    async def analyze_tokens_security_batch(
+        self,
+        token_addresses: List[str],
+        source_event: str = "batch",
+        force_refresh: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Security-only analysis for many tokens - yields each result as soon as it is ready
+        
+        Duplicate mints and mints with a fresh security result are answered without
+        security provider calls. DexScreener pairs and Helius metadata for every mint
+        come from the bulk endpoints, fetched while the per-token security checks run
+        with bounded concurrency.
+        """
+        unique_tokens = list(dict.fromkeys(token_addresses))
+        
+        cached_results = await asyncio.gather(
+            *(self.get_cached_analysis(token, "security_only", force_refresh) for token in unique_tokens)
+        )
+        
+        pending = [token for token, cached_result in zip(unique_tokens, cached_results) if not cached_result]
+        if pending:
+            logger.info(f"🛡️ Batch security screening: {len(pending)} tokens to analyze, {len(unique_tokens) - len(pending)} from cache")
+        
+        context_task = asyncio.create_task(self._fetch_batch_market_context(unique_tokens))
+        semaphore = asyncio.Semaphore(settings.SECURITY_BATCH_CONCURRENCY)
+        
+        async def with_market_context(token_address: str, result: Dict[str, Any]) -> Dict[str, Any]:
+            # Shield - the bulk fetch is shared by every result of the batch
+            market_context = await asyncio.shield(context_task)
+            # Shallow copy - cached and coalesced results are shared with other callers
+            result = dict(result)
+            result["market_context"] = market_context.get(token_address, {})
+            return result
+        
+        async def screen(token_address: str) -> Dict[str, Any]:
+            try:
+                async with semaphore:
+                    result = await self.analyze_token_security_only(token_address, source_event, force_refresh)
+            except Exception as e:
+                logger.error(f"Batch security analysis failed for {token_address}: {str(e)}")
+                result = {
+                    "token_address": token_address,
+                    "analysis_type": "security_only",
+                    "errors": [f"Security analysis failed: {str(e)}"],
+                    "metadata": {"security_check_passed": False}
+                }
+            
+            return await with_market_context(token_address, result)
+        
+        tasks = [asyncio.create_task(screen(token)) for token in pending]
+        try:
+            for token, cached_result in zip(unique_tokens, cached_results):
+                if cached_result:
+                    yield await with_market_context(token, cached_result)
+            
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            context_task.cancel()
+            for task in tasks:
+                task.cancel()
+    
+    
+    async def _fetch_batch_market_context(self, token_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Bulk DexScreener pairs (30 per call) and Helius metadata (100 per call), keyed by token"""
+        clients = api_manager.clients
+        calls = []
+        
+        if clients.get("dexscreener"):
+            for i in range(0, len(token_addresses), 30):
+                calls.append(("dexscreener_pairs", clients["dexscreener"].get_tokens_by_addresses(token_addresses[i:i + 30])))
+        
+        if clients.get("helius"):
+            for i in range(0, len(token_addresses), 100):
+                calls.append(("helius_metadata", clients["helius"].get_tokens_metadata(token_addresses[i:i + 100])))
+        
+        results = await asyncio.gather(*(call for _, call in calls), return_exceptions=True)
+        
+        market_context = {token: {} for token in token_addresses}
+        for (name, _), result in zip(calls, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Batch {name} request failed: {str(result)}")
+                continue
+            
+            for token, data in (result or {}).items():
+                if token in market_context:
+                    market_context[token][name] = data
+        
+        return market_context
+
+    
+    async def get_cached_analysis(self, token_address: str, analysis_type: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Get analysis from the current freshness window, marked as served from cache"""
+        cached_result = await self.analysis_cache.get(token_address, analysis_type, force_refresh)
+        if not cached_result:
+            return None
+        
+        # Copy so memory-backed cache entries are never mutated by callers
+        result = dict(cached_result)
+        result["metadata"] = dict(cached_result.get("metadata", {}))
+        result["metadata"]["from_cache"] = True
+        
+        try:
+            cached_at = datetime.fromisoformat(cached_result["timestamp"])
+            result["metadata"]["cache_age_seconds"] = round((datetime.utcnow() - cached_at).total_seconds(), 1)
+        except (KeyError, TypeError, ValueError):
+            pass
+        
+        logger.info(f"Found cached {analysis_type} analysis for {token_address}")
+        return result
+
+    
+    async def cache_analysis(
+        self,
+        token_address: str,
+        analysis_type: str,
+        analysis_response: Dict[str, Any],
+        retention: Optional[int] = None
+    ) -> None:
+        """Store analysis in the freshness cache (kept for report TTL unless retention given)"""
+        if not self.analysis_cache.enabled:
+            return
+        
+        retention = self.cache_ttl if retention is None else retention
+        analysis_response["metadata"]["from_cache"] = False
+        
+        now = time.time()
+        cache_key = self.analysis_cache.build_key(token_address, analysis_type, now)
+        
+        if retention:
+            analysis_response["docx_cache_key"] = cache_key
+            analysis_response["docx_expires_at"] = (datetime.utcnow() + timedelta(seconds=retention)).isoformat()
+        
+        if not await self.analysis_cache.set(token_address, analysis_type, analysis_response, retention, now=now):
+            analysis_response.pop("docx_cache_key", None)
+            analysis_response.pop("docx_expires_at", None)
+            analysis_response["warnings"].append("Caching failed")
+            return
+        
+        logger.info(f"Cached {analysis_type} analysis for {token_address} (key {cache_key})")
+
+    
     async def _run_security_checks(self, token_address: str, analysis_response: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
-        """Run security checks first (GOplus + RugCheck + SolSniffer)"""
+        """Run security checks first (GOplus + RugCheck + SolSniffer)
+        
+        Concurrent callers for the same token (quick, deep, webhook, bot buy) share one fan-out.
+        """
+        security_passed, security_data, phase_response = await single_flight.do(
+            f"security_checks:{token_address}",
+            lambda: self._execute_security_checks(token_address),
+            distributed=False
+        )
+        self._merge_phase_response(analysis_response, phase_response)
+        return security_passed, security_data
+    
+    
+    async def _execute_security_checks(self, token_address: str) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+        """Execute security fan-out against a fresh phase response and index its verdict"""
+        phase_response = self._new_phase_response()
+        security_passed, security_data = await self._security_checks(token_address, phase_response)
+        await self.security_index.record(token_address, security_passed, security_data, phase_response["data_sources"])
+        return security_passed, security_data, phase_response
+    
+    
+    def _new_phase_response(self) -> Dict[str, Any]:
+        """Minimal response structure collecting one analysis phase's output"""
+        return {
+            "warnings": [],
+            "errors": [],
+            "data_sources": [],
+            "service_responses": {},
+            "metadata": {
+                "services_attempted": 0,
+                "services_successful": 0
+            }
+        }
+    
+    
+    def _merge_phase_response(self, analysis_response: Dict[str, Any], phase_response: Dict[str, Any]) -> None:
+        """Merge a (possibly shared) phase response into the caller's analysis response"""
+        analysis_response.setdefault("warnings", []).extend(phase_response["warnings"])
+        analysis_response.setdefault("errors", []).extend(phase_response["errors"])
+        analysis_response.setdefault("service_responses", {}).update(phase_response["service_responses"])
+        
+        data_sources = analysis_response.setdefault("data_sources", [])
+        for source in phase_response["data_sources"]:
+            if source not in data_sources:
+                data_sources.append(source)
+        
+        metadata = analysis_response.setdefault("metadata", {})
+        for counter in ("services_attempted", "services_successful"):
+            metadata[counter] = metadata.get(counter, 0) + phase_response["metadata"][counter]
+    
+    
+    async def _security_checks(self, token_address: str, analysis_response: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """Security checks implementation (GOplus + RugCheck + SolSniffer)"""
         security_data = {
             "goplus_result": None,
             "rugcheck_result": None,
@@ -578,126 +783,129 @@ class TokenAnalyzer:
         return {"critical": critical_issues, "warnings": warnings}
     
 
-    async def _run_market_analysis_services(self, token_address: str, analysis_response: Dict[str, Any]) -> None:
-        """Run market analysis services (Birdeye, Helius, SolanaFM, DexScreener)"""
+    async def _run_analysis_pipeline(self, token_address: str, analysis_response: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """Run security checks and market services as one dependency graph
         
-        # BIRDEYE - Handle separately with sequential processing (for rate limiting)
-        birdeye_data = {}
-        if api_manager.clients.get("birdeye"):
-            try:
-                logger.info("Processing Birdeye requests sequentially")
-                birdeye_client = api_manager.clients["birdeye"]
-                
-                # Price endpoint
-                try:
-                    price_data = await birdeye_client.get_token_price(
-                        token_address, include_liquidity=True, check_liquidity=100
-                    )
-                    if price_data:
-                        birdeye_data["price"] = price_data
-                        logger.info("Birdeye price data collected")
-                except Exception as e:
-                    logger.warning(f"Birdeye price endpoint failed: {str(e)}")
-                    analysis_response["warnings"].append(f"Birdeye price failed: {str(e)}")
-                
-                # Wait between Birdeye calls
-                await asyncio.sleep(1.0)
-                
-                # Trades endpoint
-                try:
-                    trades_data = await birdeye_client.get_token_trades(
-                        token_address, sort_type="desc", limit=20
-                    )
-                    if trades_data:
-                        birdeye_data["trades"] = trades_data
-                        logger.info("Birdeye trades data collected")
-                except Exception as e:
-                    logger.warning(f"Birdeye trades endpoint failed: {str(e)}")
-                    analysis_response["warnings"].append(f"Birdeye trades failed: {str(e)}")
-                
-                if birdeye_data:
-                    analysis_response["service_responses"]["birdeye"] = birdeye_data
-                    analysis_response["data_sources"].append("birdeye")
-                    analysis_response["metadata"]["services_attempted"] += 1
-                    analysis_response["metadata"]["services_successful"] += 1
-                    
-            except Exception as e:
-                logger.error(f"Birdeye sequential processing failed: {str(e)}")
-                analysis_response["errors"].append(f"Birdeye failed: {str(e)}")
+        Market nodes start speculatively alongside the security checks and are
+        released into the response only once security passes; if it fails they are
+        cancelled (completed provider calls stay in the provider response cache).
+        """
+        pipeline = AnalysisPipeline(f"analysis:{token_address}")
+        pipeline.add_node(
+            "security",
+            lambda: self._run_security_checks(token_address, analysis_response),
+            gate=lambda result: bool(result[0])
+        )
+        
+        # Concurrent analyses of the same token share each provider call; once every
+        # analysis waiting on it has failed its gate the shared call is cancelled too
+        for name, call in self._market_service_calls(token_address).items():
+            pipeline.add_node(
+                name,
+                lambda name=name, call=call: single_flight.do(
+                    f"market:{name}:{token_address}", call, distributed=False, cancel_when_abandoned=True
+                ),
+                depends_on=["security"],
+                speculative=True,
+                timeout=self._market_node_timeout(name)
+            )
+        
+        attempted = set()
         
-        # OTHER SERVICES - Run in parallel
-        other_tasks = {}
+        def on_result(node) -> None:
+            if node.name != "security":
+                self._merge_market_node(node, analysis_response, attempted)
+        
+        nodes = await pipeline.run(on_result)
+        analysis_response["metadata"]["pipeline"] = pipeline.get_report()
+        
+        security_node = nodes["security"]
+        if security_node.error is not None:
+            logger.error(f"Security checks failed: {str(security_node.error)}")
+            analysis_response["errors"].append(f"Security checks failed: {str(security_node.error)}")
+            return False, {"critical_issues": [], "warnings": [], "overall_safe": False}
+        
+        return security_node.result
+    
+    
+    def _market_service_calls(self, token_address: str) -> Dict[str, Any]:
+        """Market provider calls keyed by node name (service_dataset)"""
+        clients = api_manager.clients
+        calls = {}
+        
+        # Birdeye price + trades (quota handled by the provider rate limiter)
+        if clients.get("birdeye"):
+            calls["birdeye"] = lambda: clients["birdeye"].get_market_data(token_address)
         
         # Helius
-        if api_manager.clients.get("helius"):
-            other_tasks["helius_supply"] = self._safe_service_call(
-                api_manager.clients["helius"].get_token_supply, token_address
-            )
-            other_tasks["helius_metadata"] = self._safe_service_call(
-                api_manager.clients["helius"].get_token_metadata, [token_address]
-            )
-            analysis_response["metadata"]["services_attempted"] += 1
+        if clients.get("helius"):
+            calls["helius_supply"] = lambda: self._safe_service_call(clients["helius"].get_token_supply, token_address)
+            calls["helius_metadata"] = lambda: self._safe_service_call(clients["helius"].get_token_metadata, [token_address])
         
         # SolanaFM
-        if api_manager.clients.get("solanafm"):
-            other_tasks["solanafm_token"] = self._safe_service_call(
-                api_manager.clients["solanafm"].get_token_info, token_address
-            )
-            analysis_response["metadata"]["services_attempted"] += 1
+        if clients.get("solanafm"):
+            calls["solanafm_token"] = lambda: self._safe_service_call(clients["solanafm"].get_token_info, token_address)
         
         # DexScreener
-        if api_manager.clients.get("dexscreener"):
-            other_tasks["dexscreener_pairs"] = self._safe_service_call(
-                api_manager.clients["dexscreener"].get_token_pairs, token_address, "solana"
-            )
+        if clients.get("dexscreener"):
+            calls["dexscreener_pairs"] = lambda: self._safe_service_call(clients["dexscreener"].get_token_pairs, token_address, "solana")
+        
+        return calls
+    
+    
+    def _market_node_timeout(self, node_name: str) -> float:
+        """Birdeye may wait on its quota so gets a longer cap, other market services 20s"""
+        return settings.BIRDEYE_MARKET_TIMEOUT if node_name == "birdeye" else 20.0
+    
+    
+    def _merge_market_node(self, node, analysis_response: Dict[str, Any], attempted: set) -> None:
+        """Merge a released market node into the analysis response"""
+        if node.name == "birdeye":
+            if node.error is not None:
+                logger.error(f"Birdeye market data failed: {str(node.error)}")
+                self._merge_birdeye_data({"errors": [f"Birdeye failed: {str(node.error)}"]}, analysis_response)
+            else:
+                self._merge_birdeye_data(node.result, analysis_response)
+            return
+        
+        service_name, dataset = node.name.split("_", 1)
+        if service_name not in attempted:
+            attempted.add(service_name)
             analysis_response["metadata"]["services_attempted"] += 1
         
-        # Execute other services if any
-        if other_tasks:
-            try:
-                logger.info(f"Executing {len(other_tasks)} market analysis services")
-                results = await asyncio.wait_for(
-                    asyncio.gather(*other_tasks.values(), return_exceptions=True),
-                    timeout=20.0
-                )
-                
-                # Process results
-                task_names = list(other_tasks.keys())
-                for i, task_name in enumerate(task_names):
-                    try:
-                        result = results[i] if i < len(results) else None
-                        service_name = task_name.split("_")[0]
-                        
-                        if isinstance(result, Exception):
-                            analysis_response["errors"].append(f"{task_name}: {str(result)}")
-                            continue
-                        
-                        if result is None:
-                            analysis_response["warnings"].append(f"{task_name}: No data returned")
-                            continue
-                        
-                        # Store service response
-                        if service_name not in analysis_response["service_responses"]:
-                            analysis_response["service_responses"][service_name] = {}
-                        
-                        analysis_response["service_responses"][service_name][task_name.split("_", 1)[1]] = result
-                        
-                        if service_name not in analysis_response["data_sources"]:
-                            analysis_response["data_sources"].append(service_name)
-                            analysis_response["metadata"]["services_successful"] += 1
-                        
-                        logger.debug(f"{task_name} processed successfully")
-                        
-                    except Exception as e:
-                        logger.warning(f"Error processing {task_name}: {str(e)}")
-                        analysis_response["errors"].append(f"Error processing {task_name}: {str(e)}")
-                        
-            except asyncio.TimeoutError:
-                logger.warning("Market analysis services timed out")
-                analysis_response["warnings"].append("Some market services timed out")
-            except Exception as e:
-                logger.error(f"Market analysis execution failed: {str(e)}")
-                analysis_response["errors"].append(f"Market analysis failed: {str(e)}")
+        if node.error is not None:
+            if isinstance(node.error, asyncio.TimeoutError):
+                logger.warning(f"{node.name} timed out")
+                analysis_response["warnings"].append(f"{node.name}: timed out")
+            else:
+                analysis_response["errors"].append(f"{node.name}: {str(node.error)}")
+            return
+        
+        if node.result is None:
+            analysis_response["warnings"].append(f"{node.name}: No data returned")
+            return
+        
+        analysis_response["service_responses"].setdefault(service_name, {})[dataset] = node.result
+        
+        if service_name not in analysis_response["data_sources"]:
+            analysis_response["data_sources"].append(service_name)
+            analysis_response["metadata"]["services_successful"] += 1
+        
+        logger.debug(f"{node.name} processed successfully")
+
+    def _merge_birdeye_data(self, market_data: Optional[Dict[str, Any]], analysis_response: Dict[str, Any]) -> None:
+        """Merge Birdeye price/trades into the analysis response"""
+        if not market_data:
+            return
+        
+        analysis_response["warnings"].extend(market_data.get("errors", []))
+        
+        birdeye_data = {key: market_data[key] for key in ("price", "trades") if market_data.get(key)}
+        if birdeye_data:
+            analysis_response["service_responses"]["birdeye"] = birdeye_data
+            analysis_response["data_sources"].append("birdeye")
+            analysis_response["metadata"]["services_attempted"] += 1
+            analysis_response["metadata"]["services_successful"] += 1
 
     async def _generate_security_focused_analysis(self, security_data: Dict[str, Any], token_address: str, passed: bool) -> Dict[str, Any]:
         """Generate analysis focused on security results when security check fails"""
@@ -1213,27 +1421,28 @@ async def analyze_token_from_webhook(
         raise
 
 
-async def analyze_token_on_demand(token_address: str, analysis_type: str = "quick") -> Dict[str, Any]:
+async def analyze_token_on_demand(token_address: str, analysis_type: str = "quick", force_refresh: bool = False) -> Dict[str, Any]:
     """Analyze token on demand (API call) - supports both quick and deep analysis"""
     
     if analysis_type == "deep":
         from app.services.ai.ai_token_analyzer import analyze_token_deep_comprehensive
         logger.info(f"🤖 API triggering DEEP AI-enhanced analysis for {token_address}")
-        return await analyze_token_deep_comprehensive(token_address, "api_deep")
+        return await analyze_token_deep_comprehensive(token_address, "api_deep", force_refresh)
     else:
         # Keep quick analysis for API calls when explicitly requested
-        return await token_analyzer.analyze_token_comprehensive(token_address, "api_quick")
+        return await token_analyzer.analyze_token_comprehensive(token_address, "api_quick", force_refresh)
     
     
-async def analyze_token_security_only(token_address: str, source_event: str = "webhook") -> Dict[str, Any]:
+async def analyze_token_security_only(token_address: str, source_event: str = "webhook", force_refresh: bool = False) -> Dict[str, Any]:
     """
     Main entry point for security-only token analysis
     
     Args:
         token_address: Token mint address
         source_event: Source of analysis request
+        force_refresh: Bypass cached results from the current freshness window
     
     Returns:
         Security analysis result (stores to DB if security passes)
     """
-    return await token_analyzer.analyze_token_security_only(token_address, source_event)
\ No newline at end of file
+    return await token_analyzer.analyze_token_security_only(token_address, source_event, force_refresh)
\ No newline at end of file
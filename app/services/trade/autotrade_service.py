@@ -6,8 +6,12 @@ from loguru import logger
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 from app.core.config import get_settings
 from app.services.trade.bot_service import bot_service
+from app.services.trade.position_book import PositionBook
+from app.services.trade.sell_conditions import SELL_REASONS, PositionColumns, evaluate_sell_conditions
 
 settings = get_settings()
 
@@ -18,6 +22,9 @@ class AutoTradeService:
     def __init__(self):
         self.positions_file = Path("shared_data/active_positions.json")
         self.positions_file.parent.mkdir(exist_ok=True)
+        self.book = PositionBook(self.positions_file)
+        self._columns: Optional[PositionColumns] = None
+        self._columns_version = -1
         self.config = self._load_autotrade_config()
         
     def _load_autotrade_config(self) -> Dict[str, Any]:
@@ -78,9 +85,7 @@ class AutoTradeService:
                 "source": buy_data.get("source", "manual")
             }
             
-            positions = self._load_positions()
-            positions[token_address] = position
-            self._save_positions(positions)
+            self.book.put(token_address, position)
             
             logger.info(f"📊 Position tracked: {position['token_name']} (${position['entry_price']:.6f})")
             return True
@@ -92,8 +97,7 @@ class AutoTradeService:
     def get_active_positions(self) -> List[Dict[str, Any]]:
         """Get all active positions"""
         try:
-            positions = self._load_positions()
-            return [pos for pos in positions.values() if pos.get("status") == "active"]
+            return [pos for pos in self.book.values() if pos.get("status") == "active"]
         except Exception as e:
             logger.error(f"Failed to get active positions: {e}")
             return []
@@ -101,10 +105,8 @@ class AutoTradeService:
     def close_position(self, token_address: str, sell_reason: str, sell_data: Dict[str, Any]) -> bool:
         """Close position by removing it from active positions"""
         try:
-            positions = self._load_positions()
-            if token_address in positions:
-                position = positions[token_address]
-                
+            position = self.book.get(token_address)
+            if position is not None:
                 # Calculate P&L for logging
                 entry_price = position["entry_price"]
                 sell_price = sell_data.get("sell_price", 0)
@@ -114,8 +116,7 @@ class AutoTradeService:
                 logger.info(f"📊 Position closed: {position['token_name']} - {sell_reason} (P&L: {pnl_percent:.2f}%)")
                 
                 # Remove from positions
-                del positions[token_address]
-                self._save_positions(positions)
+                self.book.delete(token_address)
                 
                 return True
             return False
@@ -123,65 +124,112 @@ class AutoTradeService:
             logger.error(f"Failed to close position: {e}")
             return False
     
-    def _load_positions(self) -> Dict[str, Any]:
-        """Load positions from JSON file"""
-        try:
-            if self.positions_file.exists():
-                with open(self.positions_file, 'r') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            logger.error(f"Failed to load positions: {e}")
-            return {}
-    
-    def _save_positions(self, positions: Dict[str, Any]) -> bool:
-        """Save positions to JSON file"""
-        try:
-            with open(self.positions_file, 'w') as f:
-                json.dump(positions, f, indent=2, default=str)
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save positions: {e}")
-            return False
-    
     # ==============================================
     # SNAPSHOT-TRIGGERED POSITION CHECKING
     # ==============================================
     
     async def check_position_on_snapshot_update(self, token_address: str, fresh_market_data: Dict[str, Any]):
-        """Check position when snapshot updates for this token"""
+        """Check position when snapshot (or price feed tick) updates for this token"""
         try:
             if not self.config.get("enabled"):
                 return
             
-            # Get all positions and find this token
-            positions = self._load_positions()
-            if token_address not in positions or positions[token_address].get("status") != "active":
-                return  # No active position for this token
-            
-            position = positions[token_address]
-            
-            # Check sell conditions
-            should_sell, sell_reason = self._evaluate_sell_conditions(position, fresh_market_data)
+            if token_address not in self.book:
+                return  # No position for this token
             
-            if should_sell:
-                # Execute sell
-                await self._execute_autosell(position, sell_reason, fresh_market_data)
-            else:
-                # Update highest price if needed
-                current_price = fresh_market_data.get("currentPriceUSD", 0)
-                if current_price > position["highest_price_seen"]:
-                    positions[token_address]["highest_price_seen"] = current_price
-                    positions[token_address]["last_check_time"] = time.time()
-                    self._save_positions(positions)
-                    
-                    entry_price = position["entry_price"]
-                    pnl = (current_price - entry_price) / entry_price * 100
-                    logger.debug(f"📈 {position['token_name']}: ${current_price:.6f} (P&L: {pnl:.2f}%)")
+            # One check at a time per position, so concurrent updates cannot sell twice
+            async with self.book.lock(token_address):
+                position = self.book.get(token_address)
+                if position is None or position.get("status") != "active":
+                    return  # No active position for this token
+                
+                # Check sell conditions
+                should_sell, sell_reason = self._evaluate_sell_conditions(position, fresh_market_data)
+                
+                if should_sell:
+                    # Execute sell
+                    await self._execute_autosell(position, sell_reason, fresh_market_data)
+                else:
+                    # Update highest price if needed
+                    current_price = fresh_market_data.get("currentPriceUSD", 0)
+                    if current_price > position["highest_price_seen"]:
+                        self.book.update(token_address, highest_price_seen=current_price, last_check_time=time.time())
+                        
+                        entry_price = position["entry_price"]
+                        pnl = (current_price - entry_price) / entry_price * 100
+                        logger.debug(f"📈 {position['token_name']}: ${current_price:.6f} (P&L: {pnl:.2f}%)")
                     
         except Exception as e:
             logger.error(f"Error checking position for {token_address}: {e}")
     
+    async def check_positions_batch(self, market_data: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Check many positions against fresh market data and execute resulting sells"""
+        if not self.config.get("enabled"):
+            return []
+        
+        intents = self.evaluate_positions_batch(market_data)
+        if intents:
+            await asyncio.gather(*(self._execute_sell_intent(intent) for intent in intents))
+        return intents
+    
+    def evaluate_positions_batch(self, market_data: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Exit conditions for all given positions in one vectorized pass
+        
+        Returns sell intents; positions that hold get their high-water mark updated.
+        """
+        try:
+            columns = self._get_position_columns()
+            tokens = [token_address for token_address in market_data if token_address in columns.index]
+            if not tokens:
+                return []
+            
+            now = time.time()
+            rows = np.fromiter((columns.index[token_address] for token_address in tokens), dtype=np.intp, count=len(tokens))
+            prices = np.array([float(market_data[t].get("currentPriceUSD") or 0) for t in tokens], dtype=np.float64)
+            liquidities = np.array([float(market_data[t].get("liquidityUSD") or 0) for t in tokens], dtype=np.float64)
+            
+            codes = evaluate_sell_conditions(
+                columns, rows, prices, liquidities, now,
+                self.config["liquidity_drain_threshold"], self.config["max_hold_hours"]
+            )
+            
+            # High-water marks for positions that hold (kept in the columns too)
+            new_highs = (codes == 0) & (prices > columns.highest_price[rows])
+            for i in np.flatnonzero(new_highs):
+                columns.highest_price[rows[i]] = prices[i]
+                self.book.update(tokens[i], highest_price_seen=float(prices[i]), last_check_time=now)
+            self._columns_version = self.book.version
+            
+            return [
+                {
+                    "token_address": tokens[i],
+                    "sell_reason": SELL_REASONS[codes[i]],
+                    "price": float(prices[i]),
+                    "pnl_percent": round(float((prices[i] - columns.entry_price[rows[i]]) / columns.entry_price[rows[i]] * 100), 2),
+                    "market_data": market_data[tokens[i]]
+                }
+                for i in np.flatnonzero(codes)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error evaluating positions batch: {e}")
+            return []
+    
+    def _get_position_columns(self) -> PositionColumns:
+        """Column view of active positions, rebuilt only when the book changed"""
+        if self._columns is None or self._columns_version != self.book.version:
+            self._columns = PositionColumns(self.get_active_positions())
+            self._columns_version = self.book.version
+        return self._columns
+    
+    async def _execute_sell_intent(self, intent: Dict[str, Any]) -> None:
+        token_address = intent["token_address"]
+        async with self.book.lock(token_address):
+            position = self.book.get(token_address)
+            if position is None or position.get("status") != "active":
+                return  # already sold by a concurrent check
+            await self._execute_autosell(position, intent["sell_reason"], intent["market_data"])
+    
     def _evaluate_sell_conditions(self, position: Dict[str, Any], current_data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """Evaluate if position should be sold"""
         try:
@@ -264,12 +312,7 @@ class AutoTradeService:
             
             # Update highest price for trailing stop
             if current_price > position["highest_price_seen"]:
-                positions = self._load_positions()
-                if token_address in positions:
-                    positions[token_address]["highest_price_seen"] = current_price
-                    positions[token_address]["last_check_time"] = time.time()
-                    self._save_positions(positions)
-                    
+                if self.book.update(token_address, highest_price_seen=current_price, last_check_time=time.time()):
                     entry_price = position["entry_price"]
                     pnl = (current_price - entry_price) / entry_price * 100
                     logger.debug(f"📈 New high: {position['token_name']} ${current_price:.6f} (P&L: {pnl:.2f}%)")
@@ -284,9 +327,9 @@ class AutoTradeService:
     def get_positions_summary(self) -> Dict[str, Any]:
         """Get summary of all positions"""
         try:
-            positions = self._load_positions()
-            active = [p for p in positions.values() if p.get("status") == "active"]
-            closed = [p for p in positions.values() if p.get("status") == "closed"]
+            positions = self.book.values()
+            active = [p for p in positions if p.get("status") == "active"]
+            closed = [p for p in positions if p.get("status") == "closed"]
             
             total_pnl = sum(p.get("final_pnl_percent", 0) for p in closed)
             
@@ -1,12 +1,12 @@
 import asyncio
 import time
 import httpx
-import json
 from typing import Dict, Any, Optional, List
 from loguru import logger
 from pydantic import BaseModel
 
 from app.core.config import get_settings
+from app.services.api.http_transport import http_transport
 
 settings = get_settings()
 
@@ -339,19 +339,19 @@ class BotService:
             logger.info("📊 Fetching bot trading history")
             
             # Get history from bot API
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{self.bot_url}/api/history")
-                
-                if response.status_code != 200:
-                    logger.warning(f"Bot history API returned {response.status_code}")
-                    return []
-                
-                bot_data = response.json()
-                
-                if not bot_data.get("success") or not bot_data.get("data"):
-                    logger.warning("Bot history API returned no data")
-                    return []
+            client = http_transport.get_httpx_client()
+            response = await client.get(f"{self.bot_url}/api/history", timeout=30.0)
             
+            if response.status_code != 200:
+                logger.warning(f"Bot history API returned {response.status_code}")
+                return []
+            
+            bot_data = response.json()
+            
+            if not bot_data.get("success") or not bot_data.get("data"):
+                logger.warning("Bot history API returned no data")
+                return []
+        
             # Transform to frontend format
             transformed_history = []
             for trade in bot_data["data"]:
@@ -390,16 +390,28 @@ class BotService:
     async def _run_security_check(self, token_address: str) -> bool:
         """
         Run security check using existing token analyzer logic
-        
+
+        A fresh verdict from the security index (any recent webhook, analysis or
+        buy screening of this mint) is used directly; unknown or stale mints fall
+        back to a live check, which indexes its own verdict.
+
         Args:
             token_address: Token mint address
-            
+
         Returns:
             True if security check passed, False otherwise
         """
         try:
             from app.services.token_analyzer import token_analyzer
-            
+
+            indexed = await token_analyzer.security_index.lookup(token_address)
+            if indexed:
+                logger.info(f"Using indexed security verdict for {token_address}: {indexed['verdict']} "
+                            f"({indexed['age_seconds']}s old, {', '.join(indexed['coverage']) or 'no coverage'})")
+                if indexed["verdict"] != "safe":
+                    logger.warning(f"Indexed critical issues for {token_address}: {indexed['critical_issues']}")
+                return indexed["verdict"] == "safe"
+
             # Create minimal analysis response structure
             analysis_response = {
                 "warnings": [],
@@ -446,7 +458,7 @@ class BotService:
             
             if recent_snapshot:
                 logger.info(f"Using recent snapshot for {token_address}")
-                full_snapshot = await self._get_full_snapshot(token_address)
+                full_snapshot = recent_snapshot
                 if full_snapshot:
                     onchain_data = self._extract_onchain_data_from_snapshot(full_snapshot)
                     if onchain_data and onchain_data.get("currentPriceUSD", 0) > 0:
@@ -485,30 +497,18 @@ class BotService:
     async def _get_recent_snapshot(self, token_address: str, max_age_minutes: int = 15) -> Optional[Dict[str, Any]]:
         """Get recent snapshot if fresh enough"""
         try:
-            from app.services.snapshots.token_snapshot import token_snapshot_service
+            from app.services.snapshots.snapshot_store import snapshot_store
             
-            latest_snapshot = await token_snapshot_service._get_latest_snapshot(token_address)
+            latest_snapshot = await snapshot_store.get(token_address)
             if not latest_snapshot:
                 return None
             
             # Check age
-            snapshot_time = latest_snapshot.get("timestamp", 0)
-            if isinstance(snapshot_time, str):
-                from datetime import datetime, timezone
-                try:
-                    # Parse ISO format as UTC
-                    dt = datetime.fromisoformat(snapshot_time).replace(tzinfo=timezone.utc)
-                    snapshot_time = dt.timestamp()
-                except ValueError as e:
-                    logger.warning(f"Failed to parse timestamp {snapshot_time}: {e}")
-                    return None
-
-            age_minutes = (time.time() - snapshot_time) / 60
+            age_minutes = (time.time() - latest_snapshot["updated_at"]) / 60
             
             if age_minutes <= max_age_minutes:
                 logger.info(f"Found recent snapshot (age: {age_minutes:.1f} min)")
-                # Get full snapshot data, not just metadata
-                return await self._get_full_snapshot(token_address)
+                return latest_snapshot["market_data"]
             else:
                 logger.info(f"Snapshot too old (age: {age_minutes:.1f} min)")
                 return None
@@ -518,38 +518,12 @@ class BotService:
             return None
 
     async def _get_full_snapshot(self, token_address: str) -> Optional[Dict[str, Any]]:
-        """Get full snapshot data from storage by token_address"""
+        """Get full snapshot data (OnChainData) from the snapshot store by token_address"""
         try:
-            from app.services.analysis_storage import analysis_storage
+            from app.services.snapshots.snapshot_store import snapshot_store
             
-            results = await analysis_storage.search_analyses(
-                query=f"snapshot {token_address}",
-                limit=1,
-                filters={"token_address": token_address, "doc_type": "token_snapshot"}
-            )
-            
-            if results and len(results) > 0:
-                # Parse the full snapshot from the stored JSON content
-                content = results[0].get("content", "{}")
-                
-                # Handle different content types
-                if isinstance(content, list) and len(content) > 0:
-                    content = content[0]  # Take first item if it's a list
-                
-                if isinstance(content, str):
-                    try:
-                        onchain_data = json.loads(content)
-                        return onchain_data
-                    except json.JSONDecodeError as e:
-                        logger.error(f"🔍 SNAPSHOT DEBUG: JSON decode failed: {e}")
-                        return None
-                elif isinstance(content, dict):
-                    return content
-                
-                else:
-                    return None
-            
-            return None
+            latest_snapshot = await snapshot_store.get(token_address)
+            return latest_snapshot["market_data"] if latest_snapshot else None
             
         except Exception as e:
             logger.warning(f"Error getting full snapshot: {e}")
@@ -613,20 +587,21 @@ class BotService:
         Make async call to bot API for buy orders
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.bot_url}/api/buy",
-                    json=bot_request,
-                    headers={"Content-Type": "application/json"}
-                )
+            client = http_transport.get_httpx_client()
+            response = await client.post(
+                f"{self.bot_url}/api/buy",
+                json=bot_request,
+                headers={"Content-Type": "application/json"},
+                timeout=30.0
+            )
+            
+            if response.status_code == 200:
+                logger.info(f"✅ Bot buy API call successful for order {order_id}")
+                return response.json()
+            else:
+                logger.warning(f"⚠️ Bot buy API call failed for order {order_id}: {response.status_code}")
+                return {"success": False, "message": f"HTTP {response.status_code}"}
                 
-                if response.status_code == 200:
-                    logger.info(f"✅ Bot buy API call successful for order {order_id}")
-                    return response.json()
-                else:
-                    logger.warning(f"⚠️ Bot buy API call failed for order {order_id}: {response.status_code}")
-                    return {"success": False, "message": f"HTTP {response.status_code}"}
-                    
         except Exception as e:
             logger.error(f"❌ Bot buy API call error for order {order_id}: {str(e)}")
             return {"success": False, "message": str(e)}
@@ -636,20 +611,21 @@ class BotService:
         Make async call to bot API for sell orders
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.bot_url}/api/sell",
-                    json=bot_request,
-                    headers={"Content-Type": "application/json"}
-                )
+            client = http_transport.get_httpx_client()
+            response = await client.post(
+                f"{self.bot_url}/api/sell",
+                json=bot_request,
+                headers={"Content-Type": "application/json"},
+                timeout=30.0
+            )
+            
+            if response.status_code == 200:
+                logger.info(f"✅ Bot sell API call successful for order {order_id}")
+                return response.json()
+            else:
+                logger.warning(f"⚠️ Bot sell API call failed for order {order_id}: {response.status_code}")
+                return {"success": False, "message": f"HTTP {response.status_code}"}
                 
-                if response.status_code == 200:
-                    logger.info(f"✅ Bot sell API call successful for order {order_id}")
-                    return response.json()
-                else:
-                    logger.warning(f"⚠️ Bot sell API call failed for order {order_id}: {response.status_code}")
-                    return {"success": False, "message": f"HTTP {response.status_code}"}
-                    
         except Exception as e:
             logger.error(f"❌ Bot sell API call error for order {order_id}: {str(e)}")
             return {"success": False, "message": str(e)}
@@ -659,20 +635,21 @@ class BotService:
         Make async call to bot API for wallet secret update
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.bot_url}/api/wallet",
-                    json=bot_request,
-                    headers={"Content-Type": "application/json"}
-                )
+            client = http_transport.get_httpx_client()
+            response = await client.post(
+                f"{self.bot_url}/api/wallet",
+                json=bot_request,
+                headers={"Content-Type": "application/json"},
+                timeout=30.0
+            )
 
-                if response.status_code == 200:
-                    logger.info(f"✅ Bot update API call successful")
-                    return response.json()
-                else:
-                    logger.warning(f"⚠️ Bot update API call failed: {response.status_code}")
-                    return {"success": False, "message": f"HTTP {response.status_code}"}
-                    
+            if response.status_code == 200:
+                logger.info(f"✅ Bot update API call successful")
+                return response.json()
+            else:
+                logger.warning(f"⚠️ Bot update API call failed: {response.status_code}")
+                return {"success": False, "message": f"HTTP {response.status_code}"}
+                
         except Exception as e:
             logger.error(f"❌ Bot update API call error: {str(e)}")
             return {"success": False, "message": str(e)}
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class PositionBook:
+    """In-memory position records backed by a write-ahead log
+
+    Reads never touch disk. Every change is applied in memory at once and appended
+    to ``<checkpoint>.wal`` by a background flush running in a worker thread. After
+    ``checkpoint_every`` log records the whole book is written to the checkpoint
+    file (temp file + atomic rename) and the log is truncated. On start the
+    checkpoint is loaded and the log replayed; a torn last line is ignored.
+    """
+
+    def __init__(self, checkpoint_path: Path, checkpoint_every: Optional[int] = None):
+        self.checkpoint_path = Path(checkpoint_path)
+        self.wal_path = self.checkpoint_path.with_suffix(".wal")
+        self.checkpoint_every = checkpoint_every or settings.POSITION_BOOK_CHECKPOINT_EVERY
+
+        self._pending: List[str] = []
+        self._checkpoint_requested = False
+        self._io_lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._wal_records = 0
+        self.version = 0  # bumped on every change, lets readers cache derived views
+        self._positions: Dict[str, Dict[str, Any]] = self._load()
+
+    def get(self, token_address: str) -> Optional[Dict[str, Any]]:
+        position = self._positions.get(token_address)
+        return dict(position) if position is not None else None
+
+    def values(self) -> List[Dict[str, Any]]:
+        return [dict(position) for position in self._positions.values()]
+
+    def __contains__(self, token_address: str) -> bool:
+        return token_address in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def put(self, token_address: str, position: Dict[str, Any]) -> None:
+        """Insert or replace a position"""
+        self._positions[token_address] = dict(position)
+        self.version += 1
+        self._append({"op": "put", "token": token_address, "position": position})
+
+    def update(self, token_address: str, **fields: Any) -> bool:
+        """Change some fields of a position, False if it does not exist"""
+        position = self._positions.get(token_address)
+        if position is None:
+            return False
+        position.update(fields)
+        self.version += 1
+        self._append({"op": "update", "token": token_address, "fields": fields})
+        return True
+
+    def delete(self, token_address: str) -> Optional[Dict[str, Any]]:
+        """Remove a position, returns the removed record"""
+        position = self._positions.pop(token_address, None)
+        if position is not None:
+            self.version += 1
+            self._append({"op": "delete", "token": token_address})
+        return position
+
+    def lock(self, token_address: str) -> asyncio.Lock:
+        """Per-position lock serializing check-and-act sequences"""
+        return self._locks.setdefault(token_address, asyncio.Lock())
+
+    async def flush(self) -> None:
+        """Write pending log records (and a checkpoint when due) off the event loop"""
+        while self._pending or self._checkpoint_requested:
+            lines, self._pending = self._pending, []
+            checkpoint = None
+            if self._checkpoint_requested or self._wal_records + len(lines) >= self.checkpoint_every:
+                # Captured together with the batch, so the checkpoint covers every record in it
+                checkpoint = _dumps(self._positions)
+                self._checkpoint_requested = False
+            await asyncio.to_thread(self._write, lines, checkpoint)
+
+    async def checkpoint(self) -> None:
+        """Write the whole book and truncate the log
+
+        Runs in the flush task, so changes made while the checkpoint is being written
+        are logged after it instead of being truncated away.
+        """
+        self._checkpoint_requested = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        await asyncio.shield(self._flush_task)
+
+    async def close(self) -> None:
+        await self.checkpoint()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._pending.append(_dumps(record))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            lines, self._pending = self._pending, []
+            self._write(lines, None)
+            return
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self.flush())
+
+    def _write(self, lines: List[str], checkpoint: Optional[str]) -> None:
+        with self._io_lock:
+            try:
+                self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+
+                if checkpoint is not None:
+                    tmp_path = self.checkpoint_path.with_suffix(".tmp")
+                    with open(tmp_path, "w") as f:
+                        f.write(checkpoint)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.checkpoint_path)
+                    open(self.wal_path, "w").close()
+                    self._wal_records = 0
+                    return
+
+                with open(self.wal_path, "a") as f:
+                    f.write("".join(line + "\n" for line in lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._wal_records += len(lines)
+
+            except Exception as e:
+                logger.error(f"Failed to persist position book: {e}")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Checkpoint plus log replay"""
+        positions: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            if self.checkpoint_path.exists():
+                with open(self.checkpoint_path, "r") as f:
+                    positions = json.load(f) or {}
+        except Exception as e:
+            logger.error(f"Failed to load position checkpoint: {e}")
+
+        if self.wal_path.exists():
+            with open(self.wal_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping torn position log record")
+                        continue
+
+                    self._wal_records += 1
+                    token_address = record.get("token")
+                    if record.get("op") == "put":
+                        positions[token_address] = record["position"]
+                    elif record.get("op") == "update" and token_address in positions:
+                        positions[token_address].update(record["fields"])
+                    elif record.get("op") == "delete":
+                        positions.pop(token_address, None)
+
+        if positions:
+            logger.info(f"📊 Position book loaded {len(positions)} positions ({self._wal_records} log records replayed)")
+        return positions
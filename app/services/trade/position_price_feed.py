@@ -0,0 +1,373 @@
+import asyncio
+import base64
+import itertools
+import json
+import struct
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from loguru import logger
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+    logger.debug("websockets not installed - position price feed disabled")
+
+from app.core.config import get_settings
+from app.services.service_manager import api_manager
+from app.services.snapshots.snapshot_store import snapshot_store
+
+settings = get_settings()
+
+
+WSOL_MINT = "So11111111111111111111111111111111111111112"
+LAMPORTS_PER_SOL = 1_000_000_000
+
+# Pump.fun bonding curve account: discriminator, virtual token reserves, virtual SOL
+# reserves, real token reserves, real SOL reserves, token supply, complete flag
+BONDING_CURVE_DEX_IDS = ("pumpfun",)
+BONDING_CURVE_LAYOUT = struct.Struct("<8sQQQQQ?")
+BONDING_CURVE_TOKEN_DECIMALS = 6
+
+
+def decode_bonding_curve(data: Any) -> Dict[str, Any]:
+    """Decode reserves from a base64 bonding curve account"""
+    raw = base64.b64decode(data[0] if isinstance(data, list) else data)
+    _, virtual_token, virtual_sol, _, real_sol, _, complete = BONDING_CURVE_LAYOUT.unpack_from(raw)
+    return {
+        "sol": virtual_sol / LAMPORTS_PER_SOL,
+        "token": virtual_token / 10 ** BONDING_CURVE_TOKEN_DECIMALS,
+        "liquidity_sol": real_sol / LAMPORTS_PER_SOL,
+        "complete": complete
+    }
+
+
+def decode_token_account(data: Dict[str, Any]) -> float:
+    """UI balance of a jsonParsed SPL token account"""
+    return float(data["parsed"]["info"]["tokenAmount"]["uiAmount"] or 0)
+
+
+class PositionPriceFeed:
+    """Push-based price and liquidity feed for tokens with open positions
+
+    Subscribes to the pool accounts of every active position over Helius websocket
+    RPC: the bonding curve account for pump.fun tokens, the token and WSOL vaults
+    for AMM pools. Every account change is decoded into reserves, priced in USD
+    with a SOL/USD quote, and handed to the autotrade exit checks. Until a quote is
+    available a watch is anchored to its snapshot price at the first reserves read
+    from its own accounts, so prices never mix reserves of different sources.
+    Ticks of all tokens are evaluated together in one vectorized pass; while a
+    pass runs, newer ticks replace older ones.
+    """
+
+    def __init__(self, connect: Optional[Callable[[str], Any]] = None):
+        self.enabled = settings.POSITION_PRICE_FEED_ENABLED
+        self.ws_url = settings.get_helius_ws_url()
+        self.commitment = settings.POSITION_PRICE_FEED_COMMITMENT
+        self.sync_interval = settings.SNAPSHOT_POSITION_INTERVAL
+        self._connect = connect or (websockets.connect if WEBSOCKETS_AVAILABLE else None)
+
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+        self.sync_task: Optional[asyncio.Task] = None
+        self._ws = None
+        self._ids = itertools.count(1)
+
+        self.watches: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[int, Tuple[str, str]] = {}
+        self._subscriptions: Dict[int, Tuple[str, str]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._evaluator: Optional[asyncio.Task] = None
+        self.sol_usd: Optional[float] = None
+
+        self.stats = {
+            "ticks": 0,
+            "evaluations": 0,
+            "reconnects": 0,
+            "decode_errors": 0,
+            "last_tick_time": None
+        }
+
+    async def start(self) -> bool:
+        """Start the websocket connection and position sync"""
+        if not self.enabled or self._connect is None:
+            logger.info("📡 Position price feed is DISABLED")
+            return False
+
+        if self.running:
+            return True
+
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+        self.sync_task = asyncio.create_task(self._sync_loop())
+        logger.info(f"📡 Position price feed started ({self.commitment} commitment)")
+        return True
+
+    async def stop(self) -> None:
+        """Stop the feed and pending exit checks"""
+        self.running = False
+
+        tasks = [task for task in (self.task, self.sync_task, self._evaluator) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.task = self.sync_task = self._evaluator = None
+        self._latest.clear()
+        self._subscriptions.clear()
+        self._pending.clear()
+        logger.info("📡 Position price feed stopped")
+
+    async def sync_positions(self) -> None:
+        """Watch newly opened positions, drop closed ones, refresh the SOL/USD quote"""
+        from app.services.trade.autotrade_service import autotrade_service
+
+        tokens = {position["token_address"] for position in autotrade_service.get_active_positions()}
+
+        for token_address in set(self.watches) - tokens:
+            await self.unwatch(token_address)
+
+        if tokens:
+            sol_usd = await self._fetch_sol_usd()
+            if sol_usd:
+                self.sol_usd = sol_usd
+                for watch in self.watches.values():
+                    watch["sol_usd"] = sol_usd
+
+        for token_address in tokens - set(self.watches):
+            await self.watch(token_address)
+
+    async def watch(self, token_address: str) -> bool:
+        """Subscribe to the pool accounts of a token"""
+        watch = await self._resolve_watch(token_address)
+        if not watch:
+            return False
+
+        self.watches[token_address] = watch
+        if self._ws is not None:
+            await self._subscribe(token_address, watch)
+
+        logger.info(f"📡 Streaming {watch['dex']} pool {watch['pool']} for {token_address}")
+        return True
+
+    async def unwatch(self, token_address: str) -> None:
+        """Drop all subscriptions of a token"""
+        watch = self.watches.pop(token_address, None)
+        self._latest.pop(token_address, None)
+        if not watch:
+            return
+
+        for subscription_id in watch["subscriptions"].values():
+            self._subscriptions.pop(subscription_id, None)
+            if self._ws is not None:
+                await self._send("accountUnsubscribe", [subscription_id])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "running": self.running,
+            "connected": self._ws is not None,
+            "watched_tokens": len(self.watches),
+            "subscriptions": len(self._subscriptions),
+            "sol_usd": self.sol_usd
+        }
+
+    async def _run(self) -> None:
+        """Keep one websocket open, resubscribing every watch after a reconnect"""
+        backoff = 1.0
+
+        while self.running:
+            try:
+                async with self._connect(self.ws_url) as ws:
+                    self._ws = ws
+                    backoff = 1.0
+                    self._subscriptions.clear()
+                    self._pending.clear()
+
+                    for token_address, watch in list(self.watches.items()):
+                        await self._subscribe(token_address, watch)
+
+                    async for raw in ws:
+                        self._handle_message(json.loads(raw))
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.stats["reconnects"] += 1
+                logger.warning(f"Position price feed connection lost: {str(e)}")
+            finally:
+                self._ws = None
+
+            if self.running:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def _sync_loop(self) -> None:
+        while self.running:
+            try:
+                await self.sync_positions()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Position price feed sync failed: {str(e)}")
+            await asyncio.sleep(self.sync_interval)
+
+    async def _resolve_watch(self, token_address: str) -> Optional[Dict[str, Any]]:
+        """Pool accounts and anchor price for a token from its latest snapshot"""
+        record = await snapshot_store.get(token_address)
+        market_data = (record or {}).get("market_data", {})
+        pool = market_data.get("poolAddress")
+        dex = market_data.get("dexType") or "unknown"
+        try:
+            anchor_price = float(market_data.get("currentPriceUSD") or 0)
+        except (TypeError, ValueError):
+            anchor_price = 0.0
+
+        if not pool or anchor_price <= 0:
+            logger.debug(f"No pool/price data in snapshot for {token_address} - staying on snapshot checks")
+            return None
+
+        if dex in BONDING_CURVE_DEX_IDS:
+            accounts = {pool: "curve"}
+        else:
+            helius = api_manager.clients.get("helius")
+            if not helius:
+                return None
+            token_vaults = await helius.get_token_accounts_by_owner(pool, token_address)
+            sol_vaults = await helius.get_token_accounts_by_owner(pool, WSOL_MINT)
+            if not token_vaults or not sol_vaults:
+                logger.debug(f"Vaults of {dex} pool {pool} not owned by the pool - staying on snapshot checks")
+                return None
+            accounts = {token_vaults[0]["address"]: "token", sol_vaults[0]["address"]: "sol"}
+
+        return {
+            "token_address": token_address,
+            "pool": pool,
+            "dex": dex,
+            "accounts": accounts,
+            "reserves": {},
+            "subscriptions": {},
+            "anchor_price": anchor_price,
+            "sol_usd": self.sol_usd
+        }
+
+    async def _fetch_sol_usd(self) -> Optional[float]:
+        """Current SOL price in USD (Birdeye WSOL quote), None when unavailable"""
+        birdeye = api_manager.clients.get("birdeye")
+        if not birdeye:
+            return None
+
+        try:
+            quote = await birdeye.get_token_price(WSOL_MINT, include_liquidity=False)
+            sol_usd = float((quote or {}).get("value") or 0)
+        except Exception as e:
+            logger.debug(f"SOL/USD quote unavailable: {str(e)}")
+            return None
+        return sol_usd if sol_usd > 0 else None
+
+    async def _subscribe(self, token_address: str, watch: Dict[str, Any]) -> None:
+        for account, role in watch["accounts"].items():
+            encoding = "base64" if role == "curve" else "jsonParsed"
+            request_id = await self._send("accountSubscribe", [account, {"encoding": encoding, "commitment": self.commitment}])
+            self._pending[request_id] = (token_address, role)
+
+    async def _send(self, method: str, params: list) -> int:
+        request_id = next(self._ids)
+        await self._ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+        return request_id
+
+    def _handle_message(self, message: Dict[str, Any]) -> None:
+        if message.get("id") in self._pending:
+            token_address, role = self._pending.pop(message["id"])
+            watch = self.watches.get(token_address)
+            if watch is not None and "result" in message:
+                watch["subscriptions"][role] = message["result"]
+                self._subscriptions[message["result"]] = (token_address, role)
+            elif "error" in message:
+                logger.warning(f"Pool subscription failed for {token_address}: {message['error']}")
+            return
+
+        if message.get("method") != "accountNotification":
+            return
+
+        params = message.get("params", {})
+        target = self._subscriptions.get(params.get("subscription"))
+        if target is None:
+            return
+
+        token_address, role = target
+        result = params.get("result", {})
+        self._on_account_update(token_address, role, result.get("value", {}).get("data"), result.get("context", {}).get("slot"))
+
+    def _on_account_update(self, token_address: str, role: str, data: Any, slot: Optional[int]) -> None:
+        """Decode an account change into reserves and emit a tick once both sides are known"""
+        watch = self.watches.get(token_address)
+        if watch is None:
+            return
+
+        try:
+            if role == "curve":
+                curve = decode_bonding_curve(data)
+                watch["reserves"].update(sol=curve["sol"], token=curve["token"], liquidity_sol=curve["liquidity_sol"])
+                if curve["complete"]:
+                    watch["reserves"]["migrated"] = True
+            else:
+                watch["reserves"][role] = decode_token_account(data)
+        except Exception as e:
+            self.stats["decode_errors"] += 1
+            logger.debug(f"Could not decode {role} account update for {token_address}: {str(e)}")
+            return
+
+        tick = self._build_tick(watch, slot)
+        if tick is not None:
+            self.stats["ticks"] += 1
+            self.stats["last_tick_time"] = tick["timestamp"]
+            self._dispatch(token_address, tick)
+
+    def _build_tick(self, watch: Dict[str, Any], slot: Optional[int]) -> Optional[Dict[str, Any]]:
+        reserves = watch["reserves"]
+        sol, token = reserves.get("sol"), reserves.get("token")
+        if not sol or not token:
+            return None
+
+        if not watch["sol_usd"]:
+            # No quote yet - the first reserves of this pool correspond to the snapshot price
+            watch["sol_usd"] = watch["anchor_price"] * token / sol
+            logger.debug(f"Price feed for {watch['token_address']} anchored at ${watch['sol_usd']:.2f}/SOL")
+
+        liquidity_sol = reserves.get("liquidity_sol", sol)
+        return {
+            "currentPriceUSD": sol / token * watch["sol_usd"],
+            "liquidityUSD": liquidity_sol * watch["sol_usd"] * 2,
+            "solReserve": sol,
+            "tokenReserve": token,
+            "poolAddress": watch["pool"],
+            "dexType": watch["dex"],
+            "migrated": reserves.get("migrated", False),
+            "slot": slot,
+            "source": "price_feed",
+            "timestamp": time.time()
+        }
+
+    def _dispatch(self, token_address: str, tick: Dict[str, Any]) -> None:
+        """Queue the tick; a running batch check picks up the newest ticks when it finishes"""
+        self._latest[token_address] = tick
+        if self._evaluator is None or self._evaluator.done():
+            self._evaluator = asyncio.create_task(self._evaluate())
+
+    async def _evaluate(self) -> None:
+        from app.services.trade.autotrade_service import autotrade_service
+
+        while self._latest:
+            ticks, self._latest = self._latest, {}
+            try:
+                await autotrade_service.check_positions_batch(ticks)
+                self.stats["evaluations"] += len(ticks)
+            except Exception as e:
+                logger.error(f"Price feed exit checks failed: {str(e)}")
+
+
+# Global position price feed instance
+position_price_feed = PositionPriceFeed()
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+# Reason codes in precedence order (0 = hold), same order as AutoTradeService._evaluate_sell_conditions
+SELL_REASONS = ("", "stop_loss", "take_profit", "trailing_stop", "liquidity_drain", "max_hold_time")
+
+
+def _column(positions: List[Dict[str, Any]], field: str) -> np.ndarray:
+    return np.array([float(position.get(field) or 0) for position in positions], dtype=np.float64)
+
+
+class PositionColumns:
+    """Open positions as NumPy columns for vectorized exit checks"""
+
+    def __init__(self, positions: List[Dict[str, Any]]):
+        self.tokens = [position["token_address"] for position in positions]
+        self.index = {token_address: i for i, token_address in enumerate(self.tokens)}
+        self.entry_price = _column(positions, "entry_price")
+        self.highest_price = _column(positions, "highest_price_seen")
+        self.stop_loss_percent = _column(positions, "stop_loss_percent")
+        self.take_profit_percent = _column(positions, "take_profit_percent")
+        self.trailing_stop_percent = _column(positions, "trailing_stop_percent")
+        self.entry_liquidity = _column(positions, "entry_liquidity")
+        self.entry_time = _column(positions, "entry_time")
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+def evaluate_sell_conditions(
+    columns: PositionColumns,
+    rows: np.ndarray,
+    prices: np.ndarray,
+    liquidities: np.ndarray,
+    now: float,
+    liquidity_drain_threshold: float,
+    max_hold_hours: float
+) -> np.ndarray:
+    """Reason code per row (index into SELL_REASONS) for one price/liquidity vector
+
+    ``rows`` selects positions in ``columns``; ``prices`` and ``liquidities`` are
+    aligned with ``rows``. Rows without a valid price or entry price always hold.
+    """
+    entry_price = columns.entry_price[rows]
+    highest_price = columns.highest_price[rows]
+    entry_liquidity = columns.entry_liquidity[rows]
+
+    valid = (prices > 0) & (entry_price > 0)
+    safe_entry = np.where(entry_price > 0, entry_price, 1.0)
+    pnl_percent = (prices - entry_price) / safe_entry * 100
+
+    conditions = [
+        pnl_percent <= columns.stop_loss_percent[rows],
+        pnl_percent >= columns.take_profit_percent[rows],
+        (prices <= highest_price * (1 - columns.trailing_stop_percent[rows] / 100)) & (highest_price > entry_price * 1.05),
+        (entry_liquidity > 0) & (liquidities < entry_liquidity * liquidity_drain_threshold),
+        (now - columns.entry_time[rows]) / 3600 > max_hold_hours
+    ]
+    codes = np.select(conditions, np.arange(1, len(SELL_REASONS)), default=0)
+    return np.where(valid, codes, 0)
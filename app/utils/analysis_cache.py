@@ -0,0 +1,133 @@
+import time
+from typing import Any, Optional, Dict
+from loguru import logger
+
+from app.core.config import get_settings
+from app.utils.cache import cache_manager
+
+settings = get_settings()
+
+
+class AnalysisCache:
+    """Content-addressed cache for analysis results keyed by token, analysis type and freshness bucket"""
+
+    def __init__(self, cache=None):
+        self.cache = cache or cache_manager
+        self.prefix = "analysis_result"
+        self.enabled = settings.ANALYSIS_CACHE_ENABLED
+        self.freshness = {
+            "quick": settings.ANALYSIS_CACHE_TTL_QUICK,
+            "deep": settings.ANALYSIS_CACHE_TTL_DEEP,
+            "security_only": settings.ANALYSIS_CACHE_TTL_SECURITY
+        }
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def get_freshness(self, analysis_type: str) -> int:
+        """Get freshness window (seconds) for an analysis tier"""
+        return max(1, int(self.freshness.get(analysis_type, settings.CACHE_TTL_SHORT)))
+
+    def get_bucket(self, analysis_type: str, now: Optional[float] = None) -> int:
+        """Get current freshness bucket index for an analysis tier"""
+        now = time.time() if now is None else now
+        return int(now // self.get_freshness(analysis_type))
+
+    def build_key(self, token_address: str, analysis_type: str, now: Optional[float] = None) -> str:
+        """Build deterministic cache key for (token, analysis type, freshness bucket)"""
+        bucket = self.get_bucket(analysis_type, now)
+        return f"{self.prefix}:{analysis_type}:{token_address}:{bucket}"
+
+    async def get(self, token_address: str, analysis_type: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Get cached analysis for the current freshness bucket"""
+        if not self.enabled:
+            return None
+
+        if force_refresh:
+            self._record(analysis_type, "bypasses")
+            return None
+
+        key = self.build_key(token_address, analysis_type)
+        try:
+            cached = await self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"Analysis cache GET failed for {token_address}: {str(e)}")
+            self._record(analysis_type, "errors")
+            return None
+
+        if isinstance(cached, dict):
+            self._record(analysis_type, "hits")
+            return cached
+
+        self._record(analysis_type, "misses")
+        return None
+
+    async def set(
+        self,
+        token_address: str,
+        analysis_type: str,
+        analysis_result: Dict[str, Any],
+        retention: Optional[int] = None,
+        now: Optional[float] = None
+    ) -> Optional[str]:
+        """Store analysis in the current freshness bucket, returns cache key on success"""
+        if not self.enabled:
+            return None
+
+        key = self.build_key(token_address, analysis_type, now)
+        ttl = max(self.get_freshness(analysis_type), retention or 0)
+        try:
+            success = await self.cache.set(key, analysis_result, ttl=ttl)
+            if success:
+                self._record(analysis_type, "sets")
+                return key
+        except Exception as e:
+            logger.warning(f"Analysis cache SET failed for {token_address}: {str(e)}")
+            self._record(analysis_type, "errors")
+        return None
+
+    async def invalidate(self, token_address: str, analysis_type: Optional[str] = None) -> int:
+        """Drop current-bucket entries for a token (all tiers if analysis_type is None)"""
+        analysis_types = [analysis_type] if analysis_type else list(self.freshness.keys())
+        deleted = 0
+        for tier in analysis_types:
+            if await self.cache.delete(self.build_key(token_address, tier)):
+                deleted += 1
+        return deleted
+
+    def _record(self, analysis_type: str, event: str) -> None:
+        """Record cache event for an analysis tier"""
+        tier_stats = self._stats.setdefault(
+            analysis_type,
+            {"hits": 0, "misses": 0, "bypasses": 0, "sets": 0, "errors": 0}
+        )
+        tier_stats[event] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss metrics per analysis tier"""
+        tiers = {}
+        total_hits = 0
+        total_lookups = 0
+
+        for analysis_type, tier_stats in self._stats.items():
+            lookups = tier_stats["hits"] + tier_stats["misses"]
+            total_hits += tier_stats["hits"]
+            total_lookups += lookups
+            tiers[analysis_type] = {
+                **tier_stats,
+                "hit_rate": round(tier_stats["hits"] / lookups * 100, 2) if lookups > 0 else 0,
+                "freshness_seconds": self.get_freshness(analysis_type)
+            }
+
+        return {
+            "enabled": self.enabled,
+            "tiers": tiers,
+            "hit_rate": round(total_hits / total_lookups * 100, 2) if total_lookups > 0 else 0,
+            "total_lookups": total_lookups
+        }
+
+    def reset_stats(self) -> None:
+        """Reset analysis cache metrics"""
+        self._stats = {}
+
+
+# Global analysis cache instance
+analysis_cache = AnalysisCache()
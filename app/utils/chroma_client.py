@@ -1,6 +1,10 @@
 import hashlib
 import asyncio
-from typing import Any, Dict, List, Optional
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
@@ -20,8 +24,96 @@ from app.core.config import get_settings
 settings = get_settings()
 
 
+def _default_embedding_function(model: str):
+    # ONNX all-MiniLM-L6-v2 bundled with ChromaDB - local, no torch required
+    from chromadb.utils import embedding_functions
+    return embedding_functions.DefaultEmbeddingFunction()
+
+
+def _sentence_transformer_embedding_function(model: str):
+    from chromadb.utils import embedding_functions
+    return embedding_functions.SentenceTransformerEmbeddingFunction(model_name=model)
+
+
+# Embedding backends by CHROMA_EMBEDDING_BACKEND name: factory(model) -> ChromaDB embedding function
+EMBEDDING_BACKENDS: Dict[str, Callable[[str], Any]] = {
+    "default": _default_embedding_function,
+    "sentence_transformers": _sentence_transformer_embedding_function
+}
+
+# Query phrasings embedded at startup so the first searches skip model load and inference
+WARMUP_QUERIES = ("token analysis", "analysis run", "snapshot")
+
+
+def register_embedding_backend(name: str, factory: Callable[[str], Any]) -> None:
+    """Make an embedding backend selectable through CHROMA_EMBEDDING_BACKEND"""
+    EMBEDDING_BACKENDS[name] = factory
+
+
+class CachedEmbedder:
+    """Embedding function wrapper with an LRU of query embeddings
+    
+    Document batches are embedded in a single backend call; query strings are
+    memoized, so repeated searches skip inference entirely. Methods are synchronous
+    and meant to run on the Chroma thread pool.
+    """
+    
+    def __init__(self, function: Any, name: str, cache_size: int):
+        self.function = function
+        self.name = name
+        self.cache_size = cache_size
+        self._queries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"query_hits": 0, "query_misses": 0, "documents_embedded": 0, "document_batches": 0}
+    
+    @staticmethod
+    def _as_lists(embeddings: Any) -> List[List[float]]:
+        return [[float(x) for x in embedding] for embedding in embeddings]
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        embeddings = self._as_lists(self.function(texts))
+        self.stats["documents_embedded"] += len(texts)
+        self.stats["document_batches"] += 1
+        return embeddings
+    
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            if text in self._queries:
+                self._queries.move_to_end(text)
+                self.stats["query_hits"] += 1
+                return self._queries[text]
+        
+        embedding = self._as_lists(self.function([text]))[0]
+        with self._lock:
+            self.stats["query_misses"] += 1
+            self._queries[text] = embedding
+            while len(self._queries) > self.cache_size:
+                self._queries.popitem(last=False)
+        return embedding
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "cached_queries": len(self._queries), **self.stats}
+
+
 class ChromaClient:
-    """ChromaDB client for vector storage and knowledge management"""
+    """ChromaDB client for vector storage and knowledge management
+    
+    Chroma calls are synchronous (SQLite I/O plus embedding computation), so every
+    one of them runs on a small dedicated thread pool behind async methods instead of
+    on the event loop. Use ``get``/``query``/``update``/``delete``/``count`` rather
+    than touching the collection directly.
+    
+    Writes are write-behind: ``add_document`` queues an upsert and returns, and the
+    queue is flushed as one batched ``upsert`` (one embedding call) once it holds
+    ``CHROMA_WRITE_BATCH_SIZE`` documents or ``CHROMA_WRITE_FLUSH_MS`` after the first
+    queued write. Reads flush pending writes first, and ``disconnect`` drains them.
+    A document whose batch failed ``CHROMA_WRITE_MAX_RETRIES`` times is written on
+    its own and dropped if it still fails, so it cannot block the queue.
+    
+    Embeddings come from the ``CHROMA_EMBEDDING_BACKEND`` backend through a
+    ``CachedEmbedder``: each flushed batch is embedded in one call and search
+    queries are memoized.
+    """
     
     def __init__(self):
         self._client = None
@@ -30,6 +122,65 @@ class ChromaClient:
         self.collection_name = settings.CHROMA_COLLECTION_NAME
         self._connected = False
         self._connection_lock = asyncio.Lock()
+        self.pool_size = max(1, settings.CHROMA_THREAD_POOL_SIZE)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Write-behind buffer: doc_id -> (content, metadata), last write wins
+        self.write_batch_size = max(1, settings.CHROMA_WRITE_BATCH_SIZE)
+        self.write_flush_interval = settings.CHROMA_WRITE_FLUSH_MS / 1000
+        self.write_max_retries = max(1, settings.CHROMA_WRITE_MAX_RETRIES)
+        self._pending: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._failures: Dict[str, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: Optional[asyncio.Task] = None
+        self.write_stats = {"queued": 0, "flushed": 0, "batches": 0, "failed_batches": 0, "dropped": 0}
+        # Called with the ID of every queued document that is given up on (never written)
+        self._drop_listeners: List[Callable[[str], Awaitable[None]]] = []
+        
+        # Created with the collection; None leaves embedding to the collection itself
+        self.embedder: Optional[CachedEmbedder] = None
+    
+    async def _run(self, func, *args, **kwargs) -> Any:
+        """Run a synchronous Chroma call on the Chroma thread pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="chroma")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def _require_collection(self, ids: Optional[List[str]] = None):
+        if not self.is_connected():
+            success = await self.connect()
+            if not success:
+                raise Exception("ChromaDB not available")
+        # Operations see every write queued before them; exact-ID calls only wait for their own IDs
+        if self._pending and (ids is None or any(doc_id in self._pending for doc_id in ids)):
+            await self.flush()
+        return self._collection
+    
+    async def get(self, **kwargs) -> Dict[str, Any]:
+        """Collection ``get`` (exact ids / metadata filter, no embedding)"""
+        collection = await self._require_collection(kwargs.get("ids") if not kwargs.get("where") else None)
+        return await self._run(collection.get, **kwargs)
+    
+    async def query(self, **kwargs) -> Dict[str, Any]:
+        """Collection ``query`` (embeds ``query_texts``)"""
+        collection = await self._require_collection()
+        return await self._run(collection.query, **kwargs)
+    
+    async def update(self, **kwargs) -> None:
+        """Collection ``update`` (re-embeds changed documents)"""
+        collection = await self._require_collection(kwargs.get("ids"))
+        await self._run(collection.update, **kwargs)
+    
+    async def delete(self, **kwargs) -> None:
+        """Collection ``delete``"""
+        collection = await self._require_collection(kwargs.get("ids") if not kwargs.get("where") else None)
+        await self._run(collection.delete, **kwargs)
+    
+    async def count(self) -> int:
+        """Number of documents in the collection"""
+        collection = await self._require_collection()
+        return await self._run(collection.count)
     
     async def connect(self):
         """Initialize ChromaDB connection with improved error handling"""
@@ -125,7 +276,7 @@ class ChromaClient:
     async def _init_persistent_client(self):
         """Try new persistent client method"""
         try:
-            return chromadb.PersistentClient(path=str(self.db_path))
+            return await self._run(chromadb.PersistentClient, path=str(self.db_path))
         except Exception as e:
             logger.debug(f"PersistentClient failed: {e}")
             raise
@@ -138,7 +289,7 @@ class ChromaClient:
                 persist_directory=str(self.db_path),
                 anonymized_telemetry=False
             )
-            return chromadb.Client(chroma_settings)
+            return await self._run(chromadb.Client, chroma_settings)
         except Exception as e:
             logger.debug(f"Legacy client failed: {e}")
             raise
@@ -147,16 +298,29 @@ class ChromaClient:
         """Fallback to ephemeral (in-memory) client"""
         try:
             logger.warning("Using ephemeral ChromaDB client - data will not persist")
-            return chromadb.EphemeralClient()
+            return await self._run(chromadb.EphemeralClient)
         except Exception as e:
             logger.debug(f"Ephemeral client failed: {e}")
             raise
     
+    def _create_embedder(self) -> CachedEmbedder:
+        backend = settings.CHROMA_EMBEDDING_BACKEND
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{backend}' (available: {', '.join(EMBEDDING_BACKENDS)})")
+        
+        function = EMBEDDING_BACKENDS[backend](settings.CHROMA_EMBEDDING_MODEL)
+        name = backend if backend == "default" else f"{backend}:{settings.CHROMA_EMBEDDING_MODEL}"
+        return CachedEmbedder(function, name, settings.CHROMA_QUERY_EMBEDDING_CACHE_SIZE)
+    
     async def _initialize_collection(self):
         """Initialize collection with better error handling"""
         if not self._client:
             return False
         
+        if self.embedder is None:
+            self.embedder = await self._run(self._create_embedder)
+            logger.info(f"ChromaDB embedding backend: {self.embedder.name}")
+        
         # Generate unique collection name if there are conflicts
         original_name = self.collection_name
         attempts = 0
@@ -168,7 +332,11 @@ class ChromaClient:
                 
                 # Try to get existing collection first
                 try:
-                    self._collection = self._client.get_collection(name=current_name)
+                    self._collection = await self._run(
+                        self._client.get_collection,
+                        name=current_name,
+                        embedding_function=self.embedder.function
+                    )
                     logger.info(f"Using existing collection: {current_name}")
                     self.collection_name = current_name
                     return True
@@ -177,8 +345,10 @@ class ChromaClient:
                     pass
                 
                 # Try to create new collection
-                self._collection = self._client.create_collection(
+                self._collection = await self._run(
+                    self._client.create_collection,
                     name=current_name,
+                    embedding_function=self.embedder.function,
                     metadata={
                         "description": "Solana token knowledge base",
                         "created_at": datetime.utcnow().isoformat(),
@@ -196,7 +366,7 @@ class ChromaClient:
                 if attempts < max_attempts:
                     # Try to delete potentially corrupted collection
                     try:
-                        self._client.delete_collection(name=current_name)
+                        await self._run(self._client.delete_collection, name=current_name)
                         logger.debug(f"Deleted potentially corrupted collection: {current_name}")
                     except Exception:
                         pass
@@ -214,13 +384,33 @@ class ChromaClient:
         )
     
     async def disconnect(self):
-        """Close ChromaDB connection"""
+        """Flush queued writes and close ChromaDB connection
+        
+        Flushing repeats until every queued document is written or has been dropped
+        after its retries; only documents left when ChromaDB is unreachable are lost.
+        """
+        if self._flush_timer and not self._flush_timer.done():
+            self._flush_timer.cancel()
+        delay = 0.05
+        while self._pending and self.is_connected():
+            dropped = self.write_stats["dropped"]
+            if not await self.flush() and self.write_stats["dropped"] == dropped:
+                # Nothing went through - give a transient error (locked database) a moment
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 1.0)
+        if self._pending:
+            logger.warning(f"ChromaDB closed with {len(self._pending)} unflushed documents")
+            for doc_id in list(self._pending):
+                await self._drop(doc_id)
+            self._pending.clear()
+        self._failures.clear()
+        
         async with self._connection_lock:
             if self._client:
                 try:
                     # Try to persist data if method exists
                     if hasattr(self._client, 'persist'):
-                        self._client.persist()
+                        await self._run(self._client.persist)
                         logger.debug("ChromaDB data persisted")
                 except Exception as e:
                     logger.warning(f"Error persisting ChromaDB data: {str(e)}")
@@ -228,6 +418,10 @@ class ChromaClient:
             self._client = None
             self._collection = None
             self._connected = False
+            
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
             logger.debug("ChromaDB connection closed")
     
     def _generate_id(self, content: str, metadata: Dict[str, Any] = None) -> str:
@@ -244,55 +438,111 @@ class ChromaClient:
         metadata: Dict[str, Any] = None,
         doc_id: Optional[str] = None
     ) -> str:
-        """Add document to knowledge base with better error handling"""
+        """Queue a document upsert (write-behind), returns its ID
+        
+        An existing document with the same ID is replaced. A full batch is flushed
+        before returning, which keeps producers from outrunning ChromaDB.
+        """
         if not self.is_connected():
             success = await self.connect()
             if not success:
                 raise Exception("ChromaDB not available")
         
-        try:
-            if doc_id is None:
-                doc_id = self._generate_id(content, metadata)
-            
-            # Ensure doc_id is unique by checking if it already exists
-            max_attempts = 3
-            for attempt in range(max_attempts):
-                current_doc_id = f"{doc_id}_{attempt}" if attempt > 0 else doc_id
-                
+        if doc_id is None:
+            doc_id = self._generate_id(content, metadata)
+        
+        doc_metadata = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "content_type": "text",
+            "doc_id": doc_id,
+            **(metadata or {})
+        }
+        
+        self._pending[doc_id] = (content, doc_metadata)
+        self._pending.move_to_end(doc_id)
+        self._failures.pop(doc_id, None)
+        self.write_stats["queued"] += 1
+        
+        if len(self._pending) >= self.write_batch_size:
+            await self.flush()
+        elif self._flush_timer is None or self._flush_timer.done():
+            self._flush_timer = asyncio.create_task(self._flush_after(self.write_flush_interval))
+        
+        logger.debug(f"Queued document for ChromaDB: {doc_id}")
+        return doc_id
+    
+    async def flush(self) -> int:
+        """Upsert queued documents in batches, returns number written
+        
+        A failed batch goes back to the front of the queue (newer writes for the
+        same IDs win) and is retried on the next flush. Documents that failed
+        ``write_max_retries`` times are retried alone and dropped if that fails too.
+        """
+        async with self._flush_lock:
+            flushed = 0
+            while self._pending and self._collection is not None:
+                head = next(iter(self._pending))
+                size = 1 if self._failures.get(head, 0) >= self.write_max_retries else self.write_batch_size
+                batch = [self._pending.popitem(last=False) for _ in range(min(size, len(self._pending)))]
+                documents = [content for _, (content, _) in batch]
                 try:
-                    # Check if document already exists
-                    existing = self._collection.get(ids=[current_doc_id])
-                    if existing['ids']:
-                        if attempt == max_attempts - 1:
-                            # Use the existing document ID with timestamp
-                            current_doc_id = f"{doc_id}_{int(datetime.utcnow().timestamp())}"
-                        else:
-                            continue
-                except Exception:
-                    # Document doesn't exist, we can use this ID
-                    pass
-                
-                # Prepare metadata
-                doc_metadata = {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "content_type": "text",
-                    "doc_id": current_doc_id,
-                    **(metadata or {})
-                }
-                
-                # Add to collection
-                self._collection.add(
-                    documents=[content],
-                    metadatas=[doc_metadata],
-                    ids=[current_doc_id]
-                )
-                
-                logger.debug(f"Added document to ChromaDB: {current_doc_id}")
-                return current_doc_id
+                    extra = {}
+                    if self.embedder is not None:
+                        extra["embeddings"] = await self._run(self.embedder.embed_documents, documents)
+                    await self._run(
+                        self._collection.upsert,
+                        ids=[doc_id for doc_id, _ in batch],
+                        documents=documents,
+                        metadatas=[metadata for _, (_, metadata) in batch],
+                        **extra
+                    )
+                except Exception as e:
+                    self.write_stats["failed_batches"] += 1
+                    if size == 1:
+                        doc_id = batch[0][0]
+                        logger.error(f"Dropping ChromaDB document {doc_id} after {self.write_max_retries + 1} failed upserts: {str(e)}")
+                        await self._drop(doc_id)
+                        continue
+                    
+                    logger.error(f"Error upserting {len(batch)} documents to ChromaDB: {str(e)}")
+                    for doc_id, _ in batch:
+                        self._failures[doc_id] = self._failures.get(doc_id, 0) + 1
+                    restored = OrderedDict(batch)
+                    restored.update(self._pending)
+                    self._pending = restored
+                    break
                 
+                for doc_id, _ in batch:
+                    self._failures.pop(doc_id, None)
+                flushed += len(batch)
+                self.write_stats["flushed"] += len(batch)
+                self.write_stats["batches"] += 1
+                logger.debug(f"Upserted {len(batch)} documents to ChromaDB")
+            return flushed
+    
+    def add_drop_listener(self, listener: Callable[[str], Awaitable[None]]) -> None:
+        """Register a coroutine called with the ID of each queued document that is never written"""
+        self._drop_listeners.append(listener)
+    
+    async def _drop(self, doc_id: str) -> None:
+        self._failures.pop(doc_id, None)
+        self.write_stats["dropped"] += 1
+        for listener in self._drop_listeners:
+            try:
+                await listener(doc_id)
+            except Exception as e:
+                logger.warning(f"ChromaDB drop listener failed for {doc_id}: {str(e)}")
+    
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self.flush()
         except Exception as e:
-            logger.error(f"Error adding document to ChromaDB: {str(e)}")
-            raise
+            logger.error(f"ChromaDB write-behind flush failed: {str(e)}")
+        if self._pending and self._collection is not None:
+            # Retry what is left (failed batch or writes queued during the flush), backing off while batches fail
+            next_delay = min(delay * 2, 30.0) if self._failures else self.write_flush_interval
+            self._flush_timer = asyncio.create_task(self._flush_after(next_delay))
     
     def _build_where_clause(self, filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
@@ -332,8 +582,17 @@ class ChromaClient:
             # Build proper where clause
             where_clause = self._build_where_clause(where)
             
-            results = self._collection.query(
-                query_texts=[query],
+            if self._pending:
+                await self.flush()
+            
+            if self.embedder is not None:
+                query_input = {"query_embeddings": [await self._run(self.embedder.embed_query, query)]}
+            else:
+                query_input = {"query_texts": [query]}
+            
+            results = await self._run(
+                self._collection.query,
+                **query_input,
                 n_results=n_results,
                 where=where_clause,
                 include=["documents", "metadatas", "distances"]
@@ -367,11 +626,17 @@ class ChromaClient:
                 return {"error": "ChromaDB not available", "total_documents": 0}
         
         try:
+            if self._pending:
+                await self.flush()
+            
             # Get collection count
-            count = self._collection.count()
+            count = await self._run(self._collection.count)
             
             stats = {
                 "total_documents": count,
+                "pending_writes": len(self._pending),
+                "write_stats": dict(self.write_stats),
+                "embeddings": self.embedder.get_stats() if self.embedder else None,
                 "collection_name": self.collection_name,
                 "db_path": str(self.db_path),
                 "chromadb_version": getattr(chromadb, '__version__', "unknown"),
@@ -390,6 +655,18 @@ class ChromaClient:
                 "connected": False
             }
     
+    async def warm_up(self) -> None:
+        """Load the embedding model and cache common query embeddings"""
+        if self.embedder is None:
+            return
+        
+        try:
+            for query in WARMUP_QUERIES:
+                await self._run(self.embedder.embed_query, query)
+            logger.info(f"ChromaDB embeddings warmed up ({self.embedder.name})")
+        except Exception as e:
+            logger.warning(f"ChromaDB embedding warm-up failed: {str(e)}")
+    
     async def _log_troubleshooting_info(self):
         """Log troubleshooting information"""
         logger.info("ChromaDB troubleshooting suggestions:")
@@ -408,6 +685,7 @@ async def init_chroma():
     if CHROMADB_AVAILABLE:
         success = await chroma_client.connect()
         if success:
+            await chroma_client.warm_up()
             logger.info("ChromaDB initialized successfully")
         else:
             logger.warning("ChromaDB initialization failed - continuing without vector storage")
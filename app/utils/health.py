@@ -463,7 +463,70 @@ async def get_service_metrics() -> Dict[str, Any]:
                 metrics["cache"] = {"status": "error", "error": cache_stats.get("error")}
         except Exception as e:
             metrics["cache"] = {"status": "error", "error": str(e)}
-        
+
+        # Analysis result cache metrics
+        try:
+            from app.utils.analysis_cache import analysis_cache
+            metrics["analysis_cache"] = analysis_cache.get_stats()
+        except Exception as e:
+            metrics["analysis_cache"] = {"status": "error", "error": str(e)}
+
+        # Event loop lag monitor metrics
+        try:
+            from app.utils.loop_monitor import loop_monitor
+            metrics["event_loop"] = loop_monitor.get_stats()
+        except Exception as e:
+            metrics["event_loop"] = {"status": "error", "error": str(e)}
+
+        # Security verdict index metrics
+        try:
+            from app.utils.security_index import security_index
+            metrics["security_index"] = security_index.get_stats()
+        except Exception as e:
+            metrics["security_index"] = {"status": "error", "error": str(e)}
+
+        # Snapshot refresh scheduler metrics (throughput and schedule lag)
+        try:
+            from app.services.snapshots.snapshot_scheduler import snapshot_scheduler
+            metrics["snapshot_scheduler"] = snapshot_scheduler.get_status()
+        except Exception as e:
+            metrics["snapshot_scheduler"] = {"status": "error", "error": str(e)}
+
+        # Analysis run blob store metrics
+        try:
+            from app.services.run_blob_store import run_blob_store
+            metrics["run_blobs"] = run_blob_store.get_stats()
+        except Exception as e:
+            metrics["run_blobs"] = {"status": "error", "error": str(e)}
+
+        # Single-flight coalescing metrics
+        try:
+            from app.utils.single_flight import single_flight
+            metrics["single_flight"] = single_flight.get_stats()
+        except Exception as e:
+            metrics["single_flight"] = {"status": "error", "error": str(e)}
+
+        # Per-provider API response cache metrics
+        try:
+            from app.utils.provider_cache import provider_cache
+            metrics["provider_cache"] = provider_cache.get_stats()
+        except Exception as e:
+            metrics["provider_cache"] = {"status": "error", "error": str(e)}
+
+        # Shared HTTP connection pool metrics
+        try:
+            from app.services.api.http_transport import http_transport
+            metrics["http_transport"] = http_transport.get_stats()
+        except Exception as e:
+            metrics["http_transport"] = {"status": "error", "error": str(e)}
+
+        # Provider rate limiter metrics
+        try:
+            from app.utils.provider_rate_limiter import provider_rate_limiter
+            metrics["provider_rate_limits"] = provider_rate_limiter.get_stats()
+        except Exception as e:
+            metrics["provider_rate_limits"] = {"status": "error", "error": str(e)}
+
         return metrics
         
     except Exception as e:
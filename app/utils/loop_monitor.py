@@ -0,0 +1,103 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class LoopLagMonitor:
+    """Detects callbacks that block the event loop
+
+    A heartbeat coroutine stamps the loop every ``interval``; a watchdog thread
+    checks the stamp and, once it is older than ``threshold``, logs the loop
+    thread's current stack - the code that is holding the loop. One warning is
+    logged per stall, with the total blocked time once the loop recovers.
+    """
+
+    def __init__(self, threshold_ms: Optional[float] = None, interval_ms: Optional[float] = None):
+        self.threshold = (threshold_ms if threshold_ms is not None else settings.LOOP_MONITOR_THRESHOLD_MS) / 1000
+        self.interval = (interval_ms if interval_ms is not None else settings.LOOP_MONITOR_INTERVAL_MS) / 1000
+        self.running = False
+        self._last_beat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stalled_since: Optional[float] = None
+        self.stats = {"stalls": 0, "max_lag_ms": 0.0, "last_stall_stack": None}
+
+    async def start(self) -> bool:
+        """Start heartbeat and watchdog on the running loop"""
+        if self.running:
+            return True
+
+        self.running = True
+        self._stop.clear()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"🐢 Event loop lag monitor started (threshold {self.threshold * 1000:.0f}ms)")
+        return True
+
+    async def stop(self) -> None:
+        """Stop heartbeat and watchdog"""
+        if not self.running:
+            return
+
+        self.running = False
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join, self.interval * 4)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while self.running:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            lag = time.monotonic() - self._last_beat - self.interval
+
+            if lag > self.threshold:
+                self.stats["max_lag_ms"] = max(self.stats["max_lag_ms"], round(lag * 1000, 1))
+                if self._stalled_since is None:
+                    self._stalled_since = self._last_beat
+                    self.stats["stalls"] += 1
+                    self._report_stall(lag)
+            elif self._stalled_since is not None:
+                blocked = time.monotonic() - self._stalled_since
+                logger.warning(f"🐢 Event loop recovered after ~{blocked * 1000:.0f}ms blocked")
+                self._stalled_since = None
+
+    def _report_stall(self, lag: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<loop thread stack unavailable>"
+        self.stats["last_stall_stack"] = stack
+        logger.warning(f"🐢 Event loop blocked for {lag * 1000:.0f}ms+ (threshold {self.threshold * 1000:.0f}ms), loop thread stack:\n{stack}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Stall counters for health metrics"""
+        return {
+            "running": self.running,
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "stalls": self.stats["stalls"],
+            "max_lag_ms": self.stats["max_lag_ms"],
+            "stalled": self._stalled_since is not None
+        }
+
+
+# Global event loop lag monitor instance
+loop_monitor = LoopLagMonitor()
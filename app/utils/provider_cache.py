@@ -0,0 +1,234 @@
+import copy
+import json
+import time
+import hashlib
+import functools
+import contextvars
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+# Set while a cached _request is running so internal retries hit the network directly
+_inside_request: contextvars.ContextVar[bool] = contextvars.ContextVar("provider_cache_inside_request", default=False)
+
+
+# TTL policy per provider: (HTTP method, endpoint or RPC method fragment, tier)
+# Tiers follow data stability - metadata for hours, security verdicts for minutes, market data for seconds.
+# Requests not matching any rule are never cached.
+PROVIDER_CACHE_RULES: Dict[str, List[Tuple[str, str, str]]] = {
+    "helius": [
+        ("POST", "getTokenSupply", "metadata"),
+        ("POST", "/v0/token-metadata", "metadata"),
+        ("POST", "getTokenLargestAccounts", "security"),
+    ],
+    "birdeye": [
+        ("GET", "/defi/price", "market"),
+        ("GET", "/defi/v3/token/txs", "market"),
+        ("GET", "/defi/token_trending", "market"),
+        ("GET", "/defi/v2/tokens/top_traders", "market"),
+        ("GET", "/defi/history_price", "security"),
+    ],
+    "goplus": [
+        ("GET", "/api/v1/solana/token_security", "security"),
+        ("GET", "/api/v1/rugpull_detecting", "security"),
+        ("GET", "/api/v1/supported_chains", "metadata"),
+    ],
+    "rugcheck": [
+        ("GET", "/report", "security"),
+        ("GET", "/v1/stats/trending", "market"),
+    ],
+    "solsniffer": [
+        ("GET", "/v2/token/", "security"),
+    ],
+    "solanafm": [
+        ("GET", "/v1/tokens/", "metadata"),
+        ("GET", "/v0/accounts/", "security"),
+    ],
+    "dexscreener": [
+        ("GET", "/tokens/v1/", "market"),
+        ("GET", "/latest/dex/", "market"),
+    ],
+}
+
+
+class ProviderResponseCache:
+    """Response cache for external API clients
+
+    Successful responses are kept in an in-process LRU in front of Redis, with a
+    TTL chosen from the provider's endpoint rules. Redis lets worker processes and
+    the snapshot scheduler reuse each other's provider calls for the same mint.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.enabled = settings.PROVIDER_CACHE_ENABLED
+        self.prefix = "provider_cache"
+        self.max_entries = max_entries or settings.PROVIDER_CACHE_LRU_SIZE
+        self.ttls = {
+            "metadata": settings.PROVIDER_CACHE_TTL_METADATA,
+            "security": settings.PROVIDER_CACHE_TTL_SECURITY,
+            "market": settings.PROVIDER_CACHE_TTL_MARKET
+        }
+        self.rules = PROVIDER_CACHE_RULES
+        self._lru: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.redis_client = None
+
+    def get_tier(self, provider: str, method: str, endpoint: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Match request against provider rules, None if it must not be cached"""
+        rpc_method = None
+        json_data = kwargs.get("json")
+        if isinstance(json_data, dict):
+            rpc_method = json_data.get("method")
+
+        for rule_method, fragment, tier in self.rules.get(provider, []):
+            if rule_method != method.upper():
+                continue
+            if fragment == rpc_method or fragment in endpoint:
+                return tier
+        return None
+
+    def get_ttl(self, tier: str) -> int:
+        """Get TTL (seconds) for a cache tier"""
+        return int(self.ttls.get(tier, 0))
+
+    def build_key(self, provider: str, method: str, endpoint: str, kwargs: Dict[str, Any]) -> str:
+        """Build deterministic key from request identity (headers and credentials excluded)"""
+        identity = {
+            "method": method.upper(),
+            "endpoint": endpoint.split("?")[0],
+            "params": {k: v for k, v in (kwargs.get("params") or {}).items() if k != "api-key"},
+            "json": kwargs.get("json")
+        }
+        digest = hashlib.sha1(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.prefix}:{provider}:{digest}"
+
+    async def get(self, provider: str, key: str) -> Optional[Any]:
+        """Get cached response from LRU, then Redis"""
+        entry = self._lru.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self._lru.move_to_end(key)
+                self._record(provider, "hits")
+                return copy.deepcopy(value)
+            self._lru.pop(key, None)
+
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                data = await redis.get(key)
+                if data:
+                    value = json.loads(data)
+                    ttl = await redis.ttl(key)
+                    if ttl and ttl > 0:
+                        self._store_local(key, value, ttl)
+                    self._record(provider, "hits")
+                    self._record(provider, "redis_hits")
+                    return copy.deepcopy(value)
+            except Exception as e:
+                logger.debug(f"Provider cache Redis GET failed for {provider}: {str(e)}")
+                self._record(provider, "errors")
+
+        self._record(provider, "misses")
+        return None
+
+    async def set(self, provider: str, key: str, value: Any, ttl: int) -> None:
+        """Store response in LRU and Redis"""
+        self._store_local(key, copy.deepcopy(value), ttl)
+        self._record(provider, "sets")
+
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                await redis.set(key, json.dumps(value, default=str), ex=ttl)
+            except Exception as e:
+                logger.debug(f"Provider cache Redis SET failed for {provider}: {str(e)}")
+                self._record(provider, "errors")
+
+    def _store_local(self, key: str, value: Any, ttl: int) -> None:
+        """Insert into LRU, evicting least recently used entries"""
+        self._lru[key] = (time.time() + ttl, value)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def _get_redis(self):
+        """Get raw Redis connection, None when running on memory fallback"""
+        if self.redis_client is None:
+            try:
+                from app.utils.redis_client import get_redis_client
+                redis_client = await get_redis_client()
+                self.redis_client = redis_client.client or False
+            except Exception:
+                self.redis_client = False
+        return self.redis_client or None
+
+    def _record(self, provider: str, event: str) -> None:
+        stats = self._stats.setdefault(provider, {"hits": 0, "redis_hits": 0, "misses": 0, "sets": 0, "uncacheable": 0, "errors": 0})
+        stats[event] += 1
+
+    def clear(self) -> None:
+        """Drop in-process entries"""
+        self._lru.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-provider cache statistics"""
+        providers = {}
+        for provider, stats in self._stats.items():
+            lookups = stats["hits"] + stats["misses"]
+            providers[provider] = {
+                **stats,
+                "hit_rate": round(stats["hits"] / lookups * 100, 2) if lookups > 0 else 0
+            }
+        return {
+            "enabled": self.enabled,
+            "lru_entries": len(self._lru),
+            "lru_max_entries": self.max_entries,
+            "ttls": dict(self.ttls),
+            "providers": providers
+        }
+
+
+# Global provider response cache instance
+provider_cache = ProviderResponseCache()
+
+
+def cached_request(provider: str) -> Callable:
+    """Decorate a client's ``_request(method, endpoint, ...)`` with the provider response cache"""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self, method: str, endpoint: str, *args, **kwargs):
+            if not provider_cache.enabled or _inside_request.get():
+                return await func(self, method, endpoint, *args, **kwargs)
+
+            tier = provider_cache.get_tier(provider, method, endpoint, kwargs)
+            ttl = provider_cache.get_ttl(tier) if tier else 0
+            if ttl <= 0:
+                provider_cache._record(provider, "uncacheable")
+                return await func(self, method, endpoint, *args, **kwargs)
+
+            key = provider_cache.build_key(provider, method, endpoint, kwargs)
+            cached = await provider_cache.get(provider, key)
+            if cached is not None:
+                logger.debug(f"{provider} cache hit for {method} {endpoint.split('?')[0]} ({tier})")
+                return cached
+
+            token = _inside_request.set(True)
+            try:
+                response = await func(self, method, endpoint, *args, **kwargs)
+            finally:
+                _inside_request.reset(token)
+
+            if response:
+                await provider_cache.set(provider, key, response, ttl)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+# Default provider quotas: rate = sustained requests per second, burst = bucket capacity.
+# Override per plan with PROVIDER_RATE_LIMITS, e.g. {"birdeye": {"rate": 15, "burst": 15}}
+DEFAULT_PROVIDER_QUOTAS: Dict[str, Dict[str, float]] = {
+    "helius": {"rate": 10.0, "burst": 10},
+    "birdeye": {"rate": 1.0, "burst": 1},
+    "goplus": {"rate": 0.5, "burst": 2},
+    "rugcheck": {"rate": 3.0, "burst": 5},
+    "solsniffer": {"rate": 2.0, "burst": 4},
+    "solanafm": {"rate": 5.0, "burst": 5},
+    "dexscreener": {"rate": 2.0, "burst": 5},
+    "solscan": {"rate": 5.0, "burst": 5},
+}
+
+
+# Atomic token bucket: refill by elapsed time, take tokens or report the wait.
+# Returns {allowed, wait_seconds, tokens_left}; floats are returned as strings
+# because Lua numbers are truncated to integers in replies.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local state = redis.call("HMGET", key, "tokens", "ts", "blocked_until")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+
+if blocked_until > now then
+    return {0, tostring(blocked_until - now), tostring(0)}
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+    allowed = 1
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call("HSET", key, "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("EXPIRE", key, math.ceil(capacity / rate) + 60)
+return {allowed, tostring(wait), tostring(tokens)}
+"""
+
+# Drain bucket and block it until now + retry_after (429 feedback)
+PENALIZE_SCRIPT = """
+local key = KEYS[1]
+local until_ts = tonumber(ARGV[1])
+local current = tonumber(redis.call("HGET", key, "blocked_until")) or 0
+if until_ts > current then
+    redis.call("HSET", key, "tokens", "0", "ts", ARGV[2], "blocked_until", tostring(until_ts))
+    redis.call("EXPIRE", key, math.ceil(until_ts - tonumber(ARGV[2])) + 60)
+end
+return 1
+"""
+
+
+class ProviderRateLimiter:
+    """Token-bucket rate limiter for external API providers
+
+    Buckets are keyed by provider and API key, so every worker process and the
+    snapshot scheduler draw from the same quota through an atomic Redis script.
+    Without Redis the same algorithm runs in-process. Bursts are allowed up to
+    the bucket capacity; a 429 drains the bucket until Retry-After has passed.
+    """
+
+    def __init__(self):
+        self.enabled = settings.PROVIDER_RATE_LIMIT_ENABLED
+        self.max_wait = settings.PROVIDER_RATE_LIMIT_MAX_WAIT
+        self.prefix = "provider_rate_limit"
+        self.quotas = {name: dict(quota) for name, quota in DEFAULT_PROVIDER_QUOTAS.items()}
+        for name, quota in (settings.PROVIDER_RATE_LIMITS or {}).items():
+            self.quotas.setdefault(name, {"rate": 1.0, "burst": 1}).update(quota)
+
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._recent: Dict[str, Deque[Tuple[float, bool]]] = {}
+        self.redis_client = None
+
+    def get_quota(self, provider: str) -> Tuple[float, float]:
+        """Get (rate per second, burst capacity) for a provider"""
+        quota = self.quotas.get(provider, {"rate": 1.0, "burst": 1})
+        rate = max(float(quota.get("rate", 1.0)), 0.001)
+        burst = max(float(quota.get("burst", 1)), 1.0)
+        return rate, burst
+
+    def build_key(self, provider: str, api_key: Optional[str] = None) -> str:
+        """Bucket key per provider and API key (key is hashed, never stored)"""
+        key_id = hashlib.sha1(api_key.encode()).hexdigest()[:12] if api_key else "public"
+        return f"{self.prefix}:{provider}:{key_id}"
+
+    async def acquire(self, provider: str, api_key: Optional[str] = None, tokens: int = 1) -> float:
+        """Wait until the provider's bucket grants a request, returns seconds waited"""
+        if not self.enabled:
+            return 0.0
+
+        key = self.build_key(provider, api_key)
+        rate, burst = self.get_quota(provider)
+        started = time.time()
+
+        while True:
+            allowed, wait = await self._try_acquire(key, rate, burst, tokens)
+            if allowed:
+                waited = time.time() - started
+                self._record(provider, waited)
+                return waited
+
+            elapsed = time.time() - started
+            if elapsed >= self.max_wait:
+                logger.warning(f"{provider} rate limiter wait exceeded {self.max_wait}s, proceeding")
+                self._record(provider, elapsed, timed_out=True)
+                return elapsed
+
+            # Small jitter so waiting workers do not retry in lockstep
+            await asyncio.sleep(min(wait, self.max_wait - elapsed) + random.uniform(0, 0.05))
+
+    async def penalize(self, provider: str, api_key: Optional[str] = None, retry_after: float = 1.0) -> None:
+        """Feed back a 429: block the bucket for retry_after seconds across all workers"""
+        key = self.build_key(provider, api_key)
+        now = time.time()
+        blocked_until = now + max(float(retry_after), 0.0)
+        self._stats_for(provider)["throttled"] += 1
+
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                await redis.eval(PENALIZE_SCRIPT, 1, key, blocked_until, now)
+                return
+            except Exception as e:
+                logger.debug(f"Rate limiter penalize failed in Redis for {provider}: {str(e)}")
+
+        bucket = self._buckets.setdefault(key, {"tokens": 0.0, "ts": now, "blocked_until": 0.0})
+        if blocked_until > bucket["blocked_until"]:
+            bucket.update({"tokens": 0.0, "ts": now, "blocked_until": blocked_until})
+
+    async def _try_acquire(self, key: str, rate: float, burst: float, tokens: int) -> Tuple[bool, float]:
+        """Single bucket check - Redis script first, memory fallback"""
+        now = time.time()
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                allowed, wait, _ = await redis.eval(TOKEN_BUCKET_SCRIPT, 1, key, rate, burst, now, tokens)
+                return int(allowed) == 1, float(wait)
+            except Exception as e:
+                logger.debug(f"Rate limiter Redis script failed for {key}: {str(e)}")
+
+        return self._memory_try_acquire(key, rate, burst, tokens, now)
+
+    def _memory_try_acquire(self, key: str, rate: float, burst: float, tokens: int, now: float) -> Tuple[bool, float]:
+        """In-process token bucket"""
+        bucket = self._buckets.setdefault(key, {"tokens": burst, "ts": now, "blocked_until": 0.0})
+
+        if bucket["blocked_until"] > now:
+            return False, bucket["blocked_until"] - now
+
+        bucket["tokens"] = min(burst, bucket["tokens"] + max(0.0, now - bucket["ts"]) * rate)
+        bucket["ts"] = now
+
+        if bucket["tokens"] >= tokens:
+            bucket["tokens"] -= tokens
+            return True, 0.0
+        return False, (tokens - bucket["tokens"]) / rate
+
+    async def _get_redis(self):
+        """Get raw Redis connection, None when running on memory fallback"""
+        if self.redis_client is None:
+            try:
+                from app.utils.redis_client import get_redis_client
+                redis_client = await get_redis_client()
+                self.redis_client = redis_client.client or False
+            except Exception:
+                self.redis_client = False
+        return self.redis_client or None
+
+    def _stats_for(self, provider: str) -> Dict[str, Any]:
+        return self._stats.setdefault(provider, {"acquired": 0, "delayed": 0, "throttled": 0, "timeouts": 0, "total_wait": 0.0})
+
+    def _record(self, provider: str, waited: float, timed_out: bool = False) -> None:
+        stats = self._stats_for(provider)
+        stats["acquired"] += 1
+        stats["total_wait"] += waited
+        if waited > 0.01:
+            stats["delayed"] += 1
+        if timed_out:
+            stats["timeouts"] += 1
+        self._recent.setdefault(provider, deque(maxlen=500)).append((time.time(), waited > 0.01))
+
+    def get_pressure(self, provider: str, window: float = 60.0) -> float:
+        """Share of this process's recent acquisitions that had to wait (0 = budget left, 1 = saturated)"""
+        cutoff = time.time() - window
+        recent = [delayed for ts, delayed in self._recent.get(provider, ()) if ts >= cutoff]
+        return sum(recent) / len(recent) if recent else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-provider limiter statistics"""
+        providers = {}
+        for provider, stats in self._stats.items():
+            rate, burst = self.get_quota(provider)
+            providers[provider] = {
+                **stats,
+                "total_wait": round(stats["total_wait"], 3),
+                "avg_wait": round(stats["total_wait"] / stats["acquired"], 3) if stats["acquired"] else 0,
+                "rate": rate,
+                "burst": burst
+            }
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if self.redis_client else "memory",
+            "providers": providers
+        }
+
+
+# Global provider rate limiter instance
+provider_rate_limiter = ProviderRateLimiter()
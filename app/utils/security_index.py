@@ -0,0 +1,135 @@
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from app.core.config import get_settings
+from app.utils.cache import cache_manager
+
+settings = get_settings()
+
+
+SECURITY_PROVIDERS = ("goplus", "rugcheck", "solsniffer")
+
+
+class SecurityVerdictIndex:
+    """Latest security verdict per mint, written by every security check run
+
+    Lets the buy path gate on a recent GOplus/RugCheck/SolSniffer verdict instead of
+    repeating the fan-out. Only conclusive verdicts are served: "safe" (no critical
+    issues, at least one provider with meaningful data) and "unsafe" (critical issues
+    found), each with its own max age. "unverified" runs are indexed for visibility
+    but always fall back to a live check.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or cache_manager
+        self.prefix = "security_verdict"
+        self.enabled = settings.SECURITY_INDEX_ENABLED
+        self.max_age = {
+            "safe": settings.SECURITY_INDEX_MAX_AGE_SAFE,
+            "unsafe": settings.SECURITY_INDEX_MAX_AGE_UNSAFE
+        }
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "inconclusive": 0, "sets": 0, "errors": 0}
+
+    def build_key(self, token_address: str) -> str:
+        return f"{self.prefix}:{token_address}"
+
+    def build_verdict(
+        self,
+        token_address: str,
+        security_passed: bool,
+        security_data: Dict[str, Any],
+        data_sources: List[str],
+        now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Summarize one security run into an index entry"""
+        coverage = [
+            provider for provider in SECURITY_PROVIDERS
+            if provider in data_sources and not security_data.get(f"{provider}_insufficient_data", False)
+        ]
+        critical_issues = list(security_data.get("critical_issues", []))
+
+        if critical_issues:
+            verdict = "unsafe"
+        elif security_passed and coverage:
+            verdict = "safe"
+        else:
+            verdict = "unverified"
+
+        return {
+            "token_address": token_address,
+            "verdict": verdict,
+            "critical_issues": critical_issues,
+            "coverage": coverage,
+            "computed_at": time.time() if now is None else now
+        }
+
+    async def record(
+        self,
+        token_address: str,
+        security_passed: bool,
+        security_data: Dict[str, Any],
+        data_sources: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Store the verdict of a finished security run"""
+        if not self.enabled:
+            return None
+
+        entry = self.build_verdict(token_address, security_passed, security_data, data_sources)
+        ttl = max(self.max_age.values())
+        try:
+            if await self.cache.set(self.build_key(token_address), entry, ttl=ttl):
+                self._stats["sets"] += 1
+                return entry
+        except Exception as e:
+            logger.warning(f"Security index SET failed for {token_address}: {str(e)}")
+            self._stats["errors"] += 1
+        return None
+
+    async def lookup(self, token_address: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Get a conclusive, fresh verdict or None (unknown, stale or unverified)"""
+        if not self.enabled:
+            return None
+
+        try:
+            entry = await self.cache.get(self.build_key(token_address))
+        except Exception as e:
+            logger.warning(f"Security index GET failed for {token_address}: {str(e)}")
+            self._stats["errors"] += 1
+            return None
+
+        if not isinstance(entry, dict):
+            self._stats["misses"] += 1
+            return None
+
+        max_age = self.max_age.get(entry.get("verdict"))
+        if max_age is None:
+            self._stats["inconclusive"] += 1
+            return None
+
+        now = time.time() if now is None else now
+        age = now - float(entry.get("computed_at", 0))
+        if age > max_age:
+            self._stats["stale"] += 1
+            return None
+
+        self._stats["hits"] += 1
+        return {**entry, "age_seconds": round(age, 1)}
+
+    async def invalidate(self, token_address: str) -> bool:
+        """Drop the indexed verdict for a mint"""
+        return await self.cache.delete(self.build_key(token_address))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lookup metrics"""
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["stale"] + self._stats["inconclusive"]
+        return {
+            "enabled": self.enabled,
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups * 100, 2) if lookups > 0 else 0,
+            "max_age_seconds": dict(self.max_age)
+        }
+
+
+# Global security verdict index instance
+security_index = SecurityVerdictIndex()
@@ -0,0 +1,176 @@
+import asyncio
+import copy
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+# Release lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight execution
+
+    Callers in the same process await one shared task. With Redis available, a
+    lock extends this across worker processes: followers wait for the lock
+    holder to finish and pick its result up via ``result_loader``.
+    """
+
+    def __init__(self, namespace: str = "single_flight"):
+        self.namespace = namespace
+        self.enabled = settings.SINGLE_FLIGHT_ENABLED
+        self.lock_ttl = settings.SINGLE_FLIGHT_LOCK_TTL
+        self.wait_timeout = settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+        self.poll_interval = 0.25
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._stats = {
+            "leaders": 0,
+            "coalesced": 0,
+            "distributed_waits": 0,
+            "distributed_hits": 0,
+            "errors": 0
+        }
+
+    async def do(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        result_loader: Optional[Callable[[], Awaitable[Any]]] = None,
+        distributed: bool = True,
+        cancel_when_abandoned: bool = False
+    ) -> Any:
+        """Run factory once per key; concurrent callers share the result
+
+        The leader receives the original result, followers receive a deep copy
+        so they can annotate it without affecting each other. With
+        ``cancel_when_abandoned`` the shared call is cancelled once every caller
+        waiting on it has been cancelled, instead of running to completion.
+        """
+        if not self.enabled:
+            return await factory()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            logger.debug(f"Single-flight: joining in-flight call for {key}")
+            result = await self._wait(task, cancel_when_abandoned)
+            return copy.deepcopy(result)
+
+        self._stats["leaders"] += 1
+        task = asyncio.create_task(self._execute(key, factory, result_loader, distributed))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await self._wait(task, cancel_when_abandoned)
+
+    async def _wait(self, task: asyncio.Task, cancel_when_abandoned: bool) -> Any:
+        """Await the shared task without letting one cancelled caller cancel it for the others"""
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if cancel_when_abandoned and self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def _execute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        result_loader: Optional[Callable[[], Awaitable[Any]]],
+        distributed: bool
+    ) -> Any:
+        """Execute factory, holding a cross-process lock when Redis is available"""
+        redis = await self._get_redis() if distributed else None
+        if redis is None:
+            return await factory()
+
+        lock_key = f"{self.namespace}:lock:{key}"
+        owner = uuid.uuid4().hex
+
+        try:
+            acquired = await redis.set(lock_key, owner, nx=True, ex=self.lock_ttl)
+        except Exception as e:
+            logger.debug(f"Single-flight lock failed for {key}: {str(e)}")
+            self._stats["errors"] += 1
+            return await factory()
+
+        if acquired:
+            try:
+                return await factory()
+            finally:
+                await self._release(redis, lock_key, owner)
+
+        # Another process is running this call - wait for it to finish
+        self._stats["distributed_waits"] += 1
+        logger.debug(f"Single-flight: waiting for another worker on {key}")
+        deadline = time.time() + self.wait_timeout
+
+        while time.time() < deadline:
+            try:
+                if not await redis.exists(lock_key):
+                    break
+            except Exception:
+                break
+            await asyncio.sleep(self.poll_interval)
+
+        if result_loader is not None:
+            try:
+                result = await result_loader()
+                if result is not None:
+                    self._stats["distributed_hits"] += 1
+                    return result
+            except Exception as e:
+                logger.debug(f"Single-flight result loader failed for {key}: {str(e)}")
+
+        return await factory()
+
+    async def _get_redis(self):
+        """Get raw Redis connection, None when running on memory fallback"""
+        try:
+            from app.utils.redis_client import get_redis_client
+            redis_client = await get_redis_client()
+            return redis_client.client
+        except Exception:
+            return None
+
+    async def _release(self, redis, lock_key: str, owner: str) -> None:
+        """Release lock if still owned"""
+        try:
+            await redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, owner)
+        except Exception as e:
+            logger.debug(f"Single-flight lock release failed for {lock_key}: {str(e)}")
+
+    def in_flight(self) -> int:
+        """Number of keys currently executing"""
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        calls = self._stats["leaders"] + self._stats["coalesced"]
+        return {
+            "enabled": self.enabled,
+            **self._stats,
+            "in_flight": self.in_flight(),
+            "coalesce_rate": round(self._stats["coalesced"] / calls * 100, 2) if calls > 0 else 0
+        }
+
+
+# Global single-flight instance for token analyses
+single_flight = SingleFlight(namespace="analysis_flight")
@@ -0,0 +1,49 @@
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+from loguru import logger
+
+
+class SQLiteStore:
+    """Base for small SQLite-backed stores
+
+    One connection per store in WAL mode; queries run in a worker thread under a
+    lock so callers never block the event loop. Subclasses define ``SCHEMA``.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+            logger.debug(f"{type(self).__name__} opened {self.db_path}")
+        return self._conn
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(connection, *args)`` in a worker thread"""
+        def call():
+            with self._lock:
+                return func(self._connect(), *args)
+
+        return await asyncio.to_thread(call)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
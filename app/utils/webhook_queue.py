@@ -0,0 +1,258 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+# Lanes are served strictly in this order
+PRIORITY_LANES = ("high", "normal", "low")
+
+# Move due retries from the delayed set into their lane streams in one step.
+# Members are "<lane>:<task json>" so the script never has to decode JSON.
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, tonumber(ARGV[2]))
+for _, member in ipairs(due) do
+    redis.call("zrem", KEYS[1], member)
+    local sep = string.find(member, ":", 1, true)
+    local lane = string.sub(member, 1, sep - 1)
+    redis.call("xadd", ARGV[3] .. lane, "MAXLEN", "~", ARGV[4], "*", "task", string.sub(member, sep + 1))
+end
+return #due
+"""
+
+
+def normalize_priority(priority: Optional[str]) -> str:
+    """Map a requested priority onto a known lane"""
+    return priority if priority in PRIORITY_LANES else "normal"
+
+
+def _serialize_task(task: Dict[str, Any]) -> str:
+    """Task JSON without backend bookkeeping fields"""
+    return json.dumps({k: v for k, v in task.items() if not k.startswith("_")}, default=str)
+
+
+class MemoryTaskBackend:
+    """In-process priority queue (single process, tasks lost on restart)"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._delayed: Dict[int, asyncio.TimerHandle] = {}
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=1000)
+
+    async def setup(self) -> None:
+        return None
+
+    async def enqueue(self, task: Dict[str, Any]) -> None:
+        lane = normalize_priority(task.get("priority"))
+        await self.queue.put((PRIORITY_LANES.index(lane), next(self._sequence), task))
+
+    async def dequeue(self, consumer: str, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            _, _, task = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            return task
+        except asyncio.TimeoutError:
+            return None
+
+    async def ack(self, task: Dict[str, Any]) -> None:
+        return None
+
+    async def retry(self, task: Dict[str, Any], delay: float) -> None:
+        handle_id = next(self._sequence)
+
+        def requeue():
+            self._delayed.pop(handle_id, None)
+            lane = normalize_priority(task.get("priority"))
+            self.queue.put_nowait((PRIORITY_LANES.index(lane), next(self._sequence), task))
+
+        self._delayed[handle_id] = asyncio.get_running_loop().call_later(delay, requeue)
+
+    async def dead_letter(self, task: Dict[str, Any], error: str) -> None:
+        self.dead_letters.append({"task": task, "error": error, "failed_at": time.time()})
+
+    async def size(self) -> Dict[str, int]:
+        lanes = defaultdict(int)
+        for rank, _, _ in list(self.queue._queue):
+            lanes[PRIORITY_LANES[rank]] += 1
+
+        return {
+            **{lane: lanes[lane] for lane in PRIORITY_LANES},
+            "delayed": len(self._delayed),
+            "dead": len(self.dead_letters)
+        }
+
+    async def oldest_age(self) -> float:
+        """Seconds the oldest queued task has been waiting"""
+        timestamps = [task.get("timestamp", time.time()) for _, _, task in list(self.queue._queue)]
+        return max(0.0, time.time() - min(timestamps)) if timestamps else 0.0
+
+    async def close(self) -> None:
+        for handle in self._delayed.values():
+            handle.cancel()
+        self._delayed.clear()
+
+
+class RedisStreamTaskBackend:
+    """Redis Streams queue shared by all worker processes
+
+    One stream per priority lane, read through a consumer group. Tasks stay in the
+    consumer's pending list until acked; entries left pending by a dead worker are
+    reclaimed after the visibility timeout. Retries wait in a sorted set and exhausted
+    tasks go to a dead-letter stream.
+    """
+
+    name = "redis_streams"
+
+    def __init__(
+        self,
+        redis,
+        prefix: str = "webhook:tasks",
+        group: str = "webhook_workers",
+        maxlen: Optional[int] = None,
+        visibility_timeout: Optional[int] = None
+    ):
+        self.redis = redis
+        self.prefix = prefix
+        self.group = group
+        self.maxlen = maxlen or settings.WEBHOOK_STREAM_MAXLEN
+        self.visibility_timeout = visibility_timeout or settings.WEBHOOK_TASK_VISIBILITY_TIMEOUT
+        self.streams = {lane: f"{prefix}:{lane}" for lane in PRIORITY_LANES}
+        self.delayed_key = f"{prefix}:delayed"
+        self.dead_key = f"{prefix}:dead"
+
+        # Extra entries returned by a multi-stream read, per consumer
+        self._buffer: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last_reclaim = 0.0
+
+    async def setup(self) -> None:
+        """Create the consumer group on every lane stream"""
+        for stream in self.streams.values():
+            try:
+                await self.redis.xgroup_create(stream, self.group, id="0", mkstream=True)
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    async def enqueue(self, task: Dict[str, Any]) -> None:
+        lane = normalize_priority(task.get("priority"))
+        await self.redis.xadd(
+            self.streams[lane], {"task": _serialize_task(task)},
+            maxlen=self.maxlen, approximate=True
+        )
+
+    async def dequeue(self, consumer: str, timeout: float) -> Optional[Dict[str, Any]]:
+        buffer = self._buffer[consumer]
+        if buffer:
+            return buffer.popleft()
+
+        await self._promote_due()
+        await self._reclaim_stale(consumer)
+        if buffer:
+            return buffer.popleft()
+
+        # Non-blocking pass in priority order, then block on all lanes
+        for lane in PRIORITY_LANES:
+            entries = await self.redis.xreadgroup(self.group, consumer, {self.streams[lane]: ">"}, count=1)
+            buffer.extend(self._decode(entries))
+            if buffer:
+                return buffer.popleft()
+
+        entries = await self.redis.xreadgroup(
+            self.group, consumer, {stream: ">" for stream in self.streams.values()},
+            count=1, block=max(1, int(timeout * 1000))
+        )
+        buffer.extend(sorted(self._decode(entries), key=lambda task: PRIORITY_LANES.index(task["_lane"])))
+        return buffer.popleft() if buffer else None
+
+    async def ack(self, task: Dict[str, Any]) -> None:
+        if "_id" not in task:
+            return  # never read from a stream
+        stream = self.streams[task["_lane"]]
+        await self.redis.xack(stream, self.group, task["_id"])
+        await self.redis.xdel(stream, task["_id"])
+
+    async def retry(self, task: Dict[str, Any], delay: float) -> None:
+        member = f"{normalize_priority(task.get('priority'))}:{_serialize_task(task)}"
+        await self.redis.zadd(self.delayed_key, {member: time.time() + delay})
+        await self.ack(task)
+
+    async def dead_letter(self, task: Dict[str, Any], error: str) -> None:
+        await self.redis.xadd(
+            self.dead_key,
+            {"task": _serialize_task(task), "error": error, "failed_at": str(time.time())},
+            maxlen=self.maxlen, approximate=True
+        )
+        await self.ack(task)
+
+    async def size(self) -> Dict[str, int]:
+        sizes = {lane: await self.redis.xlen(stream) for lane, stream in self.streams.items()}
+        sizes["delayed"] = await self.redis.zcard(self.delayed_key)
+        sizes["dead"] = await self.redis.xlen(self.dead_key)
+        return sizes
+
+    async def oldest_age(self) -> float:
+        """Seconds the oldest unacked entry has been in its stream (from the entry ID)"""
+        oldest = None
+        for stream in self.streams.values():
+            entries = await self.redis.xrange(stream, count=1)
+            if entries:
+                entry_ms = int(entries[0][0].split("-")[0])
+                oldest = entry_ms if oldest is None else min(oldest, entry_ms)
+        return max(0.0, time.time() - oldest / 1000) if oldest is not None else 0.0
+
+    async def close(self) -> None:
+        self._buffer.clear()
+
+    async def _promote_due(self) -> None:
+        try:
+            await self.redis.eval(
+                PROMOTE_DUE_SCRIPT, 1, self.delayed_key,
+                time.time(), 100, f"{self.prefix}:", self.maxlen
+            )
+        except Exception as e:
+            logger.debug(f"Webhook queue retry promotion failed: {str(e)}")
+
+    async def _reclaim_stale(self, consumer: str) -> None:
+        """Claim entries another consumer read but never acked"""
+        now = time.time()
+        if now - self._last_reclaim < self.visibility_timeout / 2:
+            return
+        self._last_reclaim = now
+
+        for lane, stream in self.streams.items():
+            try:
+                result = await self.redis.xautoclaim(
+                    stream, self.group, consumer,
+                    min_idle_time=self.visibility_timeout * 1000, start_id="0-0", count=10
+                )
+                claimed = self._decode([[stream, result[1]]])
+                if claimed:
+                    logger.warning(f"Reclaimed {len(claimed)} stale {lane} webhook tasks")
+                self._buffer[consumer].extend(claimed)
+            except Exception as e:
+                logger.debug(f"Webhook queue reclaim failed for {stream}: {str(e)}")
+
+    def _decode(self, entries: Optional[List[Tuple[str, List[Tuple[str, Dict[str, str]]]]]]) -> List[Dict[str, Any]]:
+        lanes_by_stream = {stream: lane for lane, stream in self.streams.items()}
+        tasks = []
+
+        for stream, messages in entries or []:
+            lane = lanes_by_stream.get(stream)
+            for message_id, fields in messages:
+                if not fields or "task" not in fields:
+                    continue  # deleted while pending
+                task = json.loads(fields["task"])
+                task["_id"] = message_id
+                task["_lane"] = lane
+                tasks.append(task)
+
+        return tasks
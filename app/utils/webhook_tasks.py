@@ -1,21 +1,51 @@
 import asyncio
+import math
+import os
+import socket
 import time
 import hashlib
 from typing import Dict, Any, Optional, Set
 from loguru import logger
 from datetime import datetime
 
+from app.core.config import get_settings
+from app.utils.webhook_queue import MemoryTaskBackend, RedisStreamTaskBackend, PRIORITY_LANES, normalize_priority
+from app.utils.provider_rate_limiter import provider_rate_limiter
+
+settings = get_settings()
+
+# Providers every webhook task hits - their rate-limit pressure caps the pool
+SECURITY_PROVIDERS = ("goplus", "rugcheck", "solsniffer")
+
+
 class WebhookTaskQueue:
-    """Async task queue for webhook event processing with deduplication and immediate snapshots"""
+    """Webhook event processing queue with priority lanes, retries and deduplication
+    
+    Backed by Redis Streams when available so tasks survive restarts and workers can
+    run in separate processes; falls back to an in-process priority queue. A
+    supervisor resizes the worker pool from backlog, task latency and provider
+    rate-limit pressure.
+    """
     
     def __init__(self):
-        self.queue = asyncio.Queue()
-        self.workers = []
+        self.backend = None
+        self._backend_lock = asyncio.Lock()
+        self.consumer_prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self.workers: Dict[str, asyncio.Task] = {}
         self.running = False
+        self.pool_target = 0
+        self._retire = 0
+        self._supervisor_task: Optional[asyncio.Task] = None
+        self._active_tasks = 0
+        self._task_latency: Optional[float] = None  # EWMA seconds per task
+        self._backlog_age = 0.0
+        self._provider_pressure = 0.0
         self.stats = {
             "total_processed": 0,
             "total_failed": 0,
             "queue_size": 0,
+            "retries_scheduled": 0,
+            "dead_lettered": 0,
             "security_analyses_triggered": 0,
             "security_analyses_passed": 0,
             "security_analyses_failed": 0,
@@ -24,10 +54,43 @@ class WebhookTaskQueue:
             "snapshots_failed": 0,
             "duplicates_prevented": 0
         }
-        # Deduplication cache: token_address -> last_processed_timestamp
+        self._queue_sizes: Dict[str, int] = {}
+        # Deduplication cache (memory backend): task_hash -> last_processed_timestamp
         self._processed_tokens: Dict[str, float] = {}
         self._dedup_window = 300  # 5 minutes deduplication window
     
+    async def _get_backend(self):
+        """Create the queue backend on first use"""
+        if self.backend is None:
+            async with self._backend_lock:
+                if self.backend is None:
+                    self.backend = await self._create_backend()
+        return self.backend
+    
+    async def _create_backend(self):
+        if settings.WEBHOOK_QUEUE_BACKEND == "redis":
+            redis = await self._get_redis()
+            if redis is not None:
+                backend = RedisStreamTaskBackend(redis)
+                try:
+                    await backend.setup()
+                    logger.info("Webhook queue using Redis Streams backend")
+                    return backend
+                except Exception as e:
+                    logger.warning(f"Redis Streams webhook queue unavailable, using memory queue: {str(e)}")
+        
+        logger.info("Webhook queue using in-memory backend")
+        return MemoryTaskBackend()
+    
+    async def _get_redis(self):
+        """Get raw Redis connection, None when running on memory fallback"""
+        try:
+            from app.utils.redis_client import get_redis_client
+            redis_client = await get_redis_client()
+            return redis_client.client
+        except Exception:
+            return None
+    
     def _generate_task_hash(self, token_address: str, event_type: str) -> str:
         """Generate unique hash for task deduplication"""
         # Round timestamp to nearest 5 minutes for deduplication window
@@ -37,12 +100,23 @@ class WebhookTaskQueue:
         hash_input = f"{token_address}_{event_type}_{time_bucket}"
         return hashlib.md5(hash_input.encode()).hexdigest()[:12]
     
-    def _is_duplicate_task(self, token_address: str, event_type: str) -> bool:
-        """Check if this is a duplicate task within the deduplication window"""
+    async def _is_duplicate_task(self, token_address: str, event_type: str) -> bool:
+        """Check if this is a duplicate task within the deduplication window (shared across processes on Redis)"""
         if not token_address:
             return False
         
         task_hash = self._generate_task_hash(token_address, event_type)
+        
+        if isinstance(self.backend, RedisStreamTaskBackend):
+            try:
+                if await self.backend.redis.set(f"webhook:dedup:{task_hash}", token_address, nx=True, ex=self._dedup_window):
+                    return False
+                logger.info(f"Duplicate task detected for {token_address} - skipping")
+                self.stats["duplicates_prevented"] += 1
+                return True
+            except Exception as e:
+                logger.debug(f"Redis webhook dedup failed, using local window: {str(e)}")
+        
         current_time = time.time()
         
         # Clean old entries
@@ -69,12 +143,16 @@ class WebhookTaskQueue:
         if self.running:
             return
         
+        await self._get_backend()
         self.running = True
-        logger.info(f"Starting {num_workers} webhook workers with security analysis + snapshots")
+        initial = min(max(num_workers, settings.WEBHOOK_WORKERS_MIN), settings.WEBHOOK_WORKERS_MAX)
+        logger.info(
+            f"Starting {initial} webhook workers with security analysis + snapshots "
+            f"({self.backend.name} queue, autoscaling {settings.WEBHOOK_WORKERS_MIN}-{settings.WEBHOOK_WORKERS_MAX})"
+        )
         
-        for i in range(num_workers):
-            worker = asyncio.create_task(self._worker(f"worker-{i}"))
-            self.workers.append(worker)
+        self._resize(initial)
+        self._supervisor_task = asyncio.create_task(self._supervisor())
     
     async def stop_workers(self):
         """Stop background workers"""
@@ -84,13 +162,22 @@ class WebhookTaskQueue:
         self.running = False
         logger.info("Stopping webhook workers")
         
-        # Cancel all workers
-        for worker in self.workers:
-            worker.cancel()
+        # Cancel supervisor and all workers
+        tasks = list(self.workers.values())
+        if self._supervisor_task:
+            tasks.append(self._supervisor_task)
+            self._supervisor_task = None
+        for task in tasks:
+            task.cancel()
         
         # Wait for workers to finish
-        await asyncio.gather(*self.workers, return_exceptions=True)
+        await asyncio.gather(*tasks, return_exceptions=True)
         self.workers.clear()
+        self.pool_target = 0
+        self._retire = 0
+        
+        if self.backend:
+            await self.backend.close()
     
     async def add_task(self, event_type: str, payload: Dict[str, Any], priority: str = "normal"):
         """Add a webhook event to the processing queue with deduplication"""
@@ -101,25 +188,26 @@ class WebhookTaskQueue:
         except Exception as e:
             logger.debug(f"Could not extract token for deduplication: {e}")
         
+        backend = await self._get_backend()
+        
         # Check for duplicates
-        if token_address and self._is_duplicate_task(token_address, event_type):
+        if token_address and await self._is_duplicate_task(token_address, event_type):
             logger.info(f"Prevented duplicate {event_type} task for {token_address}")
             return
         
         task = {
             "event_type": event_type,
             "payload": payload,
-            "priority": priority,
+            "priority": normalize_priority(priority),
             "timestamp": time.time(),
             "retries": 0,
             "analysis_type": "security_only",
             "primary_token": token_address  # Store for processing
         }
         
-        await self.queue.put(task)
-        self.stats["queue_size"] = self.queue.qsize()
+        await backend.enqueue(task)
         
-        logger.debug(f"Added {event_type} task to queue (token: {token_address}, queue size: {self.queue.qsize()})")
+        logger.debug(f"Added {event_type} task to {task['priority']} lane (token: {token_address}, backend: {backend.name})")
     
     def _extract_primary_token(self, payload: Dict[str, Any], event_type: str) -> Optional[str]:
         """Extract the primary token from payload for deduplication"""
@@ -139,31 +227,115 @@ class WebhookTaskQueue:
             pass
         return None
     
+    def _resize(self, target: int) -> None:
+        """Grow or shrink the worker pool towards target (shrinking workers exit between tasks)"""
+        self.pool_target = target
+        live = len(self.workers) - self._retire
+        
+        if target < live:
+            self._retire += live - target
+            return
+        
+        # Cancel pending retirements before starting new workers
+        revived = min(self._retire, target - live)
+        self._retire -= revived
+        live += revived
+        
+        # Reuse the lowest free names so a Redis consumer's buffered entries are picked up again
+        index = 0
+        while live < target:
+            name = f"worker-{index}"
+            if name not in self.workers:
+                self._start_worker(name)
+                live += 1
+            index += 1
+    
+    def _start_worker(self, worker_name: str) -> None:
+        task = asyncio.create_task(self._worker(worker_name))
+        self.workers[worker_name] = task
+        task.add_done_callback(
+            lambda done: self.workers.pop(worker_name, None) if self.workers.get(worker_name) is done else None
+        )
+    
+    async def _supervisor(self):
+        """Periodically resize the worker pool"""
+        while self.running:
+            try:
+                await asyncio.sleep(settings.WEBHOOK_AUTOSCALE_INTERVAL)
+                await self.refresh_queue_stats()
+                
+                self._provider_pressure = max(
+                    provider_rate_limiter.get_pressure(provider, window=settings.WEBHOOK_AUTOSCALE_INTERVAL * 6)
+                    for provider in SECURITY_PROVIDERS
+                )
+                target = self._target_pool_size(
+                    self.stats["queue_size"], self._task_latency or 1.0, self._provider_pressure
+                )
+                
+                if target != self.pool_target:
+                    logger.info(
+                        f"Resizing webhook worker pool {self.pool_target} -> {target} "
+                        f"(backlog: {self.stats['queue_size']}, latency: {self._task_latency or 0:.2f}s, "
+                        f"provider pressure: {self._provider_pressure:.2f})"
+                    )
+                    self._resize(target)
+                    
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Webhook pool supervisor error: {str(e)}")
+    
+    def _target_pool_size(self, backlog: int, latency: float, pressure: float) -> int:
+        """Workers needed for in-flight work plus draining the backlog within the target time"""
+        current = self.pool_target
+        demand = self._active_tasks + math.ceil(backlog * latency / settings.WEBHOOK_BACKLOG_TARGET_SECONDS)
+        
+        if pressure >= 0.8:
+            # Providers are saturated - extra workers would only wait on the rate limiter
+            target = current - 1
+        elif pressure >= 0.5:
+            target = min(demand, current)
+        elif demand < current:
+            target = current - 1  # shrink gradually
+        else:
+            target = demand
+        
+        return max(settings.WEBHOOK_WORKERS_MIN, min(settings.WEBHOOK_WORKERS_MAX, target))
+    
     async def _worker(self, worker_name: str):
         """Background worker to process webhook events"""
         logger.info(f"Webhook worker {worker_name} started")
+        consumer = f"{self.consumer_prefix}-{worker_name}"
         
         while self.running:
+            if self._retire > 0:
+                self._retire -= 1
+                break
+            
             try:
                 # Get task from queue with timeout
-                task = await asyncio.wait_for(self.queue.get(), timeout=1.0)
-                
-                # Process the task
-                await self._process_task(task, worker_name)
+                task = await self.backend.dequeue(consumer, timeout=1.0)
+                if task is None:
+                    # No tasks in queue, continue
+                    continue
                 
-                # Mark task as done
-                self.queue.task_done()
-                self.stats["queue_size"] = self.queue.qsize()
+                # Process the task (acks, retries or dead-letters it)
+                self._active_tasks += 1
+                started = time.time()
+                try:
+                    await self._process_task(task, worker_name)
+                finally:
+                    self._active_tasks -= 1
+                    elapsed = time.time() - started
+                    self._task_latency = elapsed if self._task_latency is None else 0.8 * self._task_latency + 0.2 * elapsed
                 
-            except asyncio.TimeoutError:
-                # No tasks in queue, continue
-                continue
             except asyncio.CancelledError:
                 # Worker was cancelled
                 break
             except Exception as e:
                 logger.error(f"Worker {worker_name} error: {str(e)}")
                 self.stats["total_failed"] += 1
+                await asyncio.sleep(1.0)
         
         logger.info(f"Webhook worker {worker_name} stopped")
     
@@ -183,111 +355,26 @@ class WebhookTaskQueue:
                 self.stats["security_analyses_triggered"] += len(tokens_for_analysis)
                 logger.info(f"Worker {worker_name} triggered security analysis for {len(tokens_for_analysis)} tokens from {event_type} event")
                 
-                # Import security-only analysis function
-                from app.services.token_analyzer import analyze_token_security_only
+                semaphore = asyncio.Semaphore(settings.WEBHOOK_TOKEN_CONCURRENCY)
                 
-                for token_address in tokens_for_analysis:
-                    try:
-                        logger.info(f"🛡️ Starting security-only analysis for webhook token: {token_address}")
-                        
-                        analysis_result = await analyze_token_security_only(
-                            token_address, 
-                            f"webhook_{event_type}"
-                        )
-                        
-                        # Add webhook metadata to the analysis result
-                        if analysis_result and "metadata" not in analysis_result:
-                            analysis_result["metadata"] = {}
-                        
-                        if analysis_result:
-                            analysis_result["metadata"].update({
-                                "webhook_event_type": event_type,
-                                "webhook_timestamp": datetime.utcnow().isoformat(),
-                                "source": f"webhook_{event_type}",
-                                "worker_name": worker_name
-                            })
-                        
-                        # Check if security analysis passed and was stored
-                        if analysis_result:
-                            security_passed = analysis_result.get("metadata", {}).get("security_check_passed", False)
-                            
-                            if security_passed:
-                                self.stats["security_analyses_passed"] += 1
-                                logger.info(f"✅ Security analysis PASSED and stored for {token_address}")
-                                
-                                # TRIGGER SNAPSHOT immediately after security check passes
-                                try:
-                                    self.stats["snapshots_triggered"] += 1
-                                    logger.info(f"📸 Triggering snapshot for webhook token: {token_address}")
-                                    
-                                    # Extract security status, data, and security service responses from analysis result
-                                    security_status = "safe"  # Default
-                                    security_data = {}
-                                    
-                                    if analysis_result.get("security_analysis"):
-                                        security_analysis = analysis_result["security_analysis"]
-                                        
-                                        # Check for critical issues
-                                        critical_issues = security_analysis.get("critical_issues", [])
-                                        warnings = security_analysis.get("warnings", [])
-                                        
-                                        if critical_issues:
-                                            security_status = "unsafe"
-                                            logger.warning(f"Token {token_address} has critical issues but passed security: {critical_issues}")
-                                        elif warnings:
-                                            security_status = "warning"
-                                            logger.info(f"Token {token_address} has warnings: {warnings}")
-                                        else:
-                                            security_status = "safe"
-                                    
-                                    # Extract ONLY security service responses
-                                    all_service_responses = analysis_result.get("service_responses", {})
-                                    security_services = ["goplus", "rugcheck", "solsniffer"]
-                                    security_respnoses = {}
-                                    
-                                    for service in security_services:
-                                        if service in all_service_responses:
-                                            security_respnoses[service] = all_service_responses[service]
-                                    
-                                    logger.info(f"Using security status '{security_status}' for snapshot")
-                                    logger.info(f"Extracted security service responses: {security_services}")
-                                    
-                                    # Import snapshot function
-                                    from app.services.snapshots.token_snapshot import capture_single_snapshot
-                                    
-                                    # Capture snapshot with extracted security data
-                                    snapshot_result = await capture_single_snapshot(
-                                        token_address=token_address,
-                                        security_status=security_status,
-                                        security_data=security_data,
-                                        security_service_responses=security_respnoses,
-                                        update_existing=True
-                                    )
-                                    
-                                    if snapshot_result and snapshot_result.get("errors"):
-                                        self.stats["snapshots_failed"] += 1
-                                        logger.error(f"❌ Snapshot failed for {token_address}: {snapshot_result['errors']}")
-                                    else:
-                                        self.stats["snapshots_successful"] += 1
-                                        snapshot_gen = snapshot_result.get("snapshot_generation", 1) if snapshot_result else 1
-                                        is_first = snapshot_result.get("metadata", {}).get("is_first_snapshot", True) if snapshot_result else True
-                                        logger.info(f"✅ Snapshot successful for {token_address} (gen: {snapshot_gen}, first: {is_first}, security: {security_status})")
-                                        
-                                except Exception as snapshot_error:
-                                    self.stats["snapshots_failed"] += 1
-                                    logger.error(f"❌ Snapshot capture failed for {token_address}: {str(snapshot_error)}")
-                                    
-                            elif security_passed:
-                                self.stats["security_analyses_passed"] += 1
-                                logger.warning(f"⚠️ Security analysis PASSED but storage failed for {token_address}")
-                            else:
-                                self.stats["security_analyses_failed"] += 1
-                                logger.warning(f"❌ Security analysis FAILED for {token_address} - not stored, no snapshot")
-                        
-                    except Exception as analysis_error:
-                        self.stats["security_analyses_failed"] += 1
-                        logger.error(f"Security analysis failed for {token_address}: {str(analysis_error)}")
-                        continue
+                async def analyze(token_address: str):
+                    async with semaphore:
+                        await self._process_token(token_address, event_type, worker_name)
+                
+                # Let every token finish, then fail the task so the failed ones are retried
+                results = await asyncio.gather(
+                    *(analyze(token) for token in tokens_for_analysis), return_exceptions=True
+                )
+                failed = [
+                    f"{token}: {result}" for token, result in zip(tokens_for_analysis, results)
+                    if isinstance(result, Exception)
+                ]
+                if failed:
+                    raise RuntimeError(
+                        f"Security analysis failed for {len(failed)}/{len(tokens_for_analysis)} tokens ({'; '.join(failed)})"
+                    )
+            
+            await self.backend.ack(task)
             
             processing_time = time.time() - start_time
             self.stats["total_processed"] += 1
@@ -301,12 +388,132 @@ class WebhookTaskQueue:
             self.stats["total_failed"] += 1
             
             logger.error(f"Webhook task failed: {event_type} - {str(e)}")
+            await self._retry_or_dead_letter(task, str(e))
+    
+    async def _process_token(self, token_address: str, event_type: str, worker_name: str):
+        """Security analysis + snapshot for one token from a webhook payload"""
+        # Import security-only analysis function
+        from app.services.token_analyzer import analyze_token_security_only
+        
+        try:
+            logger.info(f"🛡️ Starting security-only analysis for webhook token: {token_address}")
+            
+            analysis_result = await analyze_token_security_only(
+                token_address, 
+                f"webhook_{event_type}"
+            )
+            
+            # Add webhook metadata to the analysis result
+            if analysis_result and "metadata" not in analysis_result:
+                analysis_result["metadata"] = {}
+            
+            if analysis_result:
+                analysis_result["metadata"].update({
+                    "webhook_event_type": event_type,
+                    "webhook_timestamp": datetime.utcnow().isoformat(),
+                    "source": f"webhook_{event_type}",
+                    "worker_name": worker_name
+                })
+            
+            # Check if security analysis passed and was stored
+            if analysis_result:
+                security_passed = analysis_result.get("metadata", {}).get("security_check_passed", False)
+                
+                if security_passed:
+                    self.stats["security_analyses_passed"] += 1
+                    logger.info(f"✅ Security analysis PASSED and stored for {token_address}")
+                    
+                    # TRIGGER SNAPSHOT immediately after security check passes
+                    try:
+                        self.stats["snapshots_triggered"] += 1
+                        logger.info(f"📸 Triggering snapshot for webhook token: {token_address}")
+                        
+                        # Extract security status, data, and security service responses from analysis result
+                        security_status = "safe"  # Default
+                        security_data = {}
+                        
+                        if analysis_result.get("security_analysis"):
+                            security_analysis = analysis_result["security_analysis"]
+                            
+                            # Check for critical issues
+                            critical_issues = security_analysis.get("critical_issues", [])
+                            warnings = security_analysis.get("warnings", [])
+                            
+                            if critical_issues:
+                                security_status = "unsafe"
+                                logger.warning(f"Token {token_address} has critical issues but passed security: {critical_issues}")
+                            elif warnings:
+                                security_status = "warning"
+                                logger.info(f"Token {token_address} has warnings: {warnings}")
+                            else:
+                                security_status = "safe"
+                        
+                        # Extract ONLY security service responses
+                        all_service_responses = analysis_result.get("service_responses", {})
+                        security_services = ["goplus", "rugcheck", "solsniffer"]
+                        security_respnoses = {}
+                        
+                        for service in security_services:
+                            if service in all_service_responses:
+                                security_respnoses[service] = all_service_responses[service]
+                        
+                        logger.info(f"Using security status '{security_status}' for snapshot")
+                        logger.info(f"Extracted security service responses: {security_services}")
+                        
+                        # Import snapshot function
+                        from app.services.snapshots.token_snapshot import capture_single_snapshot
+                        
+                        # Capture snapshot with extracted security data
+                        snapshot_result = await capture_single_snapshot(
+                            token_address=token_address,
+                            security_status=security_status,
+                            security_data=security_data,
+                            security_service_responses=security_respnoses,
+                            update_existing=True
+                        )
+                        
+                        if snapshot_result and snapshot_result.get("errors"):
+                            self.stats["snapshots_failed"] += 1
+                            logger.error(f"❌ Snapshot failed for {token_address}: {snapshot_result['errors']}")
+                        else:
+                            self.stats["snapshots_successful"] += 1
+                            snapshot_gen = snapshot_result.get("snapshot_generation", 1) if snapshot_result else 1
+                            is_first = snapshot_result.get("metadata", {}).get("is_first_snapshot", True) if snapshot_result else True
+                            logger.info(f"✅ Snapshot successful for {token_address} (gen: {snapshot_gen}, first: {is_first}, security: {security_status})")
+                            
+                    except Exception as snapshot_error:
+                        self.stats["snapshots_failed"] += 1
+                        logger.error(f"❌ Snapshot capture failed for {token_address}: {str(snapshot_error)}")
+                        
+                elif security_passed:
+                    self.stats["security_analyses_passed"] += 1
+                    logger.warning(f"⚠️ Security analysis PASSED but storage failed for {token_address}")
+                else:
+                    self.stats["security_analyses_failed"] += 1
+                    logger.warning(f"❌ Security analysis FAILED for {token_address} - not stored, no snapshot")
             
-            # Retry logic for failed tasks
-            if task["retries"] < 2:
+        except Exception as analysis_error:
+            self.stats["security_analyses_failed"] += 1
+            logger.error(f"Security analysis failed for {token_address}: {str(analysis_error)}")
+            raise
+    
+    async def _retry_or_dead_letter(self, task: Dict[str, Any], error: str):
+        """Retry a failed task with exponential backoff, dead-letter it once retries run out"""
+        event_type = task["event_type"]
+        
+        try:
+            if task["retries"] < settings.WEBHOOK_MAX_RETRIES:
                 task["retries"] += 1
-                await self.queue.put(task)
-                logger.info(f"Retrying {event_type} task (attempt {task['retries']})")
+                delay = settings.WEBHOOK_RETRY_BACKOFF * (2 ** (task["retries"] - 1))
+                await self.backend.retry(task, delay)
+                self.stats["retries_scheduled"] += 1
+                logger.info(f"Retrying {event_type} task in {delay:.0f}s (attempt {task['retries']})")
+            else:
+                await self.backend.dead_letter(task, error)
+                self.stats["dead_lettered"] += 1
+                logger.error(f"Dead-lettered {event_type} task after {task['retries']} retries: {error}")
+        except Exception as e:
+            logger.error(f"Could not reschedule {event_type} task: {str(e)}")
     
     def _extract_tokens_for_analysis(self, payload: Dict[str, Any], event_type: str) -> list:
         """Extract token addresses for analysis - MINT EVENTS ONLY"""
@@ -338,6 +545,17 @@ class WebhookTaskQueue:
             
         return []
     
+    async def refresh_queue_stats(self) -> None:
+        """Refresh per-lane backlog sizes from the backend"""
+        if self.backend is None:
+            return
+        try:
+            self._queue_sizes = await self.backend.size()
+            self.stats["queue_size"] = sum(self._queue_sizes.get(lane, 0) for lane in PRIORITY_LANES)
+            self._backlog_age = await self.backend.oldest_age()
+        except Exception as e:
+            logger.debug(f"Could not read webhook queue size: {str(e)}")
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get queue statistics with security analysis and snapshot metrics"""
         total_events = self.stats["total_processed"] + self.stats["total_failed"]
@@ -359,7 +577,19 @@ class WebhookTaskQueue:
         return {
             "running": self.running,
             "workers_count": len(self.workers),
-            "queue_size": self.queue.qsize(),
+            "pool_size": len(self.workers) - self._retire,
+            "pool_target": self.pool_target,
+            "pool_min": settings.WEBHOOK_WORKERS_MIN,
+            "pool_max": settings.WEBHOOK_WORKERS_MAX,
+            "active_tasks": self._active_tasks,
+            "avg_task_latency": round(self._task_latency, 3) if self._task_latency is not None else None,
+            "provider_pressure": round(self._provider_pressure, 2),
+            "backlog_age_seconds": round(self._backlog_age, 1),
+            "queue_backend": self.backend.name if self.backend else None,
+            "queue_size": self.stats["queue_size"],
+            "queue_lanes": self._queue_sizes,
+            "retries_scheduled": self.stats["retries_scheduled"],
+            "dead_lettered": self.stats["dead_lettered"],
             "total_processed": self.stats["total_processed"],
             "total_failed": self.stats["total_failed"],
             "success_rate": round(success_rate, 2),
@@ -389,7 +619,7 @@ async def queue_webhook_task(event_type: str, payload: Dict[str, Any], priority:
     await webhook_task_queue.add_task(event_type, payload, priority)
 
 
-async def start_webhook_workers(num_workers: int = 3):
+async def start_webhook_workers(num_workers: int = settings.WEBHOOK_WORKER_COUNT):
     """Start webhook background workers"""
     await webhook_task_queue.start_workers(num_workers)
 
@@ -401,6 +631,7 @@ async def stop_webhook_workers():
 
 async def get_webhook_queue_stats() -> Dict[str, Any]:
     """Get webhook queue statistics"""
+    await webhook_task_queue.refresh_queue_stats()
     return webhook_task_queue.get_stats()
 
 
@@ -0,0 +1,51 @@
+"""
+Standalone webhook worker process
+
+Consumes the shared Redis Streams webhook queue so workers can be scaled
+separately from the API (set WEBHOOK_WORKERS_ENABLED=false on API processes).
+
+    python -m app.webhook_worker
+"""
+import asyncio
+import signal
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.logging import setup_logging
+from app.core.dependencies import startup_dependencies, shutdown_dependencies
+from app.services.service_manager import initialize_api_services, cleanup_api_services
+from app.utils.webhook_tasks import webhook_task_queue, start_webhook_workers, stop_webhook_workers
+
+settings = get_settings()
+
+
+async def run_worker() -> None:
+    """Run webhook workers until SIGINT/SIGTERM"""
+    await startup_dependencies()
+    await initialize_api_services()
+    await start_webhook_workers(settings.WEBHOOK_WORKER_COUNT)
+
+    if webhook_task_queue.backend and webhook_task_queue.backend.name == "memory":
+        logger.warning("⚠️  Webhook worker is using the in-memory queue - it will not see tasks queued by the API")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows
+
+    logger.info(f"📦 Webhook worker process running ({settings.WEBHOOK_WORKER_COUNT} workers)")
+    await stop_event.wait()
+
+    logger.info("🛑 Stopping webhook worker process...")
+    await stop_webhook_workers()
+    await cleanup_api_services()
+    await shutdown_dependencies()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(run_worker())
@@ -0,0 +1,110 @@
+import pytest
+import asyncio
+import threading
+import time
+
+from app.services.api import goplus_client as goplus_module
+from app.services.api import rugcheck_client as rugcheck_module
+from app.services.api.access_token import AccessTokenRefresher
+from app.services.api.goplus_client import GOplusClient
+from app.services.api.rugcheck_client import RugCheckClient
+
+
+@pytest.mark.unit
+class TestAccessTokenRefresher:
+    """Unit tests for background bearer token renewal"""
+
+    @pytest.mark.asyncio
+    async def test_renews_before_expiry_without_blocking(self):
+        """Cold callers share one fetch; inside the margin the old token is served while renewing"""
+        fetches = []
+        release = asyncio.Event()
+
+        async def fetch():
+            fetches.append(time.time())
+            if len(fetches) > 1:
+                await release.wait()
+            return f"token-{len(fetches)}", 1.0
+
+        auth = AccessTokenRefresher("test", fetch, refresh_margin=0.5)
+        assert await asyncio.gather(auth.get(), auth.get(), auth.get()) == ["token-1"] * 3
+        assert len(fetches) == 1
+
+        # The renewal timer fires inside the margin; requests keep the valid token meanwhile
+        await asyncio.sleep(0.65)
+        assert len(fetches) == 2
+        assert await asyncio.wait_for(auth.get(), timeout=0.05) == "token-1"
+
+        release.set()
+        await asyncio.sleep(0)
+        assert await auth.get() == "token-2"
+        assert auth.expires_at > time.time() + 0.9
+
+        auth.invalidate()
+        assert await auth.get() == "token-3"
+        await auth.close()
+
+    @pytest.mark.asyncio
+    async def test_goplus_sdk_call_runs_off_the_event_loop(self, monkeypatch):
+        """The synchronous GOplus SDK runs in a worker thread and expires_in is a lifetime"""
+        calls = []
+
+        class FakeResponse:
+            def to_dict(self):
+                return {"code": 1, "result": {"access_token": "bearer", "expires_in": 7200}}
+
+        class FakeAuth:
+            def __init__(self, key, secret):
+                pass
+
+            def get_access_token(self):
+                calls.append(threading.current_thread() is threading.main_thread())
+                return FakeResponse()
+
+        monkeypatch.setattr(goplus_module, "Auth", FakeAuth)
+        client = GOplusClient()
+        client.app_key, client.app_secret = "key", "secret"
+
+        assert await client._get_access_token() == "bearer"
+        assert await client._get_access_token() == "bearer"
+        assert calls == [False]
+        assert 7000 < client._auth.expires_at - time.time() <= 7200
+        await client.__aexit__(None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_rugcheck_prefetch_signs_in_before_the_first_request(self, monkeypatch):
+        """The startup prefetch initializes the wallet itself, so the first request reuses its JWT"""
+        if not rugcheck_module.SOLANA_AVAILABLE:
+            pytest.skip("solders not installed")
+
+        logins = []
+
+        class FakeResponse:
+            status = 200
+
+            async def json(self):
+                return {"accessToken": f"jwt-{len(logins)}", "expiresIn": 3600}
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        class FakeSession:
+            def post(self, url, headers=None, json=None):
+                logins.append(json["wallet"])
+                return FakeResponse()
+
+        monkeypatch.setattr(rugcheck_module.http_transport, "get_session", lambda: FakeSession())
+        keypair = rugcheck_module.Keypair()
+        client = RugCheckClient()
+        client.wallet_private_key = str(keypair)
+
+        client.prefetch_access_token()
+        await asyncio.wait_for(client._auth._refresh_task, timeout=1.0)
+        assert logins == [str(keypair.pubkey())]
+
+        assert await client._get_access_token() == "jwt-1"
+        assert len(logins) == 1
+        await client.__aexit__(None, None, None)
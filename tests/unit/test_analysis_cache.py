@@ -0,0 +1,64 @@
+import pytest
+
+from app.utils.cache import CacheManager
+from app.utils.analysis_cache import AnalysisCache
+
+
+TOKEN = "So11111111111111111111111111111111111112"
+
+
+def make_cache() -> AnalysisCache:
+    """Analysis cache backed by memory-only cache manager"""
+    backend = CacheManager()
+    backend.redis_client = False
+    cache = AnalysisCache(cache=backend)
+    cache.enabled = True
+    return cache
+
+
+@pytest.mark.unit
+class TestAnalysisCache:
+    """Unit tests for content-addressed analysis cache"""
+
+    def test_key_is_stable_within_freshness_window(self):
+        """Keys only change when the freshness bucket rolls over"""
+        cache = make_cache()
+        cache.freshness["quick"] = 60
+
+        assert cache.build_key(TOKEN, "quick", now=120) == cache.build_key(TOKEN, "quick", now=179)
+        assert cache.build_key(TOKEN, "quick", now=120) != cache.build_key(TOKEN, "quick", now=180)
+        assert cache.build_key(TOKEN, "quick", now=120) != cache.build_key(TOKEN, "deep", now=120)
+
+    @pytest.mark.asyncio
+    async def test_hit_miss_and_force_refresh(self):
+        """Repeat lookups hit, force_refresh bypasses"""
+        cache = make_cache()
+
+        assert await cache.get(TOKEN, "deep") is None
+
+        key = await cache.set(TOKEN, "deep", {"token_address": TOKEN, "metadata": {}})
+        assert key is not None
+
+        cached = await cache.get(TOKEN, "deep")
+        assert cached["token_address"] == TOKEN
+
+        assert await cache.get(TOKEN, "deep", force_refresh=True) is None
+
+        stats = cache.get_stats()["tiers"]["deep"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bypasses"] == 1
+        assert stats["sets"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_and_disabled(self):
+        """Invalidation drops entries and disabled cache never stores"""
+        cache = make_cache()
+
+        await cache.set(TOKEN, "quick", {"metadata": {}})
+        assert await cache.invalidate(TOKEN, "quick") == 1
+        assert await cache.get(TOKEN, "quick") is None
+
+        cache.enabled = False
+        assert await cache.set(TOKEN, "quick", {"metadata": {}}) is None
+        assert await cache.get(TOKEN, "quick") is None
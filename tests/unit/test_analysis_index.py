@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+from app.services import analysis_storage as analysis_storage_module
+from app.services.analysis_index import AnalysisIndex
+from app.services.analysis_storage import AnalysisStorageService
+
+
+def make_metadata(i: int) -> dict:
+    return {
+        "doc_type": "token_analysis",
+        "analysis_id": f"analysis_{i}",
+        "token_address": f"Mint{i:040d}",
+        "token_name": "Pepe" if i % 10 == 0 else f"Token {i}",
+        "token_symbol": f"T{i}",
+        "timestamp_unix": 1_700_000_000 + i // 2,  # pairs share a timestamp
+        "risk_level": "high" if i % 3 == 0 else "low",
+        "security_status": "safe",
+        "source_event": "webhook" if i % 2 else "api_request",
+        "analysis_type": "quick"
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = AnalysisIndex(str(tmp_path / "analyses.db"))
+    index._backfilled = True
+    yield index
+    index.close()
+
+
+@pytest.mark.unit
+class TestAnalysisIndex:
+    """Unit tests for the analysis metadata side-index"""
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_match_offset_pages(self, index):
+        """Cursor pages walk the same newest-first order as offsets, including timestamp ties"""
+        for i in range(95):
+            await index.add(f"doc_{i:03d}", make_metadata(i))
+
+        filters = {"risk_level": "low"}
+        assert await index.count(filters) == 63
+        assert await index.count({"search": "pepe", "source_event": "api_request"}) == 10
+
+        walked, cursor = [], None
+        while True:
+            result = await index.page(filters, limit=20, cursor=cursor)
+            walked.extend(item["doc_id"] for item in result["items"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+
+        by_offset = []
+        for offset in range(0, 63, 20):
+            by_offset.extend(item["doc_id"] for item in (await index.page(filters, limit=20, offset=offset))["items"])
+
+        assert walked == by_offset
+        assert len(set(walked)) == 63
+        assert [item["analysis_id"] for item in await index.recent(2)] == ["analysis_94", "analysis_93"]
+
+    @pytest.mark.asyncio
+    async def test_stored_analyses_are_indexed(self, index, monkeypatch):
+        """store_analysis writes the side-index under the ChromaDB document ID"""
+
+        class FakeChroma:
+            def is_connected(self):
+                return True
+
+            async def add_document(self, content, metadata, doc_id):
+                return doc_id
+
+        async def fake_get_chroma_client():
+            return FakeChroma()
+
+        storage = AnalysisStorageService()
+        monkeypatch.setattr(analysis_storage_module, "get_chroma_client", fake_get_chroma_client)
+        monkeypatch.setattr(analysis_storage_module, "analysis_index", index)
+        monkeypatch.setattr(storage, "_extract_analysis_data", lambda result: {"timestamp_unix": 1_700_000_000, "token_address": "Mint1234567890", "analysis_type": "deep"})
+        monkeypatch.setattr(storage, "_generate_searchable_content", lambda doc_data: "content")
+        monkeypatch.setattr(storage, "_generate_metadata", lambda doc_data: make_metadata(7))
+
+        assert await storage.store_analysis({}) is True
+
+        page = await storage.get_analyses_paginated(page=1, per_page=10, filters={"source_event": "webhook"})
+        assert [item["doc_id"] for item in page["items"]] == ["analysis_1700000000_deep_Mint1234567890"]
+        assert page["pagination"]["total_items"] == 1
+        assert page["pagination"]["has_next"] is False
+
+    @pytest.mark.asyncio
+    async def test_runs_are_fetched_by_id_and_listed_by_time(self, index, monkeypatch):
+        """Run lookups use exact document IDs and the run index - never a vector search"""
+        documents = {}
+
+        class FakeChroma:
+            def is_connected(self):
+                return True
+
+            async def add_document(self, content, metadata, doc_id):
+                documents[doc_id] = metadata
+                return doc_id
+
+            async def get(self, ids, include):
+                return {"ids": ids, "metadatas": [documents[doc_id] for doc_id in ids if doc_id in documents]}
+
+            async def search(self, *args, **kwargs):
+                raise AssertionError("semantic search used for a run lookup")
+
+        async def fake_get_chroma_client():
+            return FakeChroma()
+
+        async def fake_put(results):
+            return {"blob_id": None, "raw_size": 0}
+
+        storage = AnalysisStorageService()
+        index._runs_backfilled = True
+        monkeypatch.setattr(analysis_storage_module, "get_chroma_client", fake_get_chroma_client)
+        monkeypatch.setattr(analysis_storage_module, "analysis_index", index)
+        monkeypatch.setattr(analysis_storage_module.run_blob_store, "put", fake_put)
+
+        for i, profile_type in enumerate(["pump", "discovery", "pump", "whale"]):
+            await storage.store_analysis_run({"run_id": f"r{i}", "profile_type": profile_type, "timestamp": 1_700_000_000 + i})
+
+        assert (await storage.get_analysis_run("r1", "discovery"))["profile_type"] == "discovery"
+        assert await storage.get_analysis_run("r1", "pump") is None
+        assert (await storage.get_analysis_run("r3"))["profile_type"] == "whale"
+        assert await storage.get_analysis_run("missing") is None
+
+        assert [run["run_id"] for run in await storage.get_recent_runs(limit=3)] == ["r3", "r2", "r1"]
+        assert [run["run_id"] for run in await storage.get_recent_runs("pump")] == ["r2", "r0"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_retries_until_chroma_is_connected(self, tmp_path, monkeypatch):
+        """An unavailable ChromaDB leaves the backfill pending; concurrent first calls share one backfill"""
+        from app.utils import chroma_client as chroma_client_module
+
+        calls = []
+
+        class FakeChroma:
+            connected = False
+
+            def is_connected(self):
+                return self.connected
+
+            async def get(self, where, include):
+                calls.append(where)
+                return {"ids": ["doc_001", "doc_002"], "metadatas": [make_metadata(1), make_metadata(2)]}
+
+        chroma = FakeChroma()
+
+        async def fake_get_chroma_client():
+            return chroma
+
+        monkeypatch.setattr(chroma_client_module, "get_chroma_client", fake_get_chroma_client)
+        index = AnalysisIndex(str(tmp_path / "analyses.db"))
+        try:
+            assert await index.count() == 0
+            assert index._backfilled is False
+
+            chroma.connected = True
+            counts = await asyncio.gather(*(index.count() for _ in range(5)))
+            assert counts == [2] * 5
+            assert calls == [{"doc_type": "token_analysis"}]
+            assert index._backfilled is True
+        finally:
+            index.close()
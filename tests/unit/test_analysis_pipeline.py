@@ -0,0 +1,106 @@
+import pytest
+import asyncio
+import time
+
+from app.services.analysis_pipeline import AnalysisPipeline
+
+
+async def delayed(value, delay: float):
+    await asyncio.sleep(delay)
+    return value
+
+
+@pytest.mark.unit
+class TestAnalysisPipeline:
+    """Unit tests for the speculative analysis pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_speculative_nodes_overlap_the_gate(self):
+        """Market nodes run during security checks, so latency is max() not sum()"""
+        pipeline = AnalysisPipeline("test")
+        pipeline.add_node("security", lambda: delayed((True, {}), 0.2), gate=lambda result: result[0])
+        pipeline.add_node("market", lambda: delayed({"price": 1}, 0.2), depends_on=["security"], speculative=True)
+
+        released = []
+        started = time.time()
+        nodes = await pipeline.run(lambda node: released.append(node.name))
+
+        assert time.time() - started < 0.35
+        assert released == ["security", "market"]
+        assert nodes["market"].status == "completed"
+        assert nodes["market"].result == {"price": 1}
+
+    @pytest.mark.asyncio
+    async def test_failed_gate_cancels_speculative_nodes(self):
+        """A rejected security result cancels in-flight market nodes without releasing them"""
+        pipeline = AnalysisPipeline("test")
+        pipeline.add_node("security", lambda: delayed((False, {}), 0.05), gate=lambda result: result[0])
+        pipeline.add_node("market", lambda: delayed({"price": 1}, 1.0), depends_on=["security"], speculative=True)
+        pipeline.add_node("report", lambda: delayed("report", 0.01), depends_on=["security"])
+
+        released = []
+        started = time.time()
+        nodes = await pipeline.run(lambda node: released.append(node.name))
+
+        assert time.time() - started < 0.5
+        assert released == ["security"]
+        assert nodes["market"].status == "cancelled"
+        assert nodes["market"].task.cancelled()
+        assert nodes["report"].status == "skipped"
+
+    @pytest.mark.asyncio
+    async def test_errors_and_timeouts_are_reported_per_node(self):
+        """A failing or slow node is released as failed without affecting its siblings"""
+        async def broken():
+            raise RuntimeError("boom")
+
+        pipeline = AnalysisPipeline("test")
+        pipeline.add_node("broken", broken)
+        pipeline.add_node("slow", lambda: delayed("late", 1.0), timeout=0.05)
+        pipeline.add_node("ok", lambda: delayed("ok", 0.01))
+
+        nodes = await pipeline.run()
+
+        assert nodes["broken"].status == "failed"
+        assert isinstance(nodes["slow"].error, asyncio.TimeoutError)
+        assert nodes["ok"].result == "ok"
+
+        with pytest.raises(ValueError):
+            pipeline.add_node("ok", broken)
+
+    @pytest.mark.asyncio
+    async def test_failed_security_cancels_market_provider_calls(self, monkeypatch):
+        """Speculative market calls of an analysis are cancelled, not left running, when security fails"""
+        from app.services.token_analyzer import TokenAnalyzer
+
+        provider = {"started": False, "cancelled": False}
+
+        async def market_call():
+            provider["started"] = True
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                provider["cancelled"] = True
+                raise
+            return {"price": 1}
+
+        async def failing_security(token_address, analysis_response):
+            await asyncio.sleep(0.05)
+            return False, {"critical_issues": ["mintable"], "warnings": [], "overall_safe": False}
+
+        from app.services import token_analyzer as token_analyzer_module
+
+        # Market calls go through single-flight, which must still let them be cancelled
+        monkeypatch.setattr(token_analyzer_module.single_flight, "enabled", True)
+        analyzer = TokenAnalyzer()
+        monkeypatch.setattr(analyzer, "_run_security_checks", failing_security)
+        monkeypatch.setattr(analyzer, "_market_service_calls", lambda token_address: {"dexscreener_pairs": market_call})
+
+        response = analyzer._new_phase_response()
+        started = time.time()
+        security_passed, _ = await analyzer._run_analysis_pipeline("Mint1234567890", response)
+
+        assert security_passed is False
+        assert time.time() - started < 0.5
+        assert provider == {"started": True, "cancelled": True}
+        assert analyzer._market_node_timeout("birdeye") is not None
@@ -0,0 +1,54 @@
+import pytest
+import asyncio
+import time
+
+from app.services.api.birdeye_client import BirdeyeClient, BirdeyeAPIError
+
+
+@pytest.mark.unit
+class TestBirdeyeMarketData:
+    """Unit tests for concurrent Birdeye price/trades collection"""
+
+    @pytest.mark.asyncio
+    async def test_price_and_trades_run_concurrently(self, monkeypatch):
+        """Both endpoints are requested together, not one after the other"""
+        client = BirdeyeClient()
+
+        async def fake_price(token_address, **kwargs):
+            await asyncio.sleep(0.2)
+            return {"address": token_address, "value": 1.5}
+
+        async def fake_trades(token_address, **kwargs):
+            await asyncio.sleep(0.2)
+            return {"items": [{"side": "buy"}]}
+
+        monkeypatch.setattr(client, "get_token_price", fake_price)
+        monkeypatch.setattr(client, "get_token_trades", fake_trades)
+
+        started = time.time()
+        result = await client.get_market_data("mint")
+
+        assert time.time() - started < 0.35
+        assert result["data_collected"] == ["price", "trades"]
+        assert result["price"]["value"] == 1.5
+        assert result["errors"] == []
+
+    @pytest.mark.asyncio
+    async def test_failed_endpoint_does_not_drop_the_other(self, monkeypatch):
+        """An API error on one endpoint is reported while the other result is kept"""
+        client = BirdeyeClient()
+
+        async def fake_price(token_address, **kwargs):
+            raise BirdeyeAPIError("HTTP 500")
+
+        async def fake_trades(token_address, **kwargs):
+            return {"items": []}
+
+        monkeypatch.setattr(client, "get_token_price", fake_price)
+        monkeypatch.setattr(client, "get_token_trades", fake_trades)
+
+        result = await client.get_market_data("mint")
+
+        assert result["data_collected"] == ["trades"]
+        assert "price" not in result
+        assert any("price failed" in error for error in result["errors"])
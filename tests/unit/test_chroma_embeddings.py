@@ -0,0 +1,71 @@
+import pytest
+
+from app.utils import chroma_client as chroma_client_module
+from app.utils.chroma_client import CachedEmbedder, ChromaClient, EMBEDDING_BACKENDS
+
+
+class CountingEmbeddingFunction:
+    """Embedding function recording each backend call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [[float(len(text)), 1.0] for text in input]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.upserts = []
+        self.queries = []
+
+    def upsert(self, ids, documents, metadatas, embeddings=None):
+        self.upserts.append(embeddings)
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        return {"documents": [["doc"]], "metadatas": [[{}]], "distances": [[0.1]]}
+
+
+@pytest.mark.unit
+class TestChromaEmbeddings:
+    """Unit tests for the cached, batched embedding backend"""
+
+    @pytest.mark.asyncio
+    async def test_batches_documents_and_memoizes_queries(self):
+        """A flushed batch is one backend call; repeated queries are embedded once"""
+        function = CountingEmbeddingFunction()
+        collection = FakeCollection()
+        client = ChromaClient()
+        client._collection = collection
+        client.is_connected = lambda: True
+        client.write_batch_size = 3
+        client.embedder = CachedEmbedder(function, "counting", cache_size=2)
+
+        for i in range(3):
+            await client.add_document(f"doc {i}", doc_id=f"id{i}")
+        assert function.calls == [["doc 0", "doc 1", "doc 2"]]
+        assert collection.upserts == [[[5.0, 1.0]] * 3]
+
+        for query in ["token analysis", "analysis run", "token analysis"]:
+            await client.search(query)
+        assert function.calls[1:] == [["token analysis"], ["analysis run"]]
+        assert collection.queries[-1]["query_embeddings"] == [[14.0, 1.0]]
+        assert "query_texts" not in collection.queries[-1]
+        assert client.embedder.get_stats()["query_hits"] == 1
+        await client.disconnect()
+
+    def test_backend_is_selected_from_settings(self, monkeypatch):
+        """Registered backends are built with the configured model name"""
+        monkeypatch.setitem(EMBEDDING_BACKENDS, "counting", lambda model: CountingEmbeddingFunction())
+        monkeypatch.setattr(chroma_client_module.settings, "CHROMA_EMBEDDING_BACKEND", "counting")
+        monkeypatch.setattr(chroma_client_module.settings, "CHROMA_EMBEDDING_MODEL", "tiny")
+
+        embedder = ChromaClient()._create_embedder()
+        assert embedder.name == "counting:tiny"
+        assert embedder.embed_query("abc") == [3.0, 1.0]
+
+        monkeypatch.setattr(chroma_client_module.settings, "CHROMA_EMBEDDING_BACKEND", "missing")
+        with pytest.raises(ValueError):
+            ChromaClient()._create_embedder()
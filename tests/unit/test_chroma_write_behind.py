@@ -0,0 +1,126 @@
+import pytest
+import asyncio
+
+from app.utils.chroma_client import ChromaClient
+
+
+class FakeCollection:
+    """Collection recording batched upserts"""
+
+    def __init__(self, fail_first: bool = False, poison: str = None):
+        self.upserts = []
+        self.docs = {}
+        self.fail_first = fail_first
+        self.poison = poison
+
+    def upsert(self, ids, documents, metadatas):
+        if self.fail_first:
+            self.fail_first = False
+            raise RuntimeError("database is locked")
+        if self.poison in ids:
+            raise ValueError("Expected metadata value to be a str, int, float or bool")
+        self.upserts.append(list(ids))
+        self.docs.update(zip(ids, documents))
+
+    def get(self, ids=None, **kwargs):
+        return {"ids": [doc_id for doc_id in ids or self.docs if doc_id in self.docs]}
+
+
+def make_client(collection: FakeCollection, batch_size: int = 3, flush_ms: int = 50) -> ChromaClient:
+    client = ChromaClient()
+    client._collection = collection
+    client.is_connected = lambda: True
+    client.write_batch_size = batch_size
+    client.write_flush_interval = flush_ms / 1000
+    return client
+
+
+@pytest.mark.unit
+class TestChromaWriteBehind:
+    """Unit tests for batched ChromaDB ingestion"""
+
+    @pytest.mark.asyncio
+    async def test_writes_flush_by_size_and_time(self):
+        """Full batches flush at once, the remainder after the interval; same IDs collapse"""
+        collection = FakeCollection()
+        client = make_client(collection)
+
+        for i in range(4):
+            await client.add_document(f"doc {i}", {"n": i}, doc_id=f"id{i}")
+        assert collection.upserts == [["id0", "id1", "id2"]]
+
+        await client.add_document("doc 3 v2", doc_id="id3")
+        await asyncio.sleep(0.1)
+        assert collection.upserts[1] == ["id3"]
+        assert collection.docs["id3"] == "doc 3 v2"
+        assert client.write_stats["queued"] == 5
+        assert client.write_stats["flushed"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_and_drained_on_disconnect(self):
+        """A failing upsert keeps its documents; reads of queued IDs and shutdown flush them"""
+        collection = FakeCollection(fail_first=True)
+        client = make_client(collection, batch_size=10, flush_ms=10_000)
+
+        await client.add_document("a", doc_id="a")
+        await client.add_document("b", doc_id="b")
+        assert await client.flush() == 0
+        assert list(client._pending) == ["a", "b"]
+
+        assert (await client.get(ids=["a"]))["ids"] == ["a"]
+        await client.add_document("c", doc_id="c")
+        await client.disconnect()
+
+        assert collection.upserts == [["a", "b"], ["c"]]
+        assert not client._pending
+
+    @pytest.mark.asyncio
+    async def test_rejected_document_is_isolated_and_dropped(self):
+        """A document Chroma always rejects is retried alone after the cap and dropped; the rest is written"""
+        collection = FakeCollection(poison="bad")
+        client = make_client(collection, batch_size=10, flush_ms=10_000)
+        client.write_max_retries = 2
+
+        for doc_id in ("a", "bad", "b"):
+            await client.add_document(doc_id, doc_id=doc_id)
+
+        assert await client.flush() == 0
+        assert await client.flush() == 0
+        assert await client.flush() == 2
+
+        assert sorted(collection.docs) == ["a", "b"]
+        assert not client._pending and not client._failures
+        assert client.write_stats["dropped"] == 1
+
+        await client.add_document("c", doc_id="c")
+        assert await client.flush() == 1
+        await client.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_drains_and_unindexes_dropped_documents(self, tmp_path):
+        """Shutdown keeps flushing until the queue is empty; a dropped document leaves the side index"""
+        from app.services.analysis_index import AnalysisIndex
+
+        index = AnalysisIndex(str(tmp_path / "analyses.db"))
+        index._backfilled = index._runs_backfilled = True
+        collection = FakeCollection(fail_first=True, poison="bad")
+        client = make_client(collection, batch_size=10, flush_ms=10_000)
+        client.write_max_retries = 2
+        client.add_drop_listener(index.remove)
+
+        try:
+            for doc_id in ("a", "bad", "b"):
+                await client.add_document(doc_id, doc_id=doc_id)
+                await index.add(doc_id, {"doc_type": "token_analysis", "timestamp_unix": 1})
+            await client.add_document("run", doc_id="run_pump_bad")
+            await index.add_run("run_pump_bad", {"run_id": "bad", "profile_type": "pump"})
+
+            await client.disconnect()
+
+            assert not client._pending
+            assert sorted(collection.docs) == ["a", "b", "run_pump_bad"]
+            assert client.write_stats["dropped"] == 1
+            assert [item["doc_id"] for item in (await index.page())["items"]] == ["b", "a"]
+            assert await index.find_run("bad") is not None
+        finally:
+            index.close()
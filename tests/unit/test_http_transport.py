@@ -0,0 +1,48 @@
+import pytest
+
+from app.services.api.http_transport import HTTPTransport
+from app.services.api.helius_client import HeliusClient
+from app.services.api.dexscreener_client import DexScreenerClient
+import app.services.api.helius_client as helius_module
+import app.services.api.dexscreener_client as dexscreener_module
+
+
+@pytest.mark.unit
+class TestHTTPTransport:
+    """Unit tests for the shared pooled HTTP transport"""
+
+    @pytest.mark.asyncio
+    async def test_session_is_shared_and_pooled(self):
+        """Repeated calls reuse one session with configured connector limits"""
+        transport = HTTPTransport()
+        try:
+            session = transport.get_session()
+            assert transport.get_session() is session
+            assert session.connector.limit == transport.pool_size
+            assert session.connector.limit_per_host == transport.per_host_limit
+
+            client = transport.get_httpx_client()
+            assert transport.get_httpx_client() is client
+        finally:
+            await transport.close()
+
+        assert transport.get_stats()["session_open"] is False
+
+    @pytest.mark.asyncio
+    async def test_clients_share_session_and_do_not_close_it(self, monkeypatch):
+        """API clients use the pooled session and leave it open on exit"""
+        transport = HTTPTransport()
+        monkeypatch.setattr(helius_module, "http_transport", transport)
+        monkeypatch.setattr(dexscreener_module, "http_transport", transport)
+
+        try:
+            async with HeliusClient() as helius, DexScreenerClient() as dexscreener:
+                assert helius.session is dexscreener.session
+                shared = helius.session
+
+            assert not shared.closed
+            assert transport.get_stats()["sessions_created"] == 1
+        finally:
+            await transport.close()
+
+        assert shared.closed
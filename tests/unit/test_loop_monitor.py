@@ -0,0 +1,62 @@
+import pytest
+import asyncio
+import threading
+import time
+
+from app.utils.chroma_client import ChromaClient
+from app.utils.loop_monitor import LoopLagMonitor
+
+
+def blocking_chroma_call():
+    time.sleep(0.2)
+
+
+class FakeCollection:
+    """Synchronous collection recording which thread served each call"""
+
+    def __init__(self):
+        self.threads = []
+
+    def get(self, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(0.2)
+        return {"ids": kwargs.get("ids", [])}
+
+
+@pytest.mark.unit
+class TestLoopLagMonitor:
+    """Unit tests for event loop stall detection and Chroma offloading"""
+
+    @pytest.mark.asyncio
+    async def test_reports_blocking_callback_with_stack(self):
+        """A synchronous call on the loop is reported once, naming the blocking function"""
+        monitor = LoopLagMonitor(threshold_ms=50, interval_ms=10)
+        await monitor.start()
+        await asyncio.sleep(0.05)
+
+        blocking_chroma_call()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["stalls"] == 1
+        assert stats["max_lag_ms"] >= 50
+        assert "blocking_chroma_call" in monitor.stats["last_stall_stack"]
+
+    @pytest.mark.asyncio
+    async def test_chroma_calls_leave_the_loop_responsive(self):
+        """Collection calls run on the Chroma pool, so the loop keeps ticking meanwhile"""
+        client = ChromaClient()
+        collection = FakeCollection()
+        client._collection = collection
+        client.is_connected = lambda: True
+
+        monitor = LoopLagMonitor(threshold_ms=50, interval_ms=10)
+        await monitor.start()
+        results = await asyncio.gather(client.get(ids=["a"]), client.get(ids=["b"]))
+        await monitor.stop()
+        await client.disconnect()
+
+        assert [r["ids"] for r in results] == [["a"], ["b"]]
+        assert all(name.startswith("chroma") for name in collection.threads)
+        assert monitor.get_stats()["stalls"] == 0
@@ -0,0 +1,109 @@
+import pytest
+import asyncio
+import json
+import time
+
+from app.services.trade.autotrade_service import AutoTradeService
+from app.services.trade.position_book import PositionBook
+
+
+def make_position(token_address: str, price: float = 1.0) -> dict:
+    return {"token_address": token_address, "entry_price": price, "highest_price_seen": price, "status": "active"}
+
+
+@pytest.mark.unit
+class TestPositionBook:
+    """Unit tests for the WAL-backed position book"""
+
+    @pytest.mark.asyncio
+    async def test_changes_are_logged_and_replayed(self, tmp_path):
+        """A new book rebuilds the same positions from the log, ignoring a torn last record"""
+        path = tmp_path / "positions.json"
+        book = PositionBook(path, checkpoint_every=100)
+        book.put("mintA", make_position("mintA"))
+        book.put("mintB", make_position("mintB"))
+        book.update("mintA", highest_price_seen=2.5)
+        book.delete("mintB")
+        await book.flush()
+
+        assert not path.exists()
+        assert len(book.wal_path.read_text().splitlines()) == 4
+        with open(book.wal_path, "a") as f:
+            f.write('{"op":"put","token":"mintC"')
+
+        replayed = PositionBook(path)
+        assert [p["token_address"] for p in replayed.values()] == ["mintA"]
+        assert replayed.get("mintA")["highest_price_seen"] == 2.5
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_compacts_the_log(self, tmp_path):
+        """Reaching the checkpoint threshold writes the whole book and truncates the log"""
+        path = tmp_path / "positions.json"
+        book = PositionBook(path, checkpoint_every=3)
+        book.put("mintA", make_position("mintA"))
+        for price in (1.1, 1.2, 1.3):
+            book.update("mintA", highest_price_seen=price)
+        await book.flush()
+
+        assert json.loads(path.read_text())["mintA"]["highest_price_seen"] == 1.3
+        assert book.wal_path.read_text() == ""
+
+        book.update("mintA", highest_price_seen=1.4)
+        await book.close()
+        assert json.loads(path.read_text())["mintA"]["highest_price_seen"] == 1.4
+        assert PositionBook(path).get("mintA")["highest_price_seen"] == 1.4
+
+    @pytest.mark.asyncio
+    async def test_changes_during_checkpoint_survive(self, tmp_path, monkeypatch):
+        """Changes made while a checkpoint is being written are not truncated with the log"""
+        path = tmp_path / "positions.json"
+        book = PositionBook(path, checkpoint_every=100)
+        book.put("mintA", make_position("mintA"))
+        await book.flush()
+
+        write = book._write
+
+        def slow_write(lines, checkpoint):
+            if checkpoint is not None:
+                time.sleep(0.1)
+            write(lines, checkpoint)
+
+        monkeypatch.setattr(book, "_write", slow_write)
+
+        checkpoint = asyncio.create_task(book.checkpoint())
+        await asyncio.sleep(0.02)
+        book.put("mintB", make_position("mintB"))
+        book.update("mintA", highest_price_seen=3.0)
+        await checkpoint
+        await book._flush_task
+
+        assert set(json.loads(path.read_text())) == {"mintA"}
+        replayed = PositionBook(path)
+        assert replayed.get("mintA")["highest_price_seen"] == 3.0
+        assert replayed.get("mintB") is not None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_sell_once(self, tmp_path, monkeypatch):
+        """Two updates arriving together cannot both trigger the autosell"""
+        service = AutoTradeService()
+        service.book = PositionBook(tmp_path / "positions.json")
+        service.config = {**service.config, "enabled": True, "liquidity_drain_threshold": 0.07, "max_hold_hours": 24}
+        service.track_position("mintA", {"entry_price": 1.0, "token_name": "A"})
+        sells = []
+
+        async def fake_autosell(position, sell_reason, current_data):
+            sells.append(sell_reason)
+            await asyncio.sleep(0.05)
+            service.close_position(position["token_address"], sell_reason, {"sell_price": current_data["currentPriceUSD"]})
+
+        monkeypatch.setattr(service, "_execute_autosell", fake_autosell)
+
+        crash = {"currentPriceUSD": 0.5, "liquidityUSD": 0}
+        await asyncio.gather(
+            service.check_position_on_snapshot_update("mintA", crash),
+            service.check_position_on_snapshot_update("mintA", crash)
+        )
+
+        assert sells == ["stop_loss"]
+        assert service.get_active_positions() == []
+        await service.book.close()
@@ -0,0 +1,202 @@
+import pytest
+import asyncio
+import base64
+import json
+
+from app.services.trade import autotrade_service as autotrade_module
+from app.services.trade import position_price_feed as feed_module
+from app.services.trade.position_price_feed import BONDING_CURVE_LAYOUT, PositionPriceFeed, WSOL_MINT, decode_bonding_curve
+
+
+TOKEN = "Tok1111111111111111111111111111111111111111"
+
+
+class FakeSolanaWebsocket:
+    """Local stand-in for the Helius websocket RPC (account subscriptions only)"""
+
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.subscriptions = {}
+        self.unsubscribed = []
+
+    async def send(self, raw):
+        message = json.loads(raw)
+        if message["method"] == "accountSubscribe":
+            subscription_id = 100 + len(self.subscriptions)
+            self.subscriptions[message["params"][0]] = subscription_id
+            self.incoming.put_nowait(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": subscription_id}))
+        elif message["method"] == "accountUnsubscribe":
+            self.unsubscribed.append(message["params"][0])
+
+    def notify(self, account, data, slot=1):
+        self.incoming.put_nowait(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "accountNotification",
+            "params": {
+                "subscription": self.subscriptions[account],
+                "result": {"context": {"slot": slot}, "value": {"data": data}}
+            }
+        }))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.incoming.get()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def curve_data(virtual_sol: float, virtual_token: float, real_sol: float) -> list:
+    raw = BONDING_CURVE_LAYOUT.pack(b"\x00" * 8, int(virtual_token * 1e6), int(virtual_sol * 1e9), 0, int(real_sol * 1e9), 0, False)
+    return [base64.b64encode(raw).decode(), "base64"]
+
+
+def vault_data(amount: float) -> dict:
+    return {"parsed": {"info": {"tokenAmount": {"uiAmount": amount}}}, "program": "spl-token"}
+
+
+@pytest.fixture
+def feed_env(monkeypatch):
+    ws = FakeSolanaWebsocket()
+    ticks = []
+    snapshots = {}
+
+    async def fake_get(token_address):
+        return {"market_data": snapshots[token_address]} if token_address in snapshots else None
+
+    async def fake_check(batch):
+        ticks.extend(batch.values())
+
+    monkeypatch.setattr(feed_module.snapshot_store, "get", fake_get)
+    monkeypatch.setattr(autotrade_module.autotrade_service, "check_positions_batch", fake_check)
+    feed = PositionPriceFeed(connect=lambda url: ws)
+    feed.running = True
+    return feed, ws, ticks, snapshots
+
+
+async def wait_for(condition, timeout=1.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+@pytest.mark.unit
+class TestPositionPriceFeed:
+    """Unit tests for the websocket position price feed"""
+
+    def test_decode_bonding_curve(self):
+        curve = decode_bonding_curve(curve_data(30.0, 1_000_000.0, 5.0))
+        assert curve["sol"] == pytest.approx(30.0)
+        assert curve["token"] == pytest.approx(1_000_000.0)
+        assert curve["liquidity_sol"] == pytest.approx(5.0)
+        assert curve["complete"] is False
+
+    @pytest.mark.asyncio
+    async def test_bonding_curve_updates_reach_exit_checks(self, feed_env):
+        """Without a SOL quote, curve ticks are anchored to the snapshot price at the first curve update"""
+        feed, ws, ticks, snapshots = feed_env
+        # Snapshot reserves (30 SOL / 1M, e.g. another pool) differ from the curve's virtual reserves
+        snapshots[TOKEN] = {"poolAddress": "Curve1", "dexType": "pumpfun", "currentPriceUSD": 0.0045,
+                            "solReserve": 30.0, "tokenReserve": 1_000_000.0}
+
+        task = asyncio.create_task(feed._run())
+        await wait_for(lambda: feed._ws is not None)
+        assert await feed.watch(TOKEN)
+        await wait_for(lambda: feed.get_stats()["subscriptions"] == 1)
+
+        # 15 SOL / 1M tokens at $0.0045 -> SOL = $300; the first tick is not a fake 50% drop
+        ws.notify("Curve1", curve_data(15.0, 1_000_000.0, 2.0), slot=7)
+        await wait_for(lambda: len(ticks) == 1)
+
+        assert ticks[0]["currentPriceUSD"] == pytest.approx(0.0045)
+        assert ticks[0]["liquidityUSD"] == pytest.approx(1200.0)
+        assert ticks[0]["slot"] == 7
+
+        ws.notify("Curve1", curve_data(7.5, 1_000_000.0, 1.0), slot=8)
+        await wait_for(lambda: len(ticks) == 2)
+        assert ticks[1]["currentPriceUSD"] == pytest.approx(0.00225)
+
+        await feed.unwatch(TOKEN)
+        assert ws.unsubscribed == [100]
+        feed.running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_amm_vaults_and_latest_tick_wins(self, feed_env, monkeypatch):
+        """Vault balances combine into a price; ticks arriving during a check collapse to the newest"""
+        feed, ws, ticks, snapshots = feed_env
+        snapshots[TOKEN] = {"poolAddress": "Pool1", "dexType": "raydium", "currentPriceUSD": 0.15,
+                            "solReserve": 100.0, "tokenReserve": 100_000.0}
+
+        class FakeHelius:
+            async def get_token_accounts_by_owner(self, owner, mint):
+                return [{"address": "VaultSol" if mint == WSOL_MINT else "VaultTok"}]
+
+        monkeypatch.setattr(feed_module.api_manager, "clients", {"helius": FakeHelius()})
+        release = asyncio.Event()
+
+        async def slow_check(batch):
+            ticks.extend(batch.values())
+            await release.wait()
+
+        monkeypatch.setattr(autotrade_module.autotrade_service, "check_positions_batch", slow_check)
+
+        task = asyncio.create_task(feed._run())
+        await wait_for(lambda: feed._ws is not None)
+        assert await feed.watch(TOKEN)
+        await wait_for(lambda: feed.get_stats()["subscriptions"] == 2)
+
+        ws.notify("VaultTok", vault_data(100_000.0))
+        ws.notify("VaultSol", vault_data(100.0), slot=1)
+        await wait_for(lambda: len(ticks) == 1)
+        for slot, sol in ((2, 90.0), (3, 80.0), (4, 50.0)):
+            ws.notify("VaultSol", vault_data(sol), slot=slot)
+        await wait_for(lambda: feed.stats["ticks"] == 4)
+
+        release.set()
+        await wait_for(lambda: feed._evaluator.done())
+
+        assert [tick["slot"] for tick in ticks] == [1, 4]
+        assert ticks[0]["currentPriceUSD"] == pytest.approx(0.15)
+        assert ticks[1]["currentPriceUSD"] == pytest.approx(0.075)
+
+        feed.running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_sol_quote_prices_curve_ticks(self, feed_env, monkeypatch):
+        """With a SOL/USD quote, curve reserves are priced directly - snapshot reserves play no part"""
+        feed, ws, ticks, snapshots = feed_env
+        snapshots[TOKEN] = {"poolAddress": "Curve1", "dexType": "pumpfun", "currentPriceUSD": 0.0045,
+                            "solReserve": 30.0, "tokenReserve": 1_000_000.0}
+
+        class FakeBirdeye:
+            async def get_token_price(self, token_address, include_liquidity=True):
+                assert token_address == WSOL_MINT
+                return {"value": 200.0}
+
+        monkeypatch.setattr(feed_module.api_manager, "clients", {"birdeye": FakeBirdeye()})
+        monkeypatch.setattr(autotrade_module.autotrade_service, "get_active_positions", lambda: [{"token_address": TOKEN}])
+
+        task = asyncio.create_task(feed._run())
+        await wait_for(lambda: feed._ws is not None)
+        await feed.sync_positions()
+        await wait_for(lambda: feed.get_stats()["subscriptions"] == 1)
+        assert feed.get_stats()["sol_usd"] == 200.0
+
+        ws.notify("Curve1", curve_data(15.0, 1_000_000.0, 2.0))
+        await wait_for(lambda: len(ticks) == 1)
+        assert ticks[0]["currentPriceUSD"] == pytest.approx(0.003)
+
+        feed.running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,82 @@
+import pytest
+
+from app.utils.provider_cache import ProviderResponseCache, cached_request
+import app.utils.provider_cache as provider_cache_module
+
+
+class FakeClient:
+    """Minimal client whose _request counts network calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    @cached_request("goplus")
+    async def _request(self, method, endpoint, **kwargs):
+        self.calls += 1
+        return {"code": 1, "result": {"endpoint": endpoint, "params": kwargs.get("params")}}
+
+
+@pytest.fixture
+def local_cache(monkeypatch):
+    """Memory-only provider cache swapped in for the global instance"""
+    cache = ProviderResponseCache(max_entries=2)
+    cache.enabled = True
+    cache.redis_client = False
+    monkeypatch.setattr(provider_cache_module, "provider_cache", cache)
+    return cache
+
+
+@pytest.mark.unit
+class TestProviderResponseCache:
+    """Unit tests for the per-provider API response cache"""
+
+    def test_tier_rules(self):
+        """Endpoints map to stability tiers, unknown endpoints are not cached"""
+        cache = ProviderResponseCache()
+
+        assert cache.get_tier("goplus", "GET", "/api/v1/solana/token_security", {}) == "security"
+        assert cache.get_tier("birdeye", "GET", "/defi/price", {}) == "market"
+        assert cache.get_tier("helius", "POST", "https://mainnet.helius-rpc.com", {"json": {"method": "getTokenSupply"}}) == "metadata"
+        assert cache.get_tier("helius", "POST", "https://mainnet.helius-rpc.com", {"json": {"method": "getHealth"}}) is None
+        assert cache.get_tier("rugcheck", "POST", "/auth/login/solana", {}) is None
+
+    def test_key_ignores_credentials(self):
+        """API keys in params do not change the cache key"""
+        cache = ProviderResponseCache()
+        first = cache.build_key("helius", "POST", "https://rpc", {"params": {"api-key": "a"}, "json": {"method": "getTokenSupply", "params": ["mint"]}})
+        second = cache.build_key("helius", "POST", "https://rpc", {"params": {"api-key": "b"}, "json": {"method": "getTokenSupply", "params": ["mint"]}})
+        other = cache.build_key("helius", "POST", "https://rpc", {"params": {"api-key": "a"}, "json": {"method": "getTokenSupply", "params": ["other"]}})
+
+        assert first == second
+        assert first != other
+
+    @pytest.mark.asyncio
+    async def test_decorator_serves_repeat_requests_from_cache(self, local_cache):
+        """Repeated identical requests hit the network once and callers get independent copies"""
+        client = FakeClient()
+        params = {"contract_addresses": "mint"}
+
+        first = await client._request("GET", "/api/v1/solana/token_security", params=params)
+        first["result"]["mutated"] = True
+        second = await client._request("GET", "/api/v1/solana/token_security", params=params)
+        await client._request("POST", "/api/v1/solana/token_security", params=params)
+
+        assert client.calls == 2
+        assert "mutated" not in second["result"]
+
+        stats = local_cache.get_stats()["providers"]["goplus"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["uncacheable"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_oldest_entry(self, local_cache):
+        """In-process LRU stays within max_entries"""
+        client = FakeClient()
+
+        for mint in ["a", "b", "c"]:
+            await client._request("GET", "/api/v1/solana/token_security", params={"contract_addresses": mint})
+        await client._request("GET", "/api/v1/solana/token_security", params={"contract_addresses": "a"})
+
+        assert local_cache.get_stats()["lru_entries"] == 2
+        assert client.calls == 4
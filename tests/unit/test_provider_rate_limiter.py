@@ -0,0 +1,108 @@
+import pytest
+import time
+
+from app.services.api import helius_client as helius_module
+from app.services.api.helius_client import HeliusAPIError, HeliusClient
+from app.utils.provider_cache import provider_cache
+from app.utils.provider_rate_limiter import ProviderRateLimiter
+
+
+def make_limiter(rate: float, burst: int) -> ProviderRateLimiter:
+    """Memory-backed limiter with a single test provider quota"""
+    limiter = ProviderRateLimiter()
+    limiter.enabled = True
+    limiter.redis_client = False
+    limiter.quotas["test"] = {"rate": rate, "burst": burst}
+    return limiter
+
+
+class RateLimitedResponse:
+    """Response context that always answers 429 and records its release"""
+
+    def __init__(self, session):
+        self.session = session
+        self.status = 429
+        self.headers = {"Retry-After": "0"}
+
+    async def __aenter__(self):
+        self.session.open += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.session.open -= 1
+
+    async def json(self):
+        return {"error": "rate limited"}
+
+
+class RateLimitedSession:
+    """Pooled session stand-in that counts requests and unreleased responses"""
+
+    def __init__(self):
+        self.calls = 0
+        self.open = 0
+        self.open_at_request = []
+
+    def request(self, *args, **kwargs):
+        self.calls += 1
+        self.open_at_request.append(self.open)
+        return RateLimitedResponse(self)
+
+
+@pytest.mark.unit
+class TestProviderRateLimiter:
+    """Unit tests for the token-bucket provider rate limiter"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_throttle(self):
+        """Requests up to burst pass immediately, the next waits for refill"""
+        limiter = make_limiter(rate=20.0, burst=3)
+
+        for _ in range(3):
+            assert await limiter.acquire("test", "key") < 0.01
+
+        waited = await limiter.acquire("test", "key")
+        assert 0.02 <= waited < 0.5
+
+        stats = limiter.get_stats()["providers"]["test"]
+        assert stats["acquired"] == 4
+        assert stats["delayed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_buckets_are_per_api_key(self):
+        """Different API keys draw from separate buckets"""
+        limiter = make_limiter(rate=0.1, burst=1)
+
+        assert await limiter.acquire("test", "key-a") < 0.01
+        assert await limiter.acquire("test", "key-b") < 0.01
+        assert limiter.build_key("test", "key-a") != limiter.build_key("test", "key-b")
+        assert "key-a" not in limiter.build_key("test", "key-a")
+
+    @pytest.mark.asyncio
+    async def test_penalize_blocks_until_retry_after(self):
+        """A 429 drains the bucket until Retry-After has passed"""
+        limiter = make_limiter(rate=100.0, burst=10)
+
+        await limiter.penalize("test", "key", retry_after=0.2)
+        started = time.time()
+        await limiter.acquire("test", "key")
+
+        assert time.time() - started >= 0.19
+        assert limiter.get_stats()["providers"]["test"]["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_429_retries_are_capped(self, monkeypatch):
+        """A client retries a 429 a bounded number of times on a released connection"""
+        limiter = make_limiter(rate=1000.0, burst=100)
+        session = RateLimitedSession()
+        monkeypatch.setattr(helius_module, "provider_rate_limiter", limiter)
+        monkeypatch.setattr(helius_module.http_transport, "get_session", lambda: session)
+        monkeypatch.setattr(helius_module.settings, "PROVIDER_RATE_LIMIT_MAX_RETRIES", 2)
+        monkeypatch.setattr(provider_cache, "enabled", False)
+
+        with pytest.raises(HeliusAPIError, match="rate limit exceeded"):
+            await HeliusClient()._request("GET", "https://example.invalid/v0/test")
+
+        assert session.calls == 3
+        assert session.open_at_request == [0, 0, 0]
+        assert session.open == 0
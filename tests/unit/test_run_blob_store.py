@@ -0,0 +1,79 @@
+import pytest
+
+from app.services import analysis_storage as analysis_storage_module
+from app.services.analysis_index import AnalysisIndex
+from app.services.analysis_storage import AnalysisStorageService
+from app.services.run_blob_store import RunBlobStore
+
+
+def make_results(n: int) -> list:
+    return [
+        {"token_address": f"Mint{i:040d}", "pump_score": i * 1.5, "pump_probability": 60, "notes": "x" * 200}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def blob_store(tmp_path):
+    store = RunBlobStore(str(tmp_path / "run_blobs.db"), cache_size=2)
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestRunBlobStore:
+    """Unit tests for compressed, content-addressed run payloads"""
+
+    @pytest.mark.asyncio
+    async def test_payloads_are_deduplicated_compressed_and_cached(self, blob_store):
+        """Identical payloads share one blob; repeated reads are served decoded from memory"""
+        results = make_results(50)
+
+        first = await blob_store.put(results)
+        second = await blob_store.put(make_results(50))
+        assert first["blob_id"] == second["blob_id"]
+        assert first["stored_size"] < first["raw_size"] / 4
+        assert blob_store.stats["writes"] == 1
+        assert blob_store.stats["dedup_hits"] == 1
+
+        assert await blob_store.get(first["blob_id"]) == results
+        assert await blob_store.get(first["blob_id"]) == results
+        assert blob_store.stats["cache_hits"] == 1
+        assert await blob_store.get("unknown") is None
+
+    @pytest.mark.asyncio
+    async def test_run_metadata_carries_only_a_blob_reference(self, blob_store, tmp_path, monkeypatch):
+        """store_analysis_run keeps results out of ChromaDB metadata; load_run restores them"""
+        stored = {}
+
+        class FakeChroma:
+            def is_connected(self):
+                return True
+
+            async def add_document(self, content, metadata, doc_id):
+                stored[doc_id] = metadata
+                return doc_id
+
+        async def fake_get_chroma_client():
+            return FakeChroma()
+
+        monkeypatch.setattr(analysis_storage_module, "get_chroma_client", fake_get_chroma_client)
+        monkeypatch.setattr(analysis_storage_module, "run_blob_store", blob_store)
+        index = AnalysisIndex(str(tmp_path / "analyses.db"))
+        monkeypatch.setattr(analysis_storage_module, "analysis_index", index)
+        storage = AnalysisStorageService()
+        results = make_results(20)
+
+        assert await storage.store_analysis_run({"run_id": "r1", "profile_type": "pump", "timestamp": 1, "results": results})
+        metadata = stored["run_pump_r1"]
+        assert "results_json" not in metadata
+        assert metadata["results_count"] == 20
+
+        run = await storage.load_run(metadata)
+        assert run["results"] == results
+        run["results"].sort(key=lambda r: r["pump_score"], reverse=True)
+        assert (await storage.load_run(metadata))["results"] == results
+
+        legacy = await storage.load_run({"run_id": "old", "results_json": '[{"a": 1}]'})
+        assert legacy["results"] == [{"a": 1}]
+        index.close()
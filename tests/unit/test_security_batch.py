@@ -0,0 +1,123 @@
+import pytest
+import asyncio
+
+from app.services import token_analyzer as token_analyzer_module
+from app.services.token_analyzer import TokenAnalyzer
+from app.utils.cache import CacheManager
+from app.utils.analysis_cache import AnalysisCache
+
+
+def make_token(i: int) -> str:
+    return f"Batch{i:035d}"
+
+
+class FakeClient:
+    """Stands in for every provider, recording bulk calls and concurrent security checks"""
+
+    def __init__(self):
+        self.bulk_calls = {"dexscreener": [], "helius": []}
+        self.security_calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def get_tokens_by_addresses(self, addresses, chain="solana"):
+        self.bulk_calls["dexscreener"].append(list(addresses))
+        return {address: [{"pairAddress": f"pair-{address}"}] for address in addresses}
+
+    async def get_tokens_metadata(self, mint_addresses):
+        self.bulk_calls["helius"].append(list(mint_addresses))
+        return {address: {"account": address} for address in mint_addresses}
+
+    async def analyze_token_security(self, token_address):
+        self.security_calls.append(token_address)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return {"mintable": {"status": "0"}, "holder_count": "100"}
+
+    async def check_token(self, token_address):
+        return None
+
+    async def get_token_info(self, token_address):
+        return None
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(
+        token_analyzer_module.api_manager,
+        "clients",
+        {name: client for name in ["helius", "goplus", "dexscreener", "rugcheck", "solsniffer"]}
+    )
+    monkeypatch.setattr(token_analyzer_module.settings, "SECURITY_BATCH_CONCURRENCY", 4)
+
+    backend = CacheManager()
+    backend.redis_client = False
+    analyzer = TokenAnalyzer()
+    analyzer.analysis_cache = AnalysisCache(cache=backend)
+    analyzer.analysis_cache.enabled = True
+    return analyzer, client
+
+
+@pytest.mark.unit
+class TestSecurityBatch:
+    """Unit tests for batch security screening"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_endpoints_and_bounded_concurrency(self, analyzer):
+        """Market context comes from chunked bulk calls, security checks stay under the limit"""
+        analyzer, client = analyzer
+        tokens = [make_token(i) for i in range(40)]
+
+        results = [result async for result in analyzer.analyze_tokens_security_batch(tokens + tokens[:5])]
+
+        assert sorted(result["token_address"] for result in results) == sorted(tokens)
+        assert [len(chunk) for chunk in client.bulk_calls["dexscreener"]] == [30, 10]
+        assert [len(chunk) for chunk in client.bulk_calls["helius"]] == [40]
+        assert sorted(client.security_calls) == sorted(tokens)
+        assert client.max_active <= 4
+        assert results[0]["market_context"]["dexscreener_pairs"][0]["pairAddress"].startswith("pair-")
+
+    @pytest.mark.asyncio
+    async def test_recent_results_are_not_rescreened(self, analyzer):
+        """Tokens with a fresh security result skip the security providers but still get market context"""
+        analyzer, client = analyzer
+        tokens = [make_token(i) for i in range(3)]
+
+        _ = [result async for result in analyzer.analyze_tokens_security_batch(tokens[:2])]
+        client.security_calls.clear()
+        client.bulk_calls["dexscreener"].clear()
+
+        results = [result async for result in analyzer.analyze_tokens_security_batch(tokens)]
+
+        assert client.security_calls == [tokens[2]]
+        assert client.bulk_calls["dexscreener"] == [tokens]
+        assert sum(1 for result in results if result["metadata"]["from_cache"]) == 2
+        assert all(result["market_context"]["dexscreener_pairs"] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_bulk_market_context_overlaps_screening(self, analyzer):
+        """The bulk market fetch runs alongside the security checks instead of before them"""
+        analyzer, client = analyzer
+        tokens = [make_token(i) for i in range(4)]
+        order = []
+
+        async def slow_bulk(addresses, chain="solana"):
+            order.append("bulk_started")
+            await asyncio.sleep(0.05)
+            order.append("bulk_done")
+            return {address: [{"pairAddress": f"pair-{address}"}] for address in addresses}
+
+        async def security(token_address):
+            order.append("security")
+            return {"mintable": {"status": "0"}, "holder_count": "100"}
+
+        client.get_tokens_by_addresses = slow_bulk
+        client.analyze_token_security = security
+
+        results = [result async for result in analyzer.analyze_tokens_security_batch(tokens)]
+
+        assert len(results) == 4
+        assert order.index("security") < order.index("bulk_done")
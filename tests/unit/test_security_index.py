@@ -0,0 +1,72 @@
+import pytest
+
+from app.services.token_analyzer import TokenAnalyzer
+from app.services.trade.bot_service import BotService
+from app.utils.cache import CacheManager
+from app.utils.security_index import SecurityVerdictIndex
+
+
+TOKEN = "So11111111111111111111111111111111111112"
+
+
+def make_index() -> SecurityVerdictIndex:
+    """Security index backed by memory-only cache manager"""
+    backend = CacheManager()
+    backend.redis_client = False
+    index = SecurityVerdictIndex(cache=backend)
+    index.enabled = True
+    index.max_age = {"safe": 900, "unsafe": 3600}
+    return index
+
+
+@pytest.mark.unit
+class TestSecurityVerdictIndex:
+    """Unit tests for the per-mint security verdict index"""
+
+    @pytest.mark.asyncio
+    async def test_staleness_policy(self):
+        """Conclusive verdicts are served within their max age, unverified ones never"""
+        index = make_index()
+
+        await index.record(TOKEN, True, {"critical_issues": [], "rugcheck_insufficient_data": True}, ["goplus", "rugcheck"])
+        entry = await index.lookup(TOKEN)
+        assert entry["verdict"] == "safe"
+        assert entry["coverage"] == ["goplus"]
+        assert await index.lookup(TOKEN, now=entry["computed_at"] + 901) is None
+
+        await index.record(TOKEN, False, {"critical_issues": ["Token has freeze authority"]}, ["goplus"])
+        assert (await index.lookup(TOKEN, now=entry["computed_at"] + 901))["verdict"] == "unsafe"
+
+        await index.record(TOKEN, False, {"critical_issues": []}, [])
+        assert await index.lookup(TOKEN) is None
+
+        stats = index.get_stats()
+        assert stats["hits"] == 2
+        assert stats["stale"] == 1
+        assert stats["inconclusive"] == 1
+
+    @pytest.mark.asyncio
+    async def test_buy_path_reuses_indexed_verdict(self, monkeypatch):
+        """A mint screened earlier gates the buy without another provider fan-out"""
+        from app.services import token_analyzer as token_analyzer_module
+
+        analyzer = TokenAnalyzer()
+        analyzer.security_index = make_index()
+        live_checks = []
+
+        async def fake_security_checks(token_address, analysis_response):
+            live_checks.append(token_address)
+            analysis_response["data_sources"].append("goplus")
+            return True, {"critical_issues": []}
+
+        monkeypatch.setattr(analyzer, "_security_checks", fake_security_checks)
+        monkeypatch.setattr(token_analyzer_module, "token_analyzer", analyzer)
+
+        bot = BotService()
+        assert await bot._run_security_check(TOKEN) is True
+        assert await bot._run_security_check(TOKEN) is True
+        assert live_checks == [TOKEN]
+
+        await analyzer.security_index.record(TOKEN, False, {"critical_issues": ["Balance can be modified by authority"]}, ["goplus"])
+        assert await bot._run_security_check(TOKEN) is False
+        assert live_checks == [TOKEN]
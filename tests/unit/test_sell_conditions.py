@@ -0,0 +1,81 @@
+import pytest
+import random
+import time
+
+import numpy as np
+
+from app.services.trade.autotrade_service import AutoTradeService
+from app.services.trade.position_book import PositionBook
+from app.services.trade.sell_conditions import SELL_REASONS, PositionColumns, evaluate_sell_conditions
+
+
+CONFIG = {"enabled": True, "liquidity_drain_threshold": 0.07, "max_hold_hours": 24}
+
+
+def make_position(token_address: str, rng: random.Random) -> dict:
+    entry_price = rng.choice([0.0, 1.0, 2.5])
+    return {
+        "token_address": token_address,
+        "entry_price": entry_price,
+        "highest_price_seen": entry_price * rng.choice([1.0, 1.02, 1.3]),
+        "stop_loss_percent": -20.0,
+        "take_profit_percent": 7.0,
+        "trailing_stop_percent": 8.0,
+        "entry_liquidity": rng.choice([0.0, 10000.0]),
+        "entry_time": time.time() - rng.choice([60, 3600 * 30]),
+        "status": "active"
+    }
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = AutoTradeService()
+    service.book = PositionBook(tmp_path / "positions.json")
+    service.config = {**service.config, **CONFIG}
+    return service
+
+
+@pytest.mark.unit
+class TestVectorizedSellConditions:
+    """Unit tests for batch evaluation of autosell conditions"""
+
+    def test_matches_per_position_evaluation(self, service):
+        """Every row gets the same decision as _evaluate_sell_conditions"""
+        rng = random.Random(7)
+        positions = [make_position(f"mint{i}", rng) for i in range(400)]
+        market = [
+            {"currentPriceUSD": p["entry_price"] * rng.uniform(0.5, 1.3), "liquidityUSD": rng.choice([0.0, 500.0, 9000.0])}
+            for p in positions
+        ]
+
+        columns = PositionColumns(positions)
+        codes = evaluate_sell_conditions(
+            columns, np.arange(len(positions)),
+            np.array([m["currentPriceUSD"] for m in market]), np.array([m["liquidityUSD"] for m in market]),
+            time.time(), CONFIG["liquidity_drain_threshold"], CONFIG["max_hold_hours"]
+        )
+
+        expected = [service._evaluate_sell_conditions(p, m)[1] or "" for p, m in zip(positions, market)]
+        assert [SELL_REASONS[code] for code in codes] == expected
+        assert len(set(expected)) == len(SELL_REASONS)
+
+    @pytest.mark.asyncio
+    async def test_batch_emits_intents_and_tracks_highs(self, service):
+        """Only positions with fresh data are checked; holds raise their high-water mark"""
+        for token_address, entry in (("up", 1.0), ("crash", 1.0), ("idle", 1.0)):
+            service.track_position(token_address, {"entry_price": entry, "liquidity": 10000.0})
+
+        intents = service.evaluate_positions_batch({
+            "up": {"currentPriceUSD": 1.04, "liquidityUSD": 10000.0},
+            "crash": {"currentPriceUSD": 0.5, "liquidityUSD": 10000.0},
+            "unknown": {"currentPriceUSD": 3.0}
+        })
+
+        assert [(i["token_address"], i["sell_reason"], i["pnl_percent"]) for i in intents] == [("crash", "stop_loss", -50.0)]
+        assert service.book.get("up")["highest_price_seen"] == 1.04
+        assert service.book.get("idle")["highest_price_seen"] == 1.0
+
+        # Cached columns follow the book: a closed position is no longer evaluated
+        service.close_position("crash", "stop_loss", {"sell_price": 0.5})
+        assert service.evaluate_positions_batch({"crash": {"currentPriceUSD": 0.1}}) == []
+        await service.book.close()
@@ -0,0 +1,108 @@
+import pytest
+import asyncio
+
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Unit tests for single-flight request coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Concurrent callers for the same key run the factory once"""
+        flight = SingleFlight(namespace="test_flight")
+        flight.enabled = True
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"token": "mint", "warnings": []}
+
+        results = await asyncio.gather(*[
+            flight.do("quick:mint", factory, distributed=False) for _ in range(5)
+        ])
+
+        assert calls == 1
+        assert all(result == {"token": "mint", "warnings": []} for result in results)
+
+        # Followers get independent copies
+        results[1]["warnings"].append("follower note")
+        assert results[0]["warnings"] == []
+
+        stats = flight.get_stats()
+        assert stats["leaders"] == 1
+        assert stats["coalesced"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_and_sequential_calls_run_separately(self):
+        """Only overlapping calls for the same key are coalesced"""
+        flight = SingleFlight(namespace="test_flight")
+        flight.enabled = True
+        calls = []
+
+        async def factory(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        await asyncio.gather(
+            flight.do("quick:a", lambda: factory("a"), distributed=False),
+            flight.do("quick:b", lambda: factory("b"), distributed=False)
+        )
+        await flight.do("quick:a", lambda: factory("a"), distributed=False)
+
+        assert sorted(calls) == ["a", "a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_callers(self):
+        """A failed execution raises for every waiting caller"""
+        flight = SingleFlight(namespace="test_flight")
+        flight.enabled = True
+
+        async def factory():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(
+            flight.do("deep:mint", factory, distributed=False),
+            flight.do("deep:mint", factory, distributed=False),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_call_is_cancelled_after_its_last_waiter(self):
+        """With cancel_when_abandoned the shared call survives one cancelled waiter, not all of them"""
+        flight = SingleFlight(namespace="test_flight")
+        flight.enabled = True
+        cancelled = asyncio.Event()
+
+        async def factory():
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "done"
+
+        waiters = [
+            asyncio.create_task(flight.do("market:birdeye:mint", factory, distributed=False, cancel_when_abandoned=True))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+
+        waiters[0].cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled.is_set() and flight.in_flight() == 1
+
+        waiters[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), 0.5)
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert flight.in_flight() == 0
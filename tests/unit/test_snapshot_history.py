@@ -0,0 +1,77 @@
+import pytest
+import time
+from datetime import datetime
+
+from app.services.analysis_profiles.pump_profile import PumpAnalysisProfile
+from app.services.snapshots.snapshot_history import SnapshotHistoryStore
+
+
+def make_snapshot(token_address: str, ts: float, price: float, volume_5m: float = 100.0) -> dict:
+    return {
+        "token_address": token_address,
+        "timestamp": datetime.utcfromtimestamp(ts).isoformat(),
+        "metrics": {"market_data": {
+            "currentPriceUSD": price,
+            "liquidityUSD": 5000.0,
+            "marketCapUSD": price * 1000,
+            "volume5min": volume_5m,
+            "volume1h": None,
+            "whales1h": {"whaleCount": 2, "whaleVolume": 1600.0}
+        }}
+    }
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = SnapshotHistoryStore(db_path=str(tmp_path / "snapshots.db"), retention_hours=1)
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestSnapshotHistory:
+    """Unit tests for the snapshot time-series store"""
+
+    @pytest.mark.asyncio
+    async def test_append_range_and_downsample(self, history):
+        """Every capture appends a point; ranges are per mint and buckets average the points"""
+        base = 1_700_000_000 - 1_700_000_000 % 60
+        for i in range(6):
+            await history.append(make_snapshot("mintA", base + i * 20, price=1.0 + i))
+        await history.append(make_snapshot("mintB", base, price=9.0))
+
+        points = await history.range("mintA", start=base + 20, end=base + 80)
+        assert [p["price"] for p in points] == [2.0, 3.0, 4.0, 5.0]
+        assert points[0]["whale_inflow"] == 1600.0 and points[0]["volume_1h"] is None
+
+        buckets = await history.range("mintA", start=base, end=base + 120, bucket_seconds=60)
+        assert [(b["ts"], b["price"], b["samples"]) for b in buckets] == [(base, 2.0, 3), (base + 60, 5.0, 3)]
+
+        series = await history.range_many(["mintA", "mintB", "unknown"], start=base)
+        assert set(series) == {"mintA", "mintB"} and len(series["mintA"]) == 6
+
+    @pytest.mark.asyncio
+    async def test_prune_applies_retention(self, history):
+        """Points older than the retention window are removed"""
+        now = time.time()
+        await history.append(make_snapshot("mintA", now - 7200, price=1.0))
+        await history.append(make_snapshot("mintA", now - 60, price=2.0))
+
+        assert await history.prune() == 1
+        assert await history.count("mintA") == 1
+
+    def test_trajectory_velocity_and_acceleration(self):
+        """Price accelerating upward gives positive velocity and acceleration"""
+        profile = PumpAnalysisProfile()
+        points = [
+            {"ts": 0, "price": 1.0, "liquidity": 100.0, "volume_5m": 10.0},
+            {"ts": 600, "price": 1.1, "liquidity": 100.0, "volume_5m": 10.0},
+            {"ts": 1200, "price": 1.43, "liquidity": 100.0, "volume_5m": 0.0},
+        ]
+
+        trajectory = profile._calculate_trajectory(points)
+        assert trajectory["window_minutes"] == 20.0
+        assert trajectory["price_velocity"] == pytest.approx(2.15)
+        assert trajectory["price_acceleration"] == pytest.approx(0.2)
+        assert trajectory["liquidity_velocity"] == 0.0
+        assert profile._calculate_trajectory(points[:1])["price_velocity"] is None
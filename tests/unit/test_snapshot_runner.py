@@ -0,0 +1,32 @@
+import pytest
+
+from app.services.snapshots import token_snapshot
+from app.services.snapshots.token_snapshot import TokenSnapshotService
+
+
+@pytest.fixture
+def service():
+    service = TokenSnapshotService()
+    service.concurrency = 4
+    return service
+
+
+@pytest.mark.unit
+class TestSnapshotRunner:
+    """Unit tests for the provider-budget pacing of snapshot refreshes"""
+
+    def test_start_interval_follows_provider_budget(self, service, monkeypatch):
+        """The slowest active provider's budget sets the pace of token starts"""
+        monkeypatch.setattr(token_snapshot.provider_rate_limiter, "enabled", True)
+        monkeypatch.setattr(token_snapshot.provider_rate_limiter, "quotas", {
+            "birdeye": {"rate": 2.0, "burst": 2}, "helius": {"rate": 10.0, "burst": 10}
+        })
+        monkeypatch.setattr(token_snapshot.api_manager, "clients", {"birdeye": object(), "helius": object()})
+        service.provider_budget = 0.5
+        service.rate_limit_delay = 1.0
+
+        # birdeye: 2 calls per token at 2 req/s * 50% budget -> one token every 2s
+        assert service._get_start_interval() == pytest.approx(2.0)
+
+        monkeypatch.setattr(token_snapshot.api_manager, "clients", {"helius": object()})
+        assert service._get_start_interval() == pytest.approx(0.25)
@@ -0,0 +1,104 @@
+import pytest
+import asyncio
+import time
+
+from app.services.snapshots import snapshot_scheduler as scheduler_module
+from app.services.snapshots.snapshot_scheduler import SnapshotScheduler
+
+
+LIQUID = {"liquidityUSD": 50000.0, "volatility_percent": 2.0, "poolAge": 10 * 24 * 3600}
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(scheduler_module.settings, "SNAPSHOT_EVICT_LIQUIDITY_USD", 1000.0)
+    monkeypatch.setattr(scheduler_module.settings, "SNAPSHOT_HOT_VOLATILITY_PERCENT", 15.0)
+    monkeypatch.setattr(scheduler_module.settings, "SNAPSHOT_YOUNG_TOKEN_HOURS", 6.0)
+    monkeypatch.setattr(scheduler_module.token_snapshot_service, "_get_start_interval", lambda: 0.0)
+    scheduler = SnapshotScheduler()
+    scheduler.intervals = {"position": 5, "hot": 60, "normal": 3600}
+    scheduler.concurrency = 2
+    return scheduler
+
+
+@pytest.mark.unit
+class TestSnapshotScheduler:
+    """Unit tests for the priority snapshot scheduler"""
+
+    def test_classify_by_position_volatility_age_and_liquidity(self, scheduler):
+        """Held tokens beat everything, volatile/young tokens are hot, illiquid ones are evicted"""
+        scheduler._position_tokens = {"held"}
+
+        assert scheduler.classify("held", {"liquidityUSD": 0}) == ("position", 5)
+        assert scheduler.classify("calm", LIQUID) == ("normal", 3600)
+        assert scheduler.classify("wild", {**LIQUID, "volatility_percent": 40.0}) == ("hot", 60)
+        assert scheduler.classify("fresh", {**LIQUID, "poolAge": 1800}) == ("hot", 60)
+        assert scheduler.classify("dead", {"liquidityUSD": 50.0}) == ("evicted", None)
+
+    @pytest.mark.asyncio
+    async def test_due_tokens_refresh_by_priority_and_reschedule(self, scheduler, monkeypatch):
+        """Due tokens start in due/tier order within the pool size and come back on their tier interval"""
+        market = {"held": LIQUID, "wild": {**LIQUID, "volatility_percent": 40.0}, "dead": {"liquidityUSD": 10.0}, "later": LIQUID}
+        started = []
+
+        async def fake_capture(token_address, update_existing=True):
+            started.append(token_address)
+            return {"errors": [], "metrics": {"market_data": market[token_address]}}
+
+        monkeypatch.setattr(scheduler_module.token_snapshot_service, "capture_token_snapshot", fake_capture)
+
+        now = time.time()
+        scheduler._position_tokens = {"held"}
+        scheduler.schedule("dead", now - 10, "normal")
+        scheduler.schedule("wild", now - 1, "hot")
+        scheduler.schedule("held", now - 1, "position")
+        scheduler.schedule("later", now + 600, "normal")
+        scheduler.schedule("held", now + 100, "position")  # later due time never delays a pending refresh
+
+        scheduler._start_due_refreshes()
+        assert sorted(scheduler._in_flight) == ["dead", "held"]
+        await asyncio.gather(*scheduler._in_flight.values())
+
+        scheduler._start_due_refreshes()
+        await asyncio.gather(*scheduler._in_flight.values())
+
+        assert started == ["dead", "held", "wild"]
+        assert "dead" in scheduler._evicted and "dead" not in scheduler._due
+        assert scheduler._due["held"] == pytest.approx(time.time() + 5, abs=1)
+        assert scheduler._due["wild"] == pytest.approx(time.time() + 60, abs=1)
+
+        status = scheduler.get_status()
+        assert status["tracked_tokens"] == 3
+        assert status["tiers"] == {"position": 1, "hot": 1, "normal": 1}
+        assert status["evicted_tokens"] == 1
+        assert status["refreshes_per_minute"] == pytest.approx(3 / 5)
+        assert status["overdue_tokens"] == 0
+
+    @pytest.mark.asyncio
+    async def test_progress_reports_overdue_backlog_and_prunes_history(self, scheduler, monkeypatch):
+        """Tokens past their due time show up as lag, and maintenance prunes snapshot history"""
+        pruned = []
+
+        async def fake_prune():
+            pruned.append(True)
+            return 7
+
+        monkeypatch.setattr(scheduler_module.snapshot_history, "prune", fake_prune)
+
+        now = time.time()
+        scheduler.schedule("late", now - 120, "normal")
+        scheduler.schedule("due", now - 30, "hot")
+        scheduler.schedule("later", now + 600, "normal")
+
+        progress = scheduler.get_progress(now)
+        assert progress["overdue_tokens"] == 2
+        assert progress["max_lag_seconds"] == pytest.approx(120, abs=1)
+        assert progress["eta_seconds"] is None
+
+        scheduler._recent_refreshes.extend([now - 10] * 10)
+        # 10 refreshes in the 5 minute window -> 2/min, 2 overdue tokens clear in a minute
+        assert scheduler.get_progress(now)["eta_seconds"] == pytest.approx(60)
+
+        await scheduler._maintenance()
+        assert pruned == [True]
+        assert scheduler.get_status()["history_points_pruned"] == 7
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+
+from app.services.snapshots.snapshot_store import SnapshotStore, snapshot_doc_id
+
+
+def make_snapshot(token_address: str, timestamp: str, price: float, generation: int = 1) -> dict:
+    return {
+        "token_address": token_address,
+        "timestamp": timestamp,
+        "snapshot_generation": generation,
+        "metrics": {"market_data": {"mint": token_address, "priceUSD": price}}
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(db_path=str(tmp_path / "snapshots.db"))
+    store._backfilled = True
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestSnapshotStore:
+    """Unit tests for the exact-key snapshot store"""
+
+    @pytest.mark.asyncio
+    async def test_get_is_exact_per_mint(self, store):
+        """Mints sharing a prefix never overwrite each other, re-capture replaces the row"""
+        first, second = "So11111111111111111111111111111111111111112", "So11111199999999999999999999999999999999999"
+        await store.put(make_snapshot(first, "2026-01-01T00:00:00", 1.0))
+        await store.put(make_snapshot(second, "2026-01-01T00:01:00", 2.0))
+        await store.put(make_snapshot(first, "2026-01-01T00:02:00", 3.0, generation=2))
+
+        record = await store.get(first)
+        assert record["analysis_id"] == snapshot_doc_id(first)
+        assert record["snapshot_generation"] == 2
+        assert record["market_data"]["priceUSD"] == 3.0
+        assert (await store.get(second))["market_data"]["priceUSD"] == 2.0
+        assert await store.get("missing") is None
+        assert await store.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_get_many_and_time_ordering(self, store):
+        """Bulk lookups skip unknown mints, listings follow the last update time"""
+        for i, token in enumerate(["mintA", "mintB", "mintC"]):
+            await store.put(make_snapshot(token, f"2026-01-01T00:0{i}:00", float(i)))
+        await store.put(make_snapshot("mintA", "2026-01-01T00:09:00", 9.0))
+
+        found = await store.get_many(["mintC", "mintA", "unknown", "mintA"])
+        assert set(found) == {"mintA", "mintC"}
+
+        assert [r["token_address"] for r in await store.list_oldest(2)] == ["mintB", "mintC"]
+        assert "market_data" not in (await store.list_oldest(1))[0]
+
+        recent = await store.list_recent(3)
+        assert [r["token_address"] for r in recent] == ["mintA", "mintC", "mintB"]
+        assert recent[0]["market_data"]["priceUSD"] == 9.0
+
+    @pytest.mark.asyncio
+    async def test_backfill_waits_for_chroma_and_runs_once(self, tmp_path, monkeypatch):
+        """An unavailable ChromaDB leaves the import pending; concurrent first lookups share one import"""
+        from app.utils import chroma_client as chroma_client_module
+
+        calls = []
+
+        class FakeChroma:
+            connected = False
+
+            def is_connected(self):
+                return self.connected
+
+            async def get(self, where, include):
+                calls.append(where)
+                await asyncio.sleep(0.01)
+                return {
+                    "documents": ['{"priceUSD": 1.0}', '{"priceUSD": 2.0}'],
+                    "metadatas": [
+                        {"token_address": "mintA", "timestamp": "2026-01-01T00:00:00"},
+                        {"token_address": "mintB", "timestamp": "2026-01-01T00:01:00"}
+                    ]
+                }
+
+        chroma = FakeChroma()
+
+        async def fake_get_chroma_client():
+            return chroma
+
+        monkeypatch.setattr(chroma_client_module, "get_chroma_client", fake_get_chroma_client)
+        store = SnapshotStore(db_path=str(tmp_path / "snapshots.db"))
+        try:
+            assert await store.count() == 0
+            assert store._backfilled is False
+
+            chroma.connected = True
+            counts = await asyncio.gather(*(store.count() for _ in range(5)))
+            assert counts == [2] * 5
+            assert calls == [{"doc_type": "token_snapshot"}]
+            assert (await store.get("mintB"))["market_data"]["priceUSD"] == 2.0
+        finally:
+            store.close()
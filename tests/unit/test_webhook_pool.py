@@ -0,0 +1,103 @@
+import pytest
+import asyncio
+import time
+
+from app.utils import webhook_tasks
+from app.utils.webhook_queue import MemoryTaskBackend
+from app.utils.webhook_tasks import WebhookTaskQueue
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    monkeypatch.setattr(webhook_tasks.settings, "WEBHOOK_WORKERS_MIN", 2)
+    monkeypatch.setattr(webhook_tasks.settings, "WEBHOOK_WORKERS_MAX", 10)
+    monkeypatch.setattr(webhook_tasks.settings, "WEBHOOK_BACKLOG_TARGET_SECONDS", 10.0)
+    monkeypatch.setattr(webhook_tasks.settings, "WEBHOOK_TOKEN_CONCURRENCY", 4)
+
+
+@pytest.mark.unit
+class TestWebhookWorkerPool:
+    """Unit tests for the autoscaling webhook worker pool"""
+
+    def test_target_size_follows_backlog_and_provider_pressure(self, pool_settings):
+        """Backlog grows the pool, rate-limit pressure holds or shrinks it, bounds always apply"""
+        queue = WebhookTaskQueue()
+        queue.pool_target = 3
+
+        assert queue._target_pool_size(backlog=40, latency=2.0, pressure=0.0) == 8
+        assert queue._target_pool_size(backlog=500, latency=2.0, pressure=0.0) == 10
+        assert queue._target_pool_size(backlog=40, latency=2.0, pressure=0.6) == 3
+        assert queue._target_pool_size(backlog=40, latency=2.0, pressure=0.9) == 2
+        assert queue._target_pool_size(backlog=0, latency=2.0, pressure=0.0) == 2
+
+    @pytest.mark.asyncio
+    async def test_resize_starts_and_retires_workers(self, pool_settings):
+        """Shrinking retires idle workers, growing reuses their names"""
+        queue = WebhookTaskQueue()
+        queue.backend = MemoryTaskBackend()
+        queue.running = True
+
+        queue._resize(5)
+        assert sorted(queue.workers) == [f"worker-{i}" for i in range(5)]
+
+        queue._resize(2)
+        await asyncio.sleep(1.2)  # idle workers notice retirement after their dequeue timeout
+        assert len(queue.workers) == 2
+        assert queue.get_stats()["pool_size"] == 2
+
+        queue._resize(4)
+        assert len(queue.workers) == 4
+        assert all(name.startswith("worker-") and int(name[7:]) < 5 for name in queue.workers)
+
+        await queue.stop_workers()
+        assert queue.workers == {}
+
+    @pytest.mark.asyncio
+    async def test_payload_tokens_are_analyzed_concurrently(self, pool_settings, monkeypatch):
+        """Tokens of one payload fan out instead of running one after another"""
+        queue = WebhookTaskQueue()
+        queue.backend = MemoryTaskBackend()
+        processed = []
+
+        async def fake_process_token(token_address, event_type, worker_name):
+            await asyncio.sleep(0.1)
+            processed.append(token_address)
+
+        monkeypatch.setattr(queue, "_extract_tokens_for_analysis", lambda payload, event_type: ["a", "b", "c", "d"])
+        monkeypatch.setattr(queue, "_process_token", fake_process_token)
+
+        started = time.time()
+        await queue._process_task({"event_type": "mint", "payload": {}, "retries": 0}, "worker-0")
+
+        assert time.time() - started < 0.3
+        assert sorted(processed) == ["a", "b", "c", "d"]
+        assert queue.stats["total_processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_token_analysis_retries_then_dead_letters(self, pool_settings, monkeypatch):
+        """A token whose analysis raises fails the task instead of acking it"""
+        from app.services import token_analyzer
+
+        async def failing_analysis(token_address, source_event):
+            if token_address == "bad":
+                raise RuntimeError("provider down")
+            return None
+
+        monkeypatch.setattr(token_analyzer, "analyze_token_security_only", failing_analysis)
+        monkeypatch.setattr(webhook_tasks.settings, "WEBHOOK_MAX_RETRIES", 1)
+        monkeypatch.setattr(webhook_tasks.settings, "WEBHOOK_RETRY_BACKOFF", 60.0)
+        monkeypatch.setattr(WebhookTaskQueue, "_extract_tokens_for_analysis", lambda self, payload, event_type: ["good", "bad"])
+
+        queue = WebhookTaskQueue()
+        queue.backend = MemoryTaskBackend()
+        task = {"event_type": "mint", "payload": {}, "retries": 0}
+
+        await queue._process_task(task, "worker-0")
+        assert task["retries"] == 1
+        assert queue.stats["retries_scheduled"] == 1
+        assert queue.stats["total_processed"] == 0
+
+        await queue._process_task(task, "worker-0")
+        assert queue.stats["dead_lettered"] == 1
+        assert "bad: provider down" in queue.backend.dead_letters[0]["error"]
+        assert queue.stats["security_analyses_failed"] == 2
@@ -0,0 +1,84 @@
+import pytest
+import asyncio
+
+from app.utils.webhook_queue import MemoryTaskBackend, RedisStreamTaskBackend
+from app.utils.webhook_tasks import WebhookTaskQueue
+
+
+def make_task(name: str, priority: str = "normal", retries: int = 0) -> dict:
+    return {"event_type": "mint", "payload": {"name": name}, "priority": priority, "retries": retries}
+
+
+async def make_redis_backend(**kwargs) -> RedisStreamTaskBackend:
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = RedisStreamTaskBackend(fakeredis.aioredis.FakeRedis(decode_responses=True), **kwargs)
+    await backend.setup()
+    return backend
+
+
+@pytest.mark.unit
+class TestWebhookQueue:
+    """Unit tests for webhook queue backends"""
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_serves_lanes_in_priority_order(self):
+        """High priority tasks jump ahead, FIFO within a lane, retries come back after the delay"""
+        backend = MemoryTaskBackend()
+        for task in [make_task("low", "low"), make_task("n1"), make_task("high", "high"), make_task("n2")]:
+            await backend.enqueue(task)
+
+        order = [(await backend.dequeue("w", 0.1))["payload"]["name"] for _ in range(4)]
+        assert order == ["high", "n1", "n2", "low"]
+
+        await backend.retry(make_task("again"), delay=0.05)
+        assert await backend.dequeue("w", 0.01) is None
+        assert (await backend.dequeue("w", 0.2))["payload"]["name"] == "again"
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_priority_ack_and_dead_letter(self):
+        """Stream lanes are read high first, acked entries are removed, dead letters are kept"""
+        backend = await make_redis_backend()
+        await backend.enqueue(make_task("normal"))
+        await backend.enqueue(make_task("high", "high"))
+
+        first = await backend.dequeue("w1", 0.1)
+        second = await backend.dequeue("w1", 0.1)
+        assert [first["payload"]["name"], second["payload"]["name"]] == ["high", "normal"]
+
+        await backend.ack(first)
+        await backend.dead_letter(second, "boom")
+
+        sizes = await backend.size()
+        assert sizes["high"] == 0 and sizes["normal"] == 0
+        assert sizes["dead"] == 1
+        assert await backend.dequeue("w1", 0.05) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_retry_and_reclaim(self):
+        """Retries are promoted once due and unacked tasks of a dead worker are reclaimed"""
+        pytest.importorskip("lupa")
+        backend = await make_redis_backend(visibility_timeout=1)
+
+        await backend.enqueue(make_task("crashed"))
+        assert (await backend.dequeue("dead-worker", 0.1))["payload"]["name"] == "crashed"
+
+        await backend.retry(make_task("retry", retries=1), delay=0.05)
+        assert (await backend.size())["delayed"] == 1
+        await asyncio.sleep(0.06)
+        assert (await backend.dequeue("w2", 0.1))["payload"]["name"] == "retry"
+
+        await asyncio.sleep(1.05)
+        backend._last_reclaim = 0
+        reclaimed = await backend.dequeue("w2", 0.1)
+        assert reclaimed["payload"]["name"] == "crashed"
+
+    @pytest.mark.asyncio
+    async def test_dedup_is_shared_between_processes(self):
+        """Two queue instances on the same Redis see each other's recent tasks"""
+        backend = await make_redis_backend()
+        first, second = WebhookTaskQueue(), WebhookTaskQueue()
+        first.backend = second.backend = backend
+
+        assert await first._is_duplicate_task("Mint111", "mint") is False
+        assert await second._is_duplicate_task("Mint111", "mint") is True
+        assert second.stats["duplicates_prevented"] == 1